@@ -7,6 +7,125 @@ import numpy as np
 from config import CURVA_ABC_LIMITS
 
 
+def classificar_faturamento(faturamento, limite_a=CURVA_ABC_LIMITS["A"], limite_b=CURVA_ABC_LIMITS["B"]):
+    """
+    Classifica cada item em A, B ou C pelo faturamento acumulado (vetorizado)
+    
+    O resultado fica na mesma ordem da entrada; sem faturamento, todos são C.
+    
+    Args:
+        faturamento: Array/Series com o faturamento de cada item
+        limite_a: Percentual acumulado máximo da Curva A (fração)
+        limite_b: Percentual acumulado máximo da Curva B (fração)
+        
+    Returns:
+        Array com "A", "B" ou "C" para cada item
+    """
+    faturamento = np.nan_to_num(np.asarray(faturamento, dtype=float))
+    curva = np.full(len(faturamento), "C", dtype=object)
+    total = faturamento.sum()
+    if total <= 0:
+        return curva
+    
+    ordem = np.argsort(-faturamento, kind="stable")
+    acumulado = np.cumsum(faturamento[ordem]) / total
+    curva[ordem] = np.where(acumulado <= limite_a, "A", np.where(acumulado <= limite_b, "B", "C"))
+    return curva
+
+
+class VendasDiarias:
+    """
+    Tabela compacta de vendas por (SKU, dia) para Curva ABC por janela de tempo.
+    
+    Guarda somas prefixadas do faturamento por SKU ordenadas por dia, de modo que
+    o faturamento de qualquer janela (7, 30, 90 dias...) sai com duas buscas binárias
+    por SKU, sem reler o relatório.
+    """
+
+    def __init__(self, skus, codigo_sku, dia, quantidade, preco):
+        """
+        Inicializa a tabela a partir das colunas já codificadas
+        
+        Args:
+            skus: Array com os SKUs distintos (posição = código)
+            codigo_sku: Array int com o código do SKU de cada venda
+            dia: Array int com o dia de cada venda (dias desde 1970-01-01)
+            quantidade: Array com a quantidade de cada venda
+            preco: Array com o preço unitário de cada venda
+        """
+        self.skus = np.asarray(skus)
+        self.codigo_sku = np.asarray(codigo_sku, dtype=np.int32)
+        self.dia = np.asarray(dia, dtype=np.int32)
+        self.quantidade = np.asarray(quantidade, dtype=np.float32)
+        self.preco = np.asarray(preco, dtype=np.float64)
+        
+        self.primeiro_dia = int(self.dia.min()) if len(self.dia) else 0
+        self.ultimo_dia = int(self.dia.max()) if len(self.dia) else 0
+        self._preparar_somas()
+
+    @classmethod
+    def de_dataframe(cls, df):
+        """
+        Cria a tabela a partir do relatório normalizado (linhas com Data válida)
+        
+        Args:
+            df: DataFrame com colunas SKU, Data, Quantidade Vendida e Preço Atual
+            
+        Returns:
+            VendasDiarias
+        """
+        df = df[df["Data"].notna()]
+        codigo_sku, skus = pd.factorize(df["SKU"], sort=True)
+        dia = df["Data"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+        return cls(skus, codigo_sku, dia, df["Quantidade Vendida"].to_numpy(), df["Preço Atual"].to_numpy())
+
+    def _preparar_somas(self):
+        """Ordena as vendas por (SKU, dia) e calcula a soma acumulada do faturamento"""
+        self._n_dias = self.ultimo_dia - self.primeiro_dia + 1
+        chave = self.codigo_sku.astype(np.int64) * self._n_dias + (self.dia - self.primeiro_dia)
+        ordem = np.argsort(chave, kind="stable")
+        self._chaves = chave[ordem]
+        faturamento = self.preco[ordem] * self.quantidade[ordem]
+        self._acumulado = np.concatenate([[0.0], np.cumsum(faturamento)])
+
+    def _acumulado_ate(self, dia_relativo):
+        """Faturamento acumulado de cada SKU até o dia (relativo ao primeiro dia), inclusive"""
+        inicio_sku = np.arange(len(self.skus), dtype=np.int64) * self._n_dias
+        limite = inicio_sku + np.clip(dia_relativo, -1, self._n_dias - 1)
+        return self._acumulado[np.searchsorted(self._chaves, limite, side="right")]
+
+    def faturamento_por_sku(self, dias=None, data_final=None):
+        """
+        Faturamento de cada SKU na janela de dias terminando em data_final
+        
+        Args:
+            dias: Tamanho da janela em dias (None = período completo)
+            data_final: Último dia da janela (padrão: último dia com vendas)
+            
+        Returns:
+            Series com o faturamento indexada pelo SKU
+        """
+        fim = self.ultimo_dia if data_final is None else int(np.datetime64(data_final, "D").astype(np.int64))
+        fim -= self.primeiro_dia
+        inicio = -1 if dias is None else fim - dias
+        faturamento = self._acumulado_ate(fim) - self._acumulado_ate(inicio)
+        return pd.Series(faturamento, index=pd.Index(self.skus, name="SKU"), name="Faturamento")
+
+    def classificar(self, dias=None, data_final=None):
+        """
+        Curva ABC de cada SKU pelo faturamento na janela
+        
+        Args:
+            dias: Tamanho da janela em dias (None = período completo)
+            data_final: Último dia da janela (padrão: último dia com vendas)
+            
+        Returns:
+            Series com "A", "B" ou "C" indexada pelo SKU
+        """
+        faturamento = self.faturamento_por_sku(dias, data_final)
+        return pd.Series(classificar_faturamento(faturamento.to_numpy()), index=faturamento.index, name="Curva ABC")
+
+
 class ABCClassifier:
     """Classifica produtos em Curva A, B, C baseado em faturamento acumulado."""
 
@@ -3,35 +3,72 @@ Aplicativo Streamlit para Precificação - Carblue
 Novo fluxo: Relatório → Calculadora → Simulador
 """
 
+import datetime
+import sys
 import streamlit as st
 import pandas as pd
-import numpy as np
+from functools import partial, wraps
 from io import BytesIO
 
 from session_manager import inicializar_sessao, atualizar_margens
-from pricing_calculator_v2 import PricingCalculatorV2
-from price_simulator import PriceSimulator
-from mercado_livre_processor import MercadoLivreProcessor
-from promotion_exporter import PromotionExporter
+from tarefas import processar_em_blocos
+from estilos import CSS_APP
+
+# Os módulos de cálculo, o plotly e o openpyxl são importados sob demanda,
+# apenas quando a aba/exportação correspondente é usada (partida mais rápida).
 
 # ============ FUNÇÕES DE FORMATAÇÃO ============
 def formatar_moeda(valor):
     """Formata valor em reais no padrão brasileiro: R$ 1.234,50"""
-    if pd.isna(valor) or valor is None:
-        return "R$ 0,00"
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    from numeros_br import formatar_reais
+    return formatar_reais([valor])[0]
 
 def formatar_percentual(valor):
     """Formata percentual no padrão brasileiro: 12,50%"""
-    if pd.isna(valor) or valor is None:
-        return "0,00%"
-    return f"{valor:.2f}%".replace(".", ",")
+    from numeros_br import formatar_percentuais
+    return formatar_percentuais([valor])[0]
 
 def formatar_percentual_1casa(valor):
     """Formata percentual com 1 casa decimal: 12,5%"""
-    if pd.isna(valor) or valor is None:
-        return "0,0%"
-    return f"{valor:.1f}%".replace(".", ",")
+    from numeros_br import formatar_percentuais
+    return formatar_percentuais([valor], casas=1)[0]
+
+# Colunas de resultado exibidas como reais/percentual além das que têm "R$"/"%" no nome
+COLUNAS_MOEDA = ("Custo Produto", "Frete", "Impostos", "Publicidade", "Subsidio Pix (Credito)",
+                 "Preço Sugerido", "Preço Promo Limite", "Lucro Bruto", "Lucro Líquido", "Faturamento")
+COLUNAS_PERCENTUAL = ("Custo Fixo Op.",)
+
+def exibir_tabela_paginada(df, chave):
+    """
+    Exibe um resultado em páginas, formatando em pt-BR só a página visível
+
+    A tabela recebe os números (a ordenação pelo cabeçalho é numérica, dentro da página);
+    o texto "R$ 1.234,50" / "12,50%" é só o formato de exibição das linhas visíveis.
+
+    Args:
+        df: DataFrame a exibir
+        chave: Prefixo da chave do seletor de página (único por tabela)
+    """
+    from config import TAMANHO_PAGINA_TABELA
+    from numeros_br import estilizar_tabela
+
+    paginas = max(1, -(-len(df) // TAMANHO_PAGINA_TABELA))
+    chave_pagina = f"pagina_{chave}"
+    # Filtro novo pode reduzir o número de páginas: mantém a página escolhida dentro do limite
+    if st.session_state.get(chave_pagina, 1) > paginas:
+        st.session_state[chave_pagina] = paginas
+    pagina = 1
+    if paginas > 1:
+        pagina = st.number_input("Página", min_value=1, max_value=paginas, step=1, key=chave_pagina)
+
+    inicio = (pagina - 1) * TAMANHO_PAGINA_TABELA
+    df_pagina = df.iloc[inicio:inicio + TAMANHO_PAGINA_TABELA]
+    moeda = [c for c in df_pagina.columns if "R$" in c or c in COLUNAS_MOEDA]
+    percentual = [c for c in df_pagina.columns if c.endswith("%") or c in COLUNAS_PERCENTUAL]
+    st.dataframe(estilizar_tabela(df_pagina, moeda=moeda, percentual=percentual),
+                 use_container_width=True, hide_index=True)
+    if paginas > 1:
+        st.caption(f"Linhas {inicio + 1}–{inicio + len(df_pagina)} de {len(df)}")
 
 def formatar_excel_profissional(df, nome_sheet="Relatorio"):
     """Formata um DataFrame para Excel com estilos profissionais"""
@@ -88,10 +125,173 @@ def formatar_excel_profissional(df, nome_sheet="Relatorio"):
         return buffer
     
     except ImportError:
-        buffer = BytesIO()
-        df.to_excel(buffer, index=False, sheet_name=nome_sheet)
-        buffer.seek(0)
-        return buffer
+        return gerar_excel_simples(df, nome_sheet)
+
+def gerar_excel_simples(df, nome_sheet="Relatorio"):
+    """Exporta um DataFrame para Excel sem formatação"""
+    buffer = BytesIO()
+    df.to_excel(buffer, index=False, sheet_name=nome_sheet)
+    buffer.seek(0)
+    return buffer
+
+@st.cache_data(show_spinner=False)
+def gerar_modelo_planilha():
+    """Gera o modelo de planilha para download (em cache: é sempre o mesmo arquivo)"""
+    from openpyxl.styles import Font, PatternFill, Alignment
+    
+    df_modelo = pd.DataFrame({
+        'SKU/MLB': ['SKU001', 'SKU002', 'SKU003'],
+        'Titulo': ['Produto Exemplo 1', 'Produto Exemplo 2', 'Produto Exemplo 3'],
+        'Custo Produto (R$)': [25.50, 45.00, 15.75],
+        'Frete (R$)': [8.00, 12.00, 5.00],
+        'Preco Atual (R$)': [89.90, 149.90, 59.90],
+        'Tipo de Anuncio': ['Classico', 'Premium', 'Classico'],
+        'Quantidade Vendida': [150, 85, 320]
+    })
+    
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df_modelo.to_excel(writer, index=False, sheet_name='Produtos')
+        
+        # Formatar planilha
+        ws = writer.sheets['Produtos']
+        header_fill = PatternFill(start_color="556B2F", end_color="556B2F", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF")
+        
+        for cell in ws[1]:
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+        
+        # Ajustar largura das colunas
+        ws.column_dimensions['A'].width = 15
+        ws.column_dimensions['B'].width = 25
+        ws.column_dimensions['C'].width = 18
+        ws.column_dimensions['D'].width = 15
+        ws.column_dimensions['E'].width = 18
+        ws.column_dimensions['F'].width = 18
+        ws.column_dimensions['G'].width = 20
+    
+    return output.getvalue()
+
+# Janelas da Curva ABC (dias; None = período completo do relatório)
+JANELAS_ABC = {
+    "Período completo": None,
+    "Últimos 7 dias": 7,
+    "Últimos 30 dias": 30,
+    "Últimos 90 dias": 90,
+}
+
+def aplicar_janela_abc():
+    """Atualiza a Curva ABC dos resultados com a janela selecionada, sem reler o relatório"""
+    vendas = st.session_state.get("vendas_diarias")
+    if vendas is None:
+        return
+    
+    curva = vendas.classificar(JANELAS_ABC[st.session_state.get("janela_abc", "Período completo")])
+    dados = st.session_state.dados
+    for chave, coluna_sku in (("resultado_calculadora", "SKU ou MLB"), ("resultado_simulador", "SKU")):
+        df = dados.get(chave)
+        if df is not None and "Curva ABC" in df.columns:
+            # Guarda de novo pelo DadosSessao: se o resultado estiver despejado em arquivo,
+            # alterar o DataFrame no lugar não chegaria ao arquivo. A cópia continua ligada
+            # ao arquivo do cache (memory-map compartilhado entre sessões): só a coluna nova
+            # fica na memória da sessão
+            from memoria_sessao import copia_mapeada
+            df = copia_mapeada(df)
+            # SKUs sem vendas na janela ficam na Curva C
+            df["Curva ABC"] = curva.reindex(df[coluna_sku]).fillna("C").to_numpy()
+            dados[chave] = df
+
+def criar_calculadora():
+    """Calculadora V2 com as premissas atuais da sessão"""
+    from pricing_calculator_v2 import PricingCalculatorV2
+    return PricingCalculatorV2(
+        marketplaces=st.session_state.marketplaces,
+        regimes=st.session_state.regimes,
+        margem_bruta_alvo=st.session_state.margem_bruta_alvo,
+        margem_liquida_minima=st.session_state.margem_liquida_minima,
+        percent_publicidade=st.session_state.get("percent_publicidade", 3.0),
+        custo_fixo_operacional=st.session_state.get("custo_fixo_operacional", 0.0),
+        taxa_devolucao=st.session_state.get("taxa_devolucao", 0.0),
+        modo_monetario=st.session_state.get("modo_monetario", "float"),
+        data_tarifas=st.session_state.get("data_tarifas"),
+    )
+
+def iniciar_tarefa(chave, funcao, total, destino, descricao):
+    """
+    Executa um cálculo pelo executor de tarefas da sessão
+    
+    Catálogos pequenos rodam direto no script; os grandes, em segundo plano (a tela
+    continua respondendo e o progresso aparece em acompanhar_tarefa).
+    """
+    from tarefas import LIMITE_LINHAS_SINCRONO
+    executor = st.session_state.executor_tarefas
+    em_segundo_plano = total >= LIMITE_LINHAS_SINCRONO
+    executor.iniciar(chave, funcao, total, destino, descricao, em_segundo_plano=em_segundo_plano)
+    if not em_segundo_plano:
+        # O botão está no fragmento da aba: as outras abas também dependem do resultado
+        st.rerun()
+
+def coletar_tarefas():
+    """Copia para a sessão os resultados das tarefas que terminaram desde a última execução"""
+    from tarefas import CONCLUIDA
+    for tarefa in st.session_state.executor_tarefas.coletar(st.session_state.dados):
+        TAREFAS_COLETADAS[tarefa.chave] = tarefa
+        if tarefa.estado == CONCLUIDA and tarefa.destino in ("resultado_calculadora", "resultado_simulador"):
+            aplicar_janela_abc()
+
+@st.fragment(run_every=1.0)
+def _progresso_tarefa(chave):
+    """Barra de progresso da tarefa (atualizada a cada segundo) com botão de cancelar"""
+    tarefa = st.session_state.executor_tarefas.tarefa(chave)
+    if tarefa is None or not tarefa.ativa:
+        # Terminou: recarrega a página inteira para coletar e exibir o resultado
+        st.rerun()
+    eta = f" • faltam ~{tarefa.eta:.0f}s" if tarefa.eta is not None else ""
+    st.progress(
+        tarefa.progresso,
+        text=f"{tarefa.descricao}: {tarefa.concluidas:,} de {tarefa.total:,} linhas{eta}".replace(",", "."),
+    )
+    if st.button("Cancelar", key=f"btn_cancelar_{chave}"):
+        tarefa.cancelar()
+
+def acompanhar_tarefa(chave, mensagem_erro):
+    """Mostra o progresso da tarefa em andamento ou o desfecho da que acabou de terminar"""
+    from tarefas import CANCELADA, CONCLUIDA, ERRO
+    tarefa = st.session_state.executor_tarefas.tarefa(chave)
+    if tarefa is None:
+        return
+    if tarefa.ativa:
+        _progresso_tarefa(chave)
+    elif TAREFAS_COLETADAS.get(chave) is tarefa:
+        if tarefa.estado == CONCLUIDA:
+            st.success(f"{tarefa.descricao} concluído em {tarefa.segundos:.1f}s")
+        elif tarefa.estado == CANCELADA:
+            st.info(f"{tarefa.descricao} cancelado ({tarefa.concluidas:,} de {tarefa.total:,} linhas)".replace(",", "."))
+        elif tarefa.estado == ERRO:
+            st.error(f"{mensagem_erro}: {tarefa.erro}")
+
+def fragmento_aba(etapa):
+    """
+    Isola a aba em um st.fragment: um widget da aba reexecuta só a aba, não o script inteiro
+    
+    O tempo de cada execução da aba vai para o registro de desempenho com o nome da etapa.
+    Mudanças que afetam as outras abas (premissas da sidebar, novo relatório, resultado de
+    um cálculo) continuam recarregando a página inteira.
+    """
+    def decorador(funcao):
+        @st.fragment
+        @wraps(funcao)
+        def executar():
+            relatorio = st.session_state.dados.get("relatorio_vendas")
+            with st.session_state.registro_desempenho.medir(etapa, len(relatorio) if relatorio is not None else None):
+                funcao()
+        return executar
+    return decorador
+
+# Tarefas coletadas nesta execução do script (desfecho exibido uma única vez)
+TAREFAS_COLETADAS = {}
 
 # Configurar página
 st.set_page_config(
@@ -103,191 +303,17 @@ st.set_page_config(
 
 # Inicializar sessão
 inicializar_sessao()
+coletar_tarefas()
 
-# Estilos customizados
-st.markdown("""
-    <style>
-    /* Tema Minimalista - Preto & Verde Militar */
-    .stApp {
-        background-color: #000000;
-        color: #E8E8E8;
-    }
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #ffffff;
-        margin-bottom: 0.5rem;
-        text-shadow: 0px 2px 4px rgba(0,0,0,0.3);
-    }
-    .section-header {
-        font-size: 1.5rem;
-        font-weight: bold;
-        color: #ffffff;
-        margin-top: 1rem;
-        margin-bottom: 0.5rem;
-    }
-    .status-saudavel { color: #6B8E23; font-weight: bold; }
-    .status-alerta { color: #fbbf24; font-weight: bold; }
-    .status-prejuizo { color: #f87171; font-weight: bold; }
-    
-    .config-section {
-        background-color: #1e293b;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-        border: 1px solid #334155;
-    }
-
-    /* Estilização Premium Dark para o Sidebar */
-    [data-testid="stSidebar"] {
-        background-color: #000000;
-        border-right: 1px solid #1e293b;
-    }
-    [data-testid="stSidebar"] .stMarkdown h1 {
-        font-size: 1.2rem !important;
-        font-weight: 700 !important;
-        color: #ffffff;
-        margin-bottom: 0.5rem !important;
-    }
-    [data-testid="stSidebar"] .stMarkdown p, 
-    [data-testid="stSidebar"] .stMarkdown span,
-    [data-testid="stSidebar"] label {
-        font-size: 0.85rem !important;
-        color: #cbd5e1;
-    }
-    [data-testid="stSidebar"] .stExpander {
-        border: none !important;
-        background-color: transparent !important;
-        margin-bottom: 0.4rem !important;
-    }
-    [data-testid="stSidebar"] .stExpander details {
-        border: 1px solid #1e293b !important;
-        border-radius: 8px !important;
-        background-color: #0f172a !important;
-        transition: all 0.2s ease;
-    }
-    [data-testid="stSidebar"] .stExpander details:hover {
-        border-color: #334155 !important;
-        background-color: #1e293b !important;
-    }
-    [data-testid="stSidebar"] .stExpander summary p {
-        font-size: 0.9rem !important;
-        font-weight: 600 !important;
-        color: #f8fafc !important;
-    }
-    /* Ajuste de inputs no sidebar para Dark Mode */
-    [data-testid="stSidebar"] .stNumberInput input,
-    [data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] {
-        font-size: 0.8rem !important;
-        background-color: #020617 !important;
-        color: #ffffff !important;
-        border-color: #1e293b !important;
-    }
-    [data-testid="stSidebar"] .stCaption {
-        font-size: 0.75rem !important;
-        color: #94a3b8 !important;
-    }
-    [data-testid="stSidebar"] hr {
-        margin: 0.5rem 0 !important;
-        border-color: #1e293b !important;
-    }
-    /* Estilo para Tabs no Dark Mode */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background-color: transparent;
-    }
-    .stTabs [data-baseweb="tab"] {
-        height: 40px;
-        white-space: pre;
-        background-color: #1e293b;
-        border-radius: 4px 4px 0px 0px;
-        color: #94a3b8;
-        padding: 10px 20px;
-    }
-    .stTabs [aria-selected="true"] {
-        background-color: #334155 !important;
-        color: #ffffff !important;
-    }
-    /* Remover tarja branca no topo */
-    header[data-testid="stHeader"] {
-        background-color: rgba(0,0,0,0) !important;
-        color: #ffffff !important;
-    }
-    /* Corrigir legibilidade do File Uploader */
-    [data-testid="stFileUploadDropzone"] {
-        background-color: #0f172a !important;
-        border: 1px dashed #334155 !important;
-    }
-    [data-testid="stFileUploadDropzone"] p, 
-    [data-testid="stFileUploadDropzone"] span,
-    [data-testid="stFileUploadDropzone"] small {
-        color: #ffffff !important;
-    }
-    /* Corrigir botões de upload e outros botões secundários */
-    .stButton button {
-        background-color: #556B2F !important;
-        color: #ffffff !important;
-        border: 1px solid #556B2F !important;
-    }
-    .stButton button:hover {
-        background-color: #6B8E23 !important;
-        border-color: #6B8E23 !important;
-        color: #ffffff !important;
-    }
-    
-    /* PENTE FINO: Legibilidade Global */
-    /* Forçar cor de texto em todos os parágrafos e spans */
-    p, span, label, li, .stMarkdown {
-        color: #fafafa !important;
-    }
-    /* Ajustar métricas */
-    [data-testid="stMetricValue"] {
-        color: #ffffff !important;
-    }
-    [data-testid="stMetricLabel"] p {
-        color: #94a3b8 !important;
-    }
-    /* Ajustar tabelas e dataframes */
-    .stDataFrame, [data-testid="stTable"] {
-        background-color: #0f172a !important;
-    }
-    /* Ajustar legendas e captions */
-    .stCaption, small {
-        color: #94a3b8 !important;
-    }
-    /* Ajustar inputs globais (fora do sidebar também) */
-    .stNumberInput input, .stTextInput input, .stSelectbox div[data-baseweb="select"] {
-        background-color: #0f172a !important;
-        color: #ffffff !important;
-        border-color: #334155 !important;
-    }
-    /* Ajustar Sliders */
-    .stSlider [data-baseweb="slider"] {
-        background-color: transparent !important;
-    }
-    /* Ajustar Warnings e Infos */
-    .stAlert {
-        background-color: #1e293b !important;
-        color: #ffffff !important;
-        border: 1px solid #334155 !important;
-    }
-    /* Ajustar Divisores */
-    hr {
-        border-color: #334155 !important;
-    }
-    /* Forçar cor branca em títulos de expanders fora do sidebar */
-    .stExpander summary p {
-        color: #ffffff !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Estilos customizados (CSS estático, carregado uma única vez por processo)
+st.markdown(CSS_APP, unsafe_allow_html=True)
 
 # ============ SIDEBAR ============
 st.sidebar.markdown("#  CONFIGURAÇÕES")
 st.sidebar.markdown("---")
 
 # 1. MARKETPLACES
-with st.sidebar.expander("Marketplaces", expanded=False):
+with st.sidebar.expander("Marketplaces", expanded=False), st.form("form_marketplaces", border=False):
     for marketplace, config in st.session_state.marketplaces.items():
         st.markdown(f"**{marketplace}**")
         col1, col2 = st.columns([1, 1])
@@ -311,14 +337,17 @@ with st.sidebar.expander("Marketplaces", expanded=False):
                 key=f"taxa_fixa_{marketplace}",
             )
         
-        st.session_state.marketplaces[marketplace]["comissao"] = comissao
-        st.session_state.marketplaces[marketplace]["custo_fixo"] = taxa_fixa
+        st.session_state.marketplaces = st.session_state.marketplaces.alterar_campos(
+            marketplace, comissao=comissao, custo_fixo=taxa_fixa
+        )
         
         st.markdown("")
         st.divider()
+    
+    st.form_submit_button("Aplicar", use_container_width=True)
 
 # 2. REGIMES TRIBUTÁRIOS
-with st.sidebar.expander("Regimes Tributários", expanded=False):
+with st.sidebar.expander("Regimes Tributários", expanded=False), st.form("form_regimes", border=False):
     for regime, config in st.session_state.regimes.items():
         st.markdown(f"**{regime}**")
         
@@ -354,15 +383,17 @@ with st.sidebar.expander("Regimes Tributários", expanded=False):
                 key=f"impostos_{regime}",
             ) / 100
         
-        st.session_state.regimes[regime]["ibs"] = ibs
-        st.session_state.regimes[regime]["cbs"] = cbs
-        st.session_state.regimes[regime]["impostos_encargos"] = impostos
+        st.session_state.regimes = st.session_state.regimes.alterar_campos(
+            regime, ibs=ibs, cbs=cbs, impostos_encargos=impostos
+        )
         
         st.markdown("")
         st.divider()
+    
+    st.form_submit_button("Aplicar", use_container_width=True)
 
 # 3. MARGENS E PUBLICIDADE
-with st.sidebar.expander("Margens e Publicidade", expanded=False):
+with st.sidebar.expander("Margens e Publicidade", expanded=False), st.form("form_margens", border=False):
     
     # Garantir que os valores sao validos
     valor_margem_bruta = float(st.session_state.get("margem_bruta_alvo", 30.0)) if st.session_state.get("margem_bruta_alvo") is not None else 30.0
@@ -404,9 +435,11 @@ with st.sidebar.expander("Margens e Publicidade", expanded=False):
     st.caption(f"Publicidade: {formatar_percentual_1casa(percent_pub)}")
     
     atualizar_margens(margem_bruta, margem_liquida, percent_pub)
+    
+    st.form_submit_button("Aplicar", use_container_width=True)
 
 # 4. CUSTOS OPERACIONAIS
-with st.sidebar.expander("Custos Operacionais", expanded=False):
+with st.sidebar.expander("Custos Operacionais", expanded=False), st.form("form_custos", border=False):
     
     custo_fixo_op = st.slider(
         "Custo Fixo Operacional (%)",
@@ -436,6 +469,25 @@ with st.sidebar.expander("Custos Operacionais", expanded=False):
     
     st.markdown("")
     st.info("Os custos operacionais são aplicados como percentual do faturamento total.")
+    
+    modo_centavos = st.toggle(
+        "Cálculo em centavos",
+        value=st.session_state.get("modo_monetario") == "centavos",
+        help="Arredonda cada taxa ao centavo (como o marketplace calcula o \"Você recebe\")",
+        key="toggle_modo_centavos"
+    )
+    st.session_state.modo_monetario = "centavos" if modo_centavos else "float"
+    
+    data_tarifas = st.date_input(
+        "Vigência das Tarifas do Mercado Livre",
+        value=st.session_state.get("data_tarifas") or datetime.date.today(),
+        format="DD/MM/YYYY",
+        help="Tabela de tarifas usada no cálculo (regras de 2025 ou a partir de 02/03/2026)",
+        key="input_data_tarifas"
+    )
+    st.session_state.data_tarifas = data_tarifas
+    
+    st.form_submit_button("Aplicar", use_container_width=True)
 
 # 5. CARREGAR RELATÓRIO
 with st.sidebar.expander("Carregar Relatório de Vendas", expanded=False):
@@ -449,53 +501,16 @@ with st.sidebar.expander("Carregar Relatório de Vendas", expanded=False):
     - **E:** Preco Atual (R$)
     - **F:** Tipo de Anuncio (opcional)
     - **G:** Quantidade Vendida (opcional - para Curva ABC)
+    - **H:** Data (opcional - Curva ABC por janela de 7/30/90 dias)
+    - **Peso (kg), Logística (Full/Flex), Categoria** (opcionais - tarifas do Mercado Livre 2026)
     """)
     
     st.markdown("")
     
-    # Criar e disponibilizar modelo de planilha
-    from io import BytesIO
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment
-    
-    df_modelo = pd.DataFrame({
-        'SKU/MLB': ['SKU001', 'SKU002', 'SKU003'],
-        'Titulo': ['Produto Exemplo 1', 'Produto Exemplo 2', 'Produto Exemplo 3'],
-        'Custo Produto (R$)': [25.50, 45.00, 15.75],
-        'Frete (R$)': [8.00, 12.00, 5.00],
-        'Preco Atual (R$)': [89.90, 149.90, 59.90],
-        'Tipo de Anuncio': ['Classico', 'Premium', 'Classico'],
-        'Quantidade Vendida': [150, 85, 320]
-    })
-    
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df_modelo.to_excel(writer, index=False, sheet_name='Produtos')
-        
-        # Formatar planilha
-        ws = writer.sheets['Produtos']
-        header_fill = PatternFill(start_color="556B2F", end_color="556B2F", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Ajustar largura das colunas
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 18
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 18
-        ws.column_dimensions['F'].width = 18
-        ws.column_dimensions['G'].width = 20
-    
-    output.seek(0)
-    
+    # Disponibilizar modelo de planilha (gerado apenas quando o botão é clicado)
     st.download_button(
         label="Baixar Modelo de Planilha",
-        data=output.getvalue(),
+        data=gerar_modelo_planilha,
         file_name="modelo_precificacao.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         use_container_width=True
@@ -503,118 +518,74 @@ with st.sidebar.expander("Carregar Relatório de Vendas", expanded=False):
     
     st.markdown("")
     
-    uploaded_file = st.file_uploader(
-        "Escolha um arquivo",
+    uploaded_files = st.file_uploader(
+        "Escolha um ou mais arquivos",
         type=["xlsx", "xls", "csv"],
-        help="Relatório de vendas do Mercado Livre",
+        accept_multiple_files=True,
+        help="Relatórios de vendas do Mercado Livre/Shopee (várias contas ou vários dias)",
         key="sidebar_upload"
     )
     
-    if uploaded_file is not None:
-        try:
-            with st.spinner("⏳ Processando..."):
-                processor = MercadoLivreProcessor()
-                
-                if uploaded_file.name.endswith(".csv"):
-                    df = processor.carregar_de_csv(uploaded_file)
-                else:
-                    df = processor.carregar_de_excel(uploaded_file)
-                
-                df_normalizado = processor.normalizar_relatorio_vendas(df)
-                valido, mensagem = processor.validar_relatorio(df_normalizado)
-                
-                if valido:
-                    df_agregado = processor.agregar_por_sku(df_normalizado)
-                    st.session_state.relatorio_vendas = df_agregado
-                    st.success(f" {len(df_agregado)} SKUs carregados com sucesso!")
-                else:
-                    st.error(f" {mensagem}")
-        
-        except Exception as e:
-            st.error(f" Erro: {str(e)}")
+    if uploaded_files:
+        # Evitar reprocessar os mesmos arquivos a cada interação
+        assinatura_upload = tuple((f.name, f.size) for f in uploaded_files)
+        if st.session_state.get("assinatura_upload") != assinatura_upload:
+            try:
+                with st.spinner(f"⏳ Processando {len(uploaded_files)} arquivo(s)..."):
+                    from mercado_livre_processor import MercadoLivreProcessor
+                    processor = MercadoLivreProcessor()
+                    
+                    registro = st.session_state.registro_desempenho
+                    df_normalizado, erros = processor.carregar_multiplos_arquivos(uploaded_files, registro=registro)
+                    valido, mensagem = processor.validar_relatorio(df_normalizado)
+                    
+                    for erro in erros:
+                        st.warning(f" {erro}")
+
+                    conversao = df_normalizado.attrs.get("conversao_numeros", {})
+                    descartados = [f"{col}: {est['invalidos']}" for col, est in conversao.items() if est["invalidos"]]
+                    if descartados:
+                        st.warning(f" Valores não numéricos ignorados ({', '.join(descartados)})")
+
+                    if valido:
+                        with registro.medir("agregacao", len(df_normalizado)):
+                            df_agregado = processor.agregar_por_sku(df_normalizado)
+                        st.session_state.dados["relatorio_vendas"] = df_agregado
+                        st.session_state.assinatura_upload = assinatura_upload
+                        
+                        # Vendas por dia para a Curva ABC por janela de tempo
+                        st.session_state.vendas_diarias = None
+                        if "Data" in df_normalizado.columns and df_normalizado["Data"].notna().any():
+                            from abc_classifier import VendasDiarias
+                            with registro.medir("vendas_diarias", len(df_normalizado)):
+                                st.session_state.vendas_diarias = VendasDiarias.de_dataframe(df_normalizado)
+                        aplicar_janela_abc()
+                        n_contas = df_normalizado["Conta"].nunique()
+                        st.success(f" {len(df_agregado)} SKUs carregados com sucesso! ({len(uploaded_files)} arquivo(s), {n_contas} conta(s))")
+                    else:
+                        st.error(f" {mensagem}")
+            
+            except Exception as e:
+                st.error(f" Erro: {str(e)}")
+        elif "relatorio_vendas" in st.session_state.dados:
+            st.caption(f"{len(st.session_state.dados['relatorio_vendas'])} SKUs carregados")
+    
+    if st.session_state.vendas_diarias is not None:
+        st.selectbox(
+            "Janela da Curva ABC",
+            list(JANELAS_ABC),
+            key="janela_abc",
+            on_change=aplicar_janela_abc,
+            help="Faturamento considerado na Curva ABC, até o último dia do relatório"
+        )
 
 # ============ ABAS PRINCIPAIS ============
 st.markdown("---")
 tab1, tab2, tab3, tab4, tab5 = st.tabs([" Home", "Calculadora de Precificação", "Simulador de Preço Alvo", " Dashboard", " Estratégias Promocionais"])
 
 # ============ ABA 1: HOME ============
-with tab1:
-    # CSS personalizado para melhor visual
-    st.markdown("""
-    <style>
-    .hero-section {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 40px 20px;
-        border-radius: 15px;
-        color: white;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    .hero-title {
-        font-size: 2.5em;
-        font-weight: 700;
-        margin-bottom: 10px;
-    }
-    .hero-subtitle {
-        font-size: 1.1em;
-        opacity: 0.9;
-    }
-    .feature-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 25px;
-        border-radius: 12px;
-        border-left: 5px solid #667eea;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        margin-bottom: 20px;
-        transition: all 0.3s ease;
-        color: white;
-    }
-    .feature-card:hover {
-        box-shadow: 0 4px 15px rgba(0,0,0,0.12);
-        transform: translateY(-2px);
-    }
-    .feature-title {
-        font-size: 1.3em;
-        font-weight: 600;
-        color: #667eea;
-        margin-bottom: 10px;
-    }
-    .step-number {
-        display: inline-block;
-        background: #667eea;
-        color: white;
-        width: 40px;
-        height: 40px;
-        border-radius: 50%;
-        text-align: center;
-        line-height: 40px;
-        font-weight: 700;
-        margin-right: 15px;
-        font-size: 1.1em;
-    }
-    .benefit-list {
-        list-style: none;
-        padding: 0;
-    }
-    .benefit-list li {
-        padding: 12px 0;
-        padding-left: 35px;
-        position: relative;
-        line-height: 1.6;
-    }
-    .benefit-list li:before {
-        content: "✅";
-        position: absolute;
-        left: 0;
-        color: #667eea;
-        font-weight: bold;
-        font-size: 1.2em;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+@fragmento_aba("aba_home")
+def aba_home():
     # Hero Section
     st.markdown("""
     <div class="hero-section">
@@ -826,68 +797,12 @@ with tab1:
     </div>
     """, unsafe_allow_html=True)
 
-    # ============ ABA 2: CALCULADORA ============
-with tab2:
-    # CSS para Calculadora
-    st.markdown("""
-    <style>
-    .calc-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 30px 20px;
-        border-radius: 12px;
-        color: white;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    .calc-title {
-        font-size: 2em;
-        font-weight: 700;
-        margin-bottom: 5px;
-    }
-    .calc-subtitle {
-        font-size: 0.95em;
-        opacity: 0.9;
-    }
-    .input-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 20px;
-        border-radius: 12px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        margin-bottom: 20px;
-    }
-    .metric-card-calc {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 20px;
-        border-radius: 12px;
-        border-top: 4px solid #667eea;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        text-align: center;
-    }
-    .section-title-calc {
-        color: white;
-        font-size: 1.3em;
-        font-weight: 700;
-        color: white;
-        margin: 30px 0 20px 0;
-        padding-bottom: 10px;
-        border-bottom: 3px solid #667eea;
-    }
-    .filter-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 20px;
-        border-radius: 12px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        margin-bottom: 20px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+with tab1:
+    aba_home()
+
+# ============ ABA 2: CALCULADORA ============
+@fragmento_aba("aba_calculadora")
+def aba_calculadora():
     # Header
     st.markdown("""
     <div class="calc-header">
@@ -896,7 +811,7 @@ with tab2:
     </div>
     """, unsafe_allow_html=True)
     
-    if st.session_state.relatorio_vendas is None or st.session_state.relatorio_vendas.empty:
+    if st.session_state.dados.get("relatorio_vendas") is None or st.session_state.dados.get("relatorio_vendas").empty:
         st.info(" Carregue um relatório na sidebar para começar")
     else:
         st.markdown('<div class="section-title-calc">Configuração</div>', unsafe_allow_html=True)
@@ -918,31 +833,30 @@ with tab2:
             )
         
         if st.button("Calcular Precificação", use_container_width=True, key="btn_calc"):
-            try:
-                calculator = PricingCalculatorV2(
-                    marketplaces=st.session_state.marketplaces,
-                    regimes=st.session_state.regimes,
-                    margem_bruta_alvo=st.session_state.margem_bruta_alvo,
-                    margem_liquida_minima=st.session_state.margem_liquida_minima,
-                    percent_publicidade=st.session_state.get("percent_publicidade", 3.0),
-                    custo_fixo_operacional=st.session_state.get("custo_fixo_operacional", 0.0),
-                    taxa_devolucao=st.session_state.get("taxa_devolucao", 0.0),
-                )
-                
-                df_resultado = calculator.calcular_dataframe(
-                    st.session_state.relatorio_vendas,
+            from cache_resultados import obter_cache
+            calculator = criar_calculadora()
+            iniciar_tarefa(
+                "calculadora",
+                partial(
+                    calculator.calcular_dataframe,
+                    st.session_state.dados.get("relatorio_vendas"),
                     marketplace,
-                    regime
-                )
-                
-                st.session_state.resultado_calculadora = df_resultado
-                st.success("Cálculo realizado com sucesso!")
-            
-            except Exception as e:
-                st.error(f"Erro ao calcular: {str(e)}")
+                    regime,
+                    registro=st.session_state.registro_desempenho,
+                    cache=obter_cache(),
+                ),
+                len(st.session_state.dados.get("relatorio_vendas")),
+                "resultado_calculadora",
+                "Cálculo",
+            )
         
-        if "resultado_calculadora" in st.session_state:
-            df_resultado = st.session_state.resultado_calculadora
+        acompanhar_tarefa("calculadora", "Erro ao calcular")
+        
+        if "resultado_calculadora" in st.session_state.dados:
+            from indice_bitmap import indice_de
+            df_resultado = st.session_state.dados["resultado_calculadora"]
+            # Bitmaps por Status/Curva/Tipo: filtros, métricas e downloads sem comparar strings
+            indice = indice_de(df_resultado)
             
             # Métricas
             st.markdown('<div class="section-title-calc">Resumo dos Resultados</div>', unsafe_allow_html=True)
@@ -970,7 +884,7 @@ with tab2:
                 </div>
                 """, unsafe_allow_html=True)
             with col4:
-                saudaveis = len(df_resultado[df_resultado['Status'] == '🟢 Saudável'])
+                saudaveis = indice.contar(indice.igual("Status", '🟢 Saudável'))
                 st.markdown(f"""
                 <div class="metric-card-calc" style="border-top-color: #22C55E;">
                     <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">🟢 Saudáveis</div>
@@ -1006,26 +920,30 @@ with tab2:
                 else:
                     filtro_curva_abc = "Todos"
             
-            # Aplicar filtros
-            df_filtrado = df_resultado.copy()
-            
-            if pesquisa_sku:
-                df_filtrado = df_filtrado[df_filtrado['SKU ou MLB'].str.contains(pesquisa_sku, case=False, na=False)]
-            
-            if filtro_status != "Todos":
-                df_filtrado = df_filtrado[df_filtrado['Status'] == filtro_status]
-            
-            if marketplace == "Mercado Livre" and filtro_tipo_anuncio != "Todos" and "Tipo de Anuncio" in df_filtrado.columns:
-                df_filtrado = df_filtrado[df_filtrado['Tipo de Anuncio'] == filtro_tipo_anuncio]
-            
-            if filtro_curva_abc != "Todos" and "Curva ABC" in df_filtrado.columns:
-                df_filtrado = df_filtrado[df_filtrado['Curva ABC'] == filtro_curva_abc]
+            # Aplicar filtros (bitmaps do índice; a busca de texto livre roda só nas linhas que sobram)
+            with st.session_state.registro_desempenho.medir("filtro", len(df_resultado)) as medicao:
+                bits = indice.todos()
+                
+                if filtro_status != "Todos":
+                    bits &= indice.igual("Status", filtro_status)
+                
+                if marketplace == "Mercado Livre" and filtro_tipo_anuncio != "Todos" and "Tipo de Anuncio" in df_resultado.columns:
+                    bits &= indice.igual("Tipo de Anuncio", filtro_tipo_anuncio)
+                
+                if filtro_curva_abc != "Todos" and "Curva ABC" in df_resultado.columns:
+                    bits &= indice.igual("Curva ABC", filtro_curva_abc)
+                
+                df_filtrado = indice.filtrar(df_resultado, bits)
+                
+                if pesquisa_sku:
+                    df_filtrado = df_filtrado[df_filtrado['SKU ou MLB'].str.contains(pesquisa_sku, case=False, na=False)]
+                medicao["linhas_resultado"] = len(df_filtrado)
             
             st.markdown("---")
             
             # Tabela
             st.markdown(f'<div class="section-title-calc">Detalhes da Precificação ({len(df_filtrado)} produtos)</div>', unsafe_allow_html=True)
-            st.dataframe(df_filtrado, use_container_width=True, hide_index=True)
+            exibir_tabela_paginada(df_filtrado, "calculadora")
             
             st.markdown("---")
             
@@ -1036,7 +954,7 @@ with tab2:
             
             with col1:
                 if len(df_filtrado) > 0:
-                    excel_filtrado = formatar_excel_profissional(df_filtrado, "Filtrado")
+                    excel_filtrado = partial(formatar_excel_profissional, df_filtrado, "Filtrado")
                     st.download_button(
                         label="Resultado Filtrado",
                         data=excel_filtrado,
@@ -1046,9 +964,9 @@ with tab2:
                     )
             
             with col2:
-                df_saudaveis = df_resultado[df_resultado['Status'] == '🟢 Saudável']
+                df_saudaveis = indice.filtrar(df_resultado, indice.igual("Status", '🟢 Saudável'))
                 if len(df_saudaveis) > 0:
-                    excel_saudaveis = formatar_excel_profissional(df_saudaveis, "🟢 Saudáveis")
+                    excel_saudaveis = partial(formatar_excel_profissional, df_saudaveis, "🟢 Saudáveis")
                     st.download_button(
                         label=" 🟢 Saudáveis",
                         data=excel_saudaveis,
@@ -1058,9 +976,9 @@ with tab2:
                     )
             
             with col3:
-                df_alerta = df_resultado[df_resultado['Status'].str.contains('🟡 Alerta', na=False)]
+                df_alerta = indice.filtrar(df_resultado, indice.onde("Status", lambda status: '🟡 Alerta' in status))
                 if len(df_alerta) > 0:
-                    excel_alerta = formatar_excel_profissional(df_alerta, "Alerta")
+                    excel_alerta = partial(formatar_excel_profissional, df_alerta, "Alerta")
                     st.download_button(
                         label=" 🟡 Em Alerta",
                         data=excel_alerta,
@@ -1070,9 +988,9 @@ with tab2:
                     )
             
             with col4:
-                df_prejuizo = df_resultado[df_resultado['Status'].str.contains('🔴 Prejuízo', na=False)]
+                df_prejuizo = indice.filtrar(df_resultado, indice.onde("Status", lambda status: '🔴 Prejuízo' in status))
                 if len(df_prejuizo) > 0:
-                    excel_prejuizo = formatar_excel_profissional(df_prejuizo, "Prejuízo")
+                    excel_prejuizo = partial(formatar_excel_profissional, df_prejuizo, "Prejuízo")
                     st.download_button(
                         label=" 🔴 Em Prejuízo",
                         data=excel_prejuizo,
@@ -1080,51 +998,98 @@ with tab2:
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         use_container_width=True
                     )
+            
+            # Degraus de tarifa: preços logo do outro lado de uma fronteira de faixa
+            if st.session_state.dados.get("relatorio_vendas") is not None:
+                with st.expander("Degraus de Tarifa", expanded=False):
+                    distancia_degrau = st.slider(
+                        "Variação máxima de preço (%)",
+                        min_value=1,
+                        max_value=30,
+                        value=10,
+                        key="slider_distancia_degrau"
+                    )
+                    if st.button("Detectar Degraus", use_container_width=True, key="btn_detectar_degraus"):
+                        from degraus_tarifa import DetectorDegraus
+                        with st.session_state.registro_desempenho.medir(
+                            "degraus", len(st.session_state.dados.get("relatorio_vendas"))
+                        ):
+                            st.session_state.degraus_tarifa = DetectorDegraus.detectar(
+                                st.session_state.dados.get("relatorio_vendas"),
+                                criar_calculadora(),
+                                marketplace,
+                                regime,
+                                distancia_maxima=distancia_degrau / 100,
+                            )
+                    
+                    degraus = st.session_state.get("degraus_tarifa")
+                    if degraus is not None:
+                        st.caption(f"{len(degraus)} SKUs lucram mais do outro lado de uma fronteira de faixa")
+                        st.dataframe(degraus.head(100), use_container_width=True, hide_index=True)
+                        from degraus_tarifa import DetectorDegraus
+                        st.download_button(
+                            label="Degraus de Tarifa (CSV)",
+                            data=partial(DetectorDegraus.exportar_csv, degraus),
+                            file_name="degraus_tarifa.csv",
+                            mime="text/csv",
+                            use_container_width=True
+                        )
+            
+            # Logística Full x Flex (Mercado Livre)
+            if marketplace == "Mercado Livre" and st.session_state.dados.get("relatorio_vendas") is not None:
+                with st.expander("Logística Full x Flex", expanded=False):
+                    custo_envio_flex = st.number_input(
+                        "Custo de entrega por pedido no Flex (R$)",
+                        min_value=0.0,
+                        value=None,
+                        step=0.5,
+                        placeholder="Informe para comparar SKUs a partir de R$ 79",
+                        key="input_custo_envio_flex"
+                    )
+                    if st.button("Comparar Logísticas", use_container_width=True, key="btn_comparar_logisticas"):
+                        from otimizador_logistica import OtimizadorLogistica
+                        with st.session_state.registro_desempenho.medir(
+                            "logistica", len(st.session_state.dados.get("relatorio_vendas"))
+                        ):
+                            st.session_state.analise_logistica = OtimizadorLogistica.analisar_catalogo(
+                                st.session_state.dados.get("relatorio_vendas"),
+                                custo_envio_flex=custo_envio_flex,
+                                data_tarifas=st.session_state.get("data_tarifas"),
+                            )
+                    
+                    analise = st.session_state.get("analise_logistica")
+                    if analise is not None:
+                        from otimizador_logistica import OtimizadorLogistica
+                        resumo = OtimizadorLogistica.resumir(analise)
+                        col1, col2, col3 = st.columns(3)
+                        col1.metric("Recomendados Full", f"{resumo['skus_full']}/{resumo['skus']}")
+                        col2.metric("Recomendados Flex", f"{resumo['skus_flex']}/{resumo['skus']}")
+                        col3.metric("Economia no Período", formatar_moeda(resumo["economia_total"]))
+                        if resumo["skus_sem_recomendacao"]:
+                            st.caption(
+                                f"{resumo['skus_sem_recomendacao']} SKUs a partir de R$ 79 sem recomendação: "
+                                "informe o custo de entrega por pedido no Flex para compará-los"
+                            )
+                        
+                        st.dataframe(
+                            analise.nlargest(100, "Economia no Período R$"),
+                            use_container_width=True,
+                            hide_index=True
+                        )
+                        st.download_button(
+                            label="Análise de Logística",
+                            data=partial(formatar_excel_profissional, analise, "Logistica"),
+                            file_name="logistica_full_flex.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            use_container_width=True
+                        )
+
+with tab2:
+    aba_calculadora()
 
 # ============ ABA 3: SIMULADOR ============
-with tab3:
-    # CSS para Simulador
-    st.markdown("""
-    <style>
-    .sim-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 30px 20px;
-        border-radius: 12px;
-        color: white;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    .sim-title {
-        font-size: 2em;
-        font-weight: 700;
-        margin-bottom: 5px;
-    }
-    .sim-subtitle {
-        font-size: 0.95em;
-        opacity: 0.9;
-    }
-    .metric-card-sim {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 20px;
-        border-radius: 12px;
-        border-top: 4px solid #667eea;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        text-align: center;
-    }
-    .section-title-sim {
-        color: white;
-        font-size: 1.3em;
-        font-weight: 700;
-        color: white;
-        margin: 30px 0 20px 0;
-        padding-bottom: 10px;
-        border-bottom: 3px solid #667eea;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+@fragmento_aba("aba_simulador")
+def aba_simulador():
     # Header
     st.markdown("""
     <div class="sim-header">
@@ -1133,7 +1098,7 @@ with tab3:
     </div>
     """, unsafe_allow_html=True)
     
-    if st.session_state.relatorio_vendas is None or st.session_state.relatorio_vendas.empty:
+    if st.session_state.dados.get("relatorio_vendas") is None or st.session_state.dados.get("relatorio_vendas").empty:
         st.info(" Carregue um relatório na sidebar para começar")
     else:
         st.markdown('<div class="section-title-sim">Configuração</div>', unsafe_allow_html=True)
@@ -1156,6 +1121,7 @@ with tab3:
         
         if st.button("Simular Preços", use_container_width=True, key="btn_sim"):
             try:
+                from price_simulator import PriceSimulator
                 simulator = PriceSimulator(
                     marketplaces=st.session_state.marketplaces,
                     regimes=st.session_state.regimes,
@@ -1166,20 +1132,27 @@ with tab3:
                     taxa_devolucao=st.session_state.get("taxa_devolucao", 0.0),
                 )
                 
-                df_simulacao = simulator.calcular_dataframe(
-                    st.session_state.relatorio_vendas,
-                    marketplace,
-                    regime
+                iniciar_tarefa(
+                    "simulador",
+                    partial(
+                        simulator.calcular_dataframe,
+                        st.session_state.dados.get("relatorio_vendas"),
+                        marketplace,
+                        regime,
+                        registro=st.session_state.registro_desempenho,
+                    ),
+                    len(st.session_state.dados.get("relatorio_vendas")),
+                    "resultado_simulador",
+                    "Simulação",
                 )
-                
-                st.session_state.resultado_simulador = df_simulacao
-                st.success("Simulação realizada com sucesso!")
             
             except Exception as e:
                 st.error(f"Erro ao simular: {str(e)}")
         
-        if "resultado_simulador" in st.session_state:
-            df_simulacao = st.session_state.resultado_simulador
+        acompanhar_tarefa("simulador", "Erro ao simular")
+        
+        if "resultado_simulador" in st.session_state.dados:
+            df_simulacao = st.session_state.dados["resultado_simulador"]
             
             # Métricas
             st.markdown('<div class="section-title-sim">Resumo da Simulação</div>', unsafe_allow_html=True)
@@ -1247,22 +1220,28 @@ with tab3:
                 st.write("")
             
             # Aplicar filtros
-            df_filtrado = df_simulacao.copy()
-            
-            if pesquisa_sku:
-                df_filtrado = df_filtrado[df_filtrado['SKU ou MLB'].str.contains(pesquisa_sku, case=False, na=False)]
-            
-            if 'Status' in df_filtrado.columns and filtro_status != "Todos":
-                df_filtrado = df_filtrado[df_filtrado['Status'] == filtro_status]
-            
-            if filtro_curva_abc != "Todos" and "Curva ABC" in df_filtrado.columns:
-                df_filtrado = df_filtrado[df_filtrado['Curva ABC'] == filtro_curva_abc]
+            with st.session_state.registro_desempenho.medir("filtro_simulador", len(df_simulacao)) as medicao:
+                from indice_bitmap import indice_de
+                indice = indice_de(df_simulacao)
+                bits = indice.todos()
+                
+                if 'Status' in df_simulacao.columns and filtro_status != "Todos":
+                    bits &= indice.igual("Status", filtro_status)
+                
+                if filtro_curva_abc != "Todos" and "Curva ABC" in df_simulacao.columns:
+                    bits &= indice.igual("Curva ABC", filtro_curva_abc)
+                
+                df_filtrado = indice.filtrar(df_simulacao, bits)
+                
+                if pesquisa_sku:
+                    df_filtrado = df_filtrado[df_filtrado['SKU ou MLB'].str.contains(pesquisa_sku, case=False, na=False)]
+                medicao["linhas_resultado"] = len(df_filtrado)
             
             st.markdown("---")
             
             # Tabela
             st.markdown(f'<div class="section-title-sim"> Simulação de Preços ({len(df_filtrado)} produtos)</div>', unsafe_allow_html=True)
-            st.dataframe(df_filtrado, use_container_width=True, hide_index=True)
+            exibir_tabela_paginada(df_filtrado, "simulador")
             
             st.markdown("---")
             
@@ -1273,7 +1252,7 @@ with tab3:
             
             with col1:
                 if len(df_filtrado) > 0:
-                    excel_filtrado = formatar_excel_profissional(df_filtrado, "Simulação")
+                    excel_filtrado = partial(formatar_excel_profissional, df_filtrado, "Simulação")
                     st.download_button(
                         label="Resultado Filtrado",
                         data=excel_filtrado,
@@ -1283,7 +1262,7 @@ with tab3:
                     )
             
             with col2:
-                excel_completo = formatar_excel_profissional(df_simulacao, "Simulação Completa")
+                excel_completo = partial(formatar_excel_profissional, df_simulacao, "Simulação Completa")
                 st.download_button(
                     label="Simulação Completa",
                     data=excel_completo,
@@ -1295,71 +1274,12 @@ with tab3:
             with col3:
                 st.write("")
 
+with tab3:
+    aba_simulador()
+
 # ============ ABA 4: DASHBOARD ============
-with tab4:
-    # CSS para Dashboard
-    st.markdown("""
-    <style>
-    .dashboard-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 30px 20px;
-        border-radius: 12px;
-        color: white;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    .dashboard-title {
-        font-size: 2em;
-        font-weight: 700;
-        margin-bottom: 5px;
-    }
-    .dashboard-subtitle {
-        font-size: 0.95em;
-        opacity: 0.9;
-    }
-    .metric-card {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 20px;
-        border-radius: 12px;
-        border-top: 4px solid #667eea;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        text-align: center;
-    }
-    .metric-value {
-        font-size: 2em;
-        font-weight: 700;
-        color: #667eea;
-        margin: 10px 0;
-    }
-    .metric-label {
-        font-size: 0.9em;
-        color: white;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    .chart-container {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 20px;
-        border-radius: 12px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        margin-bottom: 20px;
-    }
-    .section-title {
-        color: white;
-        font-size: 1.3em;
-        font-weight: 700;
-        color: white;
-        margin: 30px 0 20px 0;
-        padding-bottom: 10px;
-        border-bottom: 3px solid #667eea;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+@fragmento_aba("aba_dashboard")
+def aba_dashboard():
     # Header do Dashboard
     st.markdown("""
     <div class="dashboard-header">
@@ -1369,13 +1289,16 @@ with tab4:
     """, unsafe_allow_html=True)
     
     # Obter dados da calculadora do session_state
-    df_dashboard = st.session_state.resultado_calculadora if 'resultado_calculadora' in st.session_state else None
+    df_dashboard = st.session_state.dados.get("resultado_calculadora")
     
     if df_dashboard is None or len(df_dashboard) == 0:
         st.info("Carregue um relatório e calcule a precificação para visualizar o dashboard")
     else:
         try:
             import plotly.graph_objects as go
+            from indice_bitmap import indice_de
+            
+            indice = indice_de(df_dashboard)
             
             # Contar produtos por status
             status_counts = df_dashboard['Status'].value_counts() if 'Status' in df_dashboard.columns else pd.Series()
@@ -1397,7 +1320,7 @@ with tab4:
                 """, unsafe_allow_html=True)
             
             with col2:
-                saudaveis_total = len(df_dashboard[df_dashboard['Status'] == '🟢 Saudável']) if 'Status' in df_dashboard.columns else 0
+                saudaveis_total = indice.contar(indice.igual("Status", '🟢 Saudável'))
                 st.markdown(f"""
                 <div class="metric-card" style="border-top-color: #22C55E;">
                     <div class="metric-label"> Saudável</div>
@@ -1406,7 +1329,7 @@ with tab4:
                 """, unsafe_allow_html=True)
             
             with col3:
-                alerta_total = len(df_dashboard[df_dashboard['Status'] == '🟡 Alerta']) if 'Status' in df_dashboard.columns else 0
+                alerta_total = indice.contar(indice.igual("Status", '🟡 Alerta'))
                 st.markdown(f"""
                 <div class="metric-card" style="border-top-color: #EAB308;">
                     <div class="metric-label"> Alerta</div>
@@ -1415,7 +1338,7 @@ with tab4:
                 """, unsafe_allow_html=True)
             
             with col4:
-                prejuizo_total = len(df_dashboard[df_dashboard['Status'].astype(str).str.contains('🔴 Prejuízo', na=False)]) if 'Status' in df_dashboard.columns else 0
+                prejuizo_total = indice.contar(indice.onde("Status", lambda status: '🔴 Prejuízo' in status))
                 st.markdown(f"""
                 <div class="metric-card" style="border-top-color: #EF4444;">
                     <div class="metric-label"> Prejuízo</div>
@@ -1535,11 +1458,12 @@ with tab4:
                 for curva in curvas:
                     curva_letra = curva.replace('Curva ', '').strip()
                     
-                    df_curva = df_dashboard[df_dashboard['Curva ABC'].astype(str).str.contains(curva_letra, na=False)]
+                    bits_curva = indice.onde("Curva ABC", lambda valor: curva_letra in valor)
+                    total_curva = indice.contar(bits_curva)
                     
-                    saudaveis_curva = len(df_curva[df_curva['Status'] == '🟢 Saudável'])
-                    alerta_curva = len(df_curva[df_curva['Status'] == '🟡 Alerta'])
-                    prejuizo_curva = len(df_curva[df_curva['Status'].astype(str).str.contains('🔴 Prejuízo', na=False)])
+                    saudaveis_curva = indice.contar(bits_curva & indice.igual("Status", '🟢 Saudável'))
+                    alerta_curva = indice.contar(bits_curva & indice.igual("Status", '🟡 Alerta'))
+                    prejuizo_curva = indice.contar(bits_curva & indice.onde("Status", lambda status: '🔴 Prejuízo' in status))
                     
                     col1, col2, col3, col4 = st.columns(4)
                     
@@ -1547,7 +1471,7 @@ with tab4:
                         st.markdown(f"""
                         <div class="metric-card">
                             <div class="metric-label">Curva {curva_letra}</div>
-                            <div class="metric-value">{len(df_curva)}</div>
+                            <div class="metric-value">{total_curva}</div>
                         </div>
                         """, unsafe_allow_html=True)
                     
@@ -1581,6 +1505,152 @@ with tab4:
             
             st.markdown("---")
             
+            # Ranking: top-N por seleção parcial e curva de Pareto em pontos fixos
+            from ranking import CONSULTAS_TOP, curva_pareto, posicoes_top_n
+            from config import CURVA_ABC_LIMITS
+            st.markdown('<div class="section-title">Ranking de Produtos</div>', unsafe_allow_html=True)
+            
+            # Faturamento calculado junto com o resultado (preço x quantidade de cada linha)
+            faturamento = None
+            if 'Faturamento' in df_dashboard.columns:
+                faturamento = df_dashboard['Faturamento'].to_numpy(dtype=float)
+            consultas = {
+                nome: (coluna, maiores) for nome, (coluna, maiores) in CONSULTAS_TOP.items()
+                if coluna in df_dashboard.columns
+            }
+            
+            if consultas:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    consulta = st.selectbox("Ordenar por", list(consultas), key="dash_top_consulta")
+                with col2:
+                    quantidade = st.number_input("Produtos", min_value=5, max_value=100, value=10, step=5, key="dash_top_n")
+                
+                coluna, maiores = consultas[consulta]
+                with st.session_state.registro_desempenho.medir("top_n", len(df_dashboard)):
+                    posicoes = posicoes_top_n(df_dashboard[coluna].to_numpy(dtype=float), quantidade, maiores)
+                    colunas_top = [c for c in ['SKU ou MLB', 'Titulo', 'Curva ABC', 'Preco Atual (R$)', 'Lucro R$',
+                                               'Margem Bruta %', 'Status', 'Faturamento'] if c in df_dashboard.columns]
+                    df_top = df_dashboard.iloc[posicoes][colunas_top]
+                st.dataframe(df_top.reset_index(drop=True), use_container_width=True, hide_index=True)
+            
+            if faturamento is not None and faturamento.sum() > 0:
+                with st.session_state.registro_desempenho.medir("pareto", len(df_dashboard)):
+                    pareto = curva_pareto(faturamento)
+                fig_pareto = go.Figure(data=[go.Scatter(
+                    x=pareto["% SKUs"],
+                    y=pareto["% Faturamento"],
+                    mode='lines',
+                    line=dict(color='#667eea', width=3),
+                    fill='tozeroy',
+                    fillcolor='rgba(102, 126, 234, 0.15)',
+                    hovertemplate='%{x:.1f}% dos SKUs<br>%{y:.1f}% do faturamento<extra></extra>'
+                )])
+                for curva_limite in ("A", "B"):
+                    fig_pareto.add_hline(
+                        y=CURVA_ABC_LIMITS[curva_limite] * 100,
+                        line=dict(color='rgba(255,255,255,0.4)', dash='dot'),
+                        annotation_text=f"Limite Curva {curva_limite}",
+                        annotation_font_color='white',
+                    )
+                fig_pareto.update_layout(
+                    height=380,
+                    margin=dict(l=20, r=20, t=20, b=20),
+                    showlegend=False,
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='white', size=11),
+                    xaxis=dict(title='% dos SKUs', range=[0, 100]),
+                    yaxis=dict(title='% do faturamento acumulado', range=[0, 100]),
+                    hovermode='closest'
+                )
+                st.plotly_chart(fig_pareto, use_container_width=True)
+            
+            # Dispersão por SKU: um ponto por SKU (WebGL) até o limite; acima, grade 2D do servidor
+            import numpy as np
+            from graficos_dispersao import VISOES_DISPERSAO, GradeDispersao
+            from config import DISPERSAO_LIMITE_PONTOS
+            visoes = {
+                nome: eixos for nome, eixos in VISOES_DISPERSAO.items()
+                if all(coluna in df_dashboard.columns for coluna in eixos)
+            }
+            if visoes:
+                st.markdown('<div class="section-title">Dispersão por SKU</div>', unsafe_allow_html=True)
+                visao = st.radio("Visão", list(visoes), horizontal=True, key="dash_dispersao_visao")
+                coluna_x, coluna_y = visoes[visao]
+                x = df_dashboard[coluna_x].to_numpy(dtype=float)
+                y = df_dashboard[coluna_y].to_numpy(dtype=float)
+                layout_dispersao = dict(
+                    height=420,
+                    margin=dict(l=20, r=20, t=20, b=20),
+                    showlegend=False,
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='white', size=11),
+                    xaxis=dict(title=coluna_x),
+                    yaxis=dict(title=coluna_y),
+                    hovermode='closest'
+                )
+                
+                if len(df_dashboard) <= DISPERSAO_LIMITE_PONTOS:
+                    skus = df_dashboard['SKU ou MLB'].astype(str) if 'SKU ou MLB' in df_dashboard.columns else None
+                    fig_dispersao = go.Figure(data=[go.Scattergl(
+                        x=x,
+                        y=y,
+                        mode='markers',
+                        marker=dict(size=5, color='#667eea', opacity=0.6),
+                        customdata=skus,
+                        hovertemplate=f'<b>%{{customdata}}</b><br>{coluna_x}: %{{x:,.2f}}<br>{coluna_y}: %{{y:,.2f}}<extra></extra>'
+                    )])
+                    fig_dispersao.update_layout(**layout_dispersao)
+                    st.plotly_chart(fig_dispersao, use_container_width=True)
+                else:
+                    with st.session_state.registro_desempenho.medir("dispersao", len(df_dashboard)):
+                        grade = GradeDispersao(x, y)
+                        centro_x, centro_y = grade.centros()
+                        x0, x1, y0, y1 = grade.intervalos()
+                    fig_dispersao = go.Figure(data=[go.Scattergl(
+                        x=centro_x,
+                        y=centro_y,
+                        mode='markers',
+                        marker=dict(
+                            symbol='square',
+                            size=9,
+                            color=np.log10(grade.contagens),
+                            colorscale='Viridis',
+                            showscale=True,
+                            colorbar=dict(title='SKUs (log10)'),
+                        ),
+                        customdata=np.column_stack([grade.contagens, x0, x1, y0, y1]),
+                        hovertemplate=(
+                            '<b>%{customdata[0]:,} SKUs</b><br>'
+                            f'{coluna_x}: %{{customdata[1]:,.2f}} a %{{customdata[2]:,.2f}}<br>'
+                            f'{coluna_y}: %{{customdata[3]:,.2f}} a %{{customdata[4]:,.2f}}<extra></extra>'
+                        )
+                    )])
+                    fig_dispersao.update_layout(**layout_dispersao)
+                    evento = st.plotly_chart(
+                        fig_dispersao, use_container_width=True, on_select="rerun",
+                        selection_mode="points", key="dash_dispersao_grade"
+                    )
+                    
+                    # Detalhes só da caixa selecionada
+                    pontos = evento.selection.points if evento else []
+                    if pontos:
+                        linhas = grade.linhas(grade.ocupadas[pontos[0]["point_index"]])
+                        colunas_caixa = [c for c in ['SKU ou MLB', 'Titulo', coluna_x, coluna_y, 'Status', 'Curva ABC']
+                                         if c in df_dashboard.columns]
+                        st.caption(f"{len(linhas):,} SKUs na caixa selecionada (até 200 exibidos)".replace(",", "."))
+                        st.dataframe(df_dashboard.iloc[linhas[:200]][list(dict.fromkeys(colunas_caixa))],
+                                     use_container_width=True, hide_index=True)
+                    else:
+                        st.caption(
+                            f"{len(df_dashboard):,} SKUs agrupados em {len(grade.ocupadas)} caixas. ".replace(",", ".")
+                            + "Clique em uma caixa para ver os SKUs."
+                        )
+            
+            st.markdown("---")
+            
             # Oportunidades de Ação
             st.markdown('<div class="section-title">Oportunidades de Ação</div>', unsafe_allow_html=True)
             
@@ -1595,13 +1665,10 @@ with tab4:
             </div>
             """, unsafe_allow_html=True)
             
-            oportunidades = df_dashboard[
-                (df_dashboard['Curva ABC'].astype(str).str.contains('B', na=False) | df_dashboard['Curva ABC'].astype(str).str.contains('C', na=False)) &
-                (df_dashboard['Status'] == '🟢 Saudável')
-            ]
+            oportunidades = indice.filtrar(df_dashboard, indice.oportunidades())
             
             # Armazenar oportunidades em session_state para uso na aba de Estrategias Promocionais
-            st.session_state.lista_oportunidades = oportunidades.copy()
+            st.session_state.dados["lista_oportunidades"] = oportunidades.copy()
             
             if len(oportunidades) > 0:
                 st.markdown(f"""
@@ -1636,14 +1703,9 @@ with tab4:
                     )
                     
                     # Botão para baixar oportunidades
-                    buffer = BytesIO()
-                    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                        oportunidades[colunas_oportunidade].to_excel(writer, sheet_name='Oportunidades', index=False)
-                    
-                    buffer.seek(0)
                     st.download_button(
                         label="Baixar Oportunidades em Excel",
-                        data=buffer,
+                        data=partial(gerar_excel_simples, oportunidades[colunas_oportunidade], "Oportunidades"),
                         file_name=f"oportunidades_curva_bc.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         key="btn_download_oportunidades"
@@ -1659,78 +1721,12 @@ with tab4:
         except Exception as e:
             st.error(f"Erro ao gerar dashboard: {str(e)}")
 
-
+with tab4:
+    aba_dashboard()
 
 # ============ ABA 5: ESTRATÉGIAS PROMOCIONAIS ============
-with tab5:
-    # CSS para Estratégias Promocionais
-    st.markdown("""
-    <style>
-    .promo-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 30px 20px;
-        border-radius: 12px;
-        color: white;
-        margin-bottom: 30px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    .promo-title {
-        font-size: 2em;
-        font-weight: 700;
-        margin-bottom: 5px;
-    }
-    .promo-subtitle {
-        font-size: 0.95em;
-        opacity: 0.9;
-    }
-    .section-title-promo {
-        color: white;
-        font-size: 1.3em;
-        font-weight: 700;
-        margin: 30px 0 20px 0;
-        padding-bottom: 10px;
-        border-bottom: 3px solid #667eea;
-    }
-    .metric-card-promo {
-        background: rgba(102, 126, 234, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 20px;
-        border-radius: 12px;
-        border-top: 4px solid #667eea;
-        border: 1px solid rgba(102, 126, 234, 0.2);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        text-align: center;
-    }
-    .step-container {
-        background: rgba(255, 255, 255, 0.05);
-        border: 1px solid rgba(102, 126, 234, 0.3);
-        border-radius: 12px;
-        padding: 25px;
-        margin-bottom: 25px;
-        backdrop-filter: blur(10px);
-    }
-    .step-number {
-        display: inline-block;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        width: 40px;
-        height: 40px;
-        border-radius: 50%;
-        text-align: center;
-        line-height: 40px;
-        font-weight: 700;
-        font-size: 1.1em;
-        margin-right: 15px;
-    }
-    .step-title {
-        display: inline-block;
-        color: white;
-        font-size: 1.1em;
-        font-weight: 600;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+@fragmento_aba("aba_estrategias")
+def aba_estrategias():
     # Header
     st.markdown("""
     <div class="promo-header">
@@ -1739,7 +1735,7 @@ with tab5:
     </div>
     """, unsafe_allow_html=True)
     
-    if st.session_state.relatorio_vendas is None or st.session_state.relatorio_vendas.empty:
+    if st.session_state.dados.get("relatorio_vendas") is None or st.session_state.dados.get("relatorio_vendas").empty:
         st.info("Carregue um relatório na sidebar para começar")
     else:
         # Seção 1: Seleção de Marketplace
@@ -1838,120 +1834,196 @@ with tab5:
             st.markdown("")
             st.info(f"💰 Desconto: **{desconto_percent*100:.1f}%**")
         
-        # Botão para processar
+        # Botão para processar (em segundo plano; o resultado fica na sessão)
+        parametros_promocao = (marketplace_selecionado, categoria_filtro, desconto_percent, margem_minima)
         if st.button("Processar e Visualizar", use_container_width=True, key="btn_promo_processar"):
-            try:
-                with st.spinner("⏳ Processando dados..."):
-                    # Inicializar exportador com o marketplace selecionado
-                    exporter = PromotionExporter(marketplace=marketplace_selecionado)
-                    
-                    # Se for oportunidade, usar a lista ja calculada no Dashboard
-                    if categoria_filtro == "oportunidade":
-                        df_filtrado = st.session_state.get("lista_oportunidades", None)
-                        if df_filtrado is None or len(df_filtrado) == 0:
-                            st.error("Erro: Nenhuma oportunidade encontrada. Verifique o Dashboard.")
-                            st.stop()
-                    else:
-                        # Para Curva ABC, usar resultado_calculadora
-                        df_base = st.session_state.get("resultado_calculadora", None)
-                        if df_base is None:
-                            st.error("Erro: Nenhum dado de Dashboard disponivel.")
-                            st.stop()
-                        
+            # Inicializar exportador com o marketplace selecionado
+            from promotion_exporter import PromotionExporter
+            exporter = PromotionExporter(marketplace=marketplace_selecionado)
+            registro = st.session_state.registro_desempenho
+            
+            # Se for oportunidade, usar a lista ja calculada no Dashboard
+            if categoria_filtro == "oportunidade":
+                df_base = st.session_state.dados.get("lista_oportunidades")
+                if df_base is None or len(df_base) == 0:
+                    st.error("Erro: Nenhuma oportunidade encontrada. Verifique o Dashboard.")
+                    return
+            else:
+                # Para Curva ABC, usar resultado_calculadora
+                df_base = st.session_state.dados.get("resultado_calculadora")
+                if df_base is None:
+                    st.error("Erro: Nenhum dado de Dashboard disponivel.")
+                    return
+            
+            # Executada fora do script: tudo que vem da sessão é lido aqui e passado pronto
+            def processar_promocao(progresso, exporter=exporter, df_base=df_base, parametros=parametros_promocao,
+                                   margem_alvo=st.session_state.get("slider_margem_bruta", 30.0), registro=registro):
+                _, categoria_filtro, desconto_percent, margem_minima = parametros
+                if categoria_filtro == "oportunidade":
+                    df_filtrado = df_base
+                else:
+                    with registro.medir("filtro_promocao", len(df_base)) as medicao:
                         df_filtrado = exporter.filtrar_por_categoria(
                             df_base,
                             categoria=categoria_filtro,
                             margem_minima=margem_minima,
-                            margem_alvo=st.session_state.get("slider_margem_bruta", 30.0)
+                            margem_alvo=margem_alvo
+                        )
+                        medicao["linhas_resultado"] = len(df_filtrado)
+                # As linhas descartadas pelo filtro contam como concluídas
+                progresso(len(df_base) - len(df_filtrado))
+                
+                df_marketplace = None
+                if len(df_filtrado) > 0:
+                    # Mapear para marketplace
+                    with registro.medir("mapeamento_promocao", len(df_filtrado)):
+                        df_marketplace = processar_em_blocos(
+                            df_filtrado,
+                            partial(exporter.mapear_dados_para_marketplace, desconto_percent=desconto_percent),
+                            progresso,
                         )
+                return {"parametros": parametros, "original": df_filtrado, "processado": df_marketplace}
+            
+            iniciar_tarefa("promocao", processar_promocao, len(df_base), "resultado_promocao", "Promoção")
+        
+        acompanhar_tarefa("promocao", "❌ Erro ao processar")
+        
+        resultado_promocao = st.session_state.dados.get("resultado_promocao")
+        if resultado_promocao is not None and resultado_promocao["parametros"] == parametros_promocao:
+            try:
+                from promotion_exporter import PromotionExporter
+                exporter = PromotionExporter(marketplace=marketplace_selecionado)
+                df_filtrado = resultado_promocao["original"]
+                df_marketplace = resultado_promocao["processado"]
+                
+                if len(df_filtrado) == 0:
+                    st.warning(f"⚠️ Nenhum produto encontrado na categoria '{categoria_selecionada}'")
+                else:
+                    # Calcular impacto
+                    relatorio = exporter.gerar_relatorio_impacto(df_marketplace, df_filtrado)
                     
-                    if len(df_filtrado) == 0:
-                        st.warning(f"⚠️ Nenhum produto encontrado na categoria '{categoria_selecionada}'")
-                    else:
-                        # Mapear para marketplace
-                        df_marketplace = exporter.mapear_dados_para_marketplace(df_filtrado, desconto_percent=desconto_percent)
-                        
-                        # Armazenar em session_state
-                        st.session_state.df_marketplace_processado = df_marketplace
-                        st.session_state.df_marketplace_original = df_filtrado
-                        st.session_state.marketplace_ativo = marketplace_selecionado
-                        
-                        # Calcular impacto
-                        relatorio = exporter.gerar_relatorio_impacto(df_marketplace, df_filtrado)
-                        
-                        # Exibir métricas
-                        st.markdown('<div class="section-title-promo">4. Resumo do Impacto</div>', unsafe_allow_html=True)
-                        
-                        col1, col2, col3, col4, col5 = st.columns(5)
-                        
-                        with col1:
-                            st.markdown(f"""
-                            <div class="metric-card-promo">
-                                <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Produtos</div>
-                                <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{relatorio['total_produtos']}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col2:
-                            st.markdown(f"""
-                            <div class="metric-card-promo">
-                                <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Economia Total</div>
-                                <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_moeda(relatorio['economia_total'])}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col3:
-                            st.markdown(f"""
-                            <div class="metric-card-promo">
-                                <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Economia Média</div>
-                                <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_moeda(relatorio['economia_media_por_produto'])}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col4:
-                            st.markdown(f"""
-                            <div class="metric-card-promo">
-                                <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Preço Médio</div>
-                                <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_moeda(relatorio['preco_medio_original'])}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col5:
-                            st.markdown(f"""
-                            <div class="metric-card-promo">
-                                <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Desconto Médio</div>
-                                <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_percentual_1casa(relatorio['desconto_medio_percent'])}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        st.markdown("---")
-                        
-                        # Exibir tabela
-                        st.markdown('<div class="section-title-promo">5. Produtos Selecionados</div>', unsafe_allow_html=True)
-                        st.dataframe(df_marketplace, use_container_width=True, hide_index=True)
-                        
-                        st.markdown("---")
-                        
-                        # Download
-                        st.markdown('<div class="section-title-promo">6. Download da Planilha</div>', unsafe_allow_html=True)
-                        
+                    # Exibir métricas
+                    st.markdown('<div class="section-title-promo">4. Resumo do Impacto</div>', unsafe_allow_html=True)
+                    
+                    col1, col2, col3, col4, col5 = st.columns(5)
+                    
+                    with col1:
+                        st.markdown(f"""
+                        <div class="metric-card-promo">
+                            <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Produtos</div>
+                            <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{relatorio['total_produtos']}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.markdown(f"""
+                        <div class="metric-card-promo">
+                            <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Economia Total</div>
+                            <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_moeda(relatorio['economia_total'])}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with col3:
+                        st.markdown(f"""
+                        <div class="metric-card-promo">
+                            <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Economia Média</div>
+                            <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_moeda(relatorio['economia_media_por_produto'])}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with col4:
+                        st.markdown(f"""
+                        <div class="metric-card-promo">
+                            <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Preço Médio</div>
+                            <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_moeda(relatorio['preco_medio_original'])}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    with col5:
+                        st.markdown(f"""
+                        <div class="metric-card-promo">
+                            <div style="font-size: 0.9em; color: white; text-transform: uppercase; letter-spacing: 0.5px;">Desconto Médio</div>
+                            <div style="font-size: 1.8em; font-weight: 700; color: #667eea; margin: 10px 0;">{formatar_percentual_1casa(relatorio['desconto_medio_percent'])}</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                    st.markdown("---")
+                    
+                    # Exibir tabela
+                    st.markdown('<div class="section-title-promo">5. Produtos Selecionados</div>', unsafe_allow_html=True)
+                    st.dataframe(df_marketplace, use_container_width=True, hide_index=True)
+                    
+                    st.markdown("---")
+                    
+                    # Download
+                    st.markdown('<div class="section-title-promo">6. Download da Planilha</div>', unsafe_allow_html=True)
+                    
+                    with st.session_state.registro_desempenho.medir("exportacao", len(df_marketplace)):
                         buffer = exporter.exportar_para_excel(
                             df_marketplace,
                             f"Promoção {marketplace_selecionado} - {categoria_selecionada}"
                         )
-                        
-                        nome_arquivo = f"{marketplace_selecionado.lower()}_promocoes_{categoria_filtro}_{int(desconto_percent*100)}pct.xlsx"
-                        
-                        st.download_button(
-                            label=f"📥 Baixar Planilha {marketplace_selecionado} ({len(df_marketplace)} produtos)",
-                            data=buffer,
-                            file_name=nome_arquivo,
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            use_container_width=True
-                        )
-                        
-                        st.success(f"✅ Planilha pronta para upload no {marketplace_selecionado}!")
-                        
+                    
+                    nome_arquivo = f"{marketplace_selecionado.lower()}_promocoes_{categoria_filtro}_{int(desconto_percent*100)}pct.xlsx"
+                    
+                    st.download_button(
+                        label=f"📥 Baixar Planilha {marketplace_selecionado} ({len(df_marketplace)} produtos)",
+                        data=buffer,
+                        file_name=nome_arquivo,
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True
+                    )
+                    
+                    st.success(f"✅ Planilha pronta para upload no {marketplace_selecionado}!")
+            
             except Exception as e:
                 st.error(f"❌ Erro ao processar: {str(e)}")
+
+with tab5:
+    aba_estrategias()
+
+# ============================================================================
+# PAINEL DE DESEMPENHO
+# ============================================================================
+
+with st.expander("Performance", expanded=False):
+    registro = st.session_state.registro_desempenho
+    if registro.etapas:
+        st.caption(f"{len(registro.etapas)} etapas medidas • {registro.tempo_total():.2f}s no total")
+        st.dataframe(registro.para_dataframe(), use_container_width=True, hide_index=True)
+        if st.button("Limpar medições", key="btn_limpar_desempenho"):
+            registro.limpar()
+            st.rerun()
+    else:
+        st.caption("Nenhuma etapa medida nesta sessão.")
+    
+    # Cache de resultados da calculadora, compartilhado pelas sessões do processo: só para
+    # administradores (limpar obriga todas as sessões a recalcular). O módulo só é carregado
+    # no primeiro cálculo; antes disso não há o que mostrar
+    from desempenho import modo_administrador
+    administrador = modo_administrador()
+    if administrador and "cache_resultados" in sys.modules:
+        cache = sys.modules["cache_resultados"].obter_cache()
+        st.markdown("**Cache de resultados**")
+        st.dataframe(cache.ocupacao(), use_container_width=True, hide_index=True)
+        st.caption(f"{cache.falhas} cálculo(s) fora do cache")
+        if st.button("Limpar cache de resultados", key="btn_limpar_cache"):
+            cache.limpar()
+            st.rerun()
+
+    # Memória dos DataFrames (orçamento do processo, ver memoria_sessao): cada usuário vê a
+    # própria sessão; a tabela de todas as sessões fica com os administradores
+    gerenciador = st.session_state.dados.gerenciador
+    if administrador:
+        st.markdown("**Memória das sessões**")
+        st.dataframe(gerenciador.ocupacao(), use_container_width=True, hide_index=True)
+        st.caption(
+            f"Sessão atual: {st.session_state.dados.sessao} • "
+            f"{gerenciador.bytes_memoria / 1024 / 1024:.1f} de {gerenciador.orcamento_bytes / 1024 / 1024:.0f} MB em memória • "
+            f"{gerenciador.bytes_mapeados / 1024 / 1024:.1f} MB mapeados de resultados compartilhados • "
+            f"{gerenciador.despejos} despejo(s) para disco • {gerenciador.leituras} releitura(s)"
+        )
+    else:
+        st.markdown("**Memória da sessão**")
+        st.dataframe(gerenciador.ocupacao(st.session_state.dados.sessao), use_container_width=True, hide_index=True)
 # Forçar recarregamento do Streamlit - Mon Feb  9 14:05:19 EST 2026
@@ -0,0 +1,336 @@
+"""
+Benchmarks de desempenho do aplicativo de precificação
+
+Uso:
+    python benchmark_desempenho.py              # executa todos os benchmarks
+    python benchmark_desempenho.py carregamento # executa apenas um benchmark
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from mercado_livre_processor import MercadoLivreProcessor
+
+
+def _cronometrar(funcao, *args, **kwargs):
+    """Executa a função e retorna (resultado, segundos)"""
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def gerar_relatorio_sintetico(n_linhas, n_skus=None, seed=0):
+    """Gera um relatório de vendas sintético no formato do modelo de planilha"""
+    rng = np.random.default_rng(seed)
+    n_skus = n_skus or max(1, n_linhas // 10)
+    codigos = rng.integers(0, n_skus, n_linhas)
+    return pd.DataFrame({
+        "SKU/MLB": np.char.add("SKU", codigos.astype(str)),
+        "Titulo": np.char.add("Produto ", codigos.astype(str)),
+        "Custo Produto (R$)": rng.uniform(10, 100, n_linhas).round(2),
+        "Frete (R$)": rng.uniform(0, 20, n_linhas).round(2),
+        "Preco Atual (R$)": rng.uniform(20, 300, n_linhas).round(2),
+        "Tipo de Anuncio": rng.choice(["Classico", "Premium"], n_linhas),
+        "Quantidade Vendida": rng.integers(1, 10, n_linhas),
+        "Data": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 120, n_linhas), unit="D"),
+    })
+
+
+def benchmark_carregamento(n_arquivos=30, linhas_por_arquivo=5000):
+    """Carregamento de um mês de exportações diárias: sequencial x paralelo"""
+    print(f"\n[carregamento] {n_arquivos} arquivos .xlsx x {linhas_por_arquivo} linhas")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminhos = []
+        for dia in range(1, n_arquivos + 1):
+            caminho = os.path.join(pasta, f"loja_{dia % 2}_2026-03-{dia:02d}.xlsx")
+            gerar_relatorio_sintetico(linhas_por_arquivo, seed=dia).to_excel(caminho, index=False)
+            caminhos.append(caminho)
+
+        (df_seq, _), t_seq = _cronometrar(
+            MercadoLivreProcessor.carregar_multiplos_arquivos, caminhos, max_workers=1
+        )
+        (df_par, _), t_par = _cronometrar(
+            MercadoLivreProcessor.carregar_multiplos_arquivos, caminhos
+        )
+
+    assert len(df_seq) == len(df_par)
+    print(f"  Sequencial: {t_seq:.2f}s")
+    print(f"  Paralelo ({os.cpu_count()} CPUs): {t_par:.2f}s  (speedup {t_seq / t_par:.1f}x)")
+
+
+def benchmark_partida(n_reruns=5):
+    """Partida a frio (importação do app.py) e custo de cada rerun do script"""
+    from streamlit.testing.v1 import AppTest
+    from test_importacao import medir_importacao
+
+    tempos = medir_importacao("import app")
+    print(f"\n[partida] Importação do app.py: {tempos['app']:.0f} ms")
+
+    app = AppTest.from_file("app.py", default_timeout=120)
+    _, t_primeira = _cronometrar(app.run)
+    reruns = [_cronometrar(app.run)[1] for _ in range(n_reruns)]
+    print(f"  Primeira execução: {t_primeira * 1000:.0f} ms")
+    print(f"  Rerun (média de {n_reruns}): {np.mean(reruns) * 1000:.0f} ms")
+
+
+def benchmark_agregacao(n_linhas=2_000_000, n_skus=50_000):
+    """Agregação por SKU: groupby original x factorize/bincount"""
+    print(f"\n[agregacao] {n_linhas} linhas, {n_skus} SKUs")
+    df = MercadoLivreProcessor.normalizar_relatorio_vendas(gerar_relatorio_sintetico(n_linhas, n_skus))
+    df["Conta"] = np.random.default_rng(1).choice(["loja_a", "loja_b", "loja_c"], n_linhas)
+
+    def agregar_com_groupby(df):
+        df_agg = df.groupby("SKU").agg({
+            "Descrição": "first",
+            "Custo Produto": "mean",
+            "Frete": "mean",
+            "Preço Atual": "mean",
+            "Tipo de Anúncio": "first",
+            "Quantidade Vendida": "sum",
+        }).reset_index()
+        contas = df[["SKU", "Conta"]].drop_duplicates().sort_values("Conta").groupby("SKU")["Conta"].agg(", ".join)
+        df_agg["Conta"] = df_agg["SKU"].map(contas)
+        return df_agg
+
+    _, t_groupby = _cronometrar(agregar_com_groupby, df)
+    _, t_rapido = _cronometrar(MercadoLivreProcessor.agregar_por_sku, df)
+    _, t_ponderado = _cronometrar(MercadoLivreProcessor.agregar_por_sku, df, ponderar_por_quantidade=True)
+    print(f"  groupby: {t_groupby:.2f}s")
+    print(f"  factorize/bincount: {t_rapido:.2f}s  (speedup {t_groupby / t_rapido:.1f}x)")
+    print(f"  factorize/bincount ponderado: {t_ponderado:.2f}s")
+
+
+def benchmark_numeros(n_linhas=1_000_000):
+    """Conversão de valores em texto no padrão brasileiro ("R$ 1.234,56") para float"""
+    from numeros_br import converter_colunas
+
+    print(f"\n[numeros] {n_linhas} linhas")
+    rng = np.random.default_rng(0)
+    valores = rng.uniform(1, 5000, n_linhas).round(2)
+    reais, centavos = np.divmod(np.round(valores * 100).astype(np.int64), 100)
+    milhar = np.where(reais >= 1000, np.char.add((reais // 1000).astype(str), "."), "")
+    inteiro = np.where(reais >= 1000, np.char.zfill((reais % 1000).astype(str), 3), reais.astype(str))
+    texto = np.char.add(np.char.add(milhar, inteiro), np.char.add(",", np.char.zfill(centavos.astype(str), 2)))
+    df = pd.DataFrame({
+        "Preço Atual": pd.array(np.char.add("R$ ", texto), dtype="str"),
+        "Frete": pd.array(np.where(rng.random(n_linhas) < 0.01, "n/d", texto), dtype="str"),
+        "Taxa": pd.array(np.char.add(texto, "%"), dtype="str"),
+    })
+
+    _, t_to_numeric = _cronometrar(lambda: {c: pd.to_numeric(df[c], errors="coerce") for c in df.columns})
+    estatisticas, segundos = _cronometrar(converter_colunas, df.copy(), list(df.columns))
+    print(f"  pd.to_numeric (descarta os valores): {t_to_numeric:.2f}s")
+    print(f"  Conversão pt-BR: {segundos:.2f}s ({len(df.columns) * n_linhas / segundos:,.0f} células/s)")
+    for coluna, est in estatisticas.items():
+        print(f"  {coluna}: {est['formato']} | {est['convertidos']} convertidos, {est['invalidos']} inválidos, "
+              f"{est['vazios']} vazios, {est['percentuais']} percentuais")
+
+
+def benchmark_csv(linhas=(10_000, 1_000_000)):
+    """Detecção do formato do CSV (tempo independente do tamanho) e leitura completa"""
+    print(f"\n[csv] CSV brasileiro (; / cp1252 / vírgula decimal) com {linhas} linhas")
+    with tempfile.TemporaryDirectory() as pasta:
+        for n_linhas in linhas:
+            df = gerar_relatorio_sintetico(n_linhas)
+            caminho = os.path.join(pasta, f"relatorio_{n_linhas}.csv")
+            df.to_csv(caminho, sep=";", decimal=",", index=False, encoding="cp1252")
+            tamanho_mb = os.path.getsize(caminho) / 1024 ** 2
+
+            amostra, t_amostra = _cronometrar(MercadoLivreProcessor._ler_amostra, caminho)
+            formato, t_deteccao = _cronometrar(MercadoLivreProcessor.detectar_formato_csv, amostra)
+            _, t_leitura = _cronometrar(MercadoLivreProcessor.carregar_de_csv, caminho)
+            print(f"  {tamanho_mb:.1f} MB: detecção {(t_amostra + t_deteccao) * 1000:.1f} ms | "
+                  f"leitura {t_leitura:.2f}s | {formato}")
+
+
+def benchmark_curva_abc_janelas(n_linhas=2_000_000, n_skus=100_000):
+    """Curva ABC por janela de tempo: groupby sobre as vendas x somas prefixadas"""
+    from abc_classifier import VendasDiarias, classificar_faturamento
+
+    print(f"\n[curva_abc_janelas] {n_linhas} vendas, {n_skus} SKUs, 120 dias")
+    df = MercadoLivreProcessor.normalizar_relatorio_vendas(gerar_relatorio_sintetico(n_linhas, n_skus))
+
+    def curva_com_groupby(dias):
+        recorte = df[df["Data"] > df["Data"].max() - pd.Timedelta(days=dias)]
+        faturamento = (recorte["Preço Atual"] * recorte["Quantidade Vendida"]).groupby(recorte["SKU"]).sum()
+        return classificar_faturamento(faturamento.to_numpy())
+
+    vendas, t_tabela = _cronometrar(VendasDiarias.de_dataframe, df)
+    print(f"  Montagem da tabela de vendas diárias: {t_tabela:.2f}s")
+    for dias in (7, 30, 90):
+        _, t_groupby = _cronometrar(curva_com_groupby, dias)
+        _, t_prefixo = _cronometrar(vendas.classificar, dias)
+        print(f"  {dias:>2} dias: groupby {t_groupby * 1000:.0f} ms | somas prefixadas {t_prefixo * 1000:.0f} ms")
+
+
+def benchmark_base_dados(n_linhas=500_000, n_linhas_referencia=20_000):
+    """Base de dados da calculadora original: apply por linha x cálculo vetorizado"""
+    from pricing_calculator import PricingCalculator
+    from test_pricing_calculator import gerar_base, processar_linha_a_linha
+
+    print(f"\n[base_dados] {n_linhas} linhas (linha a linha medido em {n_linhas_referencia})")
+    calculator = PricingCalculator()
+    df = gerar_base(n_linhas)
+
+    _, t_linhas = _cronometrar(processar_linha_a_linha, calculator, df.head(n_linhas_referencia))
+    _, t_vetorizado = _cronometrar(calculator.processar_base_dados, df)
+    estimado = t_linhas * n_linhas / n_linhas_referencia
+    print(f"  Linha a linha: {t_linhas:.2f}s ({estimado:.0f}s estimados para {n_linhas})")
+    print(f"  Vetorizado: {t_vetorizado:.2f}s  (speedup ~{estimado / t_vetorizado:.0f}x)")
+
+
+def benchmark_centavos(n_linhas=1_000_000):
+    """Calculadora V2 vetorizada: float64 x centavos int64"""
+    from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+    from pricing_calculator_v2 import PricingCalculatorV2
+    from test_pricing_calculator_v2 import gerar_relatorio
+
+    print(f"\n[centavos] {n_linhas} SKUs")
+    df = gerar_relatorio(n_linhas)
+    for marketplace in ("Mercado Livre", "Shopee"):
+        tempos = {}
+        for modo in ("float", "centavos"):
+            calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0, modo_monetario=modo)
+            _, tempos[modo] = _cronometrar(calculadora._calcular_vetorizado, df, marketplace, "Simples Nacional")
+        print(f"  {marketplace}: float {tempos['float']:.2f}s | centavos {tempos['centavos']:.2f}s "
+              f"({n_linhas / tempos['centavos']:,.0f} linhas/s)")
+
+    amostra = df.head(20_000)
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    _, t_linhas = _cronometrar(
+        lambda: [calculadora.calcular_linha(r.SKU, r.Descrição, r._3, r.Frete, r._5, "Shopee", "Simples Nacional")
+                 for r in amostra.itertuples()]
+    )
+    print(f"  calcular_linha por linha: {len(amostra) / t_linhas:,.0f} linhas/s")
+
+
+def benchmark_tarifas(n_linhas=1_000_000, n_linhas_referencia=20_000):
+    """Tarifas do Mercado Livre 2025 x 2026: cálculo escalar x tabelas compiladas"""
+    from mercado_livre_costs import MercadoLivreCostsCalculator
+    from tabelas_tarifas import comparar_tabelas
+
+    print(f"\n[tarifas] {n_linhas} SKUs (escalar medido em {n_linhas_referencia})")
+    rng = np.random.default_rng(0)
+    precos = np.round(rng.uniform(5, 300, n_linhas), 2)
+    pesos = np.round(rng.uniform(0.05, 5, n_linhas), 3)
+    logistica = pd.Categorical(rng.choice(["Full", "Flex"], n_linhas))
+
+    _, t_escalar = _cronometrar(
+        lambda: [MercadoLivreCostsCalculator.calcular_custo_total_ml(p, w, l)
+                 for p, w, l in zip(precos[:n_linhas_referencia], pesos, logistica)]
+    )
+    comparacao, t_comparacao = _cronometrar(
+        comparar_tabelas, precos, "Mercado Livre", "2025-12-31", "2026-03-02", pesos=pesos, logistica=logistica
+    )
+    estimado = t_escalar * n_linhas / n_linhas_referencia
+    print(f"  Escalar (uma tabela): {t_escalar:.2f}s ({estimado:.0f}s estimados para {n_linhas})")
+    print(f"  Comparação vetorizada (duas tabelas): {t_comparacao:.2f}s | "
+          f"diferença média R$ {comparacao['diferenca'].mean():.2f}")
+
+
+
+def benchmark_logistica(n_skus=1_000_000):
+    """Escolha de logística Full x Flex para o catálogo inteiro"""
+    from otimizador_logistica import OtimizadorLogistica
+
+    print(f"\n[logistica] {n_skus} SKUs")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "SKU": pd.array([f"SKU{i:07d}" for i in range(n_skus)]),
+        "Preço Atual": np.round(rng.uniform(5, 300, n_skus), 2),
+        "Peso (kg)": np.round(rng.uniform(0.05, 5, n_skus), 3),
+        "Logística": pd.Categorical(rng.choice(["Full", "Flex"], n_skus)),
+        "Quantidade Vendida": rng.integers(0, 50, n_skus),
+    })
+
+    analise, segundos = _cronometrar(OtimizadorLogistica.analisar_catalogo, df, custo_envio_flex=8.0)
+    resumo = OtimizadorLogistica.resumir(analise)
+    print(f"  Análise: {segundos:.2f}s ({n_skus / segundos:,.0f} SKUs/s)")
+    print(f"  {resumo['skus_mudam']} SKUs mudam de logística | economia R$ {resumo['economia_total']:,.2f}")
+
+
+
+def benchmark_degraus(n_skus=1_000_000):
+    """Varredura de degraus de tarifa: lucro no preço atual e nas duas fronteiras vizinhas"""
+    from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+    from degraus_tarifa import DetectorDegraus
+    from pricing_calculator_v2 import PricingCalculatorV2
+    from test_pricing_calculator_v2 import gerar_relatorio
+
+    print(f"\n[degraus] {n_skus} SKUs")
+    df = gerar_relatorio(n_skus)
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    for marketplace in ("Mercado Livre", "Shopee"):
+        ranking, segundos = _cronometrar(DetectorDegraus.detectar, df, calculadora, marketplace, "Simples Nacional")
+        print(f"  {marketplace}: {segundos:.2f}s | {len(ranking)} SKUs sinalizados")
+
+def benchmark_categorias(n_linhas=1_000_000, n_categorias=20_000):
+    """Resolução da comissão por categoria (árvore com herança) para o catálogo inteiro"""
+    from indice_categorias import IndiceCategorias
+
+    print(f"\n[categorias] {n_linhas} linhas, árvore com {n_categorias} categorias")
+    rng = np.random.default_rng(0)
+    ids = [f"MLB{i}" for i in range(n_categorias)]
+    pais = [None if i < 30 else ids[int(rng.integers(0, i))] for i in range(n_categorias)]
+    comissoes = np.where(rng.random((n_categorias, 1)) < 0.05, rng.uniform(0.06, 0.2, (n_categorias, 2)), np.nan)
+
+    indice, segundos = _cronometrar(IndiceCategorias, ids, pais, ids, comissoes)
+    print(f"  Montagem do índice (herança resolvida): {segundos:.3f}s")
+
+    categorias = pd.Series(np.array(ids, dtype=object)[rng.integers(0, n_categorias, n_linhas)])
+    tipos = pd.Series(rng.choice(["Clássico", "Premium"], n_linhas))
+    _, segundos = _cronometrar(indice.resolver, categorias, tipos)
+    print(f"  Resolução: {segundos:.2f}s ({n_linhas / segundos:,.0f} linhas/s)")
+
+    _, segundos = _cronometrar(lambda: [indice.comissoes[indice.posicao(c) or 0, 0] for c in categorias[:100_000]])
+    print(f"  Referência (busca por linha, 100k linhas): {segundos:.2f}s")
+
+
+def benchmark_cache(n_skus=1_000_000):
+    """Cache de resultados entre sessões: cálculo completo x resultado em memória e em disco"""
+    from cache_resultados import CacheResultados
+    from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+    from pricing_calculator_v2 import PricingCalculatorV2
+    from test_pricing_calculator_v2 import gerar_relatorio
+
+    print(f"\n[cache] {n_skus} SKUs")
+    df = gerar_relatorio(n_skus)
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    with tempfile.TemporaryDirectory() as pasta:
+        cache = CacheResultados(diretorio=pasta)
+        _, t_calculo = _cronometrar(calculadora.calcular_dataframe, df, "Mercado Livre", "Simples Nacional", cache=cache)
+        _, t_memoria = _cronometrar(calculadora.calcular_dataframe, df, "Mercado Livre", "Simples Nacional", cache=cache)
+        reiniciado = CacheResultados(diretorio=pasta)
+        _, t_disco = _cronometrar(calculadora.calcular_dataframe, df, "Mercado Livre", "Simples Nacional", cache=reiniciado)
+        print(f"  Cálculo (com gravação no cache): {t_calculo:.2f}s | acerto em memória: {t_memoria:.3f}s | "
+              f"acerto em disco: {t_disco:.2f}s")
+        print(reiniciado.ocupacao().to_string(index=False))
+
+
+BENCHMARKS = {
+    "carregamento": benchmark_carregamento,
+    "agregacao": benchmark_agregacao,
+    "numeros": benchmark_numeros,
+    "csv": benchmark_csv,
+    "curva_abc_janelas": benchmark_curva_abc_janelas,
+    "base_dados": benchmark_base_dados,
+    "centavos": benchmark_centavos,
+    "tarifas": benchmark_tarifas,
+    "categorias": benchmark_categorias,
+    "logistica": benchmark_logistica,
+    "degraus": benchmark_degraus,
+    "cache": benchmark_cache,
+    "partida": benchmark_partida,
+}
+
+
+if __name__ == "__main__":
+    selecionados = sys.argv[1:] or list(BENCHMARKS)
+    for nome in selecionados:
+        BENCHMARKS[nome]()
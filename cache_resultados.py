@@ -0,0 +1,282 @@
+"""
+Cache de resultados da calculadora compartilhado entre sessões
+Analistas que carregam o mesmo relatório com as mesmas premissas recebem o resultado já
+calculado. A chave é o hash do conteúdo dos dados mais a impressão digital das premissas
+(ver PricingCalculatorV2.impressao).
+
+Cada resultado é gravado uma única vez em um arquivo Arrow IPC sem compressão e lido de
+volta com memory-map: o DataFrame guardado na sessão (dashboard, filtros, exportação,
+paginação) aponta para as páginas do arquivo, divididas pelo cache do sistema operacional
+entre abas, sessões e processos. A camada em memória (LRU limitado em MB) mantém os
+arquivos abertos; com um diretório fixo os arquivos sobrevivem ao reinício do processo.
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+
+from config import CACHE_RESULTADOS_LIMITE_DISCO_MB, CACHE_RESULTADOS_LIMITE_MB
+from memoria_sessao import abrir_arrow, copia_mapeada, gravar_arrow
+
+
+logger = logging.getLogger(__name__)
+
+# Variável de ambiente com o diretório dos arquivos de resultado (sem ela, diretório
+# temporário apagado ao encerrar o processo)
+VARIAVEL_DIRETORIO_CACHE = "PRECIFICACAO_CACHE_DIR"
+
+# Versão do formato dos resultados: mudar invalida o que já está em disco
+VERSAO_CACHE = 4
+
+EXTENSAO = ".arrow"
+
+
+def hash_dados(df):
+    """
+    Hash do conteúdo do DataFrame (colunas, tipos e valores; o índice não conta)
+
+    Lê os buffers Arrow das colunas diretamente, sem converter valores em texto.
+
+    Args:
+        df: DataFrame
+
+    Returns:
+        String hexadecimal de 32 caracteres, ou None se alguma coluna não couber em Arrow
+        (ex: tipos misturados em uma coluna object)
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    hasher.update(str(tabela.schema.remove_metadata()).encode("utf-8"))
+    for coluna in tabela.columns:
+        for pedaco in coluna.chunks:
+            hasher.update(f"{pedaco.offset}:{len(pedaco)}".encode())
+            for buffer in pedaco.buffers():
+                if buffer is not None:
+                    hasher.update(buffer)
+    return hasher.hexdigest()
+
+
+def _tamanho(df):
+    """Bytes ocupados pelo DataFrame em memória"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class CacheResultados:
+    """Cache LRU de DataFrames em memória, com camada opcional em arquivos Arrow (memory-map)."""
+
+    def __init__(self, limite_mb=CACHE_RESULTADOS_LIMITE_MB, diretorio=None,
+                 limite_disco_mb=CACHE_RESULTADOS_LIMITE_DISCO_MB):
+        """
+        Args:
+            limite_mb: Memória máxima ocupada pelos resultados (os menos usados saem primeiro)
+            diretorio: Diretório da camada em disco (None = só memória)
+            limite_disco_mb: Espaço máximo dos arquivos em disco
+        """
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.limite_disco_bytes = int(limite_disco_mb * 1024 * 1024)
+        self.diretorio = diretorio
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self._lock = threading.Lock()
+        # Aparar o disco é E/S demorada: lock próprio, sem travar as consultas à memória
+        self._lock_disco = threading.Lock()
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self.descartes_memoria = 0
+        self.descartes_disco = 0
+
+    def __len__(self):
+        return len(self._memoria)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"v{VERSAO_CACHE}-{'-'.join(chave)}{EXTENSAO}")
+
+    def obter(self, chave):
+        """
+        Resultado em cache (memória, depois disco)
+
+        Args:
+            chave: Tupla de strings (hash dos dados, impressão das premissas)
+
+        Returns:
+            Cópia rasa do DataFrame (alterações não chegam ao cache), ou None
+        """
+        with self._lock:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                self.acertos_memoria += 1
+                return copia_mapeada(self._memoria[chave][0])
+
+        if self.diretorio:
+            df = self._abrir(chave)
+            if df is not None:
+                with self._lock:
+                    self.acertos_disco += 1
+                self._guardar_memoria(chave, df)
+                return copia_mapeada(df)
+
+        with self._lock:
+            self.falhas += 1
+        return None
+
+    def _abrir(self, chave):
+        """Abre o arquivo do resultado com memory-map (None se não existir ou estiver ilegível)"""
+        caminho = self._caminho(chave)
+        try:
+            df = abrir_arrow(caminho)
+            os.utime(caminho)  # ordem de uso da camada em disco
+        except (OSError, ValueError, pa.ArrowException):
+            return None
+        return df
+
+    def guardar(self, chave, df):
+        """
+        Guarda o resultado nas camadas configuradas
+
+        Com a camada em disco, o resultado é gravado uma vez em arquivo Arrow e o cache passa
+        a guardar a versão aberta com memory-map, que é a devolvida.
+
+        Args:
+            chave: Tupla de strings (hash dos dados, impressão das premissas)
+            df: DataFrame do resultado
+
+        Returns:
+            Cópia rasa do resultado guardado (aberta do arquivo, se houver camada em disco)
+        """
+        if self.diretorio:
+            caminho = self._caminho(chave)
+            if not os.path.exists(caminho):
+                try:
+                    gravar_arrow(df, caminho)
+                except (OSError, ValueError, pa.ArrowException) as e:
+                    logger.warning("Falha ao gravar o cache em disco (%s): %s", caminho, e)
+                self._aparar_disco()
+            mapeado = self._abrir(chave)
+            if mapeado is not None:
+                df = mapeado
+        self._guardar_memoria(chave, df)
+        return copia_mapeada(df)
+
+    def _guardar_memoria(self, chave, df):
+        """Inclui na camada de memória e descarta os menos usados acima do limite"""
+        tamanho = _tamanho(df)
+        if tamanho > self.limite_bytes:
+            return
+        with self._lock:
+            if chave in self._memoria:
+                self._bytes_memoria -= self._memoria.pop(chave)[1]
+            self._memoria[chave] = (df, tamanho)
+            self._bytes_memoria += tamanho
+            while self._bytes_memoria > self.limite_bytes:
+                _, (_, liberado) = self._memoria.popitem(last=False)
+                self._bytes_memoria -= liberado
+                self.descartes_memoria += 1
+
+    def _arquivos(self):
+        """Lista (caminho, bytes, último uso) dos arquivos da camada em disco"""
+        arquivos = []
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith(EXTENSAO):
+                caminho = os.path.join(self.diretorio, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                arquivos.append((caminho, info.st_size, info.st_mtime))
+        return arquivos
+
+    def _aparar_disco(self):
+        """Remove os arquivos menos usados até caber no limite do disco"""
+        # Sessões diferentes gravam ao mesmo tempo: uma aparagem por vez (contagem e listagem consistentes)
+        with self._lock_disco:
+            arquivos = sorted(self._arquivos(), key=lambda arquivo: arquivo[2])
+            total = sum(arquivo[1] for arquivo in arquivos)
+            for caminho, tamanho, _ in arquivos:
+                if total <= self.limite_disco_bytes:
+                    break
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    continue
+                total -= tamanho
+                self.descartes_disco += 1
+
+    def ocupacao(self):
+        """
+        Ocupação de cada camada (painel de administração)
+
+        Returns:
+            DataFrame com Camada, Entradas, Ocupado MB, Limite MB, Acertos e Descartes
+        """
+        with self._lock:
+            linhas = [{
+                "Camada": "Memória",
+                "Entradas": len(self._memoria),
+                "Ocupado MB": round(self._bytes_memoria / 1024 / 1024, 1),
+                "Limite MB": round(self.limite_bytes / 1024 / 1024, 1),
+                "Acertos": self.acertos_memoria,
+                "Descartes": self.descartes_memoria,
+            }]
+        if self.diretorio:
+            arquivos = self._arquivos()
+            linhas.append({
+                "Camada": f"Disco ({self.diretorio})",
+                "Entradas": len(arquivos),
+                "Ocupado MB": round(sum(a[1] for a in arquivos) / 1024 / 1024, 1),
+                "Limite MB": round(self.limite_disco_bytes / 1024 / 1024, 1),
+                "Acertos": self.acertos_disco,
+                "Descartes": self.descartes_disco,
+            })
+        return pd.DataFrame(linhas)
+
+    def limpar(self):
+        """Esvazia as duas camadas"""
+        with self._lock:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+        if self.diretorio:
+            with self._lock_disco:
+                for caminho, _, _ in self._arquivos():
+                    try:
+                        os.remove(caminho)
+                    except OSError:
+                        pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache():
+    """
+    Cache do processo (criado no primeiro uso)
+
+    Os arquivos de resultado ficam em PRECIFICACAO_CACHE_DIR, se existir (reabrir um cálculo
+    depois de reiniciar é imediato), ou em um diretório temporário do processo.
+
+    Returns:
+        CacheResultados compartilhado por todas as sessões
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            diretorio = os.environ.get(VARIAVEL_DIRETORIO_CACHE)
+            if not diretorio:
+                diretorio = tempfile.mkdtemp(prefix="precificacao-resultados-")
+                atexit.register(shutil.rmtree, diretorio, True)
+            _cache = CacheResultados(diretorio=diretorio)
+        return _cache
@@ -0,0 +1,104 @@
+"""
+Aritmética monetária em centavos inteiros (int64), vetorizada
+Evita a deriva de 1 centavo do float64: cada taxa é arredondada explicitamente
+para o centavo, como o marketplace faz ao calcular o "Você recebe"
+"""
+
+import numpy as np
+
+
+# Modos de arredondamento do meio centavo
+MEIO_PARA_CIMA = "meio_para_cima"  # 0,5 centavo → afasta do zero (ROUND_HALF_UP)
+BANCARIO = "bancario"  # 0,5 centavo → centavo par (ROUND_HALF_EVEN)
+MODOS_ARREDONDAMENTO = (MEIO_PARA_CIMA, BANCARIO)
+
+# Escala das taxas percentuais: 0,14 → 140000 (seis casas decimais exatas)
+ESCALA_TAXA = 1_000_000
+
+
+def dividir_arredondando(numerador, divisor, modo=MEIO_PARA_CIMA):
+    """
+    Divisão inteira com arredondamento explícito do resto
+
+    Args:
+        numerador: Array int64
+        divisor: Inteiro positivo
+        modo: MEIO_PARA_CIMA ou BANCARIO
+
+    Returns:
+        Array int64 com o quociente arredondado
+    """
+    if modo not in MODOS_ARREDONDAMENTO:
+        raise ValueError(f"Modo de arredondamento '{modo}' inválido. Use: {', '.join(MODOS_ARREDONDAMENTO)}")
+
+    numerador = np.asarray(numerador, dtype=np.int64)
+    sinal = np.sign(numerador)
+    quociente, resto = np.divmod(np.abs(numerador), divisor)
+
+    dobro = 2 * resto
+    if modo == MEIO_PARA_CIMA:
+        arredonda = dobro >= divisor
+    else:
+        arredonda = (dobro > divisor) | ((dobro == divisor) & (quociente % 2 == 1))
+
+    return sinal * (quociente + arredonda)
+
+
+def para_centavos(valores, modo=MEIO_PARA_CIMA):
+    """
+    Converte valores em reais (float) para centavos inteiros
+
+    O valor é levado primeiro a milionésimos de centavo, para que 12,345
+    (representado como 12,3449999...) seja tratado como meio centavo exato.
+
+    Args:
+        valores: Array/Series com valores em R$ (NaN vira 0)
+        modo: MEIO_PARA_CIMA ou BANCARIO
+
+    Returns:
+        Array int64 em centavos
+    """
+    valores = np.nan_to_num(np.asarray(valores, dtype=float))
+    micro = np.rint(valores * 100 * ESCALA_TAXA).astype(np.int64)
+    return dividir_arredondando(micro, ESCALA_TAXA, modo)
+
+
+def taxa_inteira(taxa):
+    """
+    Converte uma taxa (fração, ex: 0.14) para inteiro na escala ESCALA_TAXA
+
+    Args:
+        taxa: Float ou array com a taxa
+
+    Returns:
+        Int64 (ou array) com a taxa escalada
+    """
+    return np.rint(np.asarray(taxa, dtype=float) * ESCALA_TAXA).astype(np.int64)
+
+
+def aplicar_taxa(centavos, taxa, modo=MEIO_PARA_CIMA):
+    """
+    Calcula centavos × taxa arredondando para o centavo
+
+    Args:
+        centavos: Array int64 com valores em centavos
+        taxa: Taxa (fração, escalar ou array) a aplicar
+        modo: MEIO_PARA_CIMA ou BANCARIO
+
+    Returns:
+        Array int64 em centavos
+    """
+    return dividir_arredondando(np.asarray(centavos, dtype=np.int64) * taxa_inteira(taxa), ESCALA_TAXA, modo)
+
+
+def para_reais(centavos):
+    """
+    Converte centavos inteiros para reais (float com duas casas)
+
+    Args:
+        centavos: Array int64
+
+    Returns:
+        Array float64 em R$
+    """
+    return np.asarray(centavos, dtype=np.int64) / 100
@@ -35,6 +35,182 @@ MERCADO_LIVRE_TAXA_FIXA = {
 # Limite para aplicacao da taxa fixa
 MERCADO_LIVRE_LIMITE_TAXA_FIXA = 79.0
 
+# Início de vigência das novas regras de custos do Mercado Livre (ver NOVOS_CUSTOS_ML_MARCO_2026.md)
+MERCADO_LIVRE_VIGENCIA_2026 = "2026-03-02"
+
+# Faixas de peso das tabelas de 2026 (rótulo, peso máximo em kg)
+MERCADO_LIVRE_FAIXAS_PESO_2026 = [
+    ("Até 300g", 0.3),
+    ("300g a 500g", 0.5),
+    ("500g a 1kg", 1.0),
+    ("1kg a 1,5kg", 1.5),
+    ("1,5kg a 2kg", 2.0),
+    ("2kg a 3kg", 3.0),
+    ("3kg a 4kg", 4.0),
+    ("4kg a 5kg", 5.0),
+]
+
+# Custo Operacional Full/Coleta/Agências abaixo de R$ 79, por faixa de peso e preço (a partir de 02/03/2026)
+MERCADO_LIVRE_CUSTO_OPERACIONAL_FULL_2026 = {
+    "Até 300g": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 5.65},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 6.55},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 7.75},
+    ],
+    "300g a 500g": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 5.95},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 6.65},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 7.85},
+    ],
+    "500g a 1kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 6.05},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 6.75},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 7.95},
+    ],
+    "1kg a 1,5kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 6.15},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 6.85},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 8.05},
+    ],
+    "1,5kg a 2kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 6.25},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 6.95},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 8.15},
+    ],
+    "2kg a 3kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 6.35},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 7.95},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 8.55},
+    ],
+    "3kg a 4kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 6.45},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 8.15},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 8.95},
+    ],
+    "4kg a 5kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 6.55},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 8.35},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 9.75},
+    ],
+}
+
+# Custo Operacional de Livros abaixo de R$ 79 (a partir de 02/03/2026)
+MERCADO_LIVRE_CUSTO_OPERACIONAL_LIVROS_2026 = {
+    "Até 300g": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 2.83},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 3.28},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 3.88},
+    ],
+    "300g a 500g": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 2.98},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 3.33},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 3.93},
+    ],
+    "500g a 1kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 3.03},
+        {"preco_min": 19.00, "preco_max": 48.99, "custo": 3.38},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 3.98},
+    ],
+}
+
+# Custo Operacional de Supermercado (Full Super) abaixo de R$ 79 (a partir de 02/03/2026)
+MERCADO_LIVRE_CUSTO_OPERACIONAL_SUPERMERCADO_2026 = {
+    "Até 300g": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 1.25},
+        {"preco_min": 19.00, "preco_max": 28.99, "custo": 1.50},
+        {"preco_min": 29.00, "preco_max": 48.99, "custo": 2.00},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 3.00},
+    ],
+    "300g a 500g": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 1.25},
+        {"preco_min": 19.00, "preco_max": 28.99, "custo": 1.50},
+        {"preco_min": 29.00, "preco_max": 48.99, "custo": 2.00},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 3.00},
+    ],
+    "500g a 1kg": [
+        {"preco_min": 0.00, "preco_max": 18.99, "custo": 1.25},
+        {"preco_min": 19.00, "preco_max": 28.99, "custo": 1.50},
+        {"preco_min": 29.00, "preco_max": 48.99, "custo": 2.00},
+        {"preco_min": 49.00, "preco_max": 78.99, "custo": 3.00},
+    ],
+}
+
+# Taxa Fixa Flex/Retirada/Logística Própria abaixo de R$ 79 (a partir de 02/03/2026)
+MERCADO_LIVRE_TAXA_FIXA_FLEX_2026 = {
+    "Geral": [
+        {"preco_min": 0.00, "preco_max": 18.99, "taxa_fixa": 6.25},
+        {"preco_min": 19.00, "preco_max": 48.99, "taxa_fixa": 6.65},
+        {"preco_min": 49.00, "preco_max": 78.99, "taxa_fixa": 7.75},
+    ],
+    "Livros": [
+        {"preco_min": 0.00, "preco_max": 18.99, "taxa_fixa": 3.00},
+        {"preco_min": 19.00, "preco_max": 48.99, "taxa_fixa": 3.50},
+        {"preco_min": 49.00, "preco_max": 78.99, "taxa_fixa": 4.50},
+    ],
+}
+
+# Frete Grátis Full a partir de R$ 79, por faixa de peso e preço (a partir de 02/03/2026)
+MERCADO_LIVRE_FRETE_GRATIS_FULL_2026 = {
+    "Até 300g": [
+        {"preco_min": 79.00, "preco_max": 99.99, "custo": 12.35},
+        {"preco_min": 100.00, "preco_max": 119.99, "custo": 14.35},
+        {"preco_min": 120.00, "preco_max": 149.99, "custo": 16.45},
+        {"preco_min": 150.00, "preco_max": 199.99, "custo": 18.45},
+        {"preco_min": 200.00, "preco_max": float('inf'), "custo": 20.95},
+    ],
+    "300g a 500g": [
+        {"preco_min": 79.00, "preco_max": 99.99, "custo": 13.25},
+        {"preco_min": 100.00, "preco_max": 119.99, "custo": 15.45},
+        {"preco_min": 120.00, "preco_max": 149.99, "custo": 17.65},
+        {"preco_min": 150.00, "preco_max": 199.99, "custo": 19.85},
+        {"preco_min": 200.00, "preco_max": float('inf'), "custo": 22.55},
+    ],
+    "500g a 1kg": [
+        {"preco_min": 79.00, "preco_max": 99.99, "custo": 13.85},
+        {"preco_min": 100.00, "preco_max": 119.99, "custo": 16.15},
+        {"preco_min": 120.00, "preco_max": 149.99, "custo": 18.45},
+        {"preco_min": 150.00, "preco_max": 199.99, "custo": 20.75},
+        {"preco_min": 200.00, "preco_max": float('inf'), "custo": 23.65},
+    ],
+    "1kg a 1,5kg": [
+        {"preco_min": 79.00, "preco_max": 99.99, "custo": 14.15},
+        {"preco_min": 100.00, "preco_max": 119.99, "custo": 16.45},
+        {"preco_min": 120.00, "preco_max": 149.99, "custo": 18.85},
+        {"preco_min": 150.00, "preco_max": 199.99, "custo": 21.15},
+        {"preco_min": 200.00, "preco_max": float('inf'), "custo": 24.65},
+    ],
+    "1,5kg a 2kg": [
+        {"preco_min": 79.00, "preco_max": 99.99, "custo": 14.45},
+        {"preco_min": 100.00, "preco_max": 119.99, "custo": 16.85},
+        {"preco_min": 120.00, "preco_max": 149.99, "custo": 19.25},
+        {"preco_min": 150.00, "preco_max": 199.99, "custo": 21.65},
+        {"preco_min": 200.00, "preco_max": float('inf'), "custo": 24.65},
+    ],
+}
+
+# Tetos do custo operacional para produtos baratos (fração do preço)
+MERCADO_LIVRE_LIMITE_CUSTO_FIXO_BAIXO = 12.5
+MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_GERAL = 19.0
+MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_SUPERMERCADO = 29.0
+MERCADO_LIVRE_REGRAS_CUSTO_FIXO = {
+    "abaixo_12_50": 0.50,
+    "abaixo_19_geral": 0.50,
+    "abaixo_29_supermercado": 0.25,
+}
+
+# Comissões por categoria (2026); categorias ausentes usam 14% Clássico / 19% Premium
+MERCADO_LIVRE_COMISSAO_CATEGORIA_2026 = {
+    "Acessórios para Veículos": {"classico": 0.12, "premium": 0.17},
+    "Livros": {"classico": 0.065, "premium": 0.115},
+}
+
+# Árvore de categorias com as comissões por tipo de anúncio (ver indice_categorias.py);
+# caminho relativo à pasta do projeto
+MERCADO_LIVRE_ARQUIVO_CATEGORIAS = "categorias_mercado_livre.csv"
+
+# Custos adicionais por venda (nenhum vigente nas regras de 2026)
+MERCADO_LIVRE_CUSTOS_ADICIONAIS = {}
+
 # Tabelas de Comissao e Subsidio Pix da Shopee por Faixa de Preco (2025)
 SHOPEE_FAIXAS_PRECO = [
     {
@@ -128,3 +304,18 @@ BASE_DADOS_COLUMNS = [
     "Margem Líquida (%)",
     "Publicidade (%)",
 ]
+
+# Cache de resultados da calculadora compartilhado entre sessões (ver cache_resultados)
+CACHE_RESULTADOS_LIMITE_MB = 512
+CACHE_RESULTADOS_LIMITE_DISCO_MB = 4096
+
+# Memória máxima dos DataFrames das sessões, somando todas (ver memoria_sessao)
+SESSOES_ORCAMENTO_MEMORIA_MB = 2048
+
+# Gráficos de dispersão por SKU (ver graficos_dispersao): até o limite, um ponto por SKU
+# (WebGL); acima dele, grade de caixas x caixas calculada no servidor
+DISPERSAO_LIMITE_PONTOS = 20000
+DISPERSAO_CAIXAS = 60
+
+# Linhas por página das tabelas de resultado: só a página exibida é formatada em pt-BR
+TAMANHO_PAGINA_TABELA = 500
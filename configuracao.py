@@ -0,0 +1,183 @@
+"""
+Configurações congeladas de marketplaces e regimes tributários
+Os dicts padrão de config.py são convertidos uma única vez em ConfigCongelada: imutável,
+hashable e com impressão digital estável. Cada sessão parte do mesmo objeto padrão e, ao
+editar um valor, recebe uma cópia nova (copy-on-write) que compartilha o que não mudou;
+nada que uma sessão altere chega às outras. As tabelas compiladas a partir da configuração
+ficam em cache no processo, chaveadas pela própria configuração.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+
+import numpy as np
+
+from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+
+
+def congelar(valor):
+    """
+    Converte dicts e listas (recursivamente) em ConfigCongelada e tuplas
+
+    Args:
+        valor: Dict, lista ou escalar
+
+    Returns:
+        Valor imutável equivalente (ConfigCongelada já congelada é devolvida como está)
+    """
+    if isinstance(valor, ConfigCongelada):
+        return valor
+    if isinstance(valor, Mapping):
+        return ConfigCongelada(valor)
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(v) for v in valor)
+    return valor
+
+
+def descongelar(valor):
+    """Cópia mutável (dicts e listas) de um valor congelado"""
+    if isinstance(valor, Mapping):
+        return {chave: descongelar(v) for chave, v in valor.items()}
+    if isinstance(valor, tuple):
+        return [descongelar(v) for v in valor]
+    return valor
+
+
+class ConfigCongelada(Mapping):
+    """Dict imutável e hashable; alterações devolvem uma nova configuração."""
+
+    __slots__ = ("_dados", "_hash", "_impressao")
+
+    def __init__(self, dados=()):
+        """
+        Args:
+            dados: Dict (ou pares chave/valor) com a configuração; valores aninhados são congelados
+        """
+        self._dados = {chave: congelar(valor) for chave, valor in dict(dados).items()}
+        self._hash = None
+        self._impressao = None
+
+    def __getitem__(self, chave):
+        return self._dados[chave]
+
+    def __iter__(self):
+        return iter(self._dados)
+
+    def __len__(self):
+        return len(self._dados)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self._dados.items()))
+        return self._hash
+
+    def __repr__(self):
+        return f"ConfigCongelada({descongelar(self)!r})"
+
+    def __reduce__(self):
+        return ConfigCongelada, (descongelar(self),)
+
+    @property
+    def impressao(self):
+        """Impressão digital do conteúdo (igual entre processos e execuções)"""
+        if self._impressao is None:
+            texto = json.dumps(descongelar(self), sort_keys=True, ensure_ascii=False, default=str)
+            self._impressao = hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+        return self._impressao
+
+    def alterar(self, chave, valor):
+        """
+        Nova configuração com a chave trocada (copy-on-write)
+
+        Args:
+            chave: Chave a trocar ou incluir
+            valor: Novo valor (dicts são congelados)
+
+        Returns:
+            ConfigCongelada nova, ou a própria se o valor não mudou
+        """
+        valor = congelar(valor)
+        if chave in self._dados and self._dados[chave] == valor:
+            return self
+        nova = ConfigCongelada()
+        nova._dados = dict(self._dados)
+        nova._dados[chave] = valor
+        return nova
+
+    def alterar_campos(self, chave, **campos):
+        """
+        Nova configuração com campos de uma entrada aninhada trocados
+
+        Ex: marketplaces.alterar_campos("Shopee", comissao=0.18)
+
+        Args:
+            chave: Entrada aninhada (marketplace, regime, ...)
+            campos: Campos da entrada e seus novos valores
+
+        Returns:
+            ConfigCongelada nova, ou a própria se nenhum valor mudou
+        """
+        entrada = self._dados.get(chave, ConfigCongelada())
+        for campo, valor in campos.items():
+            entrada = entrada.alterar(campo, valor)
+        return self.alterar(chave, entrada)
+
+    def para_dict(self):
+        """Cópia mutável (dicts aninhados) da configuração"""
+        return descongelar(self)
+
+
+# Padrões compartilhados por todas as sessões (imutáveis, não precisam de cópia)
+MARKETPLACES_PADRAO = ConfigCongelada(DEFAULT_MARKETPLACES)
+REGIMES_PADRAO = ConfigCongelada(DEFAULT_REGIMES)
+
+
+class ConfigCompilada:
+    """Arrays de taxas por marketplace e por regime, na ordem das chaves da configuração."""
+
+    def __init__(self, marketplaces, regimes):
+        """
+        Args:
+            marketplaces: ConfigCongelada de marketplaces
+            regimes: ConfigCongelada de regimes tributários
+        """
+        self.impressao = f"{marketplaces.impressao}-{regimes.impressao}"
+        self.marketplaces = tuple(marketplaces)
+        self.regimes = tuple(regimes)
+
+        def coluna(config, campo):
+            valores = np.array([entrada.get(campo, 0.0) for entrada in config.values()], dtype=float)
+            valores.setflags(write=False)
+            return valores
+
+        self.comissao = coluna(marketplaces, "comissao")
+        self.custo_fixo = coluna(marketplaces, "custo_fixo")
+        self.taxa_devolucao = coluna(marketplaces, "taxa_devolucao")
+        self.impostos_encargos = coluna(regimes, "impostos_encargos")
+        # Alíquota total do regime (IBS + CBS + impostos e encargos)
+        self.aliquota_impostos = coluna(regimes, "ibs") + coluna(regimes, "cbs") + self.impostos_encargos
+        self.aliquota_impostos.setflags(write=False)
+
+
+@lru_cache(maxsize=32)
+def _compilar(marketplaces, regimes):
+    """Compila uma vez por configuração (cache compartilhado entre sessões)"""
+    return ConfigCompilada(marketplaces, regimes)
+
+
+def compilar(marketplaces, regimes):
+    """
+    Retorna as tabelas compiladas da configuração (em cache no processo)
+
+    Sessões com a mesma configuração recebem o mesmo objeto, com arrays somente leitura.
+
+    Args:
+        marketplaces: Dict ou ConfigCongelada de marketplaces
+        regimes: Dict ou ConfigCongelada de regimes tributários
+
+    Returns:
+        ConfigCompilada
+    """
+    return _compilar(congelar(marketplaces), congelar(regimes))
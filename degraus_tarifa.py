@@ -0,0 +1,155 @@
+"""
+Módulo de detecção de degraus de tarifa
+Preços logo acima de uma fronteira de faixa (ex: R$ 79 no Mercado Livre, R$ 80 na Shopee)
+podem render mais ou menos que o preço vizinho do outro lado da fronteira. Para cada SKU,
+o lucro é recalculado nas fronteiras mais próximas acima e abaixo do preço atual, em uma
+única passada vetorizada da calculadora sobre todos os preços candidatos.
+"""
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from tabelas_tarifas import obter_tabela
+
+
+# Ganho mínimo por unidade para sinalizar o SKU (meio centavo, abaixo disso é arredondamento)
+GANHO_MINIMO = 0.005
+
+DIRECOES = ("Subir", "Descer")
+
+
+class DetectorDegraus:
+    """Localiza SKUs cujo lucro melhora ao cruzar uma fronteira de faixa de tarifa."""
+
+    @staticmethod
+    def fronteiras(marketplace, data_tarifas=None):
+        """
+        Fronteiras de faixa de preço do marketplace
+
+        Args:
+            marketplace: Nome do marketplace
+            data_tarifas: Data da tabela de tarifas (None = hoje)
+
+        Returns:
+            Tupla de arrays (preço abaixo, preço acima) de cada fronteira, vazios se o
+            marketplace não tiver tabela de tarifas por faixa
+        """
+        try:
+            pares = obter_tabela(marketplace, data_tarifas).fronteiras()
+        except ValueError:
+            pares = []
+        abaixo = np.array([par[0] for par in pares], dtype=float)
+        acima = np.array([par[1] for par in pares], dtype=float)
+        return abaixo, acima
+
+    @staticmethod
+    def precos_candidatos(precos, abaixo, acima, distancia_maxima=0.10):
+        """
+        Preço do outro lado da fronteira mais próxima, acima e abaixo de cada preço
+
+        Args:
+            precos: Array com os preços atuais
+            abaixo: Array ordenado com o último preço antes de cada fronteira
+            acima: Array ordenado com o primeiro preço depois de cada fronteira
+            distancia_maxima: Variação máxima de preço considerada (fração do preço atual)
+
+        Returns:
+            Dict {"Subir": array, "Descer": array} com o preço candidato (NaN = sem candidato)
+        """
+        precos = np.asarray(precos, dtype=float)
+        candidatos = {}
+        if len(abaixo) == 0:
+            vazio = np.full(len(precos), np.nan)
+            return {"Subir": vazio, "Descer": vazio.copy()}
+
+        # Subir: primeira fronteira ainda não cruzada (preço <= último preço da faixa)
+        proxima = np.searchsorted(abaixo, precos, side="left")
+        subir = acima[np.minimum(proxima, len(acima) - 1)]
+        candidatos["Subir"] = np.where(proxima < len(acima), subir, np.nan)
+
+        # Descer: última fronteira já cruzada (preço >= primeiro preço da faixa seguinte)
+        anterior = np.searchsorted(acima, precos, side="right") - 1
+        descer = abaixo[np.maximum(anterior, 0)]
+        candidatos["Descer"] = np.where(anterior >= 0, descer, np.nan)
+
+        for direcao, candidato in candidatos.items():
+            longe = np.abs(candidato - precos) > distancia_maxima * precos
+            candidato[longe] = np.nan
+        return candidatos
+
+    @staticmethod
+    def detectar(df, calculadora, marketplace, regime_tributario, distancia_maxima=0.10):
+        """
+        Avalia o lucro nas fronteiras vizinhas e lista os SKUs em que cruzar compensa
+
+        Args:
+            df: DataFrame agregado por SKU (ver MercadoLivreProcessor.agregar_por_sku)
+            calculadora: PricingCalculatorV2 usada para o lucro (mesmas premissas da Calculadora)
+            marketplace: Marketplace selecionado
+            regime_tributario: Regime tributário selecionado
+            distancia_maxima: Variação máxima de preço considerada (fração do preço atual)
+
+        Returns:
+            DataFrame com um SKU por linha (a melhor direção), ordenado pelo ganho
+        """
+        data_tarifas = calculadora.tabela_mercado_livre.vigente_desde if marketplace == "Mercado Livre" else None
+        abaixo, acima = DetectorDegraus.fronteiras(marketplace, data_tarifas)
+        precos = df["Preço Atual"].to_numpy(dtype=float)
+        n = len(precos)
+        candidatos = DetectorDegraus.precos_candidatos(precos, abaixo, acima, distancia_maxima)
+
+        # Uma única passada da calculadora: preço atual, candidato acima e candidato abaixo
+        blocos = [precos] + [np.where(np.isnan(candidatos[d]), precos, candidatos[d]) for d in DIRECOES]
+        df_precos = pd.concat([df] * len(blocos), ignore_index=True)
+        df_precos["Preço Atual"] = np.concatenate(blocos)
+        calculo = calculadora.calcular_lote(df_precos, marketplace, regime_tributario)
+
+        lucro = calculo["Lucro R$"].to_numpy().reshape(len(blocos), n)
+        ganhos = lucro[1:] - lucro[0]
+        for i, direcao in enumerate(DIRECOES):
+            ganhos[i][np.isnan(candidatos[direcao])] = -np.inf
+        melhor = np.argmax(ganhos, axis=0)
+        ganho = ganhos[melhor, np.arange(n)]
+
+        linhas = np.flatnonzero(ganho > GANHO_MINIMO)
+        posicao_candidato = (melhor[linhas] + 1) * n + linhas
+        resultado = pd.DataFrame({
+            "SKU": df["SKU"].to_numpy()[linhas],
+            "Preço Atual": precos[linhas],
+            "Lucro Atual R$": lucro[0][linhas],
+            "Taxa Comissao % Atual": calculo["Taxa Comissao %"].to_numpy()[linhas],
+            "Taxa Fixa Atual R$": calculo["Taxa Fixa R$"].to_numpy()[linhas],
+            "Direção": pd.Categorical.from_codes(melhor[linhas], categories=list(DIRECOES)),
+            "Preço Sugerido": df_precos["Preço Atual"].to_numpy()[posicao_candidato],
+            "Lucro Sugerido R$": lucro[melhor[linhas] + 1, linhas],
+            "Taxa Comissao % Sugerida": calculo["Taxa Comissao %"].to_numpy()[posicao_candidato],
+            "Taxa Fixa Sugerida R$": calculo["Taxa Fixa R$"].to_numpy()[posicao_candidato],
+            "Ganho por Unidade R$": ganho[linhas],
+        })
+
+        ordenar_por = "Ganho por Unidade R$"
+        if "Quantidade Vendida" in df.columns:
+            resultado["Ganho no Período R$"] = resultado["Ganho por Unidade R$"] * (
+                df["Quantidade Vendida"].to_numpy(dtype=float)[linhas]
+            )
+            ordenar_por = "Ganho no Período R$"
+
+        return resultado.sort_values(ordenar_por, ascending=False, kind="stable").reset_index(drop=True)
+
+    @staticmethod
+    def exportar_csv(resultado):
+        """
+        Exporta o ranking em CSV no padrão brasileiro (";" e vírgula decimal)
+
+        Args:
+            resultado: DataFrame de detectar
+
+        Returns:
+            BytesIO com o arquivo CSV (UTF-8 com BOM, abre direto no Excel)
+        """
+        buffer = BytesIO()
+        resultado.to_csv(buffer, sep=";", decimal=",", index=False, encoding="utf-8-sig", float_format="%.2f")
+        buffer.seek(0)
+        return buffer
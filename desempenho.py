@@ -0,0 +1,194 @@
+"""
+Módulo de instrumentação de desempenho
+Mede tempo, linhas e variação de memória de cada etapa do processamento
+(ingestão, normalização, agregação, cálculo, ABC, simulação, filtro e exportação)
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+
+logger = logging.getLogger("precificacao.desempenho")
+
+# Variável de ambiente com o nível de log padrão (ex: DEBUG, INFO); desligado por padrão
+VARIAVEL_NIVEL_LOG = "PRECIFICACAO_LOG"
+
+# Variável de ambiente que libera os controles do processo (cache e memória de todas as sessões)
+VARIAVEL_ADMIN = "PRECIFICACAO_ADMIN"
+
+
+def modo_administrador():
+    """
+    Indica se o painel de desempenho mostra os controles do processo inteiro
+
+    Returns:
+        True se PRECIFICACAO_ADMIN for "1", "true", "sim" ou "yes"
+    """
+    return os.environ.get(VARIAVEL_ADMIN, "").strip().lower() in ("1", "true", "sim", "yes")
+
+
+def _memoria_rss_mb():
+    """
+    Retorna a memória residente (RSS) atual do processo em MB
+
+    Returns:
+        Float com a memória em MB, ou None se não for possível medir
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registro de log como uma linha JSON"""
+
+    def format(self, record):
+        dados = {
+            "nivel": record.levelname,
+            "logger": record.name,
+            "momento": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+        }
+        if isinstance(record.msg, dict):
+            dados.update(record.msg)
+        else:
+            dados["mensagem"] = record.getMessage()
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+def configurar_logging(nivel=None, formato_json=False, stream=None):
+    """
+    Configura o logging do aplicativo (desligado por padrão)
+
+    Args:
+        nivel: Nível de log ("DEBUG", "INFO", ...); padrão: variável PRECIFICACAO_LOG ou WARNING
+        formato_json: Se True, emite cada registro como uma linha JSON
+        stream: Destino do log (padrão: sys.stderr)
+    """
+    nivel = (nivel or os.environ.get(VARIAVEL_NIVEL_LOG) or "WARNING").upper()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if formato_json:
+        handler.setFormatter(FormatadorJSON())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    raiz = logging.getLogger()
+    raiz.handlers = [handler]
+    raiz.setLevel(nivel)
+
+
+class RegistroDesempenho:
+    """Acumula as medições de desempenho das etapas de uma execução."""
+
+    def __init__(self, limite=None):
+        """
+        Inicializa o registro vazio
+
+        Args:
+            limite: Número máximo de medições mantidas (as mais antigas são descartadas)
+        """
+        self.limite = limite
+        self.etapas = []
+
+    def registrar(self, etapa, segundos, linhas=None, memoria_delta_mb=None, **extras):
+        """
+        Registra uma etapa medida externamente (ex: em outro processo)
+
+        Args:
+            etapa: Nome da etapa
+            segundos: Duração em segundos
+            linhas: Número de linhas processadas
+            memoria_delta_mb: Variação de memória em MB
+            extras: Campos adicionais
+
+        Returns:
+            Dict com a medição registrada
+        """
+        medicao = {
+            "etapa": etapa,
+            "segundos": round(segundos, 6),
+            "linhas": linhas,
+            "memoria_delta_mb": round(memoria_delta_mb, 2) if memoria_delta_mb is not None else None,
+        }
+        medicao.update(extras)
+        if linhas and segundos > 0:
+            medicao["linhas_por_segundo"] = round(linhas / segundos)
+
+        self.etapas.append(medicao)
+        if self.limite and len(self.etapas) > self.limite:
+            del self.etapas[:-self.limite]
+        logger.info(medicao)
+        return medicao
+
+    @contextmanager
+    def medir(self, etapa, linhas=None):
+        """
+        Context manager que mede tempo e memória de uma etapa
+
+        O dict retornado pode ser atualizado dentro do bloco
+        (ex: medicao["linhas"] = len(df) quando o total só é conhecido no final).
+
+        Args:
+            etapa: Nome da etapa
+            linhas: Número de linhas de entrada (opcional)
+        """
+        medicao = {"linhas": linhas}
+        memoria_inicial = _memoria_rss_mb()
+        inicio = time.perf_counter()
+        try:
+            yield medicao
+        finally:
+            segundos = time.perf_counter() - inicio
+            memoria_final = _memoria_rss_mb()
+            delta = memoria_final - memoria_inicial if memoria_inicial is not None and memoria_final is not None else None
+            linhas_medidas = medicao.pop("linhas")
+            self.registrar(etapa, segundos, linhas=linhas_medidas, memoria_delta_mb=delta, **medicao)
+
+    def limpar(self):
+        """Remove todas as medições"""
+        self.etapas = []
+
+    def para_dataframe(self):
+        """
+        Converte as medições em DataFrame
+
+        Returns:
+            DataFrame com uma linha por etapa
+        """
+        colunas = ["etapa", "segundos", "linhas", "linhas_por_segundo", "memoria_delta_mb"]
+        df = pd.DataFrame(self.etapas)
+        for col in colunas:
+            if col not in df.columns:
+                df[col] = None
+        return df[colunas + [c for c in df.columns if c not in colunas]]
+
+    def para_json(self):
+        """Retorna as medições como texto JSON"""
+        return json.dumps(self.etapas, ensure_ascii=False, default=str)
+
+    def tempo_total(self):
+        """Retorna a soma dos tempos de todas as etapas (segundos)"""
+        return sum(m["segundos"] for m in self.etapas)
+
+
+def medir(registro, etapa, linhas=None):
+    """
+    Mede a etapa se houver registro; caso contrário, não faz nada
+
+    Args:
+        registro: RegistroDesempenho ou None
+        etapa: Nome da etapa
+        linhas: Número de linhas de entrada (opcional)
+    """
+    if registro is None:
+        return nullcontext({})
+    return registro.medir(etapa, linhas)
@@ -0,0 +1,468 @@
+"""
+Estilos CSS do aplicativo de precificação
+
+Mantidos como constantes de módulo para que o texto seja montado uma única vez por processo,
+e não a cada rerun do script do Streamlit.
+"""
+
+CSS_APP = """
+<style>
+/* ============ TEMA GLOBAL ============ */
+/* Tema Minimalista - Preto & Verde Militar */
+.stApp {
+    background-color: #000000;
+    color: #E8E8E8;
+}
+.main-header {
+    font-size: 2.5rem;
+    font-weight: bold;
+    color: #ffffff;
+    margin-bottom: 0.5rem;
+    text-shadow: 0px 2px 4px rgba(0,0,0,0.3);
+}
+.section-header {
+    font-size: 1.5rem;
+    font-weight: bold;
+    color: #ffffff;
+    margin-top: 1rem;
+    margin-bottom: 0.5rem;
+}
+.status-saudavel { color: #6B8E23; font-weight: bold; }
+.status-alerta { color: #fbbf24; font-weight: bold; }
+.status-prejuizo { color: #f87171; font-weight: bold; }
+
+.config-section {
+    background-color: #1e293b;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin-bottom: 1rem;
+    border: 1px solid #334155;
+}
+
+/* Estilização Premium Dark para o Sidebar */
+[data-testid="stSidebar"] {
+    background-color: #000000;
+    border-right: 1px solid #1e293b;
+}
+[data-testid="stSidebar"] .stMarkdown h1 {
+    font-size: 1.2rem !important;
+    font-weight: 700 !important;
+    color: #ffffff;
+    margin-bottom: 0.5rem !important;
+}
+[data-testid="stSidebar"] .stMarkdown p, 
+[data-testid="stSidebar"] .stMarkdown span,
+[data-testid="stSidebar"] label {
+    font-size: 0.85rem !important;
+    color: #cbd5e1;
+}
+[data-testid="stSidebar"] .stExpander {
+    border: none !important;
+    background-color: transparent !important;
+    margin-bottom: 0.4rem !important;
+}
+[data-testid="stSidebar"] .stExpander details {
+    border: 1px solid #1e293b !important;
+    border-radius: 8px !important;
+    background-color: #0f172a !important;
+    transition: all 0.2s ease;
+}
+[data-testid="stSidebar"] .stExpander details:hover {
+    border-color: #334155 !important;
+    background-color: #1e293b !important;
+}
+[data-testid="stSidebar"] .stExpander summary p {
+    font-size: 0.9rem !important;
+    font-weight: 600 !important;
+    color: #f8fafc !important;
+}
+/* Ajuste de inputs no sidebar para Dark Mode */
+[data-testid="stSidebar"] .stNumberInput input,
+[data-testid="stSidebar"] .stSelectbox div[data-baseweb="select"] {
+    font-size: 0.8rem !important;
+    background-color: #020617 !important;
+    color: #ffffff !important;
+    border-color: #1e293b !important;
+}
+[data-testid="stSidebar"] .stCaption {
+    font-size: 0.75rem !important;
+    color: #94a3b8 !important;
+}
+[data-testid="stSidebar"] hr {
+    margin: 0.5rem 0 !important;
+    border-color: #1e293b !important;
+}
+/* Estilo para Tabs no Dark Mode */
+.stTabs [data-baseweb="tab-list"] {
+    gap: 8px;
+    background-color: transparent;
+}
+.stTabs [data-baseweb="tab"] {
+    height: 40px;
+    white-space: pre;
+    background-color: #1e293b;
+    border-radius: 4px 4px 0px 0px;
+    color: #94a3b8;
+    padding: 10px 20px;
+}
+.stTabs [aria-selected="true"] {
+    background-color: #334155 !important;
+    color: #ffffff !important;
+}
+/* Remover tarja branca no topo */
+header[data-testid="stHeader"] {
+    background-color: rgba(0,0,0,0) !important;
+    color: #ffffff !important;
+}
+/* Corrigir legibilidade do File Uploader */
+[data-testid="stFileUploadDropzone"] {
+    background-color: #0f172a !important;
+    border: 1px dashed #334155 !important;
+}
+[data-testid="stFileUploadDropzone"] p, 
+[data-testid="stFileUploadDropzone"] span,
+[data-testid="stFileUploadDropzone"] small {
+    color: #ffffff !important;
+}
+/* Corrigir botões de upload e outros botões secundários */
+.stButton button {
+    background-color: #556B2F !important;
+    color: #ffffff !important;
+    border: 1px solid #556B2F !important;
+}
+.stButton button:hover {
+    background-color: #6B8E23 !important;
+    border-color: #6B8E23 !important;
+    color: #ffffff !important;
+}
+
+/* PENTE FINO: Legibilidade Global */
+/* Forçar cor de texto em todos os parágrafos e spans */
+p, span, label, li, .stMarkdown {
+    color: #fafafa !important;
+}
+/* Ajustar métricas */
+[data-testid="stMetricValue"] {
+    color: #ffffff !important;
+}
+[data-testid="stMetricLabel"] p {
+    color: #94a3b8 !important;
+}
+/* Ajustar tabelas e dataframes */
+.stDataFrame, [data-testid="stTable"] {
+    background-color: #0f172a !important;
+}
+/* Ajustar legendas e captions */
+.stCaption, small {
+    color: #94a3b8 !important;
+}
+/* Ajustar inputs globais (fora do sidebar também) */
+.stNumberInput input, .stTextInput input, .stSelectbox div[data-baseweb="select"] {
+    background-color: #0f172a !important;
+    color: #ffffff !important;
+    border-color: #334155 !important;
+}
+/* Ajustar Sliders */
+.stSlider [data-baseweb="slider"] {
+    background-color: transparent !important;
+}
+/* Ajustar Warnings e Infos */
+.stAlert {
+    background-color: #1e293b !important;
+    color: #ffffff !important;
+    border: 1px solid #334155 !important;
+}
+/* Ajustar Divisores */
+hr {
+    border-color: #334155 !important;
+}
+/* Forçar cor branca em títulos de expanders fora do sidebar */
+.stExpander summary p {
+    color: #ffffff !important;
+}
+/* ============ HOME ============ */
+.hero-section {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 40px 20px;
+    border-radius: 15px;
+    color: white;
+    margin-bottom: 30px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+}
+.hero-title {
+    font-size: 2.5em;
+    font-weight: 700;
+    margin-bottom: 10px;
+}
+.hero-subtitle {
+    font-size: 1.1em;
+    opacity: 0.9;
+}
+.feature-card {
+    background: rgba(255, 255, 255, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 25px;
+    border-radius: 12px;
+    border-left: 5px solid #667eea;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    margin-bottom: 20px;
+    transition: all 0.3s ease;
+    color: white;
+}
+.feature-card:hover {
+    box-shadow: 0 4px 15px rgba(0,0,0,0.12);
+    transform: translateY(-2px);
+}
+.feature-title {
+    font-size: 1.3em;
+    font-weight: 600;
+    color: #667eea;
+    margin-bottom: 10px;
+}
+.step-number {
+    display: inline-block;
+    background: #667eea;
+    color: white;
+    width: 40px;
+    height: 40px;
+    border-radius: 50%;
+    text-align: center;
+    line-height: 40px;
+    font-weight: 700;
+    margin-right: 15px;
+    font-size: 1.1em;
+}
+.benefit-list {
+    list-style: none;
+    padding: 0;
+}
+.benefit-list li {
+    padding: 12px 0;
+    padding-left: 35px;
+    position: relative;
+    line-height: 1.6;
+}
+.benefit-list li:before {
+    content: "✅";
+    position: absolute;
+    left: 0;
+    color: #667eea;
+    font-weight: bold;
+    font-size: 1.2em;
+}
+/* ============ CALCULADORA ============ */
+.calc-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 30px 20px;
+    border-radius: 12px;
+    color: white;
+    margin-bottom: 30px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+}
+.calc-title {
+    font-size: 2em;
+    font-weight: 700;
+    margin-bottom: 5px;
+}
+.calc-subtitle {
+    font-size: 0.95em;
+    opacity: 0.9;
+}
+.input-card {
+    background: rgba(255, 255, 255, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 20px;
+    border-radius: 12px;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    margin-bottom: 20px;
+}
+.metric-card-calc {
+    background: rgba(255, 255, 255, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 20px;
+    border-radius: 12px;
+    border-top: 4px solid #667eea;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    text-align: center;
+}
+.section-title-calc {
+    color: white;
+    font-size: 1.3em;
+    font-weight: 700;
+    color: white;
+    margin: 30px 0 20px 0;
+    padding-bottom: 10px;
+    border-bottom: 3px solid #667eea;
+}
+.filter-card {
+    background: rgba(255, 255, 255, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 20px;
+    border-radius: 12px;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    margin-bottom: 20px;
+}
+/* ============ SIMULADOR ============ */
+.sim-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 30px 20px;
+    border-radius: 12px;
+    color: white;
+    margin-bottom: 30px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+}
+.sim-title {
+    font-size: 2em;
+    font-weight: 700;
+    margin-bottom: 5px;
+}
+.sim-subtitle {
+    font-size: 0.95em;
+    opacity: 0.9;
+}
+.metric-card-sim {
+    background: rgba(255, 255, 255, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 20px;
+    border-radius: 12px;
+    border-top: 4px solid #667eea;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    text-align: center;
+}
+.section-title-sim {
+    color: white;
+    font-size: 1.3em;
+    font-weight: 700;
+    color: white;
+    margin: 30px 0 20px 0;
+    padding-bottom: 10px;
+    border-bottom: 3px solid #667eea;
+}
+/* ============ DASHBOARD ============ */
+.dashboard-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 30px 20px;
+    border-radius: 12px;
+    color: white;
+    margin-bottom: 30px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+}
+.dashboard-title {
+    font-size: 2em;
+    font-weight: 700;
+    margin-bottom: 5px;
+}
+.dashboard-subtitle {
+    font-size: 0.95em;
+    opacity: 0.9;
+}
+.metric-card {
+    background: rgba(255, 255, 255, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 20px;
+    border-radius: 12px;
+    border-top: 4px solid #667eea;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    text-align: center;
+}
+.metric-value {
+    font-size: 2em;
+    font-weight: 700;
+    color: #667eea;
+    margin: 10px 0;
+}
+.metric-label {
+    font-size: 0.9em;
+    color: white;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+}
+.chart-container {
+    background: rgba(255, 255, 255, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 20px;
+    border-radius: 12px;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    margin-bottom: 20px;
+}
+.section-title {
+    color: white;
+    font-size: 1.3em;
+    font-weight: 700;
+    color: white;
+    margin: 30px 0 20px 0;
+    padding-bottom: 10px;
+    border-bottom: 3px solid #667eea;
+}
+/* ============ ESTRATÉGIAS PROMOCIONAIS ============ */
+.promo-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 30px 20px;
+    border-radius: 12px;
+    color: white;
+    margin-bottom: 30px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+}
+.promo-title {
+    font-size: 2em;
+    font-weight: 700;
+    margin-bottom: 5px;
+}
+.promo-subtitle {
+    font-size: 0.95em;
+    opacity: 0.9;
+}
+.section-title-promo {
+    color: white;
+    font-size: 1.3em;
+    font-weight: 700;
+    margin: 30px 0 20px 0;
+    padding-bottom: 10px;
+    border-bottom: 3px solid #667eea;
+}
+.metric-card-promo {
+    background: rgba(102, 126, 234, 0.1);
+    backdrop-filter: blur(10px);
+    padding: 20px;
+    border-radius: 12px;
+    border-top: 4px solid #667eea;
+    border: 1px solid rgba(102, 126, 234, 0.2);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
+    text-align: center;
+}
+.step-container {
+    background: rgba(255, 255, 255, 0.05);
+    border: 1px solid rgba(102, 126, 234, 0.3);
+    border-radius: 12px;
+    padding: 25px;
+    margin-bottom: 25px;
+    backdrop-filter: blur(10px);
+}
+.step-number {
+    display: inline-block;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    width: 40px;
+    height: 40px;
+    border-radius: 50%;
+    text-align: center;
+    line-height: 40px;
+    font-weight: 700;
+    font-size: 1.1em;
+    margin-right: 15px;
+}
+.step-title {
+    display: inline-block;
+    color: white;
+    font-size: 1.1em;
+    font-weight: 600;
+}
+</style>
+"""
@@ -0,0 +1,96 @@
+"""
+Gráficos de dispersão por SKU com tamanho limitado
+Até DISPERSAO_LIMITE_PONTOS SKUs cada ponto vai para o navegador (Scattergl, WebGL). Acima
+disso os SKUs são agrupados no servidor em uma grade 2D (NumPy) e o gráfico recebe só as
+caixas ocupadas com a contagem: o tamanho não depende do catálogo. Os SKUs de uma caixa
+são buscados só quando ela é selecionada.
+"""
+
+import numpy as np
+
+from config import DISPERSAO_CAIXAS
+
+
+# Visões de dispersão do Dashboard: nome -> (coluna do eixo x, coluna do eixo y)
+VISOES_DISPERSAO = {
+    "Preço × Margem": ("Preco Atual (R$)", "Margem Bruta %"),
+    "Custo × Lucro": ("Custo Produto", "Lucro R$"),
+}
+
+# Percentis que definem a faixa dos eixos; valores fora dela entram nas caixas da borda
+PERCENTIS_FAIXA = (0.5, 99.5)
+
+# Valores usados para estimar os percentis (amostra a passo fixo, não o catálogo inteiro)
+AMOSTRA_FAIXA = 100_000
+
+
+def _bordas(valores, caixas):
+    """Bordas das caixas de um eixo (faixa pelos percentis, robusta a valores extremos)"""
+    if len(valores) == 0:
+        return np.linspace(0.0, 1.0, caixas + 1)
+    amostra = valores[::max(1, len(valores) // AMOSTRA_FAIXA)]
+    minimo, maximo = np.percentile(amostra, PERCENTIS_FAIXA)
+    if maximo <= minimo:
+        maximo = minimo + 1.0
+    return np.linspace(minimo, maximo, caixas + 1)
+
+
+def _posicoes(valores, bordas, caixas):
+    """Caixa de cada valor no eixo (0 a caixas - 1)"""
+    relativo = (valores - bordas[0]) / (bordas[-1] - bordas[0]) * caixas
+    return np.clip(np.floor(relativo), 0, caixas - 1).astype(np.intp)
+
+
+class GradeDispersao:
+    """Grade 2D com a contagem de SKUs por caixa e a caixa de cada SKU."""
+
+    def __init__(self, x, y, caixas=DISPERSAO_CAIXAS):
+        """
+        Args:
+            x: Valores do eixo x (um por SKU)
+            y: Valores do eixo y (um por SKU)
+            caixas: Caixas por eixo (o gráfico tem no máximo caixas² marcadores)
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        validos = np.isfinite(x) & np.isfinite(y)
+        self.caixas = caixas
+        self.bordas_x = _bordas(x[validos], caixas)
+        self.bordas_y = _bordas(y[validos], caixas)
+
+        # Caixa de cada SKU (-1 = sem valor em algum eixo)
+        caixa = (_posicoes(np.where(validos, x, self.bordas_x[0]), self.bordas_x, caixas) * caixas
+                 + _posicoes(np.where(validos, y, self.bordas_y[0]), self.bordas_y, caixas))
+        caixa[~validos] = -1
+        self.caixa = caixa
+
+        contagem = np.bincount(caixa[validos], minlength=caixas * caixas)
+        self.ocupadas = np.flatnonzero(contagem)
+        self.contagens = contagem[self.ocupadas]
+
+    def intervalos(self):
+        """
+        Intervalos das caixas ocupadas
+
+        Returns:
+            Tupla de arrays (x inicial, x final, y inicial, y final)
+        """
+        ix, iy = np.divmod(self.ocupadas, self.caixas)
+        return self.bordas_x[ix], self.bordas_x[ix + 1], self.bordas_y[iy], self.bordas_y[iy + 1]
+
+    def centros(self):
+        """Centros (x, y) das caixas ocupadas"""
+        x0, x1, y0, y1 = self.intervalos()
+        return (x0 + x1) / 2, (y0 + y1) / 2
+
+    def linhas(self, caixa):
+        """
+        Posições dos SKUs de uma caixa
+
+        Args:
+            caixa: Identificador da caixa (um elemento de ocupadas)
+
+        Returns:
+            Array de posições das linhas
+        """
+        return np.flatnonzero(self.caixa == caixa)
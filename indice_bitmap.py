@@ -0,0 +1,147 @@
+"""
+Índice de bitmaps dos resultados para filtros por Status, Curva ABC, Tipo de Anúncio e Marketplace
+Para cada valor dessas colunas o índice guarda as linhas que o têm em um bitmap compactado
+(np.packbits, 1 bit por linha). Qualquer combinação de filtros (inclusive a regra de
+oportunidades) vira AND/OR entre bitmaps, sem comparar strings linha a linha, e o mesmo
+bitmap serve para a tabela exibida, as contagens do dashboard e a exportação.
+"""
+
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from config import STATUS_SAUDAVEL
+
+
+# Colunas indexadas (as ausentes no DataFrame são ignoradas)
+COLUNAS_INDICE = ("Status", "Curva ABC", "Tipo de Anuncio", "Marketplace")
+
+# Grafias do Status saudável aceitas nos filtros (planilhas antigas vêm sem acento)
+STATUS_SAUDAVEIS = (STATUS_SAUDAVEL, "🟢 Saudavel")
+
+# Bits ligados de cada valor de byte (contagem por tabela; np.bitwise_count exige NumPy 2)
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1, dtype=np.uint8)
+
+
+class IndiceBitmap:
+    """Bitmaps das linhas de cada valor das colunas indexadas de um DataFrame."""
+
+    def __init__(self, df, colunas=COLUNAS_INDICE):
+        """
+        Args:
+            df: DataFrame (resultado da calculadora ou do simulador)
+            colunas: Colunas a indexar
+        """
+        self.linhas = len(df)
+        self.bitmaps = {}
+        for coluna in colunas:
+            if coluna not in df.columns:
+                continue
+            serie = df[coluna]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                codigos, valores = serie.cat.codes.to_numpy(), serie.cat.categories
+            else:
+                codigos, valores = pd.factorize(serie)
+            self.bitmaps[coluna] = {valor: np.packbits(codigos == codigo) for codigo, valor in enumerate(valores)}
+
+    def vazio(self):
+        """Bitmap sem nenhuma linha"""
+        return np.zeros((self.linhas + 7) // 8, dtype=np.uint8)
+
+    def todos(self):
+        """Bitmap com todas as linhas"""
+        return np.packbits(np.ones(self.linhas, dtype=bool))
+
+    def igual(self, coluna, *valores):
+        """
+        Linhas em que a coluna tem um dos valores
+
+        Args:
+            coluna: Coluna indexada
+            valores: Valores aceitos
+
+        Returns:
+            Bitmap (vazio se a coluna não estiver indexada)
+        """
+        bitmaps = self.bitmaps.get(coluna, {})
+        bits = self.vazio()
+        for valor in valores:
+            if valor in bitmaps:
+                bits |= bitmaps[valor]
+        return bits
+
+    def onde(self, coluna, condicao):
+        """
+        Linhas em que o valor da coluna (como texto) satisfaz a condição
+
+        A condição é avaliada uma vez por valor distinto, não por linha.
+
+        Args:
+            coluna: Coluna indexada
+            condicao: Função texto -> bool (ex: lambda curva: "B" in curva)
+
+        Returns:
+            Bitmap (vazio se a coluna não estiver indexada)
+        """
+        bits = self.vazio()
+        for valor, bitmap in self.bitmaps.get(coluna, {}).items():
+            if condicao(str(valor)):
+                bits |= bitmap
+        return bits
+
+    def oportunidades(self):
+        """Curva B ou C com Status saudável (mesma regra do dashboard e da exportação)"""
+        curva_b_c = self.onde("Curva ABC", lambda curva: "B" in curva or "C" in curva)
+        return curva_b_c & self.igual("Status", *STATUS_SAUDAVEIS)
+
+    @staticmethod
+    def contar(bits):
+        """Número de linhas do bitmap"""
+        return int(_BITS_POR_BYTE[bits].sum(dtype=np.int64))
+
+    def mascara(self, bits):
+        """Máscara booleana (uma posição por linha) do bitmap"""
+        return np.unpackbits(bits, count=self.linhas).view(bool)
+
+    def filtrar(self, df, bits):
+        """
+        Linhas do DataFrame indexado marcadas no bitmap
+
+        Args:
+            df: O DataFrame de onde o índice foi criado
+            bits: Bitmap
+
+        Returns:
+            DataFrame filtrado (o próprio df se o bitmap tiver todas as linhas)
+        """
+        if self.contar(bits) == self.linhas:
+            return df
+        return df[self.mascara(bits)]
+
+
+# Índices já criados: id do DataFrame -> (referência fraca, índice)
+_indices = {}
+
+
+def indice_de(df):
+    """
+    Índice do DataFrame, criado na primeira chamada e reaproveitado enquanto o objeto existir
+
+    Cada resultado guardado na sessão é o mesmo objeto a cada execução do script, então
+    os bitmaps são montados uma vez por resultado. Um DataFrame novo (ex: outra Curva ABC
+    por janela de tempo) recebe um índice novo.
+
+    Args:
+        df: DataFrame
+
+    Returns:
+        IndiceBitmap
+    """
+    registro = _indices.get(id(df))
+    if registro is not None and registro[0]() is df:
+        return registro[1]
+    indice = IndiceBitmap(df)
+    chave = id(df)
+    _indices[chave] = (weakref.ref(df, lambda _, chave=chave: _indices.pop(chave, None)), indice)
+    return indice
@@ -0,0 +1,204 @@
+"""
+Índice de comissões por categoria do Mercado Livre
+Lê a árvore de categorias de um arquivo local (id, id_pai, nome, comissões Clássico/Premium)
+e resolve a herança das comissões das categorias pai uma única vez, em um array plano.
+A coluna de categoria do catálogo é então convertida em comissões com um único take.
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config import MERCADO_LIVRE_AD_TYPES, MERCADO_LIVRE_ARQUIVO_CATEGORIAS
+
+
+logger = logging.getLogger(__name__)
+
+# Colunas de comissão do arquivo, na ordem dos tipos de anúncio
+TIPOS_ANUNCIO = ("Clássico", "Premium")
+COLUNAS_COMISSAO = ("comissao_classico", "comissao_premium")
+
+
+def _herdar(valores, pai):
+    """
+    Preenche valores ausentes com o do ancestral mais próximo que tiver valor
+
+    Usa saltos de ponteiro (cada nó passa a apontar para o avô) para resolver a
+    árvore inteira em O(log profundidade) passadas vetorizadas.
+
+    Args:
+        valores: Array float com o valor de cada nó (NaN = herdar)
+        pai: Array int com a posição do pai de cada nó (-1 = raiz)
+
+    Returns:
+        Array float com os valores herdados (NaN se nenhum ancestral tiver valor)
+    """
+    valores = valores.copy()
+    ancestral = pai.copy()
+    for _ in range(len(valores)):
+        pendentes = np.flatnonzero(np.isnan(valores) & (ancestral >= 0))
+        if len(pendentes) == 0:
+            break
+        valores[pendentes] = valores[ancestral[pendentes]]
+        ancestral[pendentes] = ancestral[ancestral[pendentes]]
+    return valores
+
+
+class IndiceCategorias:
+    """Comissões por categoria com a herança das categorias pai já resolvida."""
+
+    def __init__(self, ids, pais, nomes, comissoes):
+        """
+        Monta o índice
+
+        Args:
+            ids: Lista com o ID de cada categoria
+            pais: Lista com o ID da categoria pai (vazio/None = raiz)
+            nomes: Lista com o nome de cada categoria
+            comissoes: Array (n, 2) com as comissões Clássico/Premium (NaN = herdar)
+        """
+        self.ids = [str(i).strip() for i in ids]
+        self.nomes = [str(n).strip() for n in nomes]
+        posicao_id = {categoria: i for i, categoria in enumerate(self.ids)}
+        pai = np.array([posicao_id.get(str(p).strip(), -1) if p is not None else -1 for p in pais], dtype=np.intp)
+        self.pai = pai
+
+        comissoes = np.asarray(comissoes, dtype=float).reshape(len(self.ids), len(TIPOS_ANUNCIO))
+        herdadas = np.column_stack([_herdar(comissoes[:, j], pai) for j in range(len(TIPOS_ANUNCIO))])
+
+        # definida[i]: a categoria (ou um ancestral) tem comissão própria em algum tipo de anúncio;
+        # a linha extra é o padrão
+        self.definida = np.append(~np.isnan(herdadas).all(axis=1), False)
+
+        # Última linha: padrão do tipo de anúncio (categoria desconhecida ou sem comissão na árvore)
+        padrao = np.array([MERCADO_LIVRE_AD_TYPES[tipo]["comissao"] for tipo in TIPOS_ANUNCIO])
+        herdadas = np.where(np.isnan(herdadas), padrao, herdadas)
+        self.comissoes = np.vstack([herdadas, padrao])
+        self.comissoes.setflags(write=False)
+
+        # Impressão digital do conteúdo (entra na chave do cache de resultados)
+        hasher = hashlib.blake2b("\n".join(self.ids).encode("utf-8"), digest_size=8)
+        hasher.update(self.pai.tobytes())
+        hasher.update(self.comissoes.tobytes())
+        self.impressao = hasher.hexdigest()
+
+        # Busca por ID ou por nome (sem diferenciar maiúsculas); o ID tem prioridade
+        self._posicoes = {}
+        for i, nome in enumerate(self.nomes):
+            self._posicoes.setdefault(nome.lower(), i)
+        for i, categoria in enumerate(self.ids):
+            self._posicoes[categoria.lower()] = i
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def de_arquivo(cls, caminho):
+        """
+        Lê o índice de um CSV com as colunas id, id_pai, nome, comissao_classico e comissao_premium
+
+        Args:
+            caminho: Caminho do arquivo (linhas iniciadas por "#" são comentários)
+
+        Returns:
+            IndiceCategorias
+        """
+        df = pd.read_csv(caminho, comment="#", dtype={"id": str, "id_pai": str, "nome": str})
+        comissoes = df[list(COLUNAS_COMISSAO)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        pais = [p if isinstance(p, str) and p.strip() else None for p in df["id_pai"]]
+        return cls(df["id"].tolist(), pais, df["nome"].fillna("").tolist(), comissoes)
+
+    def posicao(self, categoria):
+        """
+        Posição da categoria (por ID ou nome) no índice
+
+        Args:
+            categoria: ID ou nome da categoria
+
+        Returns:
+            Int com a posição, ou None se a categoria não estiver no índice
+        """
+        return self._posicoes.get(str(categoria).strip().lower())
+
+    def posicoes(self, categorias):
+        """
+        Posição de cada categoria do catálogo (len(self) = não encontrada)
+
+        Args:
+            categorias: Series/array com IDs ou nomes de categoria
+
+        Returns:
+            Array int com a posição de cada linha
+        """
+        codigos, distintas = pd.factorize(pd.Series(categorias, copy=False), use_na_sentinel=False)
+        encontradas = [self.posicao(c) for c in distintas]
+        mapa = np.array([len(self) if p is None else p for p in encontradas], dtype=np.intp)
+        return mapa[codigos]
+
+    def resolver(self, categorias, tipo_anuncio="Clássico"):
+        """
+        Comissão de cada linha do catálogo em um único take
+
+        Args:
+            categorias: Series/array com IDs ou nomes de categoria
+            tipo_anuncio: "Clássico" ou "Premium" (escalar ou por linha)
+
+        Returns:
+            Array float com a comissão (fração) de cada linha
+        """
+        posicoes = self.posicoes(categorias)
+        if np.ndim(tipo_anuncio) == 0:
+            premium = np.full(len(posicoes), str(tipo_anuncio).lower() == "premium")
+        else:
+            premium = pd.Series(tipo_anuncio, copy=False).astype(str).str.lower().eq("premium").to_numpy()
+        return self.comissoes.ravel().take(posicoes * len(TIPOS_ANUNCIO) + premium)
+
+    def caminho(self, categoria):
+        """
+        Caminho da categoria na árvore (ex: "Acessórios para Veículos > Peças de Carros")
+
+        Args:
+            categoria: ID ou nome da categoria
+
+        Returns:
+            String com o caminho, ou None se a categoria não estiver no índice
+        """
+        posicao = self.posicao(categoria)
+        if posicao is None:
+            return None
+        nomes = []
+        while posicao >= 0 and len(nomes) <= len(self):
+            nomes.append(self.nomes[posicao])
+            posicao = self.pai[posicao]
+        return " > ".join(reversed(nomes))
+
+
+@lru_cache(maxsize=4)
+def _carregar(caminho, modificado_em):
+    """Carrega o índice uma vez por versão do arquivo (cache compartilhado entre sessões)"""
+    indice = IndiceCategorias.de_arquivo(caminho)
+    logger.info("Índice de categorias carregado: %d categorias de %s", len(indice), caminho)
+    return indice
+
+
+def obter_indice(caminho=None):
+    """
+    Retorna o índice de categorias (em cache no processo; recarregado se o arquivo mudar)
+
+    Args:
+        caminho: Caminho do CSV (padrão: MERCADO_LIVRE_ARQUIVO_CATEGORIAS ao lado deste módulo)
+
+    Returns:
+        IndiceCategorias, ou None se o arquivo não existir
+    """
+    if caminho is None:
+        caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), MERCADO_LIVRE_ARQUIVO_CATEGORIAS)
+    try:
+        modificado_em = os.path.getmtime(caminho)
+    except OSError:
+        return None
+    return _carregar(os.path.abspath(caminho), modificado_em)
@@ -0,0 +1,388 @@
+"""
+Orçamento de memória dos DataFrames guardados nas sessões
+Cada sessão guarda seus DataFrames (relatório, resultados, oportunidades, promoções) em um
+DadosSessao em vez de direto no st.session_state. O GerenciadorMemoria do processo soma os
+bytes de todas as sessões e, acima do orçamento, grava os menos usados em arquivos Arrow
+(Feather sem compressão) e solta a cópia em memória. No próximo acesso o arquivo é aberto
+com memory-map: as páginas vêm do cache do sistema operacional sob demanda. Os arquivos
+da sessão são apagados quando ela termina.
+
+DataFrames que já vêm de um arquivo Arrow compartilhado (resultados da calculadora, ver
+cache_resultados) não entram no orçamento: as páginas são do arquivo, divididas entre as
+sessões, e não há o que despejar.
+"""
+
+import atexit
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from config import SESSOES_ORCAMENTO_MEMORIA_MB
+
+
+logger = logging.getLogger(__name__)
+
+# Variável de ambiente com o diretório dos arquivos despejados (padrão: diretório temporário)
+VARIAVEL_DIRETORIO_SESSOES = "PRECIFICACAO_DIRETORIO_SESSOES"
+
+# Separador das partes de um dict de DataFrames (ex: "resultado_promocao/processado")
+SEPARADOR = "/"
+
+
+# DataFrames abertos por abrir_arrow: id -> (referência fraca, caminho do arquivo)
+_mapeados = {}
+
+
+def _registrar_mapeado(df, caminho):
+    chave = id(df)
+    _mapeados[chave] = (weakref.ref(df, lambda _, chave=chave: _mapeados.pop(chave, None)), caminho)
+    return df
+
+
+def arquivo_mapeado(df):
+    """
+    Arquivo Arrow de onde o DataFrame foi aberto com memory-map
+
+    Args:
+        df: DataFrame
+
+    Returns:
+        Caminho do arquivo, ou None se o DataFrame não veio de abrir_arrow/copia_mapeada
+    """
+    registro = _mapeados.get(id(df))
+    if registro is None or registro[0]() is not df:
+        return None
+    return registro[1]
+
+
+def copia_mapeada(df):
+    """Cópia rasa do DataFrame que continua associada ao arquivo de onde ele foi aberto"""
+    copia = df.copy(deep=False)
+    caminho = arquivo_mapeado(df)
+    return _registrar_mapeado(copia, caminho) if caminho else copia
+
+
+def gravar_arrow(df, caminho):
+    """
+    Grava o DataFrame em um arquivo Arrow IPC (Feather v2) sem compressão, próprio para memory-map
+
+    Args:
+        df: DataFrame
+        caminho: Caminho do arquivo (gravado em temporário e renomeado: leitores nunca veem
+            arquivo pela metade)
+    """
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        feather.write_feather(df, temporario, compression="uncompressed")
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def abrir_arrow(caminho):
+    """
+    Abre um arquivo Arrow IPC com memory-map
+
+    Colunas numéricas sem nulos e colunas de texto Arrow apontam para as páginas do
+    arquivo, sem cópia para a memória do processo. Os arrays são somente leitura:
+    alterações devem trocar a coluna inteira (df["col"] = ...), não escrever no lugar.
+
+    Args:
+        caminho: Caminho do arquivo gravado por gravar_arrow
+
+    Returns:
+        DataFrame associado ao arquivo (ver arquivo_mapeado)
+    """
+    return _registrar_mapeado(_ler_arrow(caminho), caminho)
+
+
+def _ler_arrow(caminho):
+    """Lê com memory-map sem associar ao arquivo (arquivos despejados, que são da sessão)"""
+    with pa.memory_map(caminho, "r") as arquivo:
+        tabela = pa.ipc.open_file(arquivo).read_all()
+    # Sem threads a conversão não aloca buffers intermediários no pool do Arrow
+    return tabela.to_pandas(split_blocks=True, use_threads=False)
+
+
+def tamanho_em_bytes(df):
+    """Bytes ocupados pelo DataFrame em memória"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class _Entrada:
+    """Um DataFrame de uma sessão: em memória, em arquivo ou nos dois."""
+
+    __slots__ = ("df", "caminho", "bytes", "compartilhado")
+
+    def __init__(self, df):
+        self.df = df
+        # Aberto de um arquivo compartilhado: fica fora do orçamento e o arquivo não é da sessão
+        self.caminho = arquivo_mapeado(df)
+        self.compartilhado = self.caminho is not None
+        self.bytes = tamanho_em_bytes(df)
+
+
+class GerenciadorMemoria:
+    """Orçamento de memória do processo para os DataFrames de todas as sessões."""
+
+    def __init__(self, orcamento_mb=SESSOES_ORCAMENTO_MEMORIA_MB, diretorio=None):
+        """
+        Args:
+            orcamento_mb: Memória máxima dos DataFrames em memória, somando todas as sessões
+            diretorio: Onde gravar os arquivos despejados (None = diretório temporário do processo)
+        """
+        self.orcamento_bytes = int(orcamento_mb * 1024 * 1024)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+            self.diretorio = diretorio
+        else:
+            self.diretorio = tempfile.mkdtemp(prefix="precificacao-sessoes-")
+            atexit.register(shutil.rmtree, self.diretorio, True)
+        # (sessão, nome) -> _Entrada, do menos para o mais recentemente usado
+        self._entradas = OrderedDict()
+        self._bytes_memoria = 0
+        self._bytes_mapeados = 0
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._arquivos = itertools.count(1)
+        self.despejos = 0
+        self.leituras = 0
+
+    @property
+    def bytes_memoria(self):
+        return self._bytes_memoria
+
+    @property
+    def bytes_mapeados(self):
+        """Bytes dos DataFrames abertos de arquivos compartilhados (fora do orçamento)"""
+        return self._bytes_mapeados
+
+    def nova_sessao(self):
+        """Identificador de uma nova sessão"""
+        return next(self._ids)
+
+    def guardar(self, sessao, nome, df):
+        """
+        Guarda (ou substitui) um DataFrame da sessão e aplica o orçamento
+
+        Args:
+            sessao: Identificador da sessão (nova_sessao)
+            nome: Nome do DataFrame na sessão
+            df: DataFrame
+        """
+        entrada = _Entrada(df)
+        with self._lock:
+            self._remover(sessao, nome)
+            self._entradas[(sessao, nome)] = entrada
+            if entrada.compartilhado:
+                self._bytes_mapeados += entrada.bytes
+                return
+            self._bytes_memoria += entrada.bytes
+            self._aplicar_orcamento(manter=(sessao, nome))
+
+    def obter(self, sessao, nome):
+        """
+        DataFrame da sessão, reaberto do arquivo (memory-map) se tiver sido despejado
+
+        Args:
+            sessao: Identificador da sessão
+            nome: Nome do DataFrame
+
+        Returns:
+            DataFrame
+
+        Raises:
+            KeyError: Se a sessão não tiver o DataFrame
+        """
+        with self._lock:
+            entrada = self._entradas[(sessao, nome)]
+            self._entradas.move_to_end((sessao, nome))
+            if entrada.df is None:
+                entrada.df = _ler_arrow(entrada.caminho)
+                self._bytes_memoria += entrada.bytes
+                self.leituras += 1
+                self._aplicar_orcamento(manter=(sessao, nome))
+            return entrada.df
+
+    def remover(self, sessao, nome):
+        """Remove o DataFrame da sessão (e o arquivo, se houver)"""
+        with self._lock:
+            self._remover(sessao, nome)
+
+    def _remover(self, sessao, nome):
+        entrada = self._entradas.pop((sessao, nome), None)
+        if entrada is None:
+            return
+        if entrada.compartilhado:
+            self._bytes_mapeados -= entrada.bytes
+            return
+        if entrada.df is not None:
+            self._bytes_memoria -= entrada.bytes
+        if entrada.caminho:
+            self._apagar(entrada.caminho)
+
+    def nomes(self, sessao):
+        """Nomes dos DataFrames guardados pela sessão"""
+        with self._lock:
+            return [nome for (dono, nome) in self._entradas if dono == sessao]
+
+    def encerrar_sessao(self, sessao):
+        """Libera a memória e apaga os arquivos da sessão"""
+        with self._lock:
+            for nome in self.nomes(sessao):
+                self._remover(sessao, nome)
+
+    def _aplicar_orcamento(self, manter=None):
+        """Despeja os DataFrames menos usados até a memória caber no orçamento"""
+        for chave in list(self._entradas):
+            if self._bytes_memoria <= self.orcamento_bytes:
+                break
+            entrada = self._entradas[chave]
+            if chave == manter or entrada.df is None or entrada.compartilhado:
+                continue
+            if entrada.caminho is None:
+                caminho = os.path.join(self.diretorio, f"sessao{chave[0]}-{next(self._arquivos)}.arrow")
+                try:
+                    gravar_arrow(entrada.df, caminho)
+                except (OSError, ValueError, pa.ArrowException) as e:
+                    logger.warning("Não foi possível despejar %s da sessão %s: %s", chave[1], chave[0], e)
+                    continue
+                entrada.caminho = caminho
+            # Quem ainda usa o DataFrame continua com ele; o gerenciador só solta a referência
+            entrada.df = None
+            self._bytes_memoria -= entrada.bytes
+            self.despejos += 1
+
+    @staticmethod
+    def _apagar(caminho):
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+    def ocupacao(self, sessao=None):
+        """
+        Ocupação por sessão (todas só no painel de administração)
+
+        Args:
+            sessao: Identificador de uma sessão (None = todas)
+
+        Returns:
+            DataFrame com Sessão, DataFrames, Em memória MB, Em disco MB e Mapeado MB
+            (arquivos compartilhados)
+        """
+        linhas = {}
+        with self._lock:
+            for (dona, _), entrada in self._entradas.items():
+                if sessao is not None and dona != sessao:
+                    continue
+                linha = linhas.setdefault(dona, {"Sessão": dona, "DataFrames": 0, "Em memória MB": 0.0,
+                                                 "Em disco MB": 0.0, "Mapeado MB": 0.0})
+                linha["DataFrames"] += 1
+                if entrada.compartilhado:
+                    linha["Mapeado MB"] += entrada.bytes / 1024 / 1024
+                elif entrada.df is not None:
+                    linha["Em memória MB"] += entrada.bytes / 1024 / 1024
+                else:
+                    linha["Em disco MB"] += entrada.bytes / 1024 / 1024
+        return pd.DataFrame(list(linhas.values()),
+                            columns=["Sessão", "DataFrames", "Em memória MB", "Em disco MB", "Mapeado MB"]).round(1)
+
+
+class DadosSessao(MutableMapping):
+    """DataFrames de uma sessão sob o orçamento do GerenciadorMemoria (interface de dict)."""
+
+    def __init__(self, gerenciador=None):
+        """
+        Args:
+            gerenciador: GerenciadorMemoria (padrão: o do processo)
+        """
+        self.gerenciador = gerenciador or obter_gerenciador()
+        self.sessao = self.gerenciador.nova_sessao()
+        self._outros = {}
+        # Sessão encerrada (objeto coletado) → arquivos apagados
+        self._finalizador = weakref.finalize(self, self.gerenciador.encerrar_sessao, self.sessao)
+
+    def _descartar(self, nome):
+        """Remove o valor anterior com o nome (e as partes, se era um dict de DataFrames)"""
+        for parte in self.gerenciador.nomes(self.sessao):
+            if parte.startswith(nome + SEPARADOR):
+                self.gerenciador.remover(self.sessao, parte)
+        self._outros.pop(nome, None)
+        self.gerenciador.remover(self.sessao, nome)
+
+    def __setitem__(self, nome, valor):
+        self._descartar(nome)
+        if isinstance(valor, pd.DataFrame):
+            self.gerenciador.guardar(self.sessao, nome, valor)
+        elif isinstance(valor, dict) and any(isinstance(v, pd.DataFrame) for v in valor.values()):
+            # Dict com DataFrames (ex: resultado da promoção): cada DataFrame entra no orçamento
+            demais = {}
+            for chave, parte in valor.items():
+                if isinstance(parte, pd.DataFrame):
+                    self.gerenciador.guardar(self.sessao, f"{nome}{SEPARADOR}{chave}", parte)
+                else:
+                    demais[chave] = parte
+            self._outros[nome] = (demais, list(valor))
+        else:
+            self._outros[nome] = valor
+
+    def __getitem__(self, nome):
+        if nome in self._outros:
+            valor = self._outros[nome]
+            if isinstance(valor, tuple):
+                demais, ordem = valor
+                return {chave: demais[chave] if chave in demais
+                        else self.gerenciador.obter(self.sessao, f"{nome}{SEPARADOR}{chave}") for chave in ordem}
+            return valor
+        return self.gerenciador.obter(self.sessao, nome)
+
+    def __delitem__(self, nome):
+        if nome not in self:
+            raise KeyError(nome)
+        self._descartar(nome)
+
+    def __iter__(self):
+        nomes = [n for n in self.gerenciador.nomes(self.sessao) if SEPARADOR not in n]
+        return iter(nomes + list(self._outros))
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __contains__(self, nome):
+        return nome in self._outros or nome in self.gerenciador.nomes(self.sessao)
+
+    def encerrar(self):
+        """Libera os DataFrames da sessão agora (ex: ao resetar a sessão)"""
+        self._outros.clear()
+        self._finalizador()
+
+
+_gerenciador = None
+_gerenciador_lock = threading.Lock()
+
+
+def obter_gerenciador():
+    """
+    Gerenciador do processo (criado no primeiro uso)
+
+    Returns:
+        GerenciadorMemoria compartilhado por todas as sessões
+    """
+    global _gerenciador
+    with _gerenciador_lock:
+        if _gerenciador is None:
+            _gerenciador = GerenciadorMemoria(diretorio=os.environ.get(VARIAVEL_DIRETORIO_SESSOES) or None)
+        return _gerenciador
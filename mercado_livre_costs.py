@@ -12,11 +12,13 @@ from config import (
     MERCADO_LIVRE_REGRAS_CUSTO_FIXO,
     MERCADO_LIVRE_COMISSAO_CATEGORIA_2026,
     MERCADO_LIVRE_CUSTOS_ADICIONAIS,
+    MERCADO_LIVRE_FAIXAS_PESO_2026,
     MERCADO_LIVRE_LIMITE_TAXA_FIXA,
     MERCADO_LIVRE_LIMITE_CUSTO_FIXO_BAIXO,
     MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_GERAL,
     MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_SUPERMERCADO,
 )
+from indice_categorias import obter_indice
 
 
 class MercadoLivreCostsCalculator:
@@ -25,28 +27,26 @@ class MercadoLivreCostsCalculator:
     """
 
     @staticmethod
-    def _encontrar_faixa_peso(peso_kg):
+    def _encontrar_faixa_peso(peso_kg, tabela=None):
         """
         Encontra a faixa de peso correspondente para o produto
         
         Args:
             peso_kg: Peso do produto em kg
+            tabela: Tabela por faixa de peso (opcional); restringe às faixas que ela contém
             
         Returns:
-            String com a faixa de peso (ex: "Até 0,3 kg", "0,3 a 0,5 kg")
+            String com a faixa de peso (ex: "Até 300g", "300g a 500g");
+            pesos acima da última faixa usam a última faixa
         """
-        if peso_kg <= 0.3:
-            return "Até 300g"
-        elif peso_kg <= 0.5:
-            return "300g a 500g"
-        elif peso_kg <= 1.0:
-            return "500g a 1kg"
-        elif peso_kg <= 2.0:
-            return "1kg a 2kg"
-        elif peso_kg <= 3.0:
-            return "2kg a 3kg"
-        else:
-            return "2kg a 3kg"  # Padrão para pesos maiores
+        faixas = [
+            (rotulo, peso_max) for rotulo, peso_max in MERCADO_LIVRE_FAIXAS_PESO_2026
+            if tabela is None or rotulo in tabela
+        ]
+        for rotulo, peso_max in faixas:
+            if peso_kg <= peso_max:
+                return rotulo
+        return faixas[-1][0]  # Padrão para pesos maiores
 
     @staticmethod
     def _encontrar_custo_por_preco(tabela_faixas, preco):
@@ -83,6 +83,12 @@ class MercadoLivreCostsCalculator:
         """
         tipo_key = "classico" if tipo_anuncio.lower() == "clássico" else "premium"
         
+        # Árvore de categorias (ID ou nome, com herança da categoria pai)
+        indice = obter_indice()
+        posicao = indice.posicao(categoria) if indice is not None else None
+        if posicao is not None and indice.definida[posicao]:
+            return float(indice.comissoes[posicao, int(tipo_key == "premium")])
+        
         if categoria in MERCADO_LIVRE_COMISSAO_CATEGORIA_2026:
             return MERCADO_LIVRE_COMISSAO_CATEGORIA_2026[categoria].get(tipo_key, 0.14)
         
@@ -120,7 +126,7 @@ class MercadoLivreCostsCalculator:
             tabela = MERCADO_LIVRE_CUSTO_OPERACIONAL_FULL_2026
         
         # Encontra a faixa de peso
-        faixa_peso = MercadoLivreCostsCalculator._encontrar_faixa_peso(peso_kg)
+        faixa_peso = MercadoLivreCostsCalculator._encontrar_faixa_peso(peso_kg, tabela)
         
         if faixa_peso not in tabela:
             return 0.0
@@ -197,7 +203,7 @@ class MercadoLivreCostsCalculator:
             peso_kg = 0.15  # Meio da faixa "Até 300g"
         
         # Encontra a faixa de peso
-        faixa_peso = MercadoLivreCostsCalculator._encontrar_faixa_peso(peso_kg)
+        faixa_peso = MercadoLivreCostsCalculator._encontrar_faixa_peso(peso_kg, MERCADO_LIVRE_FRETE_GRATIS_FULL_2026)
         
         if faixa_peso not in MERCADO_LIVRE_FRETE_GRATIS_FULL_2026:
             return 0.0
@@ -2,14 +2,115 @@
 Módulo para processar relatórios de vendas do Mercado Livre
 """
 
+import codecs
+import csv
+import logging
+import os
+import re
+import time
 import pandas as pd
 import numpy as np
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from numeros_br import FORMATO_BR, FORMATO_US, converter_colunas, somar_estatisticas, votos_formato
+
+
+logger = logging.getLogger(__name__)
+
+# Detecção do formato do CSV: só o início do arquivo é lido, qualquer que seja o tamanho
+TAMANHO_AMOSTRA_CSV = 64 * 1024
+LINHAS_AMOSTRA_CSV = 50
+SEPARADORES_CSV = (";", ",", "\t", "|")
+
+# Detecção das abas de dados do Excel: linhas examinadas no início de cada aba
+LINHAS_DETECCAO_EXCEL = 30
+
+# Coluna "Peso" sem unidade: mediana acima deste valor indica gramas (nenhum anúncio
+# típico pesa 30 kg; 30 g é um peso comum)
+LIMITE_PESO_EM_GRAMAS = 30.0
 
 
 class MercadoLivreProcessor:
     """Processa relatórios de vendas do Mercado Livre."""
 
+    # Mapeamento de colunas possíveis - EXATO E FLEXÍVEL
+    MAPEAMENTO_COLUNAS = {
+        # SKU
+        "sku/mlb": "SKU",
+        "sku": "SKU",
+        "mlb": "SKU",
+        "col a": "SKU",
+        # Título/Descrição
+        "titulo": "Descrição",
+        "título": "Descrição",
+        "title": "Descrição",
+        "descrição": "Descrição",
+        "descricao": "Descrição",
+        "product": "Descrição",
+        "col b": "Descrição",
+        # Custo Produto
+        "custo produto (r$)": "Custo Produto",
+        "custo produto": "Custo Produto",
+        "custo": "Custo Produto",
+        "cost": "Custo Produto",
+        "col c": "Custo Produto",
+        # Frete
+        "frete (r$)": "Frete",
+        "frete": "Frete",
+        "shipping": "Frete",
+        "col d": "Frete",
+        # Preço Atual
+        "preço atual (r$)": "Preço Atual",
+        "preco atual (r$)": "Preço Atual",
+        "preço atual": "Preço Atual",
+        "preco atual": "Preço Atual",
+        "preço": "Preço Atual",
+        "preco": "Preço Atual",
+        "price": "Preço Atual",
+        "current price": "Preço Atual",
+        "col e": "Preço Atual",
+        # Tipo de Anúncio
+        "tipo de anúncio": "Tipo de Anúncio",
+        "tipo de anuncio": "Tipo de Anúncio",
+        "ad type": "Tipo de Anúncio",
+        "anuncio": "Tipo de Anúncio",
+        "col f": "Tipo de Anúncio",
+        # Quantidade Vendida
+        "quantidade vendida": "Quantidade Vendida",
+        "quantidade": "Quantidade Vendida",
+        "quantity": "Quantidade Vendida",
+        "vendas": "Quantidade Vendida",
+        "sales": "Quantidade Vendida",
+        "col g": "Quantidade Vendida",
+        # Data da venda (opcional, para Curva ABC por janela de tempo)
+        "data": "Data",
+        "data da venda": "Data",
+        "data venda": "Data",
+        "date": "Data",
+        "dia": "Data",
+        # Conta (opcional, para relatórios de múltiplas contas)
+        "conta": "Conta",
+        "account": "Conta",
+        "loja": "Conta",
+        # Peso, logística e categoria (opcionais, para os custos do Mercado Livre 2026)
+        "peso (kg)": "Peso (kg)",
+        "peso kg": "Peso (kg)",
+        "peso": "Peso",
+        "weight": "Peso",
+        "peso (g)": "Peso (g)",
+        "peso g": "Peso (g)",
+        "logística": "Logística",
+        "logistica": "Logística",
+        "tipo de logística": "Logística",
+        "tipo de logistica": "Logística",
+        "forma de envio": "Logística",
+        "envio": "Logística",
+        "logistics": "Logística",
+        "categoria": "Categoria",
+        "category": "Categoria",
+    }
+
     @staticmethod
     def normalizar_relatorio_vendas(df):
         """
@@ -21,63 +122,17 @@ class MercadoLivreProcessor:
             
         Returns:
             DataFrame normalizado com colunas: SKU, Descrição, Custo Produto, Frete, Preço Atual, Tipo de Anúncio, Quantidade Vendida
+            (e Conta/Data/Peso (kg)/Logística/Categoria quando presentes no relatório)
         """
         df = df.copy()
         
-        # Debug: Mostrar colunas originais
-        print(f"Colunas originais: {df.columns.tolist()}")
-        
-        # Mapeamento de colunas possíveis - EXATO E FLEXÍVEL
-        mapeamento_colunas = {
-            # SKU
-            "sku/mlb": "SKU",
-            "sku": "SKU",
-            "mlb": "SKU",
-            "col a": "SKU",
-            # Título/Descrição
-            "titulo": "Descrição",
-            "título": "Descrição",
-            "title": "Descrição",
-            "product": "Descrição",
-            "col b": "Descrição",
-            # Custo Produto
-            "custo produto (r$)": "Custo Produto",
-            "custo produto": "Custo Produto",
-            "custo": "Custo Produto",
-            "cost": "Custo Produto",
-            "col c": "Custo Produto",
-            # Frete
-            "frete (r$)": "Frete",
-            "frete": "Frete",
-            "shipping": "Frete",
-            "col d": "Frete",
-            # Preço Atual
-            "preço atual (r$)": "Preço Atual",
-            "preço atual": "Preço Atual",
-            "preço": "Preço Atual",
-            "price": "Preço Atual",
-            "current price": "Preço Atual",
-            "col e": "Preço Atual",
-            # Tipo de Anúncio
-            "tipo de anúncio": "Tipo de Anúncio",
-            "tipo de anuncio": "Tipo de Anúncio",
-            "ad type": "Tipo de Anúncio",
-            "anuncio": "Tipo de Anúncio",
-            "col f": "Tipo de Anúncio",
-            # Quantidade Vendida
-            "quantidade vendida": "Quantidade Vendida",
-            "quantidade": "Quantidade Vendida",
-            "quantity": "Quantidade Vendida",
-            "vendas": "Quantidade Vendida",
-            "sales": "Quantidade Vendida",
-            "col g": "Quantidade Vendida",
-        }
+        logger.debug("Colunas originais: %s", df.columns.tolist())
         
         # Normalizar nomes de colunas
         df.columns = df.columns.str.lower().str.strip()
-        df = df.rename(columns=mapeamento_colunas)
+        df = df.rename(columns=MercadoLivreProcessor.MAPEAMENTO_COLUNAS)
         
-        print(f"Colunas após mapeamento: {df.columns.tolist()}")
+        logger.debug("Colunas após mapeamento: %s", df.columns.tolist())
         
         # Adicionar coluna Tipo de Anúncio se não existir
         if "Tipo de Anúncio" not in df.columns:
@@ -106,10 +161,20 @@ class MercadoLivreProcessor:
         # Converter Descrição para string
         df["Descrição"] = df["Descrição"].astype(str).str.strip()
         
-        # Converter valores monetários para float
-        df["Custo Produto"] = pd.to_numeric(df["Custo Produto"], errors="coerce").fillna(0.0)
-        df["Frete"] = pd.to_numeric(df["Frete"], errors="coerce").fillna(0.0)
-        df["Preço Atual"] = pd.to_numeric(df["Preço Atual"], errors="coerce")
+        # Converter valores numéricos para float (aceita "1.234,56", "R$ 12,90", "12,5%");
+        # o CSV é lido como texto e o separador decimal detectado no arquivo vale para todas as colunas
+        formato_csv = df.attrs.get("formato_csv")
+        formato = None
+        if formato_csv is not None:
+            formato = FORMATO_BR if formato_csv["decimal"] == "," else FORMATO_US
+        conversao = converter_colunas(
+            df, ["Custo Produto", "Frete", "Preço Atual", "Quantidade Vendida", "Peso (kg)", "Peso (g)", "Peso"], formato
+        )
+        for coluna, estatisticas in conversao.items():
+            if estatisticas["invalidos"]:
+                logger.warning("%s: %d valor(es) não numérico(s) descartado(s)", coluna, estatisticas["invalidos"])
+        df["Custo Produto"] = df["Custo Produto"].fillna(0.0)
+        df["Frete"] = df["Frete"].fillna(0.0)
         
         # Remover linhas com preço inválido
         df = df[df["Preço Atual"].notna() & (df["Preço Atual"] > 0)]
@@ -132,45 +197,208 @@ class MercadoLivreProcessor:
         
         # Converter Quantidade Vendida para int
         if "Quantidade Vendida" in df.columns:
-            df["Quantidade Vendida"] = pd.to_numeric(df["Quantidade Vendida"], errors="coerce").fillna(0).astype(int)
+            df["Quantidade Vendida"] = df["Quantidade Vendida"].fillna(0).astype(int)
         
-        print(f"Quantidade Vendida após conversão: {df['Quantidade Vendida'].tolist()[:5]}")
+        logger.debug("Quantidade Vendida após conversão: %s", df["Quantidade Vendida"].tolist()[:5])
         
         # Selecionar apenas as colunas necessárias
         colunas_selecionadas = ["SKU", "Descrição", "Custo Produto", "Frete", "Preço Atual", "Tipo de Anúncio"]
         if "Quantidade Vendida" in df.columns:
             colunas_selecionadas.append("Quantidade Vendida")
-        df = df[colunas_selecionadas]
+        if "Conta" in df.columns:
+            df["Conta"] = df["Conta"].astype(str).str.strip()
+            colunas_selecionadas.append("Conta")
+        if "Peso (kg)" not in df.columns and "Peso (g)" not in df.columns and "Peso" in df.columns:
+            # Coluna sem unidade: gramas se a mediana for alta demais para quilos
+            em_gramas = df["Peso"].median() > LIMITE_PESO_EM_GRAMAS
+            df["Peso (kg)"] = df["Peso"] / 1000 if em_gramas else df["Peso"]
+        if "Peso (kg)" not in df.columns and "Peso (g)" in df.columns:
+            df["Peso (kg)"] = df["Peso (g)"] / 1000
+        if "Peso (kg)" in df.columns:
+            colunas_selecionadas.append("Peso (kg)")
+        if "Logística" in df.columns:
+            df["Logística"] = MercadoLivreProcessor._normalizar_logistica(df["Logística"])
+            colunas_selecionadas.append("Logística")
+        if "Categoria" in df.columns:
+            df["Categoria"] = df["Categoria"].fillna("").astype(str).str.strip()
+            colunas_selecionadas.append("Categoria")
+        if "Data" in df.columns:
+            if not pd.api.types.is_datetime64_any_dtype(df["Data"]):
+                # ISO (2026-03-01) primeiro; o restante no padrão brasileiro (01/03/2026)
+                datas = pd.to_datetime(df["Data"], errors="coerce", format="ISO8601")
+                df["Data"] = datas.fillna(pd.to_datetime(df["Data"], dayfirst=True, errors="coerce", format="mixed"))
+            colunas_selecionadas.append("Data")
+        df = df[colunas_selecionadas].reset_index(drop=True)
         
-        return df.reset_index(drop=True)
+        # Contagem de valores convertidos/descartados por coluna (ver numeros_br.converter_numeros)
+        df.attrs["conversao_numeros"] = conversao
+        return df
 
     @staticmethod
-    def agregar_por_sku(df):
+    def _normalizar_logistica(logistica):
+        """
+        Normaliza o tipo de logística para "Full", "Flex" ou "" (não informado)
+        
+        Full, Coleta e Agências usam o custo operacional/frete grátis do Mercado Livre;
+        Flex, Retirada e Logística Própria usam a taxa fixa Flex.
+        
+        Args:
+            logistica: Series com o tipo de logística informado no relatório
+            
+        Returns:
+            Series com "Full", "Flex" ou ""
+        """
+        codigos, valores = pd.factorize(logistica.astype(str).str.strip().str.lower(), use_na_sentinel=False)
+        normalizados = []
+        for valor in valores:
+            if any(chave in valor for chave in ("flex", "própria", "propria", "retirada")):
+                normalizados.append("Flex")
+            elif any(chave in valor for chave in ("full", "coleta", "agência", "agencia", "fulfillment")):
+                normalizados.append("Full")
+            else:
+                normalizados.append("")
+        return pd.Series(np.asarray(normalizados, dtype=object)[codigos], index=logistica.index)
+
+    @staticmethod
+    def agregar_por_sku(df, ponderar_por_quantidade=False):
         """
         Agrega dados por SKU (caso haja múltiplas linhas do mesmo produto)
         
+        Os SKUs são fatorados uma única vez (pd.factorize) e somas, médias e
+        contagens são calculadas com np.bincount, evitando o groupby sobre
+        strings em relatórios com milhões de linhas.
+        
         Args:
             df: DataFrame com dados de vendas
+            ponderar_por_quantidade: Se True, o Preço Atual é a média ponderada pela
+                Quantidade Vendida (SKUs sem quantidade usam a média simples)
             
         Returns:
-            DataFrame agregado por SKU
-        """
-        agg_dict = {
-            "Descrição": "first",
-            "Custo Produto": "mean",
-            "Frete": "mean",
-            "Preço Atual": "mean",
-            "Tipo de Anúncio": "first",
-        }
+            DataFrame agregado por SKU (ordenado por SKU)
+        """
+        codigos, skus = pd.factorize(df["SKU"], sort=True)
+        validos = codigos >= 0
+        if not validos.all():
+            df = df[validos]
+            codigos = codigos[validos]
+        n_skus = len(skus)
+        
+        df_agg = pd.DataFrame({"SKU": skus})
+        
+        df_agg["Descrição"] = MercadoLivreProcessor._primeiro_por_grupo(df["Descrição"], codigos, n_skus)
+        for col in ["Custo Produto", "Frete", "Preço Atual"]:
+            df_agg[col] = MercadoLivreProcessor._media_por_grupo(df[col].to_numpy(dtype=float), codigos, n_skus)
+        df_agg["Tipo de Anúncio"] = MercadoLivreProcessor._primeiro_por_grupo(df["Tipo de Anúncio"], codigos, n_skus)
+        if "Peso (kg)" in df.columns:
+            df_agg["Peso (kg)"] = MercadoLivreProcessor._media_por_grupo(df["Peso (kg)"].to_numpy(dtype=float), codigos, n_skus)
+        for col in ["Logística", "Categoria"]:
+            if col in df.columns:
+                df_agg[col] = MercadoLivreProcessor._primeiro_por_grupo(df[col], codigos, n_skus)
         
         # Adicionar Quantidade Vendida se existir
         if "Quantidade Vendida" in df.columns:
-            agg_dict["Quantidade Vendida"] = "sum"  # Somar quantidade vendida
+            quantidade = df["Quantidade Vendida"]
+            pesos = quantidade.to_numpy(dtype=float, na_value=0.0)
+            total = np.bincount(codigos, weights=pesos, minlength=n_skus)  # Somar quantidade vendida
+            df_agg["Quantidade Vendida"] = total.astype(quantidade.dtype) if pd.api.types.is_integer_dtype(quantidade) else total
+            
+            if ponderar_por_quantidade:
+                precos = df["Preço Atual"].to_numpy(dtype=float)
+                usar = ~np.isnan(precos) & (pesos > 0)
+                peso_total = np.bincount(codigos[usar], weights=pesos[usar], minlength=n_skus)
+                receita = np.bincount(codigos[usar], weights=precos[usar] * pesos[usar], minlength=n_skus)
+                com_peso = peso_total > 0
+                preco_medio = df_agg["Preço Atual"].to_numpy(copy=True)
+                preco_medio[com_peso] = receita[com_peso] / peso_total[com_peso]
+                df_agg["Preço Atual"] = preco_medio
         
-        df_agg = df.groupby("SKU").agg(agg_dict).reset_index()
+        # Em relatórios de várias contas, listar as contas onde o SKU aparece
+        if "Conta" in df.columns:
+            df_agg["Conta"] = MercadoLivreProcessor._juntar_contas(df["Conta"], codigos, n_skus)
         
         return df_agg
 
+    @staticmethod
+    def _juntar_contas(conta, codigos, n_skus):
+        """
+        Lista as contas (ordenadas, separadas por ", ") em que cada SKU aparece
+        
+        Cada SKU recebe uma máscara de bits com as contas presentes; o texto é
+        montado uma vez por combinação distinta de contas, não por SKU.
+        
+        Args:
+            conta: Series com a conta de cada linha
+            codigos: Array com o código do SKU de cada linha
+            n_skus: Número de SKUs
+            
+        Returns:
+            Array com o texto das contas de cada SKU (NaN se nenhuma)
+        """
+        codigos_conta, contas = pd.factorize(conta, sort=True)
+        com_conta = codigos_conta >= 0
+        codigos, codigos_conta = codigos[com_conta], codigos_conta[com_conta]
+        
+        if len(contas) > 62:
+            # Muitas contas: pares (SKU, conta) únicos concatenados com np.add.reduceat
+            pares = np.unique(codigos.astype(np.int64) * len(contas) + codigos_conta)
+            sku_par, conta_par = np.divmod(pares, len(contas))
+            inicios = np.flatnonzero(np.r_[True, sku_par[1:] != sku_par[:-1]])
+            nomes = np.char.add(", ", np.asarray(contas, dtype=str)).astype(object)
+            resultado = np.full(n_skus, np.nan, dtype=object)
+            resultado[sku_par[inicios]] = [t[2:] for t in np.add.reduceat(nomes[conta_par], inicios)]
+            return resultado
+        
+        mascaras = np.zeros(n_skus, dtype=np.int64)
+        np.bitwise_or.at(mascaras, codigos, np.left_shift(1, codigos_conta.astype(np.int64)))
+        combinacoes, inverso = np.unique(mascaras, return_inverse=True)
+        
+        textos = np.array([
+            ", ".join(c for i, c in enumerate(contas) if m >> i & 1) if m else np.nan
+            for m in combinacoes
+        ], dtype=object)
+        return textos[inverso]
+
+    @staticmethod
+    def _primeiro_por_grupo(valores, codigos, n_grupos):
+        """
+        Primeiro valor não nulo de cada grupo (equivalente ao "first" do groupby)
+        
+        Args:
+            valores: Series com os valores
+            codigos: Array com o código do grupo de cada linha
+            n_grupos: Número de grupos
+            
+        Returns:
+            Series indexada pelo código do grupo
+        """
+        posicoes = np.flatnonzero(valores.notna().to_numpy())
+        primeiras = np.full(n_grupos, len(valores), dtype=np.int64)
+        np.minimum.at(primeiras, codigos[posicoes], posicoes)
+        grupos = np.flatnonzero(primeiras < len(valores))
+        
+        primeiros = valores.iloc[primeiras[grupos]]
+        primeiros.index = grupos
+        return primeiros.reindex(range(n_grupos))
+
+    @staticmethod
+    def _media_por_grupo(valores, codigos, n_grupos):
+        """
+        Média de cada grupo ignorando valores nulos (equivalente ao "mean" do groupby)
+        
+        Args:
+            valores: Array float com os valores
+            codigos: Array com o código do grupo de cada linha
+            n_grupos: Número de grupos
+            
+        Returns:
+            Array float com a média de cada grupo (NaN se o grupo não tiver valores)
+        """
+        preenchidos = ~np.isnan(valores)
+        soma = np.bincount(codigos[preenchidos], weights=valores[preenchidos], minlength=n_grupos)
+        contagem = np.bincount(codigos[preenchidos], minlength=n_grupos)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return soma / contagem
+
     @staticmethod
     def validar_relatorio(df):
         """
@@ -194,11 +422,342 @@ class MercadoLivreProcessor:
         return True, "Relatório válido"
 
     @staticmethod
-    def carregar_de_excel(arquivo):
-        """Carrega dados de arquivo Excel"""
-        return pd.read_excel(arquivo)
+    def carregar_de_excel(arquivo, max_workers=None, usar_processos=True):
+        """
+        Carrega dados de arquivo Excel
+        
+        Só as primeiras LINHAS_DETECCAO_EXCEL linhas de cada aba são examinadas: abas com um
+        cabeçalho de colunas conhecidas (MAPEAMENTO_COLUNAS) são lidas a partir dele, em
+        paralelo, e concatenadas; capas e abas de resumo ficam de fora. Sem nenhuma aba
+        reconhecida, lê a primeira aba inteira (a validação aponta as colunas faltando).
+        
+        Args:
+            arquivo: Caminho ou arquivo aberto
+            max_workers: Número máximo de processos/threads (padrão: nº de CPUs)
+            usar_processos: Se False, usa threads em vez de processos
+            
+        Returns:
+            DataFrame com os dados (abas lidas em df.attrs["abas_excel"])
+        """
+        if isinstance(arquivo, (str, os.PathLike)):
+            with open(arquivo, "rb") as f:
+                conteudo = f.read()
+        else:
+            conteudo = arquivo.read()
+        
+        # Pasta de trabalho aberta uma única vez para a detecção (e para a leitura sem paralelismo)
+        with pd.ExcelFile(BytesIO(conteudo)) as pasta:
+            abas = []
+            for aba in pasta.sheet_names:
+                inicio = pasta.parse(aba, header=None, nrows=LINHAS_DETECCAO_EXCEL)
+                linha = MercadoLivreProcessor._linha_cabecalho(inicio.itertuples(index=False))
+                if linha is not None:
+                    abas.append((aba, linha))
+            
+            if not abas:
+                return pasta.parse(pasta.sheet_names[0])
+            
+            workers = min(len(abas), max_workers or os.cpu_count() or 1)
+            if workers == 1:
+                frames = [pasta.parse(aba, header=linha) for aba, linha in abas]
+        
+        if workers > 1:
+            try:
+                executor_cls = ProcessPoolExecutor if usar_processos else ThreadPoolExecutor
+                with executor_cls(max_workers=workers) as executor:
+                    frames = list(executor.map(_ler_aba_excel, [conteudo] * len(abas), *zip(*abas)))
+            except (OSError, RuntimeError):
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    frames = list(executor.map(_ler_aba_excel, [conteudo] * len(abas), *zip(*abas)))
+        
+        if len(frames) > 1:
+            # Alinha colunas escritas de formas diferentes entre as abas ("Preço Atual" x "preco ")
+            mapeamento = MercadoLivreProcessor.MAPEAMENTO_COLUNAS
+            for frame in frames:
+                colunas = frame.columns.astype(str).str.strip().str.lower()
+                frame.columns = [mapeamento.get(coluna, coluna) for coluna in colunas]
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        df.attrs["abas_excel"] = [
+            {"aba": aba, "linha_cabecalho": linha, "linhas": len(frame)} for (aba, linha), frame in zip(abas, frames)
+        ]
+        return df
+
+    @staticmethod
+    def _linha_cabecalho(linhas):
+        """
+        Posição da primeira linha com pelo menos duas colunas conhecidas (MAPEAMENTO_COLUNAS)
+        
+        Args:
+            linhas: Iterável de linhas (sequências de células)
+            
+        Returns:
+            Int com a posição da linha, ou None se nenhuma for um cabeçalho reconhecido
+        """
+        conhecidas = MercadoLivreProcessor.MAPEAMENTO_COLUNAS
+        for i, campos in enumerate(linhas):
+            if sum(str(c).strip().lower() in conhecidas for c in campos) >= 2:
+                return i
+        return None
 
     @staticmethod
     def carregar_de_csv(arquivo):
-        """Carrega dados de arquivo CSV"""
-        return pd.read_csv(arquivo)
+        """
+        Carrega dados de arquivo CSV
+        
+        Separador, codificação, separador decimal e linha do cabeçalho são detectados no
+        início do arquivo (ver detectar_formato_csv); o restante é lido direto pelo
+        pd.read_csv com essas opções. Todas as colunas são lidas como texto: o separador
+        decimal só orienta a conversão das colunas numéricas (normalizar_relatorio_vendas),
+        então SKUs como "1.234" não viram números.
+        
+        Args:
+            arquivo: Caminho ou arquivo aberto (binário ou texto)
+            
+        Returns:
+            DataFrame com os dados (formato detectado em df.attrs["formato_csv"])
+        """
+        formato = MercadoLivreProcessor.detectar_formato_csv(MercadoLivreProcessor._ler_amostra(arquivo))
+        df = pd.read_csv(
+            arquivo,
+            sep=formato["separador"],
+            encoding=formato["encoding"],
+            encoding_errors="replace",
+            dtype=str,
+            skiprows=formato["linha_cabecalho"],
+        )
+        df.attrs["formato_csv"] = formato
+        return df
+
+    @staticmethod
+    def _ler_amostra(arquivo, tamanho=TAMANHO_AMOSTRA_CSV):
+        """Lê os primeiros bytes do arquivo sem consumir o arquivo aberto"""
+        if isinstance(arquivo, (str, os.PathLike)):
+            with open(arquivo, "rb") as f:
+                return f.read(tamanho)
+        posicao = arquivo.tell()
+        amostra = arquivo.read(tamanho)
+        arquivo.seek(posicao)
+        return amostra
+
+    @staticmethod
+    def detectar_formato_csv(amostra):
+        """
+        Detecta as opções de leitura do CSV a partir do início do arquivo
+        
+        - Codificação: BOM, senão UTF-8 se a amostra decodificar, senão cp1252 (Excel no Windows)
+        - Separador: o de SEPARADORES_CSV cujo cabeçalho tem colunas conhecidas
+          (MAPEAMENTO_COLUNAS) e cujas linhas têm o mesmo número de campos
+        - Cabeçalho: primeira linha com colunas conhecidas (pula títulos do relatório)
+        - Decimal: vírgula quando os valores só podem ser do padrão brasileiro ("1.234,56")
+        
+        Args:
+            amostra: Primeiros bytes (ou texto) do arquivo
+            
+        Returns:
+            Dict com encoding, separador, decimal, milhar e linha_cabecalho
+        """
+        encoding = None
+        if isinstance(amostra, bytes):
+            completa = len(amostra) < TAMANHO_AMOSTRA_CSV
+            if amostra.startswith(codecs.BOM_UTF8):
+                encoding = "utf-8-sig"
+            elif amostra.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                encoding = "utf-16"
+            if not completa and encoding != "utf-16":
+                # Descarta a última linha, possivelmente cortada no meio (inclusive no meio de um caractere)
+                amostra = amostra[:amostra.rfind(b"\n") + 1] or amostra
+            if encoding is None:
+                try:
+                    amostra.decode("utf-8")
+                    encoding = "utf-8"
+                except UnicodeDecodeError:
+                    encoding = "cp1252"
+            texto = amostra.decode(encoding, errors="replace")
+        else:
+            texto = amostra
+        linhas = texto.splitlines()[:LINHAS_AMOSTRA_CSV]
+        
+        melhor = None
+        for separador in SEPARADORES_CSV:
+            leitor = csv.reader(linhas, delimiter=separador)
+            inicio_linhas, linhas_campos = [], []
+            while True:
+                inicio = leitor.line_num
+                try:
+                    campos = next(leitor)
+                except (StopIteration, csv.Error):
+                    break
+                inicio_linhas.append(inicio)
+                linhas_campos.append(campos)
+            
+            cabecalho = MercadoLivreProcessor._linha_cabecalho(linhas_campos)
+            contagens = [len(c) for c in linhas_campos if any(v.strip() for v in c)]
+            if not contagens:
+                continue
+            moda = max(set(contagens), key=contagens.count)
+            pontuacao = (cabecalho is not None, moda > 1, contagens.count(moda), moda)
+            if melhor is None or pontuacao > melhor[0]:
+                if cabecalho is None:
+                    cabecalho = next(i for i, c in enumerate(linhas_campos) if len(c) == moda)
+                melhor = (pontuacao, separador, cabecalho, inicio_linhas, linhas_campos)
+        
+        if melhor is None:
+            return {"encoding": encoding, "separador": ",", "decimal": ".", "milhar": None, "linha_cabecalho": 0}
+        _, separador, cabecalho, inicio_linhas, linhas_campos = melhor
+        
+        # Separador decimal pelos valores das linhas de dados
+        valores = [
+            re.sub(r"R\$|%|\s", "", valor)
+            for campos in linhas_campos[cabecalho + 1:] for valor in campos
+        ]
+        votos = votos_formato(valores)
+        brasileiro = votos[FORMATO_BR] > votos[FORMATO_US] and separador != ","
+        return {
+            "encoding": encoding,
+            "separador": separador,
+            "decimal": "," if brasileiro else ".",
+            "milhar": "." if brasileiro else None,
+            "linha_cabecalho": inicio_linhas[cabecalho],
+        }
+
+    @staticmethod
+    def inferir_conta(nome_arquivo):
+        """
+        Infere o nome da conta a partir do nome do arquivo
+        Remove extensão e datas/números finais (ex: "loja_a_2026-03-01.xlsx" -> "loja_a")
+        
+        Args:
+            nome_arquivo: Nome (ou caminho) do arquivo
+            
+        Returns:
+            String com o nome da conta
+        """
+        base = os.path.splitext(os.path.basename(str(nome_arquivo)))[0]
+        conta = re.sub(r"[\s_\-]*\d[\d\s_\-\.]*$", "", base).strip()
+        return conta or base
+
+    @staticmethod
+    def carregar_multiplos_arquivos(arquivos, contas=None, max_workers=None, usar_processos=True, registro=None):
+        """
+        Carrega e normaliza vários relatórios em paralelo (várias contas e/ou vários dias)
+        
+        Cada arquivo é lido e normalizado em um processo separado (a leitura de Excel
+        é limitada pelo GIL) e recebe a coluna "Conta" com a conta de origem.
+        
+        Args:
+            arquivos: Lista de caminhos ou arquivos enviados (objetos com .name e .getvalue())
+            contas: Dict opcional {nome do arquivo: conta}; padrão: inferida pelo nome do arquivo
+            max_workers: Número máximo de processos/threads (padrão: nº de CPUs)
+            usar_processos: Se False, usa threads em vez de processos
+            registro: RegistroDesempenho opcional para medir ingestão e normalização
+            
+        Returns:
+            Tupla (DataFrame normalizado com coluna "Conta", lista de erros por arquivo); as
+            contagens de conversão numérica somadas ficam em df.attrs["conversao_numeros"]
+        """
+        contas = contas or {}
+        tarefas = []
+        for arquivo in arquivos:
+            if isinstance(arquivo, (str, os.PathLike)):
+                nome = os.fspath(arquivo)
+                conteudo = None
+            else:
+                nome = arquivo.name
+                conteudo = arquivo.getvalue()
+            conta = contas.get(nome, MercadoLivreProcessor.inferir_conta(nome))
+            tarefas.append((nome, conteudo, conta))
+        
+        if not tarefas:
+            raise ValueError("Nenhum arquivo informado")
+        
+        workers = max_workers or min(len(tarefas), os.cpu_count() or 1)
+        inicio = time.perf_counter()
+        
+        if len(tarefas) == 1:
+            # Arquivo único: o paralelismo fica nas abas do Excel
+            resultados = [_carregar_arquivo_normalizado(*tarefas[0], max_workers, usar_processos)]
+        elif workers == 1:
+            resultados = [_carregar_arquivo_normalizado(*tarefa, 1) for tarefa in tarefas]
+        else:
+            # Vários arquivos: um worker por arquivo e abas lidas em sequência dentro dele
+            # (sem pools aninhados de arquivos x CPUs, cada um com a pasta de trabalho inteira)
+            abas_workers = [1] * len(tarefas)
+            try:
+                executor_cls = ProcessPoolExecutor if usar_processos else ThreadPoolExecutor
+                with executor_cls(max_workers=workers) as executor:
+                    resultados = list(executor.map(_carregar_arquivo_normalizado, *zip(*tarefas), abas_workers))
+            except (OSError, RuntimeError):
+                # Ambientes sem suporte a multiprocessing: recorrer a threads
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    resultados = list(executor.map(_carregar_arquivo_normalizado, *zip(*tarefas), abas_workers))
+        
+        frames = [df for df, _, _ in resultados if df is not None]
+        erros = [erro for _, erro, _ in resultados if erro is not None]
+        
+        if registro is not None:
+            # Tempos somados dos workers (tempo de CPU por etapa) e tempo total de parede
+            linhas_lidas = sum(tempos["linhas_lidas"] for _, _, tempos in resultados)
+            linhas_validas = sum(len(df) for df in frames)
+            registro.registrar(
+                "ingestao", sum(t["ingestao"] for _, _, t in resultados), linhas=linhas_lidas,
+                arquivos=len(tarefas), workers=workers,
+                segundos_parede=round(time.perf_counter() - inicio, 6),
+            )
+            registro.registrar(
+                "normalizacao", sum(t["normalizacao"] for _, _, t in resultados), linhas=linhas_validas,
+            )
+        
+        if not frames:
+            raise ValueError("Nenhum arquivo válido: " + "; ".join(erros))
+        
+        df = pd.concat(frames, ignore_index=True)
+        df.attrs["conversao_numeros"] = somar_estatisticas([f.attrs.get("conversao_numeros", {}) for f in frames])
+        return df, erros
+
+
+def _ler_aba_excel(conteudo, aba, linha_cabecalho):
+    """
+    Lê uma aba do Excel a partir da linha do cabeçalho (executado nos workers de carregar_de_excel)
+    
+    Returns:
+        DataFrame com os dados da aba
+    """
+    return pd.read_excel(BytesIO(conteudo), sheet_name=aba, header=linha_cabecalho)
+
+
+def _carregar_arquivo_normalizado(nome, conteudo, conta, max_workers_abas=None, usar_processos=True):
+    """
+    Lê e normaliza um único arquivo (executado nos workers de carregar_multiplos_arquivos)
+    
+    Args:
+        nome: Nome (ou caminho) do arquivo
+        conteudo: Bytes do arquivo enviado, ou None para ler do caminho
+        conta: Conta atribuída às linhas sem coluna Conta
+        max_workers_abas: Workers para as abas do Excel (1 = em sequência, dentro de um worker)
+        usar_processos: Se False, as abas usam threads em vez de processos
+    
+    Returns:
+        Tupla (DataFrame normalizado ou None, mensagem de erro ou None, dict de tempos)
+    """
+    tempos = {"ingestao": 0.0, "normalizacao": 0.0, "linhas_lidas": 0}
+    try:
+        inicio = time.perf_counter()
+        origem = BytesIO(conteudo) if conteudo is not None else nome
+        if nome.lower().endswith(".csv"):
+            df = MercadoLivreProcessor.carregar_de_csv(origem)
+        else:
+            df = MercadoLivreProcessor.carregar_de_excel(origem, max_workers_abas, usar_processos)
+        tempos["ingestao"] = time.perf_counter() - inicio
+        tempos["linhas_lidas"] = len(df)
+        
+        inicio = time.perf_counter()
+        df = MercadoLivreProcessor.normalizar_relatorio_vendas(df)
+        if "Conta" not in df.columns:
+            df["Conta"] = conta
+        else:
+            df["Conta"] = df["Conta"].replace({"": conta, "nan": conta})
+        tempos["normalizacao"] = time.perf_counter() - inicio
+        return df, None, tempos
+    except Exception as e:
+        logger.warning("Falha ao carregar %s: %s", nome, e)
+        return None, f"{os.path.basename(nome)}: {e}", tempos
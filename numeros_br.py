@@ -0,0 +1,282 @@
+"""
+Conversão vetorizada de números exportados em texto (padrão brasileiro ou americano)
+Relatórios do Mercado Livre e planilhas do Excel trazem valores como "1.234,56",
+"R$ 12,90" ou "12,5%", que pd.to_numeric descarta como NaN. O formato (vírgula ou
+ponto decimal) é detectado por coluna e a conversão usa apenas operações de texto
+sobre o array inteiro, sem laço Python por célula.
+
+O caminho inverso (número → texto pt-BR para exibição) também é vetorizado: os
+resultados guardam números e só as linhas exibidas são formatadas.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+FORMATO_BR = "pt-BR"  # 1.234,56
+FORMATO_US = "en-US"  # 1,234.56
+
+# Símbolos de moeda removidos antes da conversão (o "$" solto por último)
+MOEDAS = ("R$", "US$", "$")
+
+# Espaços aparados nas pontas (inclusive o não separável do Excel)
+ESPACOS = " \xa0"
+
+# Valores que só podem ser de um dos formatos: separador de milhar seguido do decimal,
+# ou separador decimal seguido de um número de casas diferente de 3
+_EVIDENCIA = {
+    FORMATO_BR: r"^[+-]?\d{1,3}(?:\.\d{3})+,\d*$|^[+-]?\d*,(?:\d{1,2}|\d{4,})$",
+    FORMATO_US: r"^[+-]?\d{1,3}(?:,\d{3})+\.\d*$|^[+-]?\d*\.(?:\d{1,2}|\d{4,})$",
+}
+
+# Texto numérico já no formato do float (após trocar os separadores)
+_NUMERO = r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$"
+
+# Linhas usadas na detecção do formato (o formato é da coluna, não da linha)
+LINHAS_DETECCAO = 100_000
+
+
+def _como_texto(serie):
+    """Array Arrow de texto com os valores; células que não são texto ficam nulas"""
+    if serie.dtype == object:
+        # Em colunas mistas do Excel, só as células de texto passam pela conversão
+        serie = serie.where(serie.str.len().notna())
+    return pa.array(serie.astype("string[pyarrow]").array)
+
+
+def detectar_formato(textos):
+    """
+    Detecta se a coluna usa vírgula (pt-BR) ou ponto (en-US) como separador decimal
+
+    Valores ambíguos ("1.234", "12,500") não contam; sem evidência nenhuma, vale o pt-BR.
+    Só as primeiras LINHAS_DETECCAO linhas são examinadas.
+
+    Args:
+        textos: Array Arrow de texto já sem símbolos de moeda/percentual
+
+    Returns:
+        FORMATO_BR ou FORMATO_US
+    """
+    votos = votos_formato(textos[:LINHAS_DETECCAO])
+    return FORMATO_US if votos[FORMATO_US] > votos[FORMATO_BR] else FORMATO_BR
+
+
+def votos_formato(textos):
+    """
+    Conta os valores que só podem ser de cada formato
+
+    Args:
+        textos: Array Arrow (ou lista) de texto já sem símbolos de moeda/percentual
+
+    Returns:
+        Dict {FORMATO_BR: n, FORMATO_US: n}
+    """
+    textos = pa.array(textos, type=pa.string()) if isinstance(textos, list) else textos
+    return {
+        formato: pc.sum(pc.match_substring_regex(textos, padrao)).as_py() or 0
+        for formato, padrao in _EVIDENCIA.items()
+    }
+
+
+def converter_numeros(valores, formato=None):
+    """
+    Converte uma coluna com números em texto para float
+
+    Aceita símbolo de moeda ("R$ 12,90"), percentual ("12,5%" → 12.5), separador de
+    milhar e negativos com sinal ou entre parênteses ("(12,90)"). Colunas já numéricas
+    são devolvidas sem conversão de texto.
+
+    Args:
+        valores: Series/array com os valores do relatório
+        formato: FORMATO_BR, FORMATO_US ou None (detectar pela coluna)
+
+    Returns:
+        Tupla (Series float com NaN nos valores inválidos, dict com formato, convertidos,
+        invalidos, vazios e percentuais)
+    """
+    serie = pd.Series(valores, copy=False)
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        numeros = serie.astype(float)
+        vazios = int(numeros.isna().sum())
+        return numeros, {"formato": None, "convertidos": len(serie) - vazios, "invalidos": 0,
+                         "vazios": vazios, "percentuais": 0}
+
+    textos = _como_texto(serie)
+    # Cada símbolo só é removido se aparecer na coluna (uma passada de busca por símbolo)
+    percentuais = pc.sum(pc.match_substring(textos, "%")).as_py() or 0
+    if percentuais:
+        textos = pc.replace_substring(textos, "%", "")
+    if pc.any(pc.match_substring(textos, "$")).as_py():
+        for moeda in MOEDAS:
+            textos = pc.replace_substring(textos, moeda, "")
+    textos = pc.utf8_trim(textos, ESPACOS)
+    if pc.any(pc.match_substring(textos, " ")).as_py():
+        # "- R$ 12,90" ou espaço como separador de milhar
+        textos = pc.replace_substring(textos, " ", "")
+    parenteses = pc.fill_null(pc.and_(pc.starts_with(textos, "("), pc.ends_with(textos, ")")), False)
+    if pc.any(parenteses).as_py():
+        textos = pc.utf8_trim(textos, "()")
+    vazio = pc.fill_null(pc.equal(textos, ""), True).to_numpy(zero_copy_only=False)
+
+    formato = formato or detectar_formato(textos)
+    if formato == FORMATO_BR:
+        textos = pc.replace_substring(pc.replace_substring(textos, ".", ""), ",", ".")
+    else:
+        textos = pc.replace_substring(textos, ",", "")
+
+    # Só o texto válido é convertido; o restante vira NaN (inválido)
+    valido = pc.fill_null(pc.match_substring_regex(textos, _NUMERO), False)
+    numeros = pc.cast(pc.if_else(valido, textos, None), pa.float64()).to_numpy(zero_copy_only=False)
+    numeros = np.where(parenteses.to_numpy(zero_copy_only=False), -numeros, numeros)
+
+    # Células que já eram numéricas (colunas mistas) entram como estão
+    if serie.dtype == object:
+        nao_texto = serie.str.len().isna().to_numpy() & serie.notna().to_numpy()
+        if nao_texto.any():
+            numeros[nao_texto] = pd.to_numeric(serie[nao_texto], errors="coerce").to_numpy(dtype=float)
+            vazio = vazio & ~nao_texto
+
+    invalidos = np.isnan(numeros) & ~vazio
+    return pd.Series(numeros, index=serie.index, name=serie.name), {
+        "formato": formato,
+        "convertidos": int(len(serie) - vazio.sum() - invalidos.sum()),
+        "invalidos": int(invalidos.sum()),
+        "vazios": int(vazio.sum()),
+        "percentuais": int(percentuais),
+    }
+
+
+def converter_colunas(df, colunas, formato=None):
+    """
+    Converte as colunas numéricas do DataFrame no próprio DataFrame
+
+    Args:
+        df: DataFrame (alterado no lugar)
+        colunas: Nomes das colunas a converter (ausentes são ignoradas)
+        formato: FORMATO_BR, FORMATO_US ou None (detectar por coluna), ex: o do arquivo CSV
+
+    Returns:
+        Dict {coluna: estatísticas de converter_numeros}
+    """
+    estatisticas = {}
+    for coluna in colunas:
+        if coluna in df.columns:
+            df[coluna], estatisticas[coluna] = converter_numeros(df[coluna], formato)
+    return estatisticas
+
+
+def somar_estatisticas(lista):
+    """
+    Soma as estatísticas de conversão de vários arquivos
+
+    Args:
+        lista: Lista de dicts {coluna: estatísticas}
+
+    Returns:
+        Dict {coluna: estatísticas somadas} (formato = o último detectado)
+    """
+    total = {}
+    for estatisticas in lista:
+        for coluna, valores in estatisticas.items():
+            if coluna not in total:
+                total[coluna] = dict(valores)
+                continue
+            acumulado = total[coluna]
+            for chave in ("convertidos", "invalidos", "vazios", "percentuais"):
+                acumulado[chave] += valores[chave]
+            acumulado["formato"] = valores["formato"] or acumulado["formato"]
+    return total
+
+
+def _formatar(valores, casas, prefixo="", sufixo="", milhar=True):
+    """
+    Formata números como texto pt-BR em uma passada sobre o array inteiro
+
+    Args:
+        valores: Array/Series numérico (nulos e infinitos saem como zero)
+        casas: Casas decimais
+        prefixo: Texto antes do número (ex: "R$ ")
+        sufixo: Texto depois do número (ex: "%")
+        milhar: Separar os milhares com ponto
+
+    Returns:
+        Array de strings (object)
+    """
+    numeros = np.nan_to_num(np.asarray(valores, dtype=float), nan=0.0, posinf=0.0, neginf=0.0)
+    escala = 10 ** casas
+    absolutos = np.abs(numeros)
+    unidades = np.round(absolutos * escala).astype(np.int64)
+    # Empates (…,xx5) viram ,xx4999… ou ,xx5000… no binário: a multiplicação pode errar o
+    # lado, então esses poucos valores são arredondados como o f-string do Python
+    empates = np.flatnonzero(np.abs(absolutos * escala % 1 - 0.5) < 1e-6)
+    for i in empates:
+        unidades[i] = int(f"{absolutos[i]:.{casas}f}".replace(".", ""))
+
+    inteiros = pc.cast(pa.array(unidades // escala), pa.string())
+    if milhar:
+        # RE2 não tem lookahead: agrupa de 3 em 3 dígitos no texto invertido e desinverte
+        invertido = pc.replace_substring_regex(pc.utf8_reverse(inteiros), r"(\d{3})", r"\1.")
+        inteiros = pc.utf8_reverse(pc.utf8_rtrim(invertido, characters="."))
+    partes = [prefixo, pa.array(np.where((numeros < 0) & (unidades > 0), "-", "")), inteiros]
+    if casas:
+        decimais = pc.utf8_lpad(pc.cast(pa.array(unidades % escala), pa.string()), width=casas, padding="0")
+        partes += [",", decimais]
+    partes.append(sufixo)
+    return pc.binary_join_element_wise(*partes, "").to_numpy(zero_copy_only=False)
+
+
+def formatar_reais(valores):
+    """
+    Valores em reais no padrão brasileiro ("R$ 1.234,50"), vetorizado
+
+    Args:
+        valores: Array/Series numérico
+
+    Returns:
+        Array de strings
+    """
+    return _formatar(valores, 2, prefixo="R$ ")
+
+
+def formatar_percentuais(valores, casas=2):
+    """
+    Percentuais no padrão brasileiro ("12,50%"), vetorizado
+
+    Args:
+        valores: Array/Series com percentuais (12.5 = 12,5%)
+        casas: Casas decimais
+
+    Returns:
+        Array de strings
+    """
+    return _formatar(valores, casas, sufixo="%", milhar=False)
+
+
+def estilizar_tabela(df, moeda=(), percentual=()):
+    """
+    Styler que exibe as colunas de moeda e percentual no padrão pt-BR, sem trocar os valores
+
+    Os dados continuam numéricos (a ordenação pelo cabeçalho da tabela é numérica); só o
+    texto exibido vira "R$ 1.234,50" / "12,50%". Use só nas linhas exibidas (ex: a página
+    da tabela): o Styler formata célula por célula.
+
+    Args:
+        df: DataFrame (ex: página de uma tabela)
+        moeda: Colunas exibidas como reais (ausentes ou não numéricas são ignoradas)
+        percentual: Colunas exibidas como percentual (ausentes ou não numéricas são ignoradas)
+
+    Returns:
+        pandas Styler sobre o próprio df
+    """
+    def numericas(colunas):
+        return [c for c in colunas if c in df.columns and pd.api.types.is_numeric_dtype(df[c])
+                and not pd.api.types.is_bool_dtype(df[c])]
+
+    estilo = df.style
+    for colunas, formato in ((moeda, "R$ {:,.2f}"), (percentual, "{:,.2f}%")):
+        subconjunto = numericas(colunas)
+        if subconjunto:
+            estilo = estilo.format(formato, subset=subconjunto, decimal=",", thousands=".", na_rep="")
+    return estilo
@@ -0,0 +1,139 @@
+"""
+Módulo de escolha da logística (Full x Flex) por SKU no Mercado Livre
+Avalia as duas logísticas para o catálogo inteiro de uma vez, sobre as tabelas
+compiladas do registro de tarifas, e indica a mais barata para cada anúncio
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import MERCADO_LIVRE_LIMITE_TAXA_FIXA
+from tabelas_tarifas import LOGISTICAS, TabelaTarifas, obter_tabela
+
+
+class OtimizadorLogistica:
+    """Compara o custo das logísticas Full e Flex para cada SKU."""
+
+    @staticmethod
+    def comparar(precos, pesos=None, categoria="Geral", tipo_anuncio="Clássico", custo_envio_flex=None,
+                 data_tarifas=None):
+        """
+        Calcula o custo de cada logística e escolhe a mais barata por SKU
+
+        Abaixo de R$ 79 a comparação é custo operacional (Full) x taxa fixa Flex; a partir
+        de R$ 79, frete grátis por peso (Full) x envio por conta do vendedor (Flex).
+        Sem o custo de envio do vendedor, os SKUs a partir de R$ 79 ficam sem custo Flex
+        e sem recomendação (o Flex não sai de graça só porque o custo não foi informado).
+        A comissão é a mesma nas duas logísticas e fica fora da comparação.
+
+        Args:
+            precos: Array/Series com os preços de venda
+            pesos: Pesos em kg (escalar ou por linha; ausente = menor faixa)
+            categoria: Categoria (escalar ou por linha)
+            tipo_anuncio: "Clássico" ou "Premium" (escalar ou por linha)
+            custo_envio_flex: Custo de entrega por pedido no Flex (R$, escalar ou por linha;
+                None = não informado)
+            data_tarifas: Data da tabela de tarifas (None = hoje)
+
+        Returns:
+            DataFrame com Custo Full R$, Custo Flex R$, Logística Recomendada e Economia R$ por
+            unidade (nulos nos SKUs sem recomendação)
+        """
+        tabela = obter_tabela("Mercado Livre", data_tarifas)
+        entrada = TabelaTarifas.preparar(precos, pesos, categoria, "Full", tipo_anuncio)
+        precos = entrada["precos"]
+
+        # Mesma entrada preparada para as duas logísticas; só o código da logística muda
+        full = tabela.calcular_preparado(entrada)
+        entrada["logistica"] = np.full(len(precos), LOGISTICAS.index("Flex"), dtype=np.intp)
+        flex = tabela.calcular_preparado(entrada)
+
+        custo_full = full["custo_operacional"].to_numpy() + full["frete"].to_numpy()
+        custo_flex = flex["custo_operacional"].to_numpy() + flex["frete"].to_numpy()
+        acima_limite = precos >= MERCADO_LIVRE_LIMITE_TAXA_FIXA
+        if custo_envio_flex is None:
+            custo_flex = np.where(acima_limite, np.nan, custo_flex)
+        else:
+            custo_flex = custo_flex + np.broadcast_to(np.asarray(custo_envio_flex, dtype=float), len(precos))
+
+        # Código -1 (sem recomendação) onde o custo Flex é desconhecido
+        recomendacao = np.where(np.isnan(custo_flex), -1, custo_flex < custo_full).astype(np.int8)
+        indice = precos.index if isinstance(precos, pd.Series) else None
+        return pd.DataFrame({
+            "Custo Full R$": custo_full,
+            "Custo Flex R$": custo_flex,
+            "Logística Recomendada": pd.Categorical.from_codes(recomendacao, categories=list(LOGISTICAS)),
+            "Economia R$": np.abs(custo_full - custo_flex),
+            "Acima de R$ 79": acima_limite,
+        }, index=indice)
+
+    @staticmethod
+    def analisar_catalogo(df, custo_envio_flex=None, data_tarifas=None):
+        """
+        Compara as logísticas para o relatório agregado por SKU
+
+        Usa as colunas opcionais Peso (kg), Categoria, Tipo de Anúncio, Logística (atual)
+        e Quantidade Vendida quando presentes.
+
+        Args:
+            df: DataFrame com SKU e Preço Atual (ver MercadoLivreProcessor.agregar_por_sku)
+            custo_envio_flex: Custo de entrega por pedido no Flex (R$; None = não informado,
+                SKUs a partir de R$ 79 ficam sem recomendação)
+            data_tarifas: Data da tabela de tarifas (None = hoje)
+
+        Returns:
+            DataFrame por SKU com os custos, a recomendação e a economia no período
+        """
+        comparacao = OtimizadorLogistica.comparar(
+            df["Preço Atual"].to_numpy(dtype=float),
+            df["Peso (kg)"].to_numpy(dtype=float) if "Peso (kg)" in df.columns else None,
+            df["Categoria"] if "Categoria" in df.columns else "Geral",
+            df["Tipo de Anúncio"] if "Tipo de Anúncio" in df.columns else "Clássico",
+            custo_envio_flex,
+            data_tarifas,
+        )
+        comparacao.insert(0, "SKU", df["SKU"].array)
+        comparacao.insert(1, "Preço Atual", df["Preço Atual"].to_numpy(dtype=float))
+
+        if "Logística" in df.columns:
+            atual_flex = (df["Logística"] == "Flex").to_numpy()
+            comparacao.insert(2, "Logística Atual",
+                              pd.Categorical.from_codes(atual_flex.astype(np.int8), categories=list(LOGISTICAS)))
+            custo_atual = np.where(atual_flex, comparacao["Custo Flex R$"], comparacao["Custo Full R$"])
+        else:
+            custo_atual = comparacao["Custo Full R$"].to_numpy()
+
+        # Economia da recomendação em relação à logística atual (Full quando não informada);
+        # nula nos SKUs sem recomendação, que ficam fora da economia total
+        custo_recomendado = np.minimum(comparacao["Custo Full R$"], comparacao["Custo Flex R$"])
+        economia = custo_atual - custo_recomendado
+        if "Quantidade Vendida" in df.columns:
+            economia = economia * df["Quantidade Vendida"].to_numpy(dtype=float)
+        comparacao["Economia no Período R$"] = economia
+        return comparacao
+
+    @staticmethod
+    def resumir(analise):
+        """
+        Resume a economia do catálogo
+
+        Args:
+            analise: DataFrame de analisar_catalogo
+
+        Returns:
+            Dict com o número de SKUs por recomendação, sem recomendação (custo de envio Flex
+            não informado), quantos mudam de logística e a economia total
+        """
+        recomendacao = analise["Logística Recomendada"]
+        if "Logística Atual" in analise.columns:
+            mudam = int((recomendacao.notna() & (analise["Logística Atual"] != recomendacao)).sum())
+        else:
+            mudam = int((recomendacao == "Flex").sum())
+        return {
+            "skus": len(analise),
+            "skus_full": int((recomendacao == "Full").sum()),
+            "skus_flex": int((recomendacao == "Flex").sum()),
+            "skus_sem_recomendacao": int(recomendacao.isna().sum()),
+            "skus_mudam": mudam,
+            "economia_total": float(analise["Economia no Período R$"].sum()),
+        }
@@ -0,0 +1,159 @@
+"""
+Execução do fluxo de precificação sem interface (linha de comando)
+Relatório(s) → Normalização → Agregação → Calculadora → Curva ABC → Simulador → Filtro → Exportação
+
+Uso:
+    python pipeline.py relatorio.xlsx --marketplace "Mercado Livre" --regime "Simples Nacional" \\
+        --saida resultado.xlsx --log-json
+"""
+
+import argparse
+import logging
+import sys
+
+from abc_classifier import VendasDiarias
+from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+from degraus_tarifa import DetectorDegraus
+from desempenho import RegistroDesempenho, configurar_logging, medir
+from mercado_livre_processor import MercadoLivreProcessor
+from pricing_calculator_v2 import PricingCalculatorV2
+from price_simulator import PriceSimulator
+from promotion_exporter import PromotionExporter
+
+
+logger = logging.getLogger(__name__)
+
+
+def executar_pipeline(arquivos, marketplace, regime_tributario, margem_bruta_alvo=30.0,
+                      margem_liquida_minima=10.0, percent_publicidade=3.0, custo_fixo_operacional=0.0,
+                      taxa_devolucao=0.0, categoria="oportunidade", ponderar_por_quantidade=False,
+                      janela_abc=None, modo_monetario="float", data_tarifas=None, saida=None, saida_degraus=None,
+                      registro=None):
+    """
+    Executa o fluxo completo de precificação para um ou mais relatórios
+
+    Args:
+        arquivos: Lista de caminhos dos relatórios (.xlsx, .xls ou .csv)
+        marketplace: Marketplace para o cálculo
+        regime_tributario: Regime tributário para o cálculo
+        margem_bruta_alvo: Margem bruta alvo (%)
+        margem_liquida_minima: Margem líquida mínima (%)
+        percent_publicidade: % de publicidade
+        custo_fixo_operacional: Custo fixo operacional (%)
+        taxa_devolucao: Taxa de devoluções e trocas (%)
+        categoria: Categoria do filtro final (ver PromotionExporter.filtrar_por_categoria)
+        ponderar_por_quantidade: Preço Atual por SKU ponderado pela Quantidade Vendida
+        janela_abc: Dias da janela da Curva ABC (requer coluna Data; None = período completo)
+        modo_monetario: "float" ou "centavos" (ver PricingCalculatorV2)
+        data_tarifas: Data de vigência das tarifas do Mercado Livre (None = hoje)
+        saida: Caminho opcional do Excel de saída
+        saida_degraus: Caminho opcional do CSV com o ranking de degraus de tarifa
+        registro: RegistroDesempenho opcional (um novo é criado se None)
+
+    Returns:
+        Dict com DataFrames "resultado", "simulacao", "filtrado", "degraus" (None se não pedido)
+        e o "registro" de desempenho
+    """
+    registro = registro or RegistroDesempenho()
+    parametros = dict(
+        marketplaces=DEFAULT_MARKETPLACES,
+        regimes=DEFAULT_REGIMES,
+        margem_bruta_alvo=margem_bruta_alvo,
+        margem_liquida_minima=margem_liquida_minima,
+        percent_publicidade=percent_publicidade,
+        custo_fixo_operacional=custo_fixo_operacional,
+        taxa_devolucao=taxa_devolucao,
+    )
+
+    df_normalizado, erros = MercadoLivreProcessor.carregar_multiplos_arquivos(arquivos, registro=registro)
+    for erro in erros:
+        logger.warning(erro)
+
+    with medir(registro, "agregacao", len(df_normalizado)):
+        df_agregado = MercadoLivreProcessor.agregar_por_sku(df_normalizado, ponderar_por_quantidade)
+
+    calculadora = PricingCalculatorV2(**parametros, modo_monetario=modo_monetario, data_tarifas=data_tarifas)
+    resultado = calculadora.calcular_dataframe(df_agregado, marketplace, regime_tributario, registro=registro)
+    simulacao = PriceSimulator(**parametros).calcular_dataframe(
+        df_agregado, marketplace, regime_tributario, registro=registro
+    )
+    
+    if janela_abc and "Data" in df_normalizado.columns:
+        with medir(registro, "abc_janela", len(df_normalizado)):
+            curva = VendasDiarias.de_dataframe(df_normalizado).classificar(janela_abc)
+            resultado["Curva ABC"] = curva.reindex(resultado["SKU ou MLB"]).fillna("C").to_numpy()
+            simulacao["Curva ABC"] = curva.reindex(simulacao["SKU"]).fillna("C").to_numpy()
+
+    with medir(registro, "filtro", len(resultado)) as medicao:
+        filtrado = PromotionExporter().filtrar_por_categoria(resultado, categoria=categoria)
+        medicao["linhas_resultado"] = len(filtrado)
+
+    if saida:
+        with medir(registro, "exportacao", len(resultado)):
+            resultado.to_excel(saida, index=False, sheet_name="Precificacao")
+    
+    degraus = None
+    if saida_degraus:
+        with medir(registro, "degraus", len(df_agregado)) as medicao:
+            degraus = DetectorDegraus.detectar(df_agregado, calculadora, marketplace, regime_tributario)
+            medicao["linhas_resultado"] = len(degraus)
+        with open(saida_degraus, "wb") as arquivo:
+            arquivo.write(DetectorDegraus.exportar_csv(degraus).getvalue())
+
+    return {
+        "resultado": resultado,
+        "simulacao": simulacao,
+        "filtrado": filtrado,
+        "degraus": degraus,
+        "registro": registro,
+    }
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando"""
+    parser = argparse.ArgumentParser(description="Precificação em lote sem interface")
+    parser.add_argument("arquivos", nargs="+", help="Relatórios de vendas (.xlsx, .xls ou .csv)")
+    parser.add_argument("--marketplace", default="Mercado Livre", choices=list(DEFAULT_MARKETPLACES))
+    parser.add_argument("--regime", default="Simples Nacional", choices=list(DEFAULT_REGIMES))
+    parser.add_argument("--margem-bruta", type=float, default=30.0)
+    parser.add_argument("--margem-liquida", type=float, default=10.0)
+    parser.add_argument("--publicidade", type=float, default=3.0)
+    parser.add_argument("--categoria", default="oportunidade")
+    parser.add_argument("--preco-ponderado", action="store_true",
+                        help="Preço médio por SKU ponderado pela quantidade vendida")
+    parser.add_argument("--janela-abc", type=int, help="Curva ABC pelos últimos N dias (requer coluna Data)")
+    parser.add_argument("--centavos", action="store_true", help="Calcula valores monetários em centavos inteiros")
+    parser.add_argument("--data-tarifas", help="Vigência das tarifas do Mercado Livre (AAAA-MM-DD; padrão: hoje)")
+    parser.add_argument("--saida", help="Excel de saída com o resultado da calculadora")
+    parser.add_argument("--degraus", help="CSV com os SKUs que lucram mais do outro lado de uma faixa de tarifa")
+    parser.add_argument("--log-nivel", default=None, help="Nível de log (padrão: INFO com --log-json)")
+    parser.add_argument("--log-json", action="store_true", help="Emite logs estruturados em JSON")
+    args = parser.parse_args(argv)
+
+    configurar_logging(args.log_nivel or ("INFO" if args.log_json else None), formato_json=args.log_json)
+
+    saida = executar_pipeline(
+        args.arquivos,
+        args.marketplace,
+        args.regime,
+        margem_bruta_alvo=args.margem_bruta,
+        margem_liquida_minima=args.margem_liquida,
+        percent_publicidade=args.publicidade,
+        categoria=args.categoria,
+        ponderar_por_quantidade=args.preco_ponderado,
+        janela_abc=args.janela_abc,
+        modo_monetario="centavos" if args.centavos else "float",
+        data_tarifas=args.data_tarifas,
+        saida=args.saida,
+        saida_degraus=args.degraus,
+    )
+
+    registro = saida["registro"]
+    if not args.log_json:
+        print(registro.para_dataframe().to_string(index=False))
+    print(f"{len(saida['resultado'])} SKUs calculados em {registro.tempo_total():.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,14 @@ Implementa a lógica automática baseada em dados do relatório
 
 import pandas as pd
 import numpy as np
+from abc_classifier import classificar_faturamento
+from desempenho import medir
 from config import MERCADO_LIVRE_AD_TYPES
+from tarefas import processar_em_blocos
+
+
+# Linhas por bloco quando a simulação acompanha o progresso (cálculo linha a linha)
+BLOCO_SIMULACAO = 5_000
 
 
 class PriceSimulator:
@@ -119,7 +126,7 @@ class PriceSimulator:
             "Lucro Líquido": lucro_liquido,
         }
 
-    def calcular_dataframe(self, df, marketplace, regime_tributario):
+    def calcular_dataframe(self, df, marketplace, regime_tributario, registro=None, progresso=None):
         """
         Calcula simulação para múltiplas linhas
         
@@ -127,10 +134,34 @@ class PriceSimulator:
             df: DataFrame com colunas: SKU, Descrição, Custo Produto, Frete, Tipo de Anúncio (opcional)
             marketplace: Marketplace selecionado
             regime_tributario: Regime tributário selecionado
+            registro: RegistroDesempenho opcional para medir as etapas
+            progresso: Callback opcional de progresso (ver tarefas.processar_em_blocos); se
+                informado, a simulação é feita em blocos de linhas
                 
         Returns:
             DataFrame com simulação de preços
         """
+        with medir(registro, "simulacao", len(df)):
+            df_resultado = processar_em_blocos(
+                df, lambda bloco: self._calcular_linhas(bloco, marketplace, regime_tributario), progresso,
+                tamanho_bloco=BLOCO_SIMULACAO,
+            )
+        
+        # Calcular Curva ABC se houver coluna de Quantidade Vendida
+        if "Quantidade Vendida" in df.columns:
+            with medir(registro, "abc", len(df)):
+                # Calcular faturamento (preco_atual * quantidade_vendida)
+                df_temp = df.copy()
+                df_temp['Faturamento'] = df_temp['Preço Atual'] * df_temp['Quantidade Vendida']
+                
+                # Calcular Curva ABC
+                curva_abc = self.calcular_curva_abc(df_temp)
+                df_resultado['Curva ABC'] = curva_abc['Curva ABC']
+        
+        return df_resultado
+    
+    def _calcular_linhas(self, df, marketplace, regime_tributario):
+        """Calcula linha a linha e retorna o DataFrame de resultados"""
         resultados = []
         
         for _, row in df.iterrows():
@@ -147,19 +178,7 @@ class PriceSimulator:
             )
             resultados.append(resultado)
         
-        df_resultado = pd.DataFrame(resultados)
-        
-        # Calcular Curva ABC se houver coluna de Quantidade Vendida
-        if "Quantidade Vendida" in df.columns:
-            # Calcular faturamento (preco_atual * quantidade_vendida)
-            df_temp = df.copy()
-            df_temp['Faturamento'] = df_temp['Preço Atual'] * df_temp['Quantidade Vendida']
-            
-            # Calcular Curva ABC
-            curva_abc = self.calcular_curva_abc(df_temp)
-            df_resultado['Curva ABC'] = curva_abc['Curva ABC']
-        
-        return df_resultado
+        return pd.DataFrame(resultados)
     
     def calcular_curva_abc(self, df):
         """
@@ -174,28 +193,5 @@ class PriceSimulator:
         if 'Faturamento' not in df.columns or len(df) == 0:
             return pd.DataFrame({'Curva ABC': ['C'] * len(df)})
         
-        # Ordenar por faturamento (maior para menor)
-        df_sorted = df.sort_values('Faturamento', ascending=False).reset_index(drop=True)
-        
-        # Calcular faturamento total
-        total_faturamento = df_sorted['Faturamento'].sum()
-        
-        if total_faturamento == 0:
-            return pd.DataFrame({'Curva ABC': ['C'] * len(df)})
-        
-        # Calcular faturamento acumulado em percentual
-        df_sorted['Faturamento Acumulado %'] = (df_sorted['Faturamento'].cumsum() / total_faturamento * 100)
-        
-        # Classificar em Curva A (80%), B (15%), C (5%)
-        def classificar_curva(percentual):
-            if percentual <= 80:
-                return 'A'
-            elif percentual <= 95:
-                return 'B'
-            else:
-                return 'C'
-        
-        df_sorted['Curva ABC'] = df_sorted['Faturamento Acumulado %'].apply(classificar_curva)
-        
-        # Retornar na ordem original
-        return df_sorted[['Curva ABC']].reset_index(drop=True)
+        # Classificar em Curva A (80%), B (15%), C (5%), na ordem original das linhas
+        return pd.DataFrame({'Curva ABC': classificar_faturamento(df['Faturamento'].to_numpy())})
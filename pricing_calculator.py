@@ -13,6 +13,7 @@ from config import (
     MERCADO_LIVRE_TAXA_FIXA,
     MERCADO_LIVRE_LIMITE_TAXA_FIXA,
 )
+from configuracao import compilar
 
 
 class PricingCalculator:
@@ -235,52 +236,98 @@ class PricingCalculator:
 
         df = df.copy()
 
+        preco = df["Preço Base (R$)"].to_numpy(dtype=float)
+        ads_percent = df["Ads (%)"].to_numpy(dtype=float) / 100 if "Ads (%)" in df.columns else np.zeros(len(df))
+        margem_liquida_minima = df["Margem Líquida (%)"].to_numpy(dtype=float)
+        margem_bruta_alvo = df["Margem Bruta (%)"].to_numpy(dtype=float)
+
         # Calcular custo total direto
         df["Custo Total Direto"] = df["Custo Produto (R$)"] + df["Frete (R$)"]
-
-        # Calcular custos variáveis
-        df["Custos Variáveis"] = df.apply(
-            lambda row: self.calcular_custos_variáveis(
-                row["Preço Base (R$)"],
-                row["Marketplace"],
-                row["Regime Tributário"],
-                row.get("Ads (%)", 0) / 100,
-            )["total_variavel"],
-            axis=1,
+        custo_total_direto = df["Custo Total Direto"].to_numpy(dtype=float)
+
+        # Configuração de cada linha: marketplace/regime fatorados e buscados nas tabelas de config
+        mp = self._indices_config(df["Marketplace"], self.marketplaces, "Outros")
+        regime = self._indices_config(df["Regime Tributário"], self.regimes, "Lucro Real")
+        tabelas = compilar(self.marketplaces, self.regimes)
+        comissao = tabelas.comissao[mp]
+        custo_fixo = tabelas.custo_fixo[mp]
+        taxa_devolucao = tabelas.taxa_devolucao[mp]
+        aliquota_impostos = tabelas.aliquota_impostos[regime]
+
+        # Taxa fixa: tabela por faixa de preço no Mercado Livre, custo fixo nos demais
+        mercado_livre = (df["Marketplace"] == "Mercado Livre").to_numpy()
+        taxa_fixa = np.where(mercado_livre, self._taxa_fixa_mercado_livre_vetorizada(preco), custo_fixo)
+
+        # Calcular custos variáveis (comissão + taxa fixa + impostos + ads + devolução)
+        custos_variaveis = (
+            preco * comissao
+            + taxa_fixa
+            + preco * aliquota_impostos
+            + np.where(ads_percent > 0, preco * ads_percent, 0.0)
+            + preco * taxa_devolucao
         )
+        df["Custos Variáveis"] = custos_variaveis
 
         # Calcular margens
-        df["Lucro R$"] = df.apply(
-            lambda row: row["Preço Base (R$)"] - row["Custo Total Direto"] - row["Custos Variáveis"],
-            axis=1,
-        )
+        lucro = preco - custo_total_direto - custos_variaveis
+        df["Lucro R$"] = lucro
 
-        df["Margem Calculada %"] = df.apply(
-            lambda row: (row["Lucro R$"] / row["Preço Base (R$)"] * 100)
-            if row["Preço Base (R$)"] > 0
-            else 0,
-            axis=1,
-        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margem = np.where(preco > 0, lucro / preco * 100, 0.0)
+            df["Margem Calculada %"] = margem
 
-        # Calcular desconto máximo
-        df["Desconto Máximo %"] = df.apply(
-            lambda row: self.calcular_desconto_maximo(
-                row["Preço Base (R$)"],
-                row["Custo Total Direto"],
-                row["Margem Líquida (%)"],
-            ),
-            axis=1,
-        )
+            # Calcular desconto máximo
+            preco_minimo = custo_total_direto / (1 - (margem_liquida_minima / 100))
+            desconto = (preco - preco_minimo) / preco * 100
+            df["Desconto Máximo %"] = np.where((preco > 0) & (desconto > 0), desconto, 0.0)
 
         # Avaliar saúde
-        df["Status"] = df.apply(
-            lambda row: self.avaliar_saude_precificacao(
-                row["Preço Base (R$)"],
-                row["Margem Calculada %"],
-                row["Margem Líquida (%)"],
-                row["Margem Bruta (%)"],
-            ),
-            axis=1,
+        df["Status"] = np.select(
+            [preco <= 0, margem < margem_liquida_minima, margem < margem_bruta_alvo],
+            [STATUS_PREJUIZO, STATUS_PREJUIZO, STATUS_ALERTA],
+            default=STATUS_SAUDAVEL,
         )
 
         return df
+
+    @staticmethod
+    def _indices_config(coluna, config, padrao):
+        """
+        Posição de cada linha no dict de configuração (fatorando a coluna uma única vez)
+        
+        Args:
+            coluna: Series com o nome do marketplace/regime de cada linha
+            config: Dict de configurações (marketplaces ou regimes)
+            padrao: Chave usada para nomes não cadastrados
+            
+        Returns:
+            Array int com a posição da configuração de cada linha
+        """
+        codigos, nomes = pd.factorize(coluna)
+        chaves = list(config)
+        posicoes = np.array([chaves.index(n) if n in config else chaves.index(padrao) for n in nomes], dtype=np.intp)
+        # Linhas sem valor (código -1) usam o padrão
+        return np.append(posicoes, chaves.index(padrao))[codigos]
+
+    @staticmethod
+    def _taxa_fixa_mercado_livre_vetorizada(precos, categoria="Produtos Comuns"):
+        """
+        Versão vetorizada de calcular_taxa_fixa_mercado_livre (apenas o valor da taxa)
+        
+        Args:
+            precos: Array com os preços de venda
+            categoria: Categoria do produto ("Produtos Comuns" ou "Livros")
+            
+        Returns:
+            Array com a taxa fixa de cada preço
+        """
+        faixas = MERCADO_LIVRE_TAXA_FIXA.get(categoria, MERCADO_LIVRE_TAXA_FIXA["Produtos Comuns"])
+        minimos = np.array([f["min"] for f in faixas])
+        maximos = np.array([f["max"] for f in faixas])
+        taxas = np.array([f["taxa_fixa"] for f in faixas] + [0.0])
+
+        # Primeira faixa com preço <= máximo (mesma prioridade do laço por faixa)
+        faixa = np.searchsorted(maximos, precos, side="left")
+        dentro = (faixa < len(faixas)) & (precos >= minimos[np.minimum(faixa, len(faixas) - 1)])
+        taxa = taxas[np.where(dentro, faixa, len(faixas))]
+        return np.where(precos > MERCADO_LIVRE_LIMITE_TAXA_FIXA, 0.0, taxa)
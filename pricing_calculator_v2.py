@@ -5,14 +5,47 @@ Implementa a lógica automática baseada em dados do relatório
 
 import pandas as pd
 import numpy as np
+from abc_classifier import classificar_faturamento
+from cache_resultados import hash_dados
+from centavos import MEIO_PARA_CIMA, aplicar_taxa, para_centavos, para_reais
+from configuracao import congelar
+from desempenho import medir
+from indice_categorias import obter_indice
 from config import MERCADO_LIVRE_AD_TYPES, MERCADO_LIVRE_TAXA_FIXA, MERCADO_LIVRE_LIMITE_TAXA_FIXA, SHOPEE_FAIXAS_PRECO
+from tabelas_tarifas import TabelaTarifas, obter_tabela
+from tarefas import processar_em_blocos
+
+
+def _compilar_faixas_shopee():
+    """
+    Arrays somente leitura das faixas da Shopee, montados uma vez por processo
+
+    Returns:
+        Dict com min/max de cada faixa e, com uma posição extra para preços fora das
+        faixas, comissão, taxa fixa, subsídio Pix e descrição
+    """
+    faixas = {"min": [], "max": [], "comissao_percent": [], "comissao_fixa": [], "subsidio_pix_percent": []}
+    for faixa in SHOPEE_FAIXAS_PRECO:
+        for campo, valores in faixas.items():
+            valores.append(faixa[campo])
+    for campo, fora_das_faixas in (("comissao_percent", 0.20), ("comissao_fixa", 4.0), ("subsidio_pix_percent", 0.0)):
+        faixas[campo].append(fora_das_faixas)
+    compiladas = {campo: np.array(valores, dtype=float) for campo, valores in faixas.items()}
+    for valores in compiladas.values():
+        valores.setflags(write=False)
+    compiladas["descricao"] = tuple(f["descricao"] for f in SHOPEE_FAIXAS_PRECO) + ("Nao identificada",)
+    return compiladas
+
+
+FAIXAS_SHOPEE = _compilar_faixas_shopee()
 
 
 class PricingCalculatorV2:
     """Calcula precificação automática baseada em dados do relatório."""
 
     def __init__(self, marketplaces, regimes, margem_bruta_alvo, margem_liquida_minima, percent_publicidade, 
-                 custo_fixo_operacional=0.0, taxa_devolucao=0.0):
+                 custo_fixo_operacional=0.0, taxa_devolucao=0.0, modo_monetario="float",
+                 arredondamento=MEIO_PARA_CIMA, data_tarifas=None):
         """
         Inicializa a calculadora
         
@@ -24,7 +57,13 @@ class PricingCalculatorV2:
             percent_publicidade: % de publicidade
             custo_fixo_operacional: Custo fixo operacional (R$)
             taxa_devolucao: Taxa de devoluções e trocas (%)
+            modo_monetario: "float" (padrão) ou "centavos" (int64, cada taxa arredondada ao centavo)
+            arredondamento: Arredondamento do modo centavos (MEIO_PARA_CIMA ou BANCARIO)
+            data_tarifas: Data das tarifas do Mercado Livre (ver tabelas_tarifas; None = hoje)
         """
+        if modo_monetario not in ("float", "centavos"):
+            raise ValueError(f"Modo monetário '{modo_monetario}' inválido. Use 'float' ou 'centavos'")
+        
         self.marketplaces = marketplaces
         self.regimes = regimes
         self.margem_bruta_alvo = margem_bruta_alvo
@@ -32,6 +71,9 @@ class PricingCalculatorV2:
         self.percent_publicidade = percent_publicidade
         self.custo_fixo_operacional = custo_fixo_operacional
         self.taxa_devolucao = taxa_devolucao
+        self.modo_monetario = modo_monetario
+        self.arredondamento = arredondamento
+        self.tabela_mercado_livre = obter_tabela("Mercado Livre", data_tarifas)
 
     def calcular_comissao_shopee(self, preco_venda):
         """
@@ -97,31 +139,11 @@ class PricingCalculatorV2:
             df_com_faturamento: DataFrame com coluna Faturamento calculada
             
         Returns:
-            Series com classificacao ABC para cada linha
+            DataFrame com coluna 'Curva ABC' na ordem original das linhas
         """
-        # Calcular faturamento total
-        faturamento_total = df_com_faturamento['Faturamento'].sum()
-        
-        # Ordenar por faturamento em ordem decrescente
-        df_ordenado = df_com_faturamento.sort_values('Faturamento', ascending=False).reset_index(drop=True)
-        
-        # Calcular faturamento acumulado
-        df_ordenado['Faturamento_Acumulado'] = df_ordenado['Faturamento'].cumsum()
-        df_ordenado['Percentual_Acumulado'] = (df_ordenado['Faturamento_Acumulado'] / faturamento_total) * 100
-        
-        # Classificar em A, B ou C
-        def classificar_abc(percentual):
-            if percentual <= 80:
-                return "A"
-            elif percentual <= 95:
-                return "B"
-            else:
-                return "C"
-        
-        df_ordenado['Curva ABC'] = df_ordenado['Percentual_Acumulado'].apply(classificar_abc)
-        
-        # Retornar em ordem original
-        return df_ordenado[['Curva ABC']].reset_index(drop=True)
+        # Classificar pelo faturamento acumulado, mantendo a ordem original das linhas
+        curva = classificar_faturamento(df_com_faturamento['Faturamento'].to_numpy())
+        return pd.DataFrame({'Curva ABC': curva})
     
     def obter_config_marketplace(self, marketplace, tipo_anuncio=""):
         """
@@ -142,7 +164,7 @@ class PricingCalculatorV2:
         return self.marketplaces.get(marketplace, {"comissao": 0.0, "custo_fixo": 0.0})
 
     def calcular_linha(self, sku, descricao, custo_produto, frete, preco_atual, 
-                       marketplace, regime_tributario, tipo_anuncio=""):
+                       marketplace, regime_tributario, tipo_anuncio="", peso_kg=None, logistica="", categoria=""):
         """
         Calcula uma linha da Calculadora de Precificação
         
@@ -155,6 +177,9 @@ class PricingCalculatorV2:
             marketplace: Nome do marketplace
             regime_tributario: Regime tributário
             tipo_anuncio: Tipo de anúncio (opcional, para Mercado Livre)
+            peso_kg: Peso do produto em kg (opcional, para Mercado Livre)
+            logistica: "Full" ou "Flex" (opcional, para Mercado Livre; vazio = Full)
+            categoria: Categoria do produto (opcional, para Mercado Livre)
             
         Returns:
             Dict com todos os cálculos
@@ -163,6 +188,8 @@ class PricingCalculatorV2:
         taxa_fixa_info = {"cobrada": False, "faixa": "Nao aplicavel"}
         subsidio_pix = 0.0
         subsidio_pix_info = {"subsidio_pix_percent": 0.0, "faixa": "Nao aplicavel"}
+        custo_operacional = 0.0
+        frete_ml = 0.0
         
         # Calcular comissao e taxa fixa baseado no marketplace
         if marketplace == "Shopee":
@@ -185,10 +212,17 @@ class PricingCalculatorV2:
         regime_config = self.regimes.get(regime_tributario, {})
         impostos_percent = regime_config.get("impostos_encargos", 0.0)
         
-        # Calcular taxa fixa do Mercado Livre se aplicavel
+        # Tarifas do Mercado Livre pela tabela vigente (custo operacional/taxa fixa e frete grátis)
         if marketplace == "Mercado Livre":
-            taxa_fixa_info = self.calcular_taxa_fixa_mercado_livre(preco_atual, "Produtos Comuns")
-            taxa_fixa = taxa_fixa_info["taxa_fixa"]
+            comissoes, custos, fretes, (regra, rotulos) = self._tarifas_mercado_livre(
+                np.array([preco_atual], dtype=float), np.array([frete], dtype=float), np.array([comissao_percent]),
+                peso_kg, logistica, categoria, tipo_anuncio
+            )
+            comissao_percent = float(comissoes[0])
+            custo_operacional = float(custos[0])
+            frete_ml = float(fretes[0])
+            taxa_fixa = custo_operacional + frete_ml
+            taxa_fixa_info = {"cobrada": taxa_fixa > 0, "faixa": rotulos[regra[0]]}
         
         # Calculos
         comissao = preco_atual * comissao_percent
@@ -219,17 +253,19 @@ class PricingCalculatorV2:
             "SKU ou MLB": sku,
             "Titulo": descricao,
             "Tipo de Anuncio": tipo_anuncio_exibicao,
-            "Taxa Comissao %": f"{comissao_percent * 100:.2f}%",
+            "Taxa Comissao %": comissao_percent * 100,
             "Taxa Fixa R$": taxa_fixa,
             "Taxa Fixa Cobrada": "Sim" if taxa_fixa_info["cobrada"] else "Nao",
             "Faixa Taxa Fixa": taxa_fixa_info["faixa"],
             "Faixa Shopee": subsidio_pix_info["faixa"],
-            "Subsidio Pix %": f"{subsidio_pix_info['subsidio_pix_percent']:.2f}%",
+            "Subsidio Pix %": subsidio_pix_info["subsidio_pix_percent"],
             "Subsidio Pix R$": subsidio_pix,
             "Preco Atual (R$)": preco_atual,
             "Custo Produto": custo_produto,
             "Frete": frete,
             "Comissao R$": comissao,
+            "Custo Operacional R$": custo_operacional,
+            "Frete ML R$": frete_ml,
             "Custo Fixo Op.": self.custo_fixo_operacional,
             "Impostos": impostos,
             "Publicidade": publicidade,
@@ -264,11 +300,15 @@ class PricingCalculatorV2:
                 "Custo Produto",
                 "Frete",
                 "Comissao R$",
+                "Custo Operacional R$",
+                "Frete ML R$",
                 "Impostos",
                 "Publicidade",
                 "Lucro R$",
                 "Margem Bruta %",
                 "Margem Liquida %",
+                "Quantidade Vendida",
+                "Faturamento",
                 "Curva ABC",
                 "Status",
             ]
@@ -292,6 +332,8 @@ class PricingCalculatorV2:
                 "Lucro R$",
                 "Margem Bruta %",
                 "Margem Liquida %",
+                "Quantidade Vendida",
+                "Faturamento",
                 "Curva ABC",
                 "Status",
             ]
@@ -310,53 +352,358 @@ class PricingCalculatorV2:
                 "Lucro R$",
                 "Margem Bruta %",
                 "Margem Liquida %",
+                "Quantidade Vendida",
+                "Faturamento",
                 "Curva ABC",
                 "Status",
             ]
     
-    def calcular_dataframe(self, df, marketplace, regime_tributario):
+    def impressao(self, marketplace, regime_tributario):
+        """
+        Impressão digital das premissas do cálculo (igual entre sessões e processos)
+        
+        Args:
+            marketplace: Marketplace selecionado
+            regime_tributario: Regime tributário selecionado
+            
+        Returns:
+            String hexadecimal; muda se qualquer premissa que afeta o resultado mudar
+        """
+        tabela = self.tabela_mercado_livre
+        indice = obter_indice() if tabela.indice_categorias else None
+        return congelar({
+            "marketplace": marketplace,
+            "regime_tributario": regime_tributario,
+            "marketplaces": self.marketplaces,
+            "regimes": self.regimes,
+            "margem_bruta_alvo": self.margem_bruta_alvo,
+            "margem_liquida_minima": self.margem_liquida_minima,
+            "percent_publicidade": self.percent_publicidade,
+            "custo_fixo_operacional": self.custo_fixo_operacional,
+            "taxa_devolucao": self.taxa_devolucao,
+            "modo_monetario": self.modo_monetario,
+            "arredondamento": self.arredondamento,
+            "tarifas_mercado_livre": tabela.vigente_desde.isoformat(),
+            "categorias": indice.impressao if indice is not None else None,
+        }).impressao
+    
+    def calcular_dataframe(self, df, marketplace, regime_tributario, registro=None, progresso=None, cache=None):
         """
         Calcula precificação para múltiplas linhas
         
         Args:
-            df: DataFrame com colunas: SKU, Descrição, Custo Produto, Frete, Preço Atual, Tipo de Anúncio (opcional)
+            df: DataFrame com colunas: SKU, Descrição, Custo Produto, Frete, Preço Atual e, opcionais,
+                Tipo de Anúncio, Peso (kg), Logística e Categoria
             marketplace: Marketplace selecionado
             regime_tributario: Regime tributário selecionado
+            registro: RegistroDesempenho opcional para medir as etapas
+            progresso: Callback opcional de progresso (ver tarefas.processar_em_blocos); se
+                informado, o cálculo é feito em blocos de linhas
+            cache: CacheResultados opcional; mesmos dados e premissas devolvem o resultado guardado
                 
         Returns:
             DataFrame com cálculos completos
         """
-        resultados = []
-        
-        for _, row in df.iterrows():
-            tipo_anuncio = row.get("Tipo de Anúncio", "")
-            
-            resultado = self.calcular_linha(
-                sku=row.get("SKU", ""),
-                descricao=row.get("Descrição", ""),
-                custo_produto=float(row.get("Custo Produto", 0) or 0),
-                frete=float(row.get("Frete", 0) or 0),
-                preco_atual=float(row.get("Preço Atual", 0) or 0),
-                marketplace=marketplace,
-                regime_tributario=regime_tributario,
-                tipo_anuncio=tipo_anuncio,
+        if cache is not None:
+            with medir(registro, "cache_resultados", len(df)) as medicao:
+                dados = hash_dados(df)
+                chave = (dados, self.impressao(marketplace, regime_tributario)) if dados is not None else None
+                resultado = cache.obter(chave) if chave is not None else None
+                medicao["acerto"] = resultado is not None
+            if resultado is not None:
+                if progresso is not None:
+                    progresso(len(df))
+                return resultado
+            resultado = self.calcular_dataframe(df, marketplace, regime_tributario, registro, progresso)
+            if chave is not None:
+                # Com camada em disco, volta o resultado aberto do arquivo (memory-map)
+                resultado = cache.guardar(chave, resultado)
+            return resultado
+        
+        with medir(registro, "calculo", len(df)):
+            df_resultado = processar_em_blocos(
+                df, lambda bloco: self._calcular_vetorizado(bloco, marketplace, regime_tributario), progresso
             )
-            resultados.append(resultado)
-        
-        df_resultado = pd.DataFrame(resultados)
         
         # Calcular Curva ABC se houver coluna de Quantidade Vendida
         if "Quantidade Vendida" in df.columns:
-            # Calcular faturamento (preco_atual * quantidade_vendida)
-            df_temp = df.copy()
-            df_temp['Faturamento'] = df_temp['Preço Atual'] * df_temp['Quantidade Vendida']
-            
-            # Calcular Curva ABC
-            curva_abc = self.calcular_curva_abc(df_temp)
-            df_resultado['Curva ABC'] = curva_abc['Curva ABC']
+            with medir(registro, "abc", len(df)):
+                # Calcular faturamento (preco_atual * quantidade_vendida)
+                df_temp = df.copy()
+                df_temp['Faturamento'] = df_temp['Preço Atual'] * df_temp['Quantidade Vendida']
+                
+                # Calcular Curva ABC
+                curva_abc = self.calcular_curva_abc(df_temp)
+                df_resultado['Curva ABC'] = curva_abc['Curva ABC']
+                # Quantidade e faturamento acompanham cada linha do resultado (ranking e Pareto
+                # do Dashboard não dependem de o relatório na sessão ser o mesmo do cálculo)
+                df_resultado['Quantidade Vendida'] = df['Quantidade Vendida'].to_numpy()
+                df_resultado['Faturamento'] = df_temp['Faturamento'].to_numpy(dtype=float)
         
         # Filtrar colunas baseado no marketplace
         colunas_exibir = self.obter_colunas_por_marketplace(marketplace)
         colunas_existentes = [col for col in colunas_exibir if col in df_resultado.columns]
         
         return df_resultado[colunas_existentes]
+    
+    def calcular_lote(self, df, marketplace, regime_tributario):
+        """
+        Calcula a precificação de um lote de linhas em uma passada, sem Curva ABC
+
+        Devolve todas as colunas de calcular_linha (sem o filtro por marketplace de
+        calcular_dataframe), para quem precisa do lucro de preços hipotéticos.
+        
+        Args:
+            df: DataFrame com colunas: SKU, Descrição, Custo Produto, Frete, Preço Atual e, opcionais,
+                Tipo de Anúncio, Peso (kg), Logística e Categoria
+            marketplace: Marketplace selecionado
+            regime_tributario: Regime tributário selecionado
+            
+        Returns:
+            DataFrame com uma linha calculada por linha de entrada, na mesma ordem
+        """
+        return self._calcular_vetorizado(df, marketplace, regime_tributario)
+    
+    def _calcular_vetorizado(self, df, marketplace, regime_tributario):
+        """
+        Versão vetorizada de calcular_linha para todas as linhas do DataFrame
+        
+        As faixas (Shopee, tarifas do Mercado Livre) são localizadas com
+        searchsorted e as configurações por tipo de anúncio com lookup em arrays.
+        
+        Args:
+            df: DataFrame com colunas: SKU, Descrição, Custo Produto, Frete, Preço Atual e, opcionais,
+                Tipo de Anúncio, Peso (kg), Logística e Categoria
+            marketplace: Marketplace selecionado
+            regime_tributario: Regime tributário selecionado
+            
+        Returns:
+            DataFrame com as mesmas colunas de calcular_linha
+        """
+        n = len(df)
+        preco = df["Preço Atual"].to_numpy(dtype=float) if "Preço Atual" in df.columns else np.zeros(n)
+        custo_produto = df["Custo Produto"].to_numpy(dtype=float) if "Custo Produto" in df.columns else np.zeros(n)
+        frete = df["Frete"].to_numpy(dtype=float) if "Frete" in df.columns else np.zeros(n)
+        tipo_anuncio = df["Tipo de Anúncio"] if "Tipo de Anúncio" in df.columns else pd.Series([""] * n, index=df.index)
+        
+        # Colunas de texto guardadas como (códigos, rótulos) e montadas como categóricas no final
+        zeros = np.zeros(n, dtype=np.intp)
+        tipo_exibicao = (zeros, ["N/A"])
+        faixa_taxa_fixa = (zeros, ["Nao aplicavel"])
+        faixa_shopee = (zeros, ["Nao aplicavel"])
+        taxa_fixa_cobrada = np.zeros(n, dtype=bool)
+        subsidio_pix_percent = np.zeros(n)
+        custo_operacional = np.zeros(n)
+        frete_ml = np.zeros(n)
+        
+        # Comissao e taxa fixa por marketplace
+        if marketplace == "Shopee":
+            faixa = self._faixas_shopee(preco)
+            comissao_percent = FAIXAS_SHOPEE["comissao_percent"][faixa]
+            taxa_fixa = FAIXAS_SHOPEE["comissao_fixa"][faixa]
+            subsidio_pix_percent = FAIXAS_SHOPEE["subsidio_pix_percent"][faixa]
+            faixa_shopee = (faixa, FAIXAS_SHOPEE["descricao"])
+        else:
+            # Configuração por tipo de anúncio (fatorado: poucos valores distintos)
+            codigos, tipos = pd.factorize(tipo_anuncio, use_na_sentinel=False)
+            tipos = [t if isinstance(t, str) else "" for t in tipos]
+            configs = [self.obter_config_marketplace(marketplace, t) for t in tipos]
+            comissao_percent = np.array([c.get("comissao", 0.0) for c in configs], dtype=float)[codigos]
+            taxa_fixa = np.array([c.get("custo_fixo", 0.0) for c in configs], dtype=float)[codigos]
+            if marketplace == "Mercado Livre":
+                tipo_exibicao = (codigos, [t if t else "Padrão" for t in tipos])
+        
+        # Tarifas do Mercado Livre pela tabela vigente (custo operacional/taxa fixa e frete grátis)
+        if marketplace == "Mercado Livre":
+            comissao_percent, custo_operacional, frete_ml, faixa_taxa_fixa = self._tarifas_mercado_livre(
+                preco, frete, comissao_percent,
+                df["Peso (kg)"].to_numpy(dtype=float) if "Peso (kg)" in df.columns else None,
+                df["Logística"] if "Logística" in df.columns else "",
+                df["Categoria"] if "Categoria" in df.columns else "",
+                tipo_anuncio,
+            )
+            if self.modo_monetario == "centavos":
+                custo_operacional = para_reais(para_centavos(custo_operacional, self.arredondamento))
+                frete_ml = para_reais(para_centavos(frete_ml, self.arredondamento))
+            taxa_fixa = custo_operacional + frete_ml
+            taxa_fixa_cobrada = taxa_fixa > 0
+        
+        impostos_percent = self.regimes.get(regime_tributario, {}).get("impostos_encargos", 0.0)
+        
+        if self.modo_monetario == "centavos":
+            valores = self._valores_em_centavos(
+                preco, custo_produto, frete, comissao_percent, taxa_fixa, impostos_percent, subsidio_pix_percent
+            )
+        else:
+            valores = self._valores_em_float(
+                preco, custo_produto, frete, comissao_percent, taxa_fixa, impostos_percent, subsidio_pix_percent
+            )
+        
+        lucro = valores["lucro"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margem_bruta = np.where(preco > 0, lucro / valores["preco"] * 100, 0.0)
+        
+        status = np.select(
+            [margem_bruta >= self.margem_bruta_alvo, margem_bruta >= self.margem_liquida_minima], [0, 1], default=2
+        )
+        
+        return pd.DataFrame({
+            "SKU ou MLB": df["SKU"].array if "SKU" in df.columns else [""] * n,
+            "Titulo": df["Descrição"].array if "Descrição" in df.columns else [""] * n,
+            "Tipo de Anuncio": self._categorico(*tipo_exibicao),
+            "Taxa Comissao %": comissao_percent * 100,
+            "Taxa Fixa R$": valores["taxa_fixa"],
+            "Taxa Fixa Cobrada": self._categorico(taxa_fixa_cobrada.astype(np.intp), ["Nao", "Sim"]),
+            "Faixa Taxa Fixa": self._categorico(*faixa_taxa_fixa),
+            "Faixa Shopee": self._categorico(*faixa_shopee),
+            "Subsidio Pix %": subsidio_pix_percent * 100,
+            "Subsidio Pix R$": valores["subsidio_pix"],
+            "Preco Atual (R$)": valores["preco"],
+            "Custo Produto": valores["custo_produto"],
+            "Frete": valores["frete"],
+            "Comissao R$": valores["comissao"],
+            "Custo Operacional R$": custo_operacional,
+            "Frete ML R$": frete_ml,
+            "Custo Fixo Op.": self.custo_fixo_operacional,
+            "Impostos": valores["impostos"],
+            "Publicidade": valores["publicidade"],
+            "Subsidio Pix (Credito)": valores["subsidio_pix"],
+            "Lucro R$": lucro,
+            "Margem Bruta %": margem_bruta,
+            "Margem Liquida %": margem_bruta,
+            "Status": self._categorico(status, ["🟢 Saudável", "🟡 Alerta", "🔴 Prejuízo"]),
+        })
+    
+    def _valores_em_float(self, preco, custo_produto, frete, comissao_percent, taxa_fixa, impostos_percent,
+                          subsidio_pix_percent):
+        """Valores monetários em float64 (mesma ordem de operações de calcular_linha)"""
+        comissao = preco * comissao_percent
+        impostos = preco * impostos_percent
+        publicidade = preco * (self.percent_publicidade / 100)
+        devolucoes = preco * (self.taxa_devolucao / 100)
+        subsidio_pix = preco * subsidio_pix_percent
+        lucro = (preco - custo_produto - frete - comissao - taxa_fixa - impostos - publicidade - devolucoes
+                 - (self.custo_fixo_operacional / 100 * preco) + subsidio_pix)
+        
+        return {
+            "preco": preco,
+            "custo_produto": custo_produto,
+            "frete": frete,
+            "comissao": comissao,
+            "taxa_fixa": taxa_fixa,
+            "impostos": impostos,
+            "publicidade": publicidade,
+            "subsidio_pix": subsidio_pix,
+            "lucro": lucro,
+        }
+    
+    def _valores_em_centavos(self, preco, custo_produto, frete, comissao_percent, taxa_fixa, impostos_percent,
+                             subsidio_pix_percent):
+        """
+        Valores monetários em centavos int64, com cada taxa arredondada ao centavo
+        
+        Returns:
+            Dict com os mesmos valores de _valores_em_float, convertidos de volta para R$
+        """
+        modo = self.arredondamento
+        preco_c = para_centavos(preco, modo)
+        custo_c = para_centavos(custo_produto, modo)
+        frete_c = para_centavos(frete, modo)
+        taxa_fixa_c = para_centavos(taxa_fixa, modo)
+        
+        comissao_c = aplicar_taxa(preco_c, comissao_percent, modo)
+        impostos_c = aplicar_taxa(preco_c, impostos_percent, modo)
+        publicidade_c = aplicar_taxa(preco_c, self.percent_publicidade / 100, modo)
+        devolucoes_c = aplicar_taxa(preco_c, self.taxa_devolucao / 100, modo)
+        custo_fixo_op_c = aplicar_taxa(preco_c, self.custo_fixo_operacional / 100, modo)
+        subsidio_pix_c = aplicar_taxa(preco_c, subsidio_pix_percent, modo)
+        
+        lucro_c = (preco_c - custo_c - frete_c - comissao_c - taxa_fixa_c - impostos_c - publicidade_c
+                   - devolucoes_c - custo_fixo_op_c + subsidio_pix_c)
+        
+        return {
+            "preco": para_reais(preco_c),
+            "custo_produto": para_reais(custo_c),
+            "frete": para_reais(frete_c),
+            "comissao": para_reais(comissao_c),
+            "taxa_fixa": para_reais(taxa_fixa_c),
+            "impostos": para_reais(impostos_c),
+            "publicidade": para_reais(publicidade_c),
+            "subsidio_pix": para_reais(subsidio_pix_c),
+            "lucro": para_reais(lucro_c),
+        }
+    
+    def _tarifas_mercado_livre(self, preco, frete, comissao_percent, peso=None, logistica="", categoria="",
+                               tipo_anuncio=""):
+        """
+        Estágio vetorizado das tarifas do Mercado Livre pela tabela vigente em data_tarifas
+        
+        Abaixo de R$ 79: custo operacional por peso (Full) ou taxa fixa (Flex); a partir
+        de R$ 79: frete grátis por peso (Full). O frete informado no relatório prevalece
+        sobre o da tabela, e a comissão da categoria (quando a tabela tiver) substitui a
+        do tipo de anúncio.
+        
+        Args:
+            preco: Array com os preços de venda
+            frete: Array com o frete do relatório
+            comissao_percent: Array com a comissão pelo tipo de anúncio
+            peso: Pesos em kg (escalar ou por linha; None = menor faixa)
+            logistica: "Full", "Flex" ou "" (= Full), escalar ou por linha
+            categoria: Categoria do produto, escalar ou por linha
+            tipo_anuncio: "Clássico" ou "Premium", escalar ou por linha
+            
+        Returns:
+            Tupla (comissão %, custo operacional, frete ML, (códigos, rótulos) da regra cobrada)
+        """
+        tabela = self.tabela_mercado_livre
+        entrada = TabelaTarifas.preparar(preco, peso, categoria, logistica, tipo_anuncio)
+        tarifas = tabela.calcular_preparado(entrada)
+        
+        _, especifica = tabela.comissoes_categorias(entrada["categorias"])
+        comissao_percent = np.where(especifica[entrada["categoria"]], tarifas["comissao_taxa"].to_numpy(),
+                                    comissao_percent)
+        
+        frete_ml = tarifas["frete"].to_numpy()
+        frete_informado = (frete > 0) & (frete_ml > 0)
+        frete_ml = np.where(frete_informado, 0.0, frete_ml)
+        
+        regra = tarifas["regra"].array
+        codigos = np.where(frete_informado, len(regra.categories), regra.codes)
+        rotulos = list(regra.categories) + ["Frete do relatório"]
+        return comissao_percent, tarifas["custo_operacional"].to_numpy(), frete_ml, (codigos, rotulos)
+    
+    @staticmethod
+    def _faixas_shopee(precos):
+        """
+        Índice da faixa Shopee de cada preço (len(SHOPEE_FAIXAS_PRECO) = não identificada)
+        
+        Args:
+            precos: Array com os preços de venda
+            
+        Returns:
+            Array int com o índice da faixa
+        """
+        minimos = FAIXAS_SHOPEE["min"]
+        maximos = FAIXAS_SHOPEE["max"]
+        faixa = np.searchsorted(maximos, precos, side="left")
+        dentro = (faixa < len(maximos)) & (precos >= minimos[np.minimum(faixa, len(maximos) - 1)])
+        return np.where(dentro, faixa, len(maximos))
+    
+    @staticmethod
+    def _categorico(codigos, rotulos):
+        """
+        Monta uma coluna categórica a partir de códigos, sem criar um texto por linha
+        
+        Args:
+            codigos: Array int com a posição do rótulo de cada linha
+            rotulos: Lista de rótulos (pode ter repetidos)
+            
+        Returns:
+            pd.Categorical apenas com os rótulos presentes
+        """
+        rotulos = np.asarray(rotulos, dtype=object)
+        presentes = np.bincount(codigos, minlength=len(rotulos)) > 0
+        categorias, inverso = np.unique(rotulos[presentes].astype(str), return_inverse=True)
+        mapa = np.full(len(rotulos), -1, dtype=np.intp)
+        mapa[presentes] = inverso
+        return pd.Categorical.from_codes(mapa[codigos], categories=categorias)
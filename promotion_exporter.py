@@ -9,9 +9,9 @@ import pandas as pd
 import numpy as np
 import unicodedata
 from io import BytesIO
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+
+from centavos import MEIO_PARA_CIMA, aplicar_taxa, para_centavos, para_reais
+from indice_bitmap import indice_de
 
 
 class PromotionExporter:
@@ -181,95 +181,58 @@ class PromotionExporter:
         
         return df_norm
     
-    def filtrar_por_categoria(self, df, categoria="oportunidade", margem_minima=15.0, margem_alvo=30.0):
+    def filtrar_por_categoria(self, df, categoria="oportunidade", margem_minima=15.0, margem_alvo=30.0, indice=None):
         """
         Filtra produtos por categoria (Curva ABC ou Oportunidades)
-        Sincronizado com a lógica do Dashboard principal
+        Sincronizado com a lógica do Dashboard principal (mesmo IndiceBitmap.oportunidades)
         
         Args:
             df: DataFrame com dados de produtos
             categoria: "oportunidade", "curva_a", "curva_b", "curva_c", "saudavel", "alerta", "prejuizo"
             margem_minima: Margem minima (DEPRECADO - usar margem_alvo + 5%)
             margem_alvo: Margem alvo configurada no dashboard (padrao 30%)
+            indice: IndiceBitmap do df (padrão: o do próprio df, ver indice_bitmap.indice_de)
             
         Returns:
             DataFrame filtrado
         """
-        df_filtrado = df.copy()
-        
-        # Debug: Verificar colunas disponíveis
-        colunas_disponiveis = df_filtrado.columns.tolist()
+        indice = indice or indice_de(df)
+        colunas_disponiveis = df.columns.tolist()
+        categoria = categoria.lower()
+        
+        # Coluna exigida por cada categoria e condição sobre o valor (avaliada uma vez por valor distinto)
+        condicoes = {
+            "curva_a": ("Curva ABC", lambda curva: "A" in curva.upper()),
+            "curva_b": ("Curva ABC", lambda curva: "B" in curva.upper()),
+            "curva_c": ("Curva ABC", lambda curva: "C" in curva.upper()),
+            "saudavel": ("Status", lambda status: "saudável" in status.lower() or "saudavel" in status.lower()),
+            "alerta": ("Status", lambda status: "alerta" in status.lower()),
+            "prejuizo": ("Status", lambda status: "prejuízo" in status.lower() or "prejuizo" in status.lower()),
+        }
         
-        if categoria.lower() == "oportunidade":
-            # Produtos de oportunidade (Curva B/C com margem 5% acima da alvo e saudaveis)
-            # EXATAMENTE como no Dashboard (linhas 1601-1603 do app.py)
-            
-            # Verificar se as colunas necessarias existem
+        if categoria == "oportunidade":
+            # Produtos de oportunidade (Curva B/C saudaveis), EXATAMENTE como no Dashboard
             if "Curva ABC" not in colunas_disponiveis or "Status" not in colunas_disponiveis:
-                return pd.DataFrame(columns=df_filtrado.columns)
-            
-            # Aplicar EXATAMENTE a mesma logica do Dashboard
-            df_filtrado = df_filtrado[
-                (df_filtrado["Curva ABC"].astype(str).str.contains("B", na=False) | 
-                 df_filtrado["Curva ABC"].astype(str).str.contains("C", na=False)) &
-                (df_filtrado["Status"] == "🟢 Saudavel")
-            ]
+                return pd.DataFrame(columns=df.columns)
+            bits = indice.oportunidades()
+        elif categoria in condicoes:
+            coluna, condicao = condicoes[categoria]
+            if coluna not in colunas_disponiveis:
+                return pd.DataFrame(columns=df.columns)
+            bits = indice.onde(coluna, condicao)
+        else:
+            bits = indice.todos()
         
-        elif categoria.lower() == "curva_a":
-            # Apenas Curva A
-            if "Curva ABC" in colunas_disponiveis:
-                df_filtrado = df_filtrado[df_filtrado["Curva ABC"].astype(str).str.contains("A", na=False, case=False)]
-            else:
-                return pd.DataFrame(columns=df_filtrado.columns)
-        
-        elif categoria.lower() == "curva_b":
-            # Apenas Curva B
-            if "Curva ABC" in colunas_disponiveis:
-                df_filtrado = df_filtrado[df_filtrado["Curva ABC"].astype(str).str.contains("B", na=False, case=False)]
-            else:
-                return pd.DataFrame(columns=df_filtrado.columns)
-        
-        elif categoria.lower() == "curva_c":
-            # Apenas Curva C
-            if "Curva ABC" in colunas_disponiveis:
-                df_filtrado = df_filtrado[df_filtrado["Curva ABC"].astype(str).str.contains("C", na=False, case=False)]
-            else:
-                return pd.DataFrame(columns=df_filtrado.columns)
-        
-        elif categoria.lower() == "saudavel":
-            # Produtos saudáveis
-            if "Status" in colunas_disponiveis:
-                status_col = df_filtrado["Status"].astype(str)
-                df_filtrado = df_filtrado[
-                    status_col.str.contains("Saudável", na=False, case=False) | \
-                    status_col.str.contains("Saudavel", na=False, case=False)
-                ]
-            else:
-                return pd.DataFrame(columns=df_filtrado.columns)
-        
-        elif categoria.lower() == "alerta":
-            # Produtos em alerta
-            if "Status" in colunas_disponiveis:
-                df_filtrado = df_filtrado[df_filtrado["Status"].astype(str).str.contains("Alerta", na=False, case=False)]
-            else:
-                return pd.DataFrame(columns=df_filtrado.columns)
-        
-        elif categoria.lower() == "prejuizo":
-            # Produtos em prejuízo
-            if "Status" in colunas_disponiveis:
-                df_filtrado = df_filtrado[df_filtrado["Status"].astype(str).str.contains("Prejuízo|Prejuizo", na=False, case=False)]
-            else:
-                return pd.DataFrame(columns=df_filtrado.columns)
-        
-        return df_filtrado.reset_index(drop=True)
+        return indice.filtrar(df, bits).reset_index(drop=True)
     
-    def mapear_dados_para_marketplace(self, df, desconto_percent=0.0):
+    def mapear_dados_para_marketplace(self, df, desconto_percent=0.0, arredondamento=MEIO_PARA_CIMA):
         """
         Mapeia dados do dashboard para o formato EXATO do marketplace
         
         Args:
             df: DataFrame com dados de produtos
             desconto_percent: Percentual de desconto a aplicar (ex: 0.05 para 5%)
+            arredondamento: Arredondamento do centavo (MEIO_PARA_CIMA ou BANCARIO)
             
         Returns:
             DataFrame formatado exatamente como o template do marketplace
@@ -277,8 +240,13 @@ class PromotionExporter:
         # Normalizar DataFrame para identificar colunas automaticamente
         df_norm = self._normalizar_dataframe(df)
         
-        # Calcular preço com desconto
-        df_norm["_preco_desconto"] = (df_norm["_preco_original"] * (1 - desconto_percent)).round(2)
+        # Preços em centavos inteiros: o desconto é arredondado uma única vez, como no marketplace
+        sem_preco = df_norm["_preco_original"].isna()
+        preco_centavos = para_centavos(df_norm["_preco_original"], arredondamento)
+        df_norm["_preco_original"] = np.where(sem_preco, np.nan, para_reais(preco_centavos))
+        df_norm["_preco_desconto"] = np.where(
+            sem_preco, np.nan, para_reais(aplicar_taxa(preco_centavos, 1 - desconto_percent, arredondamento))
+        )
         
         # Mapear para Mercado Livre
         if self.marketplace == "Mercado Livre":
@@ -354,6 +322,11 @@ class PromotionExporter:
         Returns:
             BytesIO com arquivo Excel
         """
+        # openpyxl só é necessário na exportação (importado sob demanda)
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+        from openpyxl.utils.dataframe import dataframe_to_rows
+        
         wb = Workbook()
         ws = wb.active
         ws.title = nome_sheet
@@ -0,0 +1,93 @@
+"""
+Consultas de ranking para o Dashboard: top-N por seleção parcial e curva de Pareto amostrada
+Em vez de ordenar o resultado inteiro, np.argpartition separa os N vencedores em tempo
+linear e só eles são ordenados. A curva de Pareto (faturamento acumulado x % de SKUs) é
+amostrada em um número fixo de pontos, então o gráfico tem o mesmo tamanho com 1 mil ou
+1 milhão de SKUs.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Consultas de top-N do Dashboard: nome -> (coluna, maiores primeiro)
+CONSULTAS_TOP = {
+    "Maior lucro": ("Lucro R$", True),
+    "Maior faturamento": ("Faturamento", True),
+    "Maior margem": ("Margem Bruta %", True),
+    "Maior prejuízo": ("Lucro R$", False),
+}
+
+# Pontos da curva de Pareto (além da origem)
+PONTOS_PARETO = 200
+
+
+def posicoes_top_n(valores, n, maiores=True, mascara=None):
+    """
+    Posições dos N maiores (ou menores) valores, já ordenadas
+
+    Valores NaN nunca entram no ranking. Empates saem na ordem das linhas.
+
+    Args:
+        valores: Array/Series numérico
+        n: Quantidade de posições
+        maiores: True para os maiores valores, False para os menores
+        mascara: Máscara booleana opcional das linhas candidatas (ex: IndiceBitmap.mascara)
+
+    Returns:
+        Array de posições (inteiros) com até n elementos
+    """
+    valores = np.asarray(valores, dtype=float)
+    # Posições candidatas (None = todas as linhas, sem cópia de índices)
+    candidatas = None if mascara is None else np.flatnonzero(mascara)
+    chave = valores if candidatas is None else valores[candidatas]
+    nulos = np.isnan(chave)
+    if nulos.any():
+        validas = np.flatnonzero(~nulos)
+        candidatas = validas if candidatas is None else candidatas[validas]
+        chave = chave[validas]
+    if maiores:
+        chave = -chave
+
+    n = min(int(n), len(chave))
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if n < len(chave):
+        # O corte é o N-ésimo valor; todas as linhas empatadas com ele concorrem (argpartition
+        # escolheria entre elas arbitrariamente) e a ordem das linhas desempata
+        corte = chave[np.argpartition(chave, n - 1)[n - 1]]
+        selecionadas = np.flatnonzero(chave <= corte)
+    else:
+        selecionadas = np.arange(len(chave))
+    # Só os vencedores (e os empatados no corte) são ordenados: valor, depois posição da linha
+    selecionadas = selecionadas[np.lexsort((selecionadas, chave[selecionadas]))][:n]
+    return selecionadas if candidatas is None else candidatas[selecionadas]
+
+
+def curva_pareto(faturamento, pontos=PONTOS_PARETO):
+    """
+    Curva de Pareto do faturamento em um número fixo de pontos
+
+    Os pontos são exatos (acumulado da ordenação completa), só a saída é amostrada: a
+    ordenação de floats do NumPy é vetorizada e custa menos que np.partition com centenas
+    de posições.
+
+    Args:
+        faturamento: Array/Series com o faturamento de cada SKU
+        pontos: Número de pontos da curva (além da origem)
+
+    Returns:
+        DataFrame com "% SKUs" e "% Faturamento" (acumulado, do maior para o menor SKU)
+    """
+    faturamento = np.nan_to_num(np.asarray(faturamento, dtype=float))
+    total = faturamento.sum()
+    if len(faturamento) == 0 or total <= 0:
+        return pd.DataFrame({"% SKUs": [0.0, 100.0], "% Faturamento": [0.0, 100.0]})
+
+    n = len(faturamento)
+    acumulado = np.cumsum(np.sort(faturamento)[::-1])
+    limites = np.unique(np.linspace(0, n, pontos + 1).round().astype(np.intp))[1:]
+    return pd.DataFrame({
+        "% SKUs": np.concatenate([[0.0], limites / n * 100]),
+        "% Faturamento": np.concatenate([[0.0], acumulado[limites - 1] / total * 100]),
+    })
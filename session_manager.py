@@ -3,27 +3,34 @@ Módulo para gerenciamento de estado da sessão Streamlit
 """
 
 import streamlit as st
-from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+from configuracao import MARKETPLACES_PADRAO, REGIMES_PADRAO
+from desempenho import RegistroDesempenho
+from memoria_sessao import DadosSessao
+from tarefas import ExecutorTarefas
 
 
 def inicializar_sessao():
     """Inicializa variáveis de sessão padrão."""
     
-    # Configurações de Marketplace
+    # Configurações de Marketplace e de Regime Tributário (congeladas: alterar cria uma cópia da sessão)
     if "marketplaces" not in st.session_state:
-        st.session_state.marketplaces = DEFAULT_MARKETPLACES.copy()
+        st.session_state.marketplaces = MARKETPLACES_PADRAO
     
-    # Configurações de Regime Tributário
     if "regimes" not in st.session_state:
-        st.session_state.regimes = DEFAULT_REGIMES.copy()
+        st.session_state.regimes = REGIMES_PADRAO
     
     # Dados da Base
     if "base_dados" not in st.session_state:
         st.session_state.base_dados = None
     
-    # Relatório de Vendas Mercado Livre
-    if "relatorio_vendas" not in st.session_state:
-        st.session_state.relatorio_vendas = None
+    # DataFrames da sessão (relatório de vendas, resultados, oportunidades, promoções) sob o
+    # orçamento de memória do processo: os menos usados vão para arquivos Arrow
+    if "dados" not in st.session_state:
+        st.session_state.dados = DadosSessao()
+    
+    # Vendas por (SKU, dia) para Curva ABC por janela de tempo
+    if "vendas_diarias" not in st.session_state:
+        st.session_state.vendas_diarias = None
     
     # Dados Processados (com Curva ABC)
     if "dados_processados" not in st.session_state:
@@ -61,6 +68,14 @@ def inicializar_sessao():
     if "taxa_devolucao" not in st.session_state:
         st.session_state.taxa_devolucao = 0.0
     
+    # Modo monetário da calculadora ("float" ou "centavos")
+    if "modo_monetario" not in st.session_state:
+        st.session_state.modo_monetario = "float"
+    
+    # Data de vigência das tarifas do Mercado Livre (None = hoje, ver tabelas_tarifas)
+    if "data_tarifas" not in st.session_state:
+        st.session_state.data_tarifas = None
+    
     # Descontos por Curva ABC
     if "desconto_curva_a" not in st.session_state:
         st.session_state.desconto_curva_a = 0.0
@@ -78,23 +93,35 @@ def inicializar_sessao():
     # Aba ativa
     if "aba_ativa" not in st.session_state:
         st.session_state.aba_ativa = "home"
+    
+    # Medições de desempenho por etapa (painel "Performance")
+    if "registro_desempenho" not in st.session_state:
+        st.session_state.registro_desempenho = RegistroDesempenho(limite=200)
+    
+    # Cálculos longos em segundo plano (calculadora, simulador, promoções)
+    if "executor_tarefas" not in st.session_state:
+        st.session_state.executor_tarefas = ExecutorTarefas()
 
 
 def resetar_sessao():
     """Reseta todas as variáveis de sessão."""
+    if "executor_tarefas" in st.session_state:
+        st.session_state.executor_tarefas.encerrar()
+    if "dados" in st.session_state:
+        st.session_state.dados.encerrar()
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     inicializar_sessao()
 
 
 def atualizar_marketplace(nome, config):
-    """Atualiza configuração de um marketplace."""
-    st.session_state.marketplaces[nome] = config
+    """Atualiza configuração de um marketplace (nova cópia, o padrão compartilhado não muda)."""
+    st.session_state.marketplaces = st.session_state.marketplaces.alterar(nome, config)
 
 
 def atualizar_regime(nome, config):
-    """Atualiza configuração de um regime tributário."""
-    st.session_state.regimes[nome] = config
+    """Atualiza configuração de um regime tributário (nova cópia, o padrão compartilhado não muda)."""
+    st.session_state.regimes = st.session_state.regimes.alterar(nome, config)
 
 
 def atualizar_regras_promocao(desconto_a, desconto_b, desconto_c):
@@ -0,0 +1,550 @@
+"""
+Registro versionado das tabelas de tarifas dos marketplaces
+Cada tabela vale a partir de uma data de vigência: a tabela de uma data é a última
+que entrou em vigor até ela (ex: regras de 2025 até 01/03/2026, novas regras do
+Mercado Livre a partir de 02/03/2026). As tabelas são compiladas uma única vez em
+arrays NumPy e mantidas em cache no processo, para consulta vetorizada do catálogo.
+"""
+
+import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    MERCADO_LIVRE_AD_TYPES,
+    MERCADO_LIVRE_TAXA_FIXA,
+    MERCADO_LIVRE_VIGENCIA_2026,
+    MERCADO_LIVRE_FAIXAS_PESO_2026,
+    MERCADO_LIVRE_CUSTO_OPERACIONAL_FULL_2026,
+    MERCADO_LIVRE_CUSTO_OPERACIONAL_LIVROS_2026,
+    MERCADO_LIVRE_CUSTO_OPERACIONAL_SUPERMERCADO_2026,
+    MERCADO_LIVRE_TAXA_FIXA_FLEX_2026,
+    MERCADO_LIVRE_FRETE_GRATIS_FULL_2026,
+    MERCADO_LIVRE_COMISSAO_CATEGORIA_2026,
+    MERCADO_LIVRE_REGRAS_CUSTO_FIXO,
+    MERCADO_LIVRE_LIMITE_CUSTO_FIXO_BAIXO,
+    MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_GERAL,
+    MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_SUPERMERCADO,
+    SHOPEE_FAIXAS_PRECO,
+)
+from indice_categorias import obter_indice
+
+
+# Início de vigência das tabelas de 2025 (as mais antigas do registro)
+VIGENCIA_2025 = "2025-01-01"
+
+# Grupos de custo e tipos de logística das tabelas
+GRUPOS_CUSTO = ("Geral", "Livros", "Supermercado")
+LOGISTICAS = ("Full", "Flex")
+
+# Colunas devolvidas por TabelaTarifas.calcular
+COLUNAS_TARIFAS = [
+    "comissao_taxa",
+    "comissao",
+    "custo_operacional",
+    "frete",
+    "subsidio_pix_taxa",
+    "subsidio_pix",
+    "custo_total",
+    "regra",
+]
+
+# Valor da coluna "regra" quando nenhuma tarifa fixa é cobrada
+SEM_TARIFA_FIXA = "Sem tarifa fixa"
+
+
+def _grupo_custo(categoria):
+    """Grupo da tabela de custo de uma categoria ("Livros", "Supermercado" ou "Geral")"""
+    categoria = str(categoria).lower()
+    if categoria == "livros":
+        return "Livros"
+    if categoria == "supermercado":
+        return "Supermercado"
+    return "Geral"
+
+
+def _logistica(valor):
+    """Normaliza o tipo de logística ("Flex" para Flex/Retirada/Própria, senão "Full")"""
+    valor = str(valor).lower()
+    if any(chave in valor for chave in ("flex", "própria", "propria", "retirada")):
+        return "Flex"
+    return "Full"
+
+
+def _codificar(valor, n):
+    """
+    Códigos e valores distintos de uma entrada escalar ou por linha
+
+    Args:
+        valor: Escalar (igual para todas as linhas) ou sequência com n valores
+        n: Número de linhas
+
+    Returns:
+        Tupla (array int com o código de cada linha, lista de valores distintos)
+    """
+    if np.ndim(valor) == 0:
+        return np.zeros(n, dtype=np.intp), [valor]
+    codigos, distintos = pd.factorize(pd.Series(valor, copy=False), use_na_sentinel=False)
+    return codigos, list(distintos)
+
+
+def _data(data):
+    """Converte data (date, datetime, Timestamp, texto ISO ou None = hoje) em datetime.date"""
+    if data is None:
+        return datetime.date.today()
+    return pd.Timestamp(data).date()
+
+
+class FaixasCompiladas:
+    """Tabela de valores por faixa de preço (e de peso) compilada em arrays"""
+
+    def __init__(self, tabela, campo="custo", descricao=""):
+        """
+        Compila a tabela
+
+        Args:
+            tabela: Lista de faixas de preço ({preco_min/min, preco_max/max, campo}) ou
+                dict {faixa de peso: lista de faixas} com os rótulos de MERCADO_LIVRE_FAIXAS_PESO_2026
+            campo: Chave do valor em cada faixa
+            descricao: Nome da regra (ex: "Custo operacional Full"), exibido na coluna "regra"
+        """
+        self.descricao = descricao
+        if isinstance(tabela, dict):
+            pesos_max = dict(MERCADO_LIVRE_FAIXAS_PESO_2026)
+            self.faixas_peso = list(tabela)
+            self.pesos_max = np.array([pesos_max[rotulo] for rotulo in tabela])
+            linhas = list(tabela.values())
+        else:
+            self.faixas_peso = ["Qualquer peso"]
+            self.pesos_max = np.array([np.inf])
+            linhas = [tabela]
+
+        faixas = linhas[0]
+        self.precos_min = np.array([f.get("preco_min", f.get("min")) for f in faixas], dtype=float)
+        self.precos_max = np.array([f.get("preco_max", f.get("max")) for f in faixas], dtype=float)
+        self.valores = np.array([[f[campo] for f in linha] for linha in linhas], dtype=float)
+        self.valores.setflags(write=False)
+
+    def fronteiras(self):
+        """
+        Pares de preços vizinhos em faixas diferentes (último preço da faixa, primeiro da seguinte)
+
+        Returns:
+            Lista de tuplas (preço abaixo da fronteira, preço acima da fronteira)
+        """
+        pares = []
+        for i, preco_max in enumerate(self.precos_max):
+            if not np.isfinite(preco_max):
+                continue
+            proximo = self.precos_min[i + 1] if i + 1 < len(self.precos_min) else None
+            acima = proximo if proximo is not None and proximo > preco_max else round(preco_max + 0.01, 2)
+            pares.append((float(preco_max), float(acima)))
+        return pares
+
+    def indices_preco(self, precos):
+        """
+        Índice da faixa de preço de cada preço (-1 = fora de todas as faixas)
+
+        Em faixas que se tocam (ex: 29 em "0-29" e "29-50") vale a primeira, como na busca linear.
+
+        Args:
+            precos: Array com os preços
+
+        Returns:
+            Array int com o índice da faixa
+        """
+        precos = np.asarray(precos, dtype=float)
+        faixa = np.searchsorted(self.precos_max, precos, side="left")
+        ultima = len(self.precos_max) - 1
+        dentro = (faixa <= ultima) & (precos >= self.precos_min[np.minimum(faixa, ultima)])
+        return np.where(dentro, faixa, -1)
+
+    def indices_peso(self, pesos):
+        """
+        Índice da faixa de peso de cada peso
+
+        Peso ausente ou <= 0 usa a primeira faixa; acima da última faixa usa a última.
+
+        Args:
+            pesos: Array com os pesos em kg
+
+        Returns:
+            Array int com o índice da faixa
+        """
+        pesos = np.asarray(pesos, dtype=float)
+        faixa = np.minimum(np.searchsorted(self.pesos_max, pesos, side="left"), len(self.pesos_max) - 1)
+        return np.where(pesos > 0, faixa, 0)
+
+    def consultar(self, precos, pesos=None):
+        """
+        Valor da tabela para cada preço/peso (0 fora das faixas de preço)
+
+        Args:
+            precos: Array com os preços
+            pesos: Array com os pesos em kg (opcional)
+
+        Returns:
+            Array float com os valores
+        """
+        faixa_preco = self.indices_preco(precos)
+        if pesos is None:
+            faixa_peso = np.zeros(len(faixa_preco), dtype=np.intp)
+        else:
+            faixa_peso = self.indices_peso(pesos)
+        valores = self.valores[faixa_peso, np.maximum(faixa_preco, 0)]
+        return np.where(faixa_preco >= 0, valores, 0.0)
+
+
+class TabelaTarifas:
+    """Tarifas de um marketplace vigentes a partir de uma data"""
+
+    def __init__(self, marketplace, vigente_desde, nome, comissoes=None, custo_operacional=None,
+                 frete=None, tetos=(), faixas_comissao=None, faixas_pix=None, indice_categorias=False):
+        """
+        Monta a tabela já compilada
+
+        Args:
+            marketplace: Nome do marketplace
+            vigente_desde: datetime.date de início da vigência
+            nome: Nome da tabela (ex: "Mercado Livre 2026")
+            comissoes: Dict {categoria: {"Clássico": taxa, "Premium": taxa}}; a chave "Geral" é o padrão
+            custo_operacional: Dict {(grupo de custo, logística): FaixasCompiladas}
+            frete: Dict {logística: FaixasCompiladas} do frete grátis
+            tetos: Tuplas (grupos, logísticas, abaixo_de, fração): o custo operacional de
+                preços abaixo de abaixo_de fica limitado a fração × preço
+            faixas_comissao: FaixasCompiladas com a comissão por faixa de preço (substitui comissoes)
+            faixas_pix: FaixasCompiladas com o subsídio Pix por faixa de preço
+            indice_categorias: Consulta a árvore de categorias (indice_categorias.obter_indice)
+                antes de comissoes, aceitando ID ou nome com herança da categoria pai
+        """
+        self.marketplace = marketplace
+        self.vigente_desde = vigente_desde
+        self.nome = nome
+        self.comissoes = comissoes or {}
+        self.custo_operacional = custo_operacional or {}
+        self.frete = frete or {}
+        self.tetos = tuple(tetos)
+        self.faixas_comissao = faixas_comissao
+        self.faixas_pix = faixas_pix
+        self.indice_categorias = indice_categorias
+
+    def __repr__(self):
+        return f"TabelaTarifas({self.nome!r}, vigente desde {self.vigente_desde:%d/%m/%Y})"
+
+    def fronteiras(self):
+        """
+        Fronteiras de faixa de preço de todas as tabelas (onde alguma tarifa muda)
+
+        Returns:
+            Lista ordenada de tuplas (preço abaixo, preço acima) sem repetições
+        """
+        tabelas = list(self.custo_operacional.values()) + list(self.frete.values())
+        tabelas += [t for t in (self.faixas_comissao, self.faixas_pix) if t is not None]
+        return sorted({par for tabela in tabelas for par in tabela.fronteiras()})
+
+    @staticmethod
+    def preparar(precos, pesos=None, categoria="Geral", logistica="Full", tipo_anuncio="Clássico"):
+        """
+        Normaliza as entradas de calcular (feito uma vez e reutilizado entre tabelas)
+
+        Args:
+            precos: Array/Series com os preços de venda
+            pesos: Pesos em kg (escalar ou por linha; opcional)
+            categoria: Categoria (escalar ou por linha)
+            logistica: "Full" ou "Flex" (escalar ou por linha)
+            tipo_anuncio: "Clássico" ou "Premium" (escalar ou por linha)
+
+        Returns:
+            Dict com os arrays normalizados
+        """
+        precos = np.nan_to_num(np.asarray(precos, dtype=float))
+        n = len(precos)
+        pesos = np.zeros(n) if pesos is None else np.broadcast_to(np.asarray(pesos, dtype=float), n)
+
+        # Uma normalização por valor distinto, não por linha
+        categorias, categorias_distintas = _codificar(categoria, n)
+        grupos = np.array([GRUPOS_CUSTO.index(_grupo_custo(c)) for c in categorias_distintas], dtype=np.intp)
+        logisticas, logisticas_distintas = _codificar(logistica, n)
+        eh_flex = np.array([_logistica(l) == "Flex" for l in logisticas_distintas], dtype=np.intp)
+        tipos, tipos_distintos = _codificar(tipo_anuncio, n)
+        eh_premium = np.array([str(t).lower() == "premium" for t in tipos_distintos], dtype=np.intp)
+
+        return {
+            "precos": precos,
+            "pesos": pesos,
+            "categoria": categorias,
+            "categorias": categorias_distintas,
+            "grupo": grupos[categorias],
+            "logistica": eh_flex[logisticas],
+            "premium": eh_premium[tipos],
+        }
+
+    def calcular(self, precos, pesos=None, categoria="Geral", logistica="Full", tipo_anuncio="Clássico"):
+        """
+        Calcula as tarifas do catálogo inteiro de uma vez
+
+        Args:
+            precos: Array/Series com os preços de venda
+            pesos: Pesos em kg (escalar ou por linha; ausente = menor faixa)
+            categoria: Categoria (escalar ou por linha); "Livros"/"Supermercado" usam tabelas próprias
+            logistica: "Full" ou "Flex" (escalar ou por linha)
+            tipo_anuncio: "Clássico" ou "Premium" (escalar ou por linha)
+
+        Returns:
+            DataFrame com as colunas de COLUNAS_TARIFAS
+        """
+        return self.calcular_preparado(self.preparar(precos, pesos, categoria, logistica, tipo_anuncio))
+
+    def comissoes_categorias(self, categorias):
+        """
+        Comissões Clássico/Premium de cada categoria distinta
+
+        Ordem de busca: árvore de categorias (se indice_categorias), comissoes da tabela
+        e, por fim, a comissão padrão ("Geral").
+
+        Args:
+            categorias: Lista de categorias distintas (ID ou nome)
+
+        Returns:
+            Tupla (array (k, 2) com as comissões, array bool indicando comissão própria da categoria)
+        """
+        padrao = self.comissoes["Geral"]
+        taxas = np.array([
+            [self.comissoes.get(c, padrao)["Clássico"], self.comissoes.get(c, padrao)["Premium"]]
+            for c in categorias
+        ], dtype=float).reshape(-1, 2)
+        especifica = np.array([c != "Geral" and c in self.comissoes for c in categorias], dtype=bool)
+
+        indice = obter_indice() if self.indice_categorias else None
+        if indice is not None and len(categorias):
+            posicoes = indice.posicoes(categorias)
+            na_arvore = indice.definida[posicoes]
+            taxas[na_arvore] = indice.comissoes[posicoes[na_arvore]]
+            especifica |= na_arvore
+        return taxas, especifica
+
+    def calcular_preparado(self, entrada):
+        """
+        Calcula as tarifas a partir da entrada de preparar
+
+        Args:
+            entrada: Dict devolvido por preparar
+
+        Returns:
+            DataFrame com as colunas de COLUNAS_TARIFAS
+        """
+        precos = entrada["precos"]
+        pesos = entrada["pesos"]
+        n = len(precos)
+
+        if self.faixas_comissao is not None:
+            comissao_taxa = self.faixas_comissao.consultar(precos)
+        else:
+            taxas, _ = self.comissoes_categorias(entrada["categorias"])
+            comissao_taxa = taxas[entrada["categoria"], entrada["premium"]]
+
+        # Uma consulta por combinação (grupo, logística) presente no catálogo
+        custo_operacional = np.zeros(n)
+        frete = np.zeros(n)
+        regra = np.zeros(n, dtype=np.intp)
+        regras = [SEM_TARIFA_FIXA]
+        combinacao = entrada["grupo"] * len(LOGISTICAS) + entrada["logistica"]
+        for codigo in np.flatnonzero(np.bincount(combinacao, minlength=len(GRUPOS_CUSTO) * len(LOGISTICAS))):
+            grupo, logistica = GRUPOS_CUSTO[codigo // len(LOGISTICAS)], LOGISTICAS[codigo % len(LOGISTICAS)]
+            linhas = np.flatnonzero(combinacao == codigo)
+
+            tabela = self.custo_operacional.get((grupo, logistica))
+            if tabela is not None:
+                custo = tabela.consultar(precos[linhas], pesos[linhas])
+                for grupos_teto, logisticas_teto, abaixo_de, fracao in self.tetos:
+                    if grupo in grupos_teto and logistica in logisticas_teto:
+                        limitar = precos[linhas] < abaixo_de
+                        custo = np.where(limitar, np.minimum(custo, precos[linhas] * fracao), custo)
+                custo_operacional[linhas] = custo
+                regra[linhas[custo > 0]] = self._codigo_regra(regras, tabela.descricao)
+
+            tabela_frete = self.frete.get(logistica)
+            if tabela_frete is not None:
+                valor_frete = tabela_frete.consultar(precos[linhas], pesos[linhas])
+                frete[linhas] = valor_frete
+                regra[linhas[valor_frete > 0]] = self._codigo_regra(regras, tabela_frete.descricao)
+
+        if self.faixas_pix is not None:
+            subsidio_pix_taxa = self.faixas_pix.consultar(precos)
+        else:
+            subsidio_pix_taxa = np.zeros(n)
+
+        comissao = precos * comissao_taxa
+        subsidio_pix = precos * subsidio_pix_taxa
+        return pd.DataFrame({
+            "comissao_taxa": comissao_taxa,
+            "comissao": comissao,
+            "custo_operacional": custo_operacional,
+            "frete": frete,
+            "subsidio_pix_taxa": subsidio_pix_taxa,
+            "subsidio_pix": subsidio_pix,
+            "custo_total": comissao + custo_operacional + frete - subsidio_pix,
+            "regra": pd.Categorical.from_codes(regra, categories=regras),
+        })
+
+    @staticmethod
+    def _codigo_regra(regras, descricao):
+        """Posição da descrição na lista de regras (acrescentada se ainda não estiver)"""
+        if descricao not in regras:
+            regras.append(descricao)
+        return regras.index(descricao)
+
+
+def _mercado_livre_2025():
+    """Taxa fixa por faixa de preço até R$ 79, igual para qualquer peso e logística"""
+    comuns = FaixasCompiladas(MERCADO_LIVRE_TAXA_FIXA["Produtos Comuns"], "taxa_fixa", "Taxa fixa")
+    livros = FaixasCompiladas(MERCADO_LIVRE_TAXA_FIXA["Livros"], "taxa_fixa", "Taxa fixa")
+    tipos = {tipo: config["comissao"] for tipo, config in MERCADO_LIVRE_AD_TYPES.items()}
+    return dict(
+        nome="Mercado Livre 2025",
+        comissoes={"Geral": tipos},
+        custo_operacional={
+            (grupo, logistica): livros if grupo == "Livros" else comuns
+            for grupo in GRUPOS_CUSTO for logistica in LOGISTICAS
+        },
+    )
+
+
+def _mercado_livre_2026():
+    """Custo operacional por peso (Full), taxa fixa Flex e frete grátis por peso a partir de R$ 79"""
+    full = {
+        "Geral": FaixasCompiladas(MERCADO_LIVRE_CUSTO_OPERACIONAL_FULL_2026, descricao="Custo operacional Full"),
+        "Livros": FaixasCompiladas(MERCADO_LIVRE_CUSTO_OPERACIONAL_LIVROS_2026, descricao="Custo operacional Full"),
+        "Supermercado": FaixasCompiladas(MERCADO_LIVRE_CUSTO_OPERACIONAL_SUPERMERCADO_2026,
+                                        descricao="Custo operacional Full"),
+    }
+    flex = {
+        "Geral": FaixasCompiladas(MERCADO_LIVRE_TAXA_FIXA_FLEX_2026["Geral"], "taxa_fixa", "Taxa fixa Flex"),
+        "Livros": FaixasCompiladas(MERCADO_LIVRE_TAXA_FIXA_FLEX_2026["Livros"], "taxa_fixa", "Taxa fixa Flex"),
+    }
+    flex["Supermercado"] = flex["Geral"]
+
+    comissoes = {"Geral": {"Clássico": 0.14, "Premium": 0.19}}
+    for categoria, taxas in MERCADO_LIVRE_COMISSAO_CATEGORIA_2026.items():
+        comissoes[categoria] = {"Clássico": taxas["classico"], "Premium": taxas["premium"]}
+
+    regras = MERCADO_LIVRE_REGRAS_CUSTO_FIXO
+    return dict(
+        nome="Mercado Livre 2026",
+        comissoes=comissoes,
+        indice_categorias=True,
+        custo_operacional={
+            **{(grupo, "Full"): tabela for grupo, tabela in full.items()},
+            **{(grupo, "Flex"): tabela for grupo, tabela in flex.items()},
+        },
+        frete={"Full": FaixasCompiladas(MERCADO_LIVRE_FRETE_GRATIS_FULL_2026, descricao="Frete grátis Full")},
+        tetos=(
+            (GRUPOS_CUSTO, ("Full",), MERCADO_LIVRE_LIMITE_CUSTO_FIXO_BAIXO, regras["abaixo_12_50"]),
+            (("Geral", "Livros"), ("Full",), MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_GERAL, regras["abaixo_19_geral"]),
+            (("Supermercado",), ("Full",), MERCADO_LIVRE_LIMITE_CUSTO_OPERACIONAL_SUPERMERCADO,
+             regras["abaixo_29_supermercado"]),
+        ),
+    )
+
+
+def _shopee_2025():
+    """Comissão percentual + fixa e subsídio Pix por faixa de preço"""
+    comissao_fixa = FaixasCompiladas(SHOPEE_FAIXAS_PRECO, "comissao_fixa", "Comissão fixa")
+    return dict(
+        nome="Shopee 2025",
+        faixas_comissao=FaixasCompiladas(SHOPEE_FAIXAS_PRECO, "comissao_percent"),
+        custo_operacional={(grupo, logistica): comissao_fixa for grupo in GRUPOS_CUSTO for logistica in LOGISTICAS},
+        faixas_pix=FaixasCompiladas(SHOPEE_FAIXAS_PRECO, "subsidio_pix_percent"),
+    )
+
+
+# Construtor da tabela de cada marketplace por início de vigência (AAAA-MM-DD)
+VIGENCIAS = {
+    "Mercado Livre": {
+        VIGENCIA_2025: _mercado_livre_2025,
+        MERCADO_LIVRE_VIGENCIA_2026: _mercado_livre_2026,
+    },
+    "Shopee": {
+        VIGENCIA_2025: _shopee_2025,
+    },
+}
+
+
+def listar_vigencias(marketplace):
+    """
+    Lista as datas de início de vigência registradas para o marketplace
+
+    Args:
+        marketplace: Nome do marketplace
+
+    Returns:
+        Lista ordenada de datetime.date
+    """
+    if marketplace not in VIGENCIAS:
+        raise ValueError(
+            f"Marketplace '{marketplace}' sem tabela de tarifas. Disponíveis: {', '.join(VIGENCIAS)}"
+        )
+    return sorted(_data(inicio) for inicio in VIGENCIAS[marketplace])
+
+
+@lru_cache(maxsize=None)
+def _compilar(marketplace, vigente_desde):
+    """Compila a tabela de uma vigência (uma vez por processo)"""
+    construtor = VIGENCIAS[marketplace][vigente_desde.isoformat()]
+    return TabelaTarifas(marketplace, vigente_desde, **construtor())
+
+
+def obter_tabela(marketplace, data=None):
+    """
+    Retorna a tabela de tarifas vigente na data (compilada e em cache)
+
+    Args:
+        marketplace: Nome do marketplace
+        data: Data da precificação (date, Timestamp ou "AAAA-MM-DD"; None = hoje)
+
+    Returns:
+        TabelaTarifas vigente
+    """
+    data = _data(data)
+    vigentes = [inicio for inicio in listar_vigencias(marketplace) if inicio <= data]
+    if not vigentes:
+        raise ValueError(f"Nenhuma tabela de '{marketplace}' vigente em {data:%d/%m/%Y}")
+    return _compilar(marketplace, vigentes[-1])
+
+
+def comparar_tabelas(precos, marketplace, data_a, data_b=None, pesos=None, categoria="Geral",
+                     logistica="Full", tipo_anuncio="Clássico"):
+    """
+    Calcula as tarifas do catálogo sob duas vigências, lado a lado
+
+    As entradas são normalizadas uma única vez e consultadas nas duas tabelas.
+
+    Args:
+        precos: Array/Series com os preços de venda
+        marketplace: Nome do marketplace
+        data_a: Data da tabela de referência
+        data_b: Data da tabela comparada (None = hoje)
+        pesos: Pesos em kg (escalar ou por linha; opcional)
+        categoria: Categoria (escalar ou por linha)
+        logistica: "Full" ou "Flex" (escalar ou por linha)
+        tipo_anuncio: "Clássico" ou "Premium" (escalar ou por linha)
+
+    Returns:
+        DataFrame com as colunas de COLUNAS_TARIFAS sufixadas com "_a" e "_b" e a
+        "diferenca" de custo total (b - a); os nomes das tabelas ficam em attrs
+    """
+    tabela_a = obter_tabela(marketplace, data_a)
+    tabela_b = obter_tabela(marketplace, data_b)
+    entrada = TabelaTarifas.preparar(precos, pesos, categoria, logistica, tipo_anuncio)
+
+    tarifas_a = tabela_a.calcular_preparado(entrada)
+    tarifas_b = tabela_b.calcular_preparado(entrada)
+    comparacao = pd.concat([tarifas_a.add_suffix("_a"), tarifas_b.add_suffix("_b")], axis=1)
+    comparacao["diferenca"] = tarifas_b["custo_total"] - tarifas_a["custo_total"]
+    if isinstance(precos, pd.Series):
+        comparacao.index = precos.index
+    comparacao.attrs["tabela_a"] = tabela_a.nome
+    comparacao.attrs["tabela_b"] = tabela_b.nome
+    return comparacao
@@ -0,0 +1,236 @@
+"""
+Execução de cálculos longos em segundo plano, por sessão
+Cada sessão do Streamlit tem um ExecutorTarefas com uma thread: a tarefa processa o
+catálogo em blocos, publica o progresso (linhas concluídas, ETA) e pode ser cancelada
+entre um bloco e outro. O resultado é copiado para o st.session_state na próxima
+execução do script (coletar), pois a thread não tem acesso ao estado da sessão.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+logger = logging.getLogger(__name__)
+
+# Linhas por bloco: granularidade do progresso e do cancelamento
+TAMANHO_BLOCO = 50_000
+
+# Abaixo deste número de linhas o cálculo roda direto no script (mais rápido que acompanhar)
+LIMITE_LINHAS_SINCRONO = 20_000
+
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+CANCELADA = "cancelada"
+ERRO = "erro"
+
+
+class TarefaCancelada(Exception):
+    """Levantada no callback de progresso quando a tarefa foi cancelada"""
+
+
+def concatenar_blocos(partes):
+    """
+    Concatena os resultados dos blocos preservando as colunas categóricas
+
+    Args:
+        partes: Lista de DataFrames com as mesmas colunas
+
+    Returns:
+        DataFrame único com índice 0..n-1
+    """
+    if len(partes) == 1:
+        return partes[0].reset_index(drop=True)
+    df = pd.concat(partes, ignore_index=True)
+    for coluna in df.columns:
+        if all(isinstance(parte[coluna].dtype, pd.CategoricalDtype) for parte in partes):
+            df[coluna] = union_categoricals([parte[coluna] for parte in partes])
+    return df
+
+
+def processar_em_blocos(df, funcao, progresso=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Aplica a função a blocos de linhas do DataFrame e junta os resultados
+
+    Args:
+        df: DataFrame de entrada
+        funcao: Função DataFrame -> DataFrame, linha a linha (sem dependência entre blocos)
+        progresso: Callback opcional chamado com o nº de linhas de cada bloco concluído
+            (pode levantar TarefaCancelada)
+        tamanho_bloco: Linhas por bloco
+
+    Returns:
+        DataFrame com os resultados na ordem das linhas
+    """
+    if progresso is None or len(df) <= tamanho_bloco:
+        resultado = funcao(df)
+        if progresso is not None:
+            progresso(len(df))
+        return resultado
+    partes = []
+    for inicio in range(0, len(df), tamanho_bloco):
+        bloco = df.iloc[inicio:inicio + tamanho_bloco]
+        partes.append(funcao(bloco))
+        progresso(len(bloco))
+    return concatenar_blocos(partes)
+
+
+class Tarefa:
+    """Uma execução em segundo plano com progresso, ETA e cancelamento."""
+
+    def __init__(self, chave, funcao, total, destino=None, descricao=""):
+        """
+        Args:
+            chave: Identificador da tarefa na sessão (ex: "calculadora")
+            funcao: Função que recebe o callback progresso (argumento nomeado) e retorna o resultado
+            total: Total de linhas a processar (para o progresso)
+            destino: Chave do st.session_state que recebe o resultado (None = nenhuma)
+            descricao: Texto exibido no acompanhamento
+        """
+        self.chave = chave
+        self.funcao = funcao
+        self.total = max(int(total), 1)
+        self.destino = destino
+        self.descricao = descricao
+        self.concluidas = 0
+        self.estado = EXECUTANDO
+        self.resultado = None
+        self.erro = None
+        self.inicio = time.perf_counter()
+        self.fim = None
+        self.coletada = False
+        self._cancelar = threading.Event()
+
+    def __repr__(self):
+        return f"Tarefa({self.chave!r}, {self.estado}, {self.concluidas}/{self.total})"
+
+    @property
+    def ativa(self):
+        return self.estado == EXECUTANDO
+
+    @property
+    def progresso(self):
+        """Fração concluída (0 a 1)"""
+        return min(self.concluidas / self.total, 1.0)
+
+    @property
+    def segundos(self):
+        """Tempo decorrido (ou total, se terminou)"""
+        return (self.fim or time.perf_counter()) - self.inicio
+
+    @property
+    def eta(self):
+        """Segundos estimados até o fim pela velocidade até agora (None antes do primeiro bloco)"""
+        if not self.ativa or self.concluidas == 0:
+            return None
+        return self.segundos / self.concluidas * (self.total - self.concluidas)
+
+    def cancelar(self):
+        """Pede o cancelamento; a tarefa para ao fim do bloco em andamento"""
+        self._cancelar.set()
+
+    def _avancar(self, linhas):
+        """Callback de progresso passado à função"""
+        self.concluidas += linhas
+        if self._cancelar.is_set():
+            raise TarefaCancelada(self.chave)
+
+    def executar(self):
+        """Executa a tarefa na thread atual e registra o estado final"""
+        try:
+            if self._cancelar.is_set():
+                raise TarefaCancelada(self.chave)
+            self.resultado = self.funcao(progresso=self._avancar)
+            self.concluidas = self.total
+            self.estado = CONCLUIDA
+        except TarefaCancelada:
+            self.estado = CANCELADA
+        except Exception as e:
+            logger.exception("Falha na tarefa %s", self.chave)
+            self.erro = e
+            self.estado = ERRO
+        finally:
+            self.fim = time.perf_counter()
+        return self
+
+
+class ExecutorTarefas:
+    """Executor de tarefas de uma sessão (uma tarefa por chave)."""
+
+    def __init__(self, max_workers=1):
+        """
+        Args:
+            max_workers: Threads da sessão (1 = tarefas enfileiradas, uma por vez)
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tarefa")
+        self.tarefas = {}
+
+    def iniciar(self, chave, funcao, total, destino=None, descricao="", em_segundo_plano=True):
+        """
+        Inicia uma tarefa, cancelando a anterior com a mesma chave
+
+        Args:
+            chave: Identificador da tarefa (ex: "calculadora")
+            funcao: Função que recebe o callback progresso (argumento nomeado) e retorna o resultado
+            total: Total de linhas a processar
+            destino: Chave do st.session_state que recebe o resultado
+            descricao: Texto exibido no acompanhamento
+            em_segundo_plano: Se False, executa já, na thread atual
+
+        Returns:
+            Tarefa
+        """
+        anterior = self.tarefas.get(chave)
+        if anterior is not None and anterior.ativa:
+            anterior.cancelar()
+        tarefa = Tarefa(chave, funcao, total, destino, descricao)
+        self.tarefas[chave] = tarefa
+        if em_segundo_plano:
+            self._executor.submit(tarefa.executar)
+        else:
+            tarefa.executar()
+        return tarefa
+
+    def tarefa(self, chave):
+        """Tarefa mais recente com a chave (ou None)"""
+        return self.tarefas.get(chave)
+
+    def ativas(self):
+        """Tarefas ainda em execução"""
+        return [tarefa for tarefa in self.tarefas.values() if tarefa.ativa]
+
+    def cancelar(self, chave):
+        """Cancela a tarefa com a chave, se estiver em execução"""
+        tarefa = self.tarefas.get(chave)
+        if tarefa is not None and tarefa.ativa:
+            tarefa.cancelar()
+
+    def coletar(self, estado):
+        """
+        Copia para o estado da sessão os resultados das tarefas concluídas desde a última coleta
+
+        Args:
+            estado: st.session_state (ou dict)
+
+        Returns:
+            Lista das tarefas terminadas nesta coleta (concluídas, canceladas ou com erro)
+        """
+        terminadas = []
+        for tarefa in self.tarefas.values():
+            if tarefa.ativa or tarefa.coletada:
+                continue
+            if tarefa.estado == CONCLUIDA and tarefa.destino:
+                estado[tarefa.destino] = tarefa.resultado
+            tarefa.coletada = True
+            terminadas.append(tarefa)
+        return terminadas
+
+    def encerrar(self):
+        """Cancela as tarefas em andamento e libera a thread (fim da sessão)"""
+        for tarefa in self.ativas():
+            tarefa.cancelar()
+        self._executor.shutdown(wait=False, cancel_futures=True)
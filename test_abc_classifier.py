@@ -0,0 +1,74 @@
+"""
+Testes da Curva ABC (classificação vetorizada e janelas de tempo)
+"""
+
+import numpy as np
+import pandas as pd
+
+from abc_classifier import VendasDiarias, classificar_faturamento
+from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+from pricing_calculator_v2 import PricingCalculatorV2
+
+
+def test_classificar_faturamento_mantem_ordem():
+    """A curva volta na ordem original das linhas, não na ordem do faturamento"""
+    curva = classificar_faturamento([5.0, 800.0, 100.0, 95.0])
+    
+    assert curva.tolist() == ["C", "A", "B", "C"]
+    assert classificar_faturamento([0.0, 0.0]).tolist() == ["C", "C"]
+
+
+def test_curva_abc_calculadora_alinhada_ao_sku():
+    """Na calculadora, o SKU de maior faturamento fica na Curva A"""
+    df = pd.DataFrame({
+        "SKU": ["BAIXO", "ALTO", "MEDIO"],
+        "Descrição": ["Baixo", "Alto", "Médio"],
+        "Custo Produto": [10.0, 10.0, 10.0],
+        "Frete": [0.0, 0.0, 0.0],
+        "Preço Atual": [50.0, 50.0, 50.0],
+        "Quantidade Vendida": [1, 100, 90],
+    })
+    
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    resultado = calculadora.calcular_dataframe(df, "Shopee", "Simples Nacional")
+    curva = dict(zip(resultado["SKU ou MLB"], resultado["Curva ABC"]))
+    
+    assert curva["ALTO"] == "A"
+    assert curva["BAIXO"] == "C"
+
+
+def test_vendas_diarias_janelas():
+    """O faturamento por janela com somas prefixadas bate com o filtro por data"""
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        "SKU": rng.choice([f"SKU{i}" for i in range(40)], n),
+        "Data": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 100, n), unit="D"),
+        "Quantidade Vendida": rng.integers(1, 5, n),
+        "Preço Atual": rng.uniform(10, 200, n).round(2),
+    })
+    vendas = VendasDiarias.de_dataframe(df)
+    
+    for dias in (None, 7, 30, 90):
+        recorte = df if dias is None else df[df["Data"] > df["Data"].max() - pd.Timedelta(days=dias)]
+        esperado = (recorte["Preço Atual"] * recorte["Quantidade Vendida"]).groupby(recorte["SKU"]).sum()
+        obtido = vendas.faturamento_por_sku(dias)
+        
+        np.testing.assert_allclose(obtido.reindex(esperado.index), esperado)
+        assert obtido.drop(esperado.index).eq(0).all()
+
+
+def test_vendas_diarias_data_final():
+    """A janela pode terminar em qualquer dia, inclusive antes das vendas"""
+    df = pd.DataFrame({
+        "SKU": ["A", "A", "B"],
+        "Data": pd.to_datetime(["2026-03-01", "2026-03-10", "2026-03-05"]),
+        "Quantidade Vendida": [1, 1, 1],
+        "Preço Atual": [100.0, 10.0, 50.0],
+    })
+    vendas = VendasDiarias.de_dataframe(df)
+    
+    assert vendas.faturamento_por_sku(7, data_final="2026-03-06").tolist() == [100.0, 50.0]
+    assert vendas.faturamento_por_sku(3).tolist() == [10.0, 0.0]
+    assert vendas.faturamento_por_sku(7, data_final="2026-02-01").tolist() == [0.0, 0.0]
+    assert vendas.classificar().tolist() == ["A", "C"]
@@ -0,0 +1,95 @@
+"""
+Testes do cache de resultados compartilhado entre sessões
+"""
+
+import os
+
+import pandas as pd
+
+from cache_resultados import CacheResultados, hash_dados
+from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+from configuracao import MARKETPLACES_PADRAO
+from memoria_sessao import DadosSessao, GerenciadorMemoria, arquivo_mapeado
+from pricing_calculator_v2 import PricingCalculatorV2
+from test_pricing_calculator_v2 import gerar_relatorio
+
+
+def test_hash_dados_pelo_conteudo():
+    """O hash depende só do conteúdo: mesma tabela em outro objeto/índice dá o mesmo hash"""
+    df = gerar_relatorio(1_000)
+    copia = df.copy()
+    copia.index = copia.index + 10
+
+    assert hash_dados(df) == hash_dados(copia)
+    copia.loc[copia.index[5], "Preço Atual"] += 0.01
+    assert hash_dados(df) != hash_dados(copia)
+    assert hash_dados(df.iloc[1:]) != hash_dados(df.iloc[:-1])
+
+
+def test_calculo_em_cache_entre_sessoes():
+    """Outra sessão com os mesmos dados e premissas recebe o resultado guardado; premissas diferentes recalculam"""
+    cache = CacheResultados(limite_mb=64)
+    df = gerar_relatorio(2_000)
+    sessao_a = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    sessao_b = PricingCalculatorV2(MARKETPLACES_PADRAO, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    sessao_c = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 35.0, 10.0, 3.0)
+
+    original = sessao_a.calcular_dataframe(df, "Shopee", "Simples Nacional", cache=cache)
+    reaproveitado = sessao_b.calcular_dataframe(df.copy(), "Shopee", "Simples Nacional", cache=cache)
+    assert cache.acertos_memoria == 1
+    pd.testing.assert_frame_equal(reaproveitado, original)
+
+    # Alterar o resultado de uma sessão não altera o cache
+    reaproveitado["Lucro R$"] = 0.0
+    assert (sessao_b.calcular_dataframe(df, "Shopee", "Simples Nacional", cache=cache)["Lucro R$"] != 0).any()
+
+    sessao_c.calcular_dataframe(df, "Shopee", "Simples Nacional", cache=cache)
+    assert cache.falhas == 2 and len(cache) == 2
+
+
+def test_descarte_por_tamanho_e_camada_em_disco(tmp_path):
+    """A memória descarta os menos usados acima do limite; o disco devolve o resultado após reiniciar"""
+    df = gerar_relatorio(20_000)
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    resultado = calculadora.calcular_dataframe(df, "Mercado Livre", "Simples Nacional")
+    megas = resultado.memory_usage(deep=True).sum() / 1024 / 1024
+
+    cache = CacheResultados(limite_mb=megas * 1.5, diretorio=str(tmp_path))
+    cache.guardar(("a", "x"), resultado)
+    cache.guardar(("b", "x"), resultado)
+    assert len(cache) == 1 and cache.descartes_memoria == 1 and cache.descartes_disco == 0
+
+    reiniciado = CacheResultados(limite_mb=megas * 1.5, diretorio=str(tmp_path))
+    pd.testing.assert_frame_equal(reiniciado.obter(("a", "x")), resultado)
+    ocupacao = reiniciado.ocupacao().set_index("Camada")
+    assert ocupacao["Entradas"].tolist() == [1, 2]
+    assert reiniciado.acertos_disco == 1
+
+    # Limite de disco menor que dois resultados: o arquivo mais antigo sai e conta como descarte do disco
+    pequeno = CacheResultados(limite_mb=megas * 4, diretorio=str(tmp_path), limite_disco_mb=megas * 1.5)
+    pequeno.guardar(("c", "x"), resultado)
+    assert len(os.listdir(tmp_path)) == 1
+    assert pequeno.descartes_disco == 2 and pequeno.descartes_memoria == 0
+
+
+def test_resultado_em_arquivo_mapeado_compartilhado(tmp_path):
+    """O resultado é gravado uma vez; as sessões recebem DataFrames mapeados do mesmo arquivo, fora do orçamento"""
+    cache = CacheResultados(limite_mb=64, diretorio=str(tmp_path / "resultados"))
+    gerenciador = GerenciadorMemoria(orcamento_mb=0, diretorio=str(tmp_path / "sessoes"))
+    df = gerar_relatorio(5_000)
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    esperado = calculadora.calcular_dataframe(df, "Mercado Livre", "Simples Nacional")
+
+    sessoes = [DadosSessao(gerenciador) for _ in range(2)]
+    for dados in sessoes:
+        dados["resultado_calculadora"] = calculadora.calcular_dataframe(
+            df, "Mercado Livre", "Simples Nacional", cache=cache
+        )
+
+    a, b = (dados["resultado_calculadora"] for dados in sessoes)
+    assert arquivo_mapeado(a) is not None and arquivo_mapeado(a) == arquivo_mapeado(b)
+    assert os.listdir(tmp_path / "resultados") == [os.path.basename(arquivo_mapeado(a))]
+    pd.testing.assert_frame_equal(a, esperado)
+    # Páginas do arquivo compartilhado: nada a despejar nem gravar na pasta das sessões
+    assert gerenciador.despejos == 0 and os.listdir(tmp_path / "sessoes") == []
+    assert gerenciador.bytes_memoria == 0 and gerenciador.bytes_mapeados > 0
@@ -0,0 +1,49 @@
+"""
+Testes das configurações congeladas e do cache de configurações compiladas
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from config import DEFAULT_MARKETPLACES
+from configuracao import MARKETPLACES_PADRAO, REGIMES_PADRAO, ConfigCongelada, compilar
+
+
+def test_alterar_nao_vaza_para_o_padrao():
+    """Cada sessão altera a própria cópia; o padrão compartilhado e os dicts de config.py não mudam"""
+    sessao_a = MARKETPLACES_PADRAO.alterar_campos("Shopee", comissao=0.18)
+    sessao_b = MARKETPLACES_PADRAO
+
+    assert sessao_a["Shopee"]["comissao"] == 0.18
+    assert sessao_b["Shopee"]["comissao"] == 0.20
+    assert DEFAULT_MARKETPLACES["Shopee"]["comissao"] == 0.20
+    # Entradas não alteradas são compartilhadas (cópia só do que mudou)
+    assert sessao_a["Amazon"] is MARKETPLACES_PADRAO["Amazon"]
+    assert MARKETPLACES_PADRAO.alterar_campos("Shopee", comissao=0.20) is MARKETPLACES_PADRAO
+
+    with pytest.raises(TypeError):
+        MARKETPLACES_PADRAO["Shopee"]["comissao"] = 0.5
+
+
+def test_hash_e_impressao_pelo_conteudo():
+    """Configurações com o mesmo conteúdo têm o mesmo hash e a mesma impressão digital"""
+    copia = ConfigCongelada(MARKETPLACES_PADRAO.para_dict())
+    alterada = MARKETPLACES_PADRAO.alterar_campos("Amazon", custo_fixo=1.0)
+
+    assert copia == MARKETPLACES_PADRAO and hash(copia) == hash(MARKETPLACES_PADRAO)
+    assert copia.impressao == MARKETPLACES_PADRAO.impressao
+    assert alterada.impressao != MARKETPLACES_PADRAO.impressao
+    assert pickle.loads(pickle.dumps(alterada)) == alterada
+
+
+def test_compilar_compartilhado_entre_sessoes():
+    """Sessões com a mesma configuração recebem as mesmas tabelas compiladas, somente leitura"""
+    tabelas = compilar(MARKETPLACES_PADRAO, REGIMES_PADRAO)
+
+    assert compilar(MARKETPLACES_PADRAO.para_dict(), REGIMES_PADRAO.para_dict()) is tabelas
+    assert compilar(MARKETPLACES_PADRAO.alterar_campos("Shopee", comissao=0.18), REGIMES_PADRAO) is not tabelas
+    np.testing.assert_allclose(tabelas.comissao, [c["comissao"] for c in DEFAULT_MARKETPLACES.values()])
+    with pytest.raises(ValueError):
+        tabelas.comissao[0] = 1.0
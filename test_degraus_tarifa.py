@@ -0,0 +1,61 @@
+"""
+Testes do detector de degraus de tarifa
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+from degraus_tarifa import DetectorDegraus
+from pricing_calculator_v2 import PricingCalculatorV2
+
+
+def criar_relatorio(precos):
+    n = len(precos)
+    return pd.DataFrame({
+        "SKU": [f"SKU{i}" for i in range(n)],
+        "Descrição": [f"Produto {i}" for i in range(n)],
+        "Custo Produto": [30.0] * n,
+        "Frete": [0.0] * n,
+        "Preço Atual": precos,
+        "Tipo de Anúncio": [""] * n,
+    })
+
+
+def test_precos_candidatos():
+    """Cada preço recebe o primeiro preço acima e o último abaixo da fronteira vizinha"""
+    abaixo, acima = DetectorDegraus.fronteiras("Shopee")
+    candidatos = DetectorDegraus.precos_candidatos(np.array([79.99, 80.0, 150.0, 1000.0]), abaixo, acima, 0.5)
+
+    np.testing.assert_allclose(candidatos["Subir"], [80.0, 100.0, 200.0, np.nan])
+    np.testing.assert_allclose(candidatos["Descer"], [np.nan, 79.99, 99.99, np.nan])
+    assert DetectorDegraus.fronteiras("Amazon")[0].size == 0
+
+
+def test_detectar_degraus_mercado_livre_e_shopee():
+    """R$ 79,50 no ML e R$ 80,00 na Shopee lucram mais logo abaixo da fronteira"""
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0,
+                                      data_tarifas="2026-03-02")
+    df = criar_relatorio([79.5, 80.0, 60.0])
+    df["Quantidade Vendida"] = [1, 10, 5]
+
+    ml = DetectorDegraus.detectar(df, calculadora, "Mercado Livre", "Simples Nacional")
+    assert ml["SKU"].tolist()[:2] == ["SKU1", "SKU0"]  # Ordenado pelo ganho no período
+    assert ml["Preço Sugerido"].tolist()[:2] == [78.99, 78.99]
+    assert (ml["Direção"] == "Descer").all()
+    assert "SKU2" not in ml["SKU"].tolist()
+
+    shopee = DetectorDegraus.detectar(df, calculadora, "Shopee", "Simples Nacional")
+    linha = shopee.set_index("SKU").loc["SKU1"]
+    assert linha["Preço Sugerido"] == 79.99
+    # 20% + R$ 4 em 79,99 contra 14% + R$ 16 (com 5% de Pix) em 80,00
+    assert linha["Ganho por Unidade R$"] == pytest.approx(linha["Lucro Sugerido R$"] - linha["Lucro Atual R$"])
+    assert linha["Ganho por Unidade R$"] > 3
+
+
+def test_exportar_csv_padrao_brasileiro():
+    resultado = pd.DataFrame({"SKU": ["A"], "Ganho por Unidade R$": [3.1927]})
+    conteudo = DetectorDegraus.exportar_csv(resultado).getvalue().decode("utf-8-sig")
+
+    assert conteudo.splitlines() == ["SKU;Ganho por Unidade R$", "A;3,19"]
@@ -0,0 +1,70 @@
+"""
+Testes da instrumentação de desempenho por etapa
+"""
+
+import io
+import json
+import logging
+
+from desempenho import FormatadorJSON, RegistroDesempenho, configurar_logging, medir, modo_administrador
+
+
+def test_medir_registra_etapa():
+    registro = RegistroDesempenho()
+    
+    with registro.medir("calculo", linhas=100) as medicao:
+        medicao["linhas_resultado"] = 40
+    
+    assert len(registro.etapas) == 1
+    etapa = registro.etapas[0]
+    assert etapa["etapa"] == "calculo"
+    assert etapa["linhas"] == 100
+    assert etapa["linhas_resultado"] == 40
+    assert etapa["segundos"] >= 0
+    
+    df = registro.para_dataframe()
+    assert list(df.columns[:5]) == ["etapa", "segundos", "linhas", "linhas_por_segundo", "memoria_delta_mb"]
+    assert json.loads(registro.para_json())[0]["etapa"] == "calculo"
+
+
+def test_medir_sem_registro_nao_faz_nada():
+    with medir(None, "calculo", 10) as medicao:
+        medicao["linhas_resultado"] = 5
+
+
+def test_limite_descarta_mais_antigas():
+    registro = RegistroDesempenho(limite=3)
+    for i in range(5):
+        registro.registrar(f"etapa_{i}", 0.1)
+    
+    assert [m["etapa"] for m in registro.etapas] == ["etapa_2", "etapa_3", "etapa_4"]
+
+
+def test_logs_json():
+    saida = io.StringIO()
+    configurar_logging("INFO", formato_json=True, stream=saida)
+    try:
+        RegistroDesempenho().registrar("filtro", 0.5, linhas=1000)
+    finally:
+        configurar_logging("WARNING")
+    
+    linha = json.loads(saida.getvalue().strip().splitlines()[-1])
+    assert linha["etapa"] == "filtro"
+    assert linha["linhas_por_segundo"] == 2000
+    assert linha["nivel"] == "INFO"
+
+
+def test_logging_desligado_por_padrao(monkeypatch):
+    monkeypatch.delenv("PRECIFICACAO_LOG", raising=False)
+    configurar_logging()
+    assert not logging.getLogger("precificacao.desempenho").isEnabledFor(logging.INFO)
+    assert isinstance(FormatadorJSON().format(logging.makeLogRecord({"msg": "ok"})), str)
+
+
+def test_modo_administrador_desligado_por_padrao(monkeypatch):
+    monkeypatch.delenv("PRECIFICACAO_ADMIN", raising=False)
+    assert not modo_administrador()
+    monkeypatch.setenv("PRECIFICACAO_ADMIN", "sim")
+    assert modo_administrador()
+    monkeypatch.setenv("PRECIFICACAO_ADMIN", "0")
+    assert not modo_administrador()
@@ -0,0 +1,51 @@
+"""
+Testes da grade 2D dos gráficos de dispersão por SKU
+"""
+
+import numpy as np
+
+from graficos_dispersao import GradeDispersao
+
+
+def gerar_eixos(n, seed=0):
+    rng = np.random.default_rng(seed)
+    preco = rng.lognormal(4, 0.8, n)
+    margem = rng.normal(25, 15, n)
+    return preco, margem
+
+
+def test_tamanho_limitado_pela_grade():
+    """O número de caixas ocupadas não passa de caixas², com 10 mil ou 500 mil SKUs"""
+    for n in (10_000, 500_000):
+        preco, margem = gerar_eixos(n)
+        grade = GradeDispersao(preco, margem, caixas=40)
+        assert len(grade.ocupadas) <= 40 * 40
+        assert grade.contagens.sum() == n
+
+
+def test_caixa_de_cada_sku():
+    """Os SKUs de uma caixa interna estão dentro dos intervalos dela; a contagem confere"""
+    preco, margem = gerar_eixos(50_000, seed=1)
+    grade = GradeDispersao(preco, margem, caixas=30)
+    x0, x1, y0, y1 = grade.intervalos()
+
+    # Caixa mais cheia (fica no meio da distribuição, longe das bordas)
+    i = int(np.argmax(grade.contagens))
+    linhas = grade.linhas(grade.ocupadas[i])
+    assert len(linhas) == grade.contagens[i]
+    assert ((preco[linhas] >= x0[i]) & (preco[linhas] <= x1[i])).all()
+    assert ((margem[linhas] >= y0[i]) & (margem[linhas] <= y1[i])).all()
+
+
+def test_valores_nulos_e_extremos():
+    """SKUs sem valor ficam fora da grade; valores extremos entram nas caixas da borda"""
+    preco, margem = gerar_eixos(1_000, seed=2)
+    margem[:10] = np.nan
+    preco[10] = 1e9
+
+    grade = GradeDispersao(preco, margem, caixas=20)
+
+    assert (grade.caixa[:10] == -1).all()
+    assert grade.contagens.sum() == 990
+    assert grade.caixa[10] // 20 == 19
+    assert grade.bordas_x[-1] < 1e9
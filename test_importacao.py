@@ -0,0 +1,75 @@
+"""
+Testes de tempo de importação (partida a frio) do aplicativo
+
+Executa `python -X importtime -c "import app"` em um processo separado e verifica
+que os módulos pesados (openpyxl, plotly.graph_objs, módulos de cálculo) só são
+carregados sob demanda.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Módulos que não devem ser carregados na partida do app.py
+MODULOS_SOB_DEMANDA = [
+    "openpyxl",
+    "plotly.graph_objs",
+    "pricing_calculator_v2",
+    "price_simulator",
+    "promotion_exporter",
+    "mercado_livre_processor",
+]
+
+
+def medir_importacao(comando):
+    """
+    Executa o comando com -X importtime e retorna {modulo: tempo cumulativo em ms}
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", comando],
+        cwd=DIRETORIO,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    tempos = {}
+    for linha in resultado.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)", linha)
+        if m:
+            tempos[m.group(3)] = int(m.group(1)) / 1000
+    return tempos
+
+
+def relatorio_importacao(tempos, top=10):
+    """Monta o relatório dos módulos mais lentos (tempo cumulativo)"""
+    linhas = [f"{'Módulo':<30} {'ms':>10}"]
+    for modulo, ms in sorted(tempos.items(), key=lambda x: -x[1])[:top]:
+        linhas.append(f"{modulo:<30} {ms:>10.1f}")
+    return "\n".join(linhas)
+
+
+def test_partida_sem_modulos_pesados():
+    """A partida do app não importa openpyxl, plotly.graph_objs nem os módulos das abas"""
+    tempos = medir_importacao("import app")
+    assert "app" in tempos, "app.py não foi importado"
+
+    print(f"\nPartida a frio do app.py: {tempos['app']:.1f} ms")
+    print(relatorio_importacao(tempos))
+
+    carregados = [m for m in MODULOS_SOB_DEMANDA if m in tempos]
+    assert carregados == [], f"Módulos carregados na partida: {carregados}"
+
+
+def test_exportador_sem_openpyxl():
+    """Importar o exportador de promoções não carrega o openpyxl"""
+    tempos = medir_importacao("import promotion_exporter")
+    assert "openpyxl" not in tempos
+
+
+if __name__ == "__main__":
+    test_partida_sem_modulos_pesados()
+    test_exportador_sem_openpyxl()
+    print("✓ TODOS OS TESTES PASSARAM COM SUCESSO!")
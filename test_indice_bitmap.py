@@ -0,0 +1,61 @@
+"""
+Testes do índice de bitmaps dos filtros por Status, Curva ABC e Tipo de Anúncio
+"""
+
+import numpy as np
+import pandas as pd
+
+from indice_bitmap import IndiceBitmap, indice_de
+from promotion_exporter import PromotionExporter
+
+
+def criar_resultado(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "SKU ou MLB": [f"MLB{i}" for i in range(n)],
+        "Status": pd.Categorical(rng.choice(["🟢 Saudável", "🟡 Alerta", "🔴 Prejuízo"], n)),
+        "Curva ABC": rng.choice(["A", "B", "C"], n),
+        "Tipo de Anuncio": rng.choice(["Clássico", "Premium"], n),
+        "Preco Atual (R$)": rng.uniform(10, 500, n).round(2),
+    })
+
+
+def test_combinacao_de_filtros_igual_as_mascaras():
+    """AND/OR entre bitmaps seleciona as mesmas linhas que as comparações de strings"""
+    df = criar_resultado(1_003)
+    indice = IndiceBitmap(df)
+
+    bits = indice.igual("Status", "🟡 Alerta", "🔴 Prejuízo") & indice.igual("Tipo de Anuncio", "Premium")
+    esperado = df["Status"].isin(["🟡 Alerta", "🔴 Prejuízo"]) & (df["Tipo de Anuncio"] == "Premium")
+
+    np.testing.assert_array_equal(indice.mascara(bits), esperado.to_numpy())
+    assert indice.contar(bits) == esperado.sum()
+    assert indice.contar(indice.todos()) == len(df)
+    assert indice.contar(indice.igual("Marketplace", "Shopee")) == 0
+    assert indice.filtrar(df, indice.todos()) is df
+
+
+def test_oportunidades_iguais_no_dashboard_e_na_exportacao():
+    """A regra de oportunidades (Curva B/C saudável) é a mesma nos bitmaps e no PromotionExporter"""
+    df = criar_resultado(2_000, seed=1)
+    esperado = df[df["Curva ABC"].isin(["B", "C"]) & (df["Status"] == "🟢 Saudável")]
+
+    oportunidades = indice_de(df).filtrar(df, indice_de(df).oportunidades())
+    exportadas = PromotionExporter().filtrar_por_categoria(df, "oportunidade")
+
+    pd.testing.assert_frame_equal(oportunidades, esperado)
+    pd.testing.assert_frame_equal(exportadas, esperado.reset_index(drop=True))
+    curva_a = PromotionExporter().filtrar_por_categoria(df, "curva_a")
+    assert (curva_a["Curva ABC"] == "A").all() and len(curva_a) == (df["Curva ABC"] == "A").sum()
+
+
+def test_indice_reaproveitado_por_objeto():
+    """O índice é montado uma vez por DataFrame; outro objeto (ex: nova Curva ABC) recebe outro"""
+    df = criar_resultado(100)
+    indice = indice_de(df)
+    assert indice_de(df) is indice
+
+    nova_curva = df.copy(deep=False)
+    nova_curva["Curva ABC"] = "C"
+    assert indice_de(nova_curva) is not indice
+    assert indice_de(nova_curva).contar(indice_de(nova_curva).igual("Curva ABC", "C")) == len(df)
@@ -0,0 +1,64 @@
+"""
+Testes do índice de comissões por categoria do Mercado Livre
+"""
+
+import numpy as np
+import pytest
+
+from indice_categorias import IndiceCategorias, obter_indice
+from mercado_livre_costs import MercadoLivreCostsCalculator
+from tabelas_tarifas import obter_tabela
+
+
+def _indice():
+    nan = np.nan
+    return IndiceCategorias(
+        ["A", "A1", "A11", "B", "B1", "C"],
+        [None, "A", "A1", None, "B", "X"],
+        ["Veículos", "Peças", "Suspensão", "Casa", "Móveis", "Órfã"],
+        [[0.12, 0.17], [nan, nan], [nan, nan], [nan, nan], [0.10, nan], [nan, nan]],
+    )
+
+
+def test_heranca_da_categoria_pai():
+    """Comissão vazia vem do ancestral mais próximo; sem ancestral com valor, padrão 14%/19%"""
+    indice = _indice()
+
+    assert indice.resolver(["A11", "A1", "B1", "B", "C"]).tolist() == pytest.approx([0.12, 0.12, 0.10, 0.14, 0.14])
+    assert indice.resolver(["A11", "B1"], "Premium").tolist() == pytest.approx([0.17, 0.19])
+    assert indice.definida.tolist() == [True, True, True, False, True, False, False]
+    assert indice.caminho("A11") == "Veículos > Peças > Suspensão"
+    assert indice.caminho("Z") is None
+
+
+def test_resolver_por_id_ou_nome_vetorizado():
+    """IDs e nomes (sem diferenciar maiúsculas) resolvem em uma passada; desconhecidas usam o padrão"""
+    indice = _indice()
+    categorias = np.array(["a11", "Suspensão", "móveis", "Inexistente", None] * 1000, dtype=object)
+    tipos = np.array(["Clássico", "Premium", "Premium", "Premium", "Clássico"] * 1000, dtype=object)
+
+    comissoes = indice.resolver(categorias, tipos)
+
+    assert comissoes[:5].tolist() == pytest.approx([0.12, 0.17, 0.19, 0.19, 0.14])
+    assert len(comissoes) == 5000
+
+
+def test_arquivo_do_projeto_integrado_as_tarifas():
+    """O arquivo padrão alimenta a tabela de 2026 e a calculadora escalar, por ID ou nome"""
+    indice = obter_indice()
+    assert indice is obter_indice()
+    assert indice.caminho("MLB22693") == "Acessórios para Veículos > Peças de Carros e Caminhonetes > Suspensão e Direção"
+
+    tabela = obter_tabela("Mercado Livre", "2026-03-02")
+    tarifas = tabela.calcular([100.0, 100.0, 100.0, 100.0], pesos=0.3,
+                              categoria=["MLB22693", "Livros", "MLB1648", "Sem Categoria"])
+    assert tarifas["comissao_taxa"].tolist() == pytest.approx([0.12, 0.065, 0.14, 0.14])
+    assert MercadoLivreCostsCalculator.calcular_comissao_categoria("MLB1772", "Premium") == pytest.approx(0.17)
+
+    # A tabela de 2025 não tem comissão por categoria
+    antiga = obter_tabela("Mercado Livre", "2025-06-01").calcular([100.0], categoria="MLB22693")
+    assert antiga["comissao_taxa"].tolist() == pytest.approx([0.14])
+
+
+def test_arquivo_inexistente():
+    assert obter_indice("/caminho/que/nao/existe.csv") is None
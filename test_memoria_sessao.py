@@ -0,0 +1,95 @@
+"""
+Testes do orçamento de memória dos DataFrames das sessões
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from memoria_sessao import DadosSessao, GerenciadorMemoria, abrir_arrow, copia_mapeada, gravar_arrow
+
+
+def criar_resultado(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "SKU": [f"SKU{i}" for i in range(n)],
+        "Preço": rng.uniform(10, 500, n).round(2),
+        "Curva ABC": rng.choice(["A", "B", "C"], n),
+    })
+
+
+def test_orcamento_despeja_o_menos_usado(tmp_path):
+    """Acima do orçamento o DataFrame menos usado vai para arquivo e volta igual pelo memory-map"""
+    gerenciador = GerenciadorMemoria(orcamento_mb=0.5, diretorio=str(tmp_path))
+    sessao_a, sessao_b = DadosSessao(gerenciador), DadosSessao(gerenciador)
+    relatorio, resultado = criar_resultado(10_000, seed=1), criar_resultado(10_000, seed=2)
+
+    sessao_a["relatorio_vendas"] = relatorio
+    sessao_b["resultado_calculadora"] = resultado
+
+    assert gerenciador.despejos == 1
+    assert gerenciador.bytes_memoria <= gerenciador.orcamento_bytes
+    assert len(os.listdir(tmp_path)) == 1
+    pd.testing.assert_frame_equal(sessao_a["relatorio_vendas"], relatorio)
+    assert gerenciador.leituras == 1
+    # Reaberto, o relatório passa a ser o mais usado: agora o resultado da outra sessão sai
+    pd.testing.assert_frame_equal(sessao_b["resultado_calculadora"], resultado)
+    assert gerenciador.despejos == 3
+
+
+def test_dict_com_dataframes(tmp_path):
+    """Dicts com DataFrames (resultado da promoção) guardam cada DataFrame no orçamento"""
+    gerenciador = GerenciadorMemoria(orcamento_mb=0, diretorio=str(tmp_path))
+    dados = DadosSessao(gerenciador)
+    original, processado = criar_resultado(100), criar_resultado(100, seed=3)
+
+    dados["resultado_promocao"] = {"parametros": ("A", 10.0), "original": original, "processado": processado}
+    dados["janela"] = 30
+
+    assert sorted(dados) == ["janela", "resultado_promocao"]
+    outra = DadosSessao(gerenciador)
+    outra["relatorio_vendas"] = criar_resultado(10)
+    assert gerenciador.ocupacao(dados.sessao)["DataFrames"].tolist() == [2]
+    assert len(gerenciador.ocupacao()) == 2
+    promocao = dados["resultado_promocao"]
+    assert list(promocao) == ["parametros", "original", "processado"]
+    assert promocao["parametros"] == ("A", 10.0)
+    pd.testing.assert_frame_equal(promocao["processado"], processado)
+
+    dados["resultado_promocao"] = None
+    assert dados["resultado_promocao"] is None
+    assert gerenciador.nomes(dados.sessao) == []
+
+
+def test_encerrar_apaga_os_arquivos(tmp_path):
+    """Ao encerrar a sessão, a memória é liberada e os arquivos despejados são apagados"""
+    gerenciador = GerenciadorMemoria(orcamento_mb=0, diretorio=str(tmp_path))
+    dados = DadosSessao(gerenciador)
+    dados["relatorio_vendas"] = criar_resultado(1_000)
+    dados["resultado_calculadora"] = criar_resultado(1_000, seed=1)
+    assert len(os.listdir(tmp_path)) == 1
+
+    dados.encerrar()
+
+    assert len(dados) == 0
+    assert os.listdir(tmp_path) == []
+    assert gerenciador.bytes_memoria == 0
+    assert gerenciador.ocupacao().empty
+
+
+def test_copia_mapeada_com_coluna_nova_continua_compartilhada(tmp_path):
+    """Trocar uma coluna da cópia mapeada (ex: Curva ABC por janela) não a torna privada da sessão"""
+    caminho = str(tmp_path / "resultado.arrow")
+    gravar_arrow(criar_resultado(10_000), caminho)
+    gerenciador = GerenciadorMemoria(orcamento_mb=0, diretorio=str(tmp_path / "sessoes"))
+    dados = DadosSessao(gerenciador)
+    dados["resultado_calculadora"] = abrir_arrow(caminho)
+
+    df = copia_mapeada(dados["resultado_calculadora"])
+    df["Curva ABC"] = "C"
+    dados["resultado_calculadora"] = df
+
+    assert gerenciador.despejos == 0
+    assert gerenciador.bytes_memoria == 0 and gerenciador.bytes_mapeados > 0
+    assert (dados["resultado_calculadora"]["Curva ABC"] == "C").all()
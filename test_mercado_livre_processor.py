@@ -0,0 +1,292 @@
+"""
+Testes para o processamento de relatórios do Mercado Livre
+"""
+
+import pandas as pd
+import numpy as np
+from io import BytesIO
+
+from mercado_livre_processor import MercadoLivreProcessor
+
+
+class ArquivoEnviado:
+    """Simula o arquivo enviado pelo st.file_uploader"""
+
+    def __init__(self, name, conteudo):
+        self.name = name
+        self._conteudo = conteudo
+
+    def getvalue(self):
+        return self._conteudo
+
+
+def gerar_relatorio(n_linhas, seed=0):
+    """Gera um relatório de vendas sintético no formato do modelo de planilha"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "SKU/MLB": [f"SKU{i % 50:03d}" for i in range(n_linhas)],
+        "Titulo": [f"Produto {i % 50}" for i in range(n_linhas)],
+        "Custo Produto (R$)": rng.uniform(10, 100, n_linhas).round(2),
+        "Frete (R$)": rng.uniform(0, 20, n_linhas).round(2),
+        "Preco Atual (R$)": rng.uniform(20, 300, n_linhas).round(2),
+        "Tipo de Anuncio": rng.choice(["Classico", "Premium"], n_linhas),
+        "Quantidade Vendida": rng.integers(1, 10, n_linhas),
+    })
+
+
+def csv_bytes(df):
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def test_inferir_conta():
+    """A conta é o nome do arquivo sem extensão e sem a data final"""
+    assert MercadoLivreProcessor.inferir_conta("loja_a_2026-03-01.xlsx") == "loja_a"
+    assert MercadoLivreProcessor.inferir_conta("/tmp/Conta Principal 01.csv") == "Conta Principal"
+    assert MercadoLivreProcessor.inferir_conta("20260301.csv") == "20260301"
+
+
+def test_carregar_multiplos_arquivos():
+    """Arquivos de contas diferentes são normalizados, marcados e agregados por SKU"""
+    arquivos = [
+        ArquivoEnviado("loja_a_01.csv", csv_bytes(gerar_relatorio(100, seed=1))),
+        ArquivoEnviado("loja_a_02.csv", csv_bytes(gerar_relatorio(100, seed=2))),
+        ArquivoEnviado("loja_b_01.csv", csv_bytes(gerar_relatorio(60, seed=3))),
+    ]
+
+    df, erros = MercadoLivreProcessor.carregar_multiplos_arquivos(arquivos, max_workers=2)
+
+    assert erros == []
+    assert len(df) == 260
+    assert sorted(df["Conta"].unique()) == ["loja_a", "loja_b"]
+
+    df_agregado = MercadoLivreProcessor.agregar_por_sku(df)
+    assert len(df_agregado) == 50
+    assert df_agregado["Quantidade Vendida"].sum() == df["Quantidade Vendida"].sum()
+    assert (df_agregado["Conta"] == "loja_a, loja_b").all()
+
+
+def test_carregar_multiplos_arquivos_com_erro():
+    """Um arquivo inválido não impede o carregamento dos demais"""
+    arquivos = [
+        ArquivoEnviado("loja_a.csv", csv_bytes(gerar_relatorio(20))),
+        ArquivoEnviado("invalido.csv", b"coluna_x,coluna_y\n1,2\n"),
+    ]
+
+    df, erros = MercadoLivreProcessor.carregar_multiplos_arquivos(arquivos, usar_processos=False)
+
+    assert len(df) == 20
+    assert len(erros) == 1 and erros[0].startswith("invalido.csv")
+
+
+def agregar_com_groupby(df):
+    """Agregação de referência com groupby (comportamento original)"""
+    df_agg = df.groupby("SKU").agg({
+        "Descrição": "first",
+        "Custo Produto": "mean",
+        "Frete": "mean",
+        "Preço Atual": "mean",
+        "Tipo de Anúncio": "first",
+        "Quantidade Vendida": "sum",
+    }).reset_index()
+    contas = df[["SKU", "Conta"]].drop_duplicates().sort_values("Conta").groupby("SKU")["Conta"].agg(", ".join)
+    df_agg["Conta"] = df_agg["SKU"].map(contas)
+    return df_agg
+
+
+def test_agregar_por_sku_igual_groupby():
+    """A agregação com factorize/bincount reproduz o groupby (inclusive valores nulos)"""
+    df = MercadoLivreProcessor.normalizar_relatorio_vendas(gerar_relatorio(500, seed=4))
+    df["Conta"] = np.random.default_rng(5).choice(["loja_b", "loja_a"], len(df))
+    df.loc[0, "Custo Produto"] = np.nan
+    df.loc[1, "Descrição"] = None
+
+    pd.testing.assert_frame_equal(
+        MercadoLivreProcessor.agregar_por_sku(df),
+        agregar_com_groupby(df),
+        check_dtype=False,
+    )
+
+
+def test_agregar_por_sku_preco_ponderado():
+    """O preço médio ponderado pela quantidade reflete a receita do SKU"""
+    df = pd.DataFrame({
+        "SKU": ["A", "A", "B", "B"],
+        "Descrição": ["Produto A", "Produto A", "Produto B", "Produto B"],
+        "Custo Produto": [10.0, 10.0, 5.0, 5.0],
+        "Frete": [0.0, 0.0, 0.0, 0.0],
+        "Preço Atual": [100.0, 50.0, 30.0, 20.0],
+        "Tipo de Anúncio": ["Clássico", "Clássico", "Premium", "Premium"],
+        "Quantidade Vendida": [1, 3, 0, 0],
+    })
+
+    simples = MercadoLivreProcessor.agregar_por_sku(df)
+    ponderado = MercadoLivreProcessor.agregar_por_sku(df, ponderar_por_quantidade=True)
+
+    assert list(ponderado.columns) == list(simples.columns)
+    assert simples["Preço Atual"].tolist() == [75.0, 25.0]
+    # A: (100*1 + 50*3) / 4; B sem vendas usa a média simples
+    assert ponderado["Preço Atual"].tolist() == [62.5, 25.0]
+
+
+def test_normalizar_data_da_venda():
+    """A coluna Data é mantida; datas ISO e no padrão brasileiro são reconhecidas"""
+    df = gerar_relatorio(4)
+    df["Data"] = ["2026-03-02", "01/03/2026", "15/03/2026 10:30", "sem data"]
+
+    df_normalizado = MercadoLivreProcessor.normalizar_relatorio_vendas(df)
+
+    assert df_normalizado["Data"].tolist()[:3] == [
+        pd.Timestamp(2026, 3, 2), pd.Timestamp(2026, 3, 1), pd.Timestamp(2026, 3, 15, 10, 30)
+    ]
+    assert pd.isna(df_normalizado["Data"].iloc[3])
+
+
+
+def test_normalizar_peso_logistica_categoria():
+    """Peso (em g ou kg), logística e categoria opcionais são normalizados e agregados por SKU"""
+    df = gerar_relatorio(4)
+    df["SKU/MLB"] = ["A", "A", "B", "C"]
+    df["Peso (g)"] = [300, 500, "", 1200]
+    df["Forma de Envio"] = ["Mercado Envios Full", "full", "Flex", "Retirada"]
+    df["Categoria"] = ["Livros", "Livros", None, " Supermercado "]
+
+    df_normalizado = MercadoLivreProcessor.normalizar_relatorio_vendas(df)
+    df_agregado = MercadoLivreProcessor.agregar_por_sku(df_normalizado)
+
+    assert df_normalizado["Logística"].tolist() == ["Full", "Full", "Flex", "Flex"]
+    assert df_agregado["Peso (kg)"].tolist()[0::2] == [0.4, 1.2]
+    assert np.isnan(df_agregado["Peso (kg)"].iloc[1])
+    assert df_agregado["Categoria"].tolist() == ["Livros", "", "Supermercado"]
+
+
+def test_peso_sem_unidade_em_gramas_ou_quilos():
+    """Coluna "Peso" sem unidade: valores em gramas são detectados e convertidos para kg"""
+    df = gerar_relatorio(3)
+    df["Peso"] = [300, 450, 1200]
+    assert MercadoLivreProcessor.normalizar_relatorio_vendas(df)["Peso (kg)"].tolist() == [0.3, 0.45, 1.2]
+
+    df["Peso"] = ["0,3", "1,5", "12"]
+    assert MercadoLivreProcessor.normalizar_relatorio_vendas(df)["Peso (kg)"].tolist() == [0.3, 1.5, 12.0]
+
+
+def test_normalizar_numeros_no_padrao_brasileiro():
+    """Valores em texto no padrão brasileiro não são descartados; inválidos são contados"""
+    df = gerar_relatorio(4)
+    df["Custo Produto (R$)"] = ["R$ 1.234,56", "10,5", "abc", "(2,00)"]
+    df["Preco Atual (R$)"] = ["R$ 1.999,90", "39,90", "59,9", ""]
+    df["Quantidade Vendida"] = ["1.200", "3", "", "7"]
+
+    df_normalizado = MercadoLivreProcessor.normalizar_relatorio_vendas(df)
+
+    assert df_normalizado["Preço Atual"].tolist() == [1999.90, 39.90, 59.90]
+    assert df_normalizado["Custo Produto"].tolist() == [1234.56, 10.5, 0.0]
+    assert df_normalizado["Quantidade Vendida"].tolist() == [1200, 3, 0]
+    conversao = df_normalizado.attrs["conversao_numeros"]
+    assert conversao["Custo Produto"]["invalidos"] == 1
+    assert conversao["Preço Atual"]["vazios"] == 1
+
+
+def test_carregar_csv_brasileiro():
+    """CSV com ";", cp1252, vírgula decimal e linhas de título antes do cabeçalho"""
+    texto = (
+        "Relatório de vendas - Março\n"
+        "\n"
+        "SKU;Título;Custo Produto;Frete;Preço Atual;Quantidade Vendida\n"
+        "A1;Caneca cerâmica;10,50;2,00;1.234,56;3\n"
+        "A2;\"Copo; vidro\";5;0;39,90;1\n"
+        "1.234;Prato;1.000;0;2.500,00;1.200\n"
+    )
+
+    df = MercadoLivreProcessor.carregar_de_csv(BytesIO(texto.encode("cp1252")))
+    df_normalizado = MercadoLivreProcessor.normalizar_relatorio_vendas(df)
+
+    assert df.attrs["formato_csv"] == {
+        "encoding": "cp1252", "separador": ";", "decimal": ",", "milhar": ".", "linha_cabecalho": 2,
+    }
+    assert df_normalizado["SKU"].tolist() == ["A1", "A2", "1.234"]
+    assert df_normalizado["Descrição"].tolist() == ["Caneca cerâmica", "Copo; vidro", "Prato"]
+    assert df_normalizado["Preço Atual"].tolist() == [1234.56, 39.90, 2500.0]
+    assert df_normalizado["Custo Produto"].tolist() == [10.5, 5.0, 1000.0]
+    assert df_normalizado["Quantidade Vendida"].tolist() == [3, 1, 1200]
+
+
+def test_detectar_formato_csv_pelo_inicio_do_arquivo():
+    """A detecção usa só a amostra inicial, mesmo cortada no meio de uma linha"""
+    linhas = ["SKU,Titulo,Custo Produto,Frete,Preco Atual"] + [f"SKU{i},Produto ção {i},10.5,1,{i}.99" for i in range(50_000)]
+    conteudo = ("\n".join(linhas) + "\n").encode("utf-8")
+
+    amostra = MercadoLivreProcessor._ler_amostra(BytesIO(conteudo))
+    formato = MercadoLivreProcessor.detectar_formato_csv(amostra)
+
+    assert len(amostra) < len(conteudo)
+    assert formato == {"encoding": "utf-8", "separador": ",", "decimal": ".", "milhar": None, "linha_cabecalho": 0}
+
+
+def test_carregar_excel_com_varias_abas():
+    """Capa ignorada; abas de dados lidas a partir do cabeçalho (abaixo de títulos) e concatenadas"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame({"Relatório": ["Vendas 2026", "Contas A e B"]}).to_excel(writer, sheet_name="Capa", index=False)
+        pd.DataFrame([
+            ["Relatório da conta A", None, None, None, None],
+            [None] * 5,
+            ["SKU", "Título", "Custo", "Frete", "Preço Atual"],
+            ["A1", "Caneca", 10, 1, 50.0],
+            ["A2", "Copo", 5, 0, 39.9],
+        ]).to_excel(writer, sheet_name="Conta A", index=False, header=False)
+        pd.DataFrame({"sku ": ["B1"], "titulo": ["Prato"], "custo": [3], "frete": [0], "Preço atual": [20]}).to_excel(
+            writer, sheet_name="Conta B", index=False
+        )
+    buffer.seek(0)
+
+    df = MercadoLivreProcessor.carregar_de_excel(buffer, max_workers=2, usar_processos=False)
+    df_normalizado = MercadoLivreProcessor.normalizar_relatorio_vendas(df)
+
+    assert df.attrs["abas_excel"] == [
+        {"aba": "Conta A", "linha_cabecalho": 2, "linhas": 2},
+        {"aba": "Conta B", "linha_cabecalho": 0, "linhas": 1},
+    ]
+    assert df_normalizado["SKU"].tolist() == ["A1", "A2", "B1"]
+    assert df_normalizado["Descrição"].tolist() == ["Caneca", "Copo", "Prato"]
+    assert df_normalizado["Preço Atual"].tolist() == [50.0, 39.9, 20.0]
+
+
+
+def test_varios_arquivos_excel_sem_pools_aninhados(monkeypatch):
+    """Com vários arquivos, cada worker lê as abas do seu Excel em sequência"""
+    chamadas = []
+    carregar_original = MercadoLivreProcessor.carregar_de_excel
+
+    def carregar_registrando(arquivo, max_workers=None, usar_processos=True):
+        chamadas.append(max_workers)
+        return carregar_original(arquivo, max_workers, usar_processos)
+
+    monkeypatch.setattr(MercadoLivreProcessor, "carregar_de_excel", staticmethod(carregar_registrando))
+    arquivos = []
+    for i in range(2):
+        buffer = BytesIO()
+        gerar_relatorio(10, seed=i).to_excel(buffer, index=False)
+        arquivos.append(ArquivoEnviado(f"loja_{i}.xlsx", buffer.getvalue()))
+
+    df, erros = MercadoLivreProcessor.carregar_multiplos_arquivos(arquivos, max_workers=2, usar_processos=False)
+    assert erros == [] and len(df) == 20
+    assert chamadas == [1, 1]
+
+    chamadas.clear()
+    MercadoLivreProcessor.carregar_multiplos_arquivos(arquivos[:1], max_workers=2, usar_processos=False)
+    assert chamadas == [2]
+
+
+if __name__ == "__main__":
+    test_inferir_conta()
+    test_carregar_multiplos_arquivos()
+    test_carregar_multiplos_arquivos_com_erro()
+    test_agregar_por_sku_igual_groupby()
+    test_agregar_por_sku_preco_ponderado()
+    test_normalizar_data_da_venda()
+    test_normalizar_peso_logistica_categoria()
+    test_normalizar_numeros_no_padrao_brasileiro()
+    test_carregar_csv_brasileiro()
+    test_detectar_formato_csv_pelo_inicio_do_arquivo()
+    test_carregar_excel_com_varias_abas()
+    print("✓ TODOS OS TESTES PASSARAM COM SUCESSO!")
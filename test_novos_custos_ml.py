@@ -16,31 +16,22 @@ def testar_custo_operacional_full():
     # Caso 1: Produto de 400g vendido a R$ 45
     resultado = MercadoLivreCostsCalculator.calcular_custo_operacional_full(45.00, 0.4, "Produtos Comuns")
     print(f"\nProduto: 400g, Preço: R$ 45,00")
-    print(f"Resultado: R$ {resultado['custo_operacional']:.2f}")
-    print(f"Faixa de Peso: {resultado['faixa_peso']}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado['custo_operacional'] == 6.65, "Custo esperado: R$ 6,65"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 6.65, "Custo esperado: R$ 6,65"
     print("✓ PASSOU")
     
-    # Caso 2: Produto de 300g vendido a R$ 12
+    # Caso 2: Produto de 250g vendido a R$ 12 (teto de 50% do preço abaixo de R$ 12,50)
     resultado = MercadoLivreCostsCalculator.calcular_custo_operacional_full(12.00, 0.25, "Produtos Comuns")
     print(f"\nProduto: 250g, Preço: R$ 12,00")
-    print(f"Resultado: R$ {resultado['custo_operacional']:.2f}")
-    print(f"Faixa de Peso: {resultado['faixa_peso']}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado['custo_operacional'] == 5.65, "Custo esperado: R$ 5,65"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 5.65, "Custo esperado: R$ 5,65"
     print("✓ PASSOU")
     
-    # Caso 3: Livro de 500g vendido a R$ 35
+    # Caso 3: Livro de 500g vendido a R$ 35 (500g ainda está na faixa "300g a 500g")
     resultado = MercadoLivreCostsCalculator.calcular_custo_operacional_full(35.00, 0.5, "Livros")
     print(f"\nLivro: 500g, Preço: R$ 35,00")
-    print(f"Resultado: R$ {resultado['custo_operacional']:.2f}")
-    print(f"Faixa de Peso: {resultado['faixa_peso']}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado['custo_operacional'] == 3.38, "Custo esperado: R$ 3,38"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 3.33, "Custo esperado: R$ 3,33"
     print("✓ PASSOU")
 
 
@@ -53,28 +44,22 @@ def testar_taxa_fixa_flex():
     # Caso 1: Produto vendido a R$ 15
     resultado = MercadoLivreCostsCalculator.calcular_taxa_fixa_flex(15.00, "Produtos Comuns")
     print(f"\nProduto: Preço R$ 15,00")
-    print(f"Resultado: R$ {resultado['taxa_fixa']:.2f}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado['taxa_fixa'] == 6.25, "Taxa esperada: R$ 6,25"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 6.25, "Taxa esperada: R$ 6,25"
     print("✓ PASSOU")
     
     # Caso 2: Produto vendido a R$ 35
     resultado = MercadoLivreCostsCalculator.calcular_taxa_fixa_flex(35.00, "Produtos Comuns")
     print(f"\nProduto: Preço R$ 35,00")
-    print(f"Resultado: R$ {resultado['taxa_fixa']:.2f}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado['taxa_fixa'] == 6.65, "Taxa esperada: R$ 6,65"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 6.65, "Taxa esperada: R$ 6,65"
     print("✓ PASSOU")
     
     # Caso 3: Livro vendido a R$ 25
     resultado = MercadoLivreCostsCalculator.calcular_taxa_fixa_flex(25.00, "Livros")
     print(f"\nLivro: Preço R$ 25,00")
-    print(f"Resultado: R$ {resultado['taxa_fixa']:.2f}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado['taxa_fixa'] == 3.50, "Taxa esperada: R$ 3,50"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 3.50, "Taxa esperada: R$ 3,50"
     print("✓ PASSOU")
 
 
@@ -85,23 +70,17 @@ def testar_frete_gratis_full():
     print("=" * 80)
     
     # Caso 1: Produto de 400g vendido a R$ 90 (exemplo do comunicado)
-    resultado = MercadoLivreCostsCalculator.calcular_frete_gratis_full(90.00, 0.4, "Produtos Comuns")
+    resultado = MercadoLivreCostsCalculator.calcular_frete_gratis_full(90.00, 0.4)
     print(f"\nProduto: 400g, Preço: R$ 90,00")
-    print(f"Resultado: R$ {resultado['custo_frete']:.2f}")
-    print(f"Faixa de Peso: {resultado['faixa_peso']}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado['custo_frete'] == 13.25, "Custo esperado: R$ 13,25"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 13.25, "Custo esperado: R$ 13,25"
     print("✓ PASSOU (Exemplo do comunicado: 300-500g entre R$ 79-99,99 = R$ 13,25)")
     
-    # Caso 2: Produto de 300g vendido a R$ 150
-    resultado = MercadoLivreCostsCalculator.calcular_frete_gratis_full(150.00, 0.25, "Produtos Comuns")
+    # Caso 2: Produto de 250g vendido a R$ 150
+    resultado = MercadoLivreCostsCalculator.calcular_frete_gratis_full(150.00, 0.25)
     print(f"\nProduto: 250g, Preço: R$ 150,00")
-    print(f"Resultado: R$ {resultado['custo_frete']:.2f}")
-    print(f"Faixa de Peso: {resultado['faixa_peso']}")
-    print(f"Faixa de Preço: {resultado['faixa_preco']}")
-    print(f"Tipo: {resultado['tipo']}")
-    assert resultado["custo_frete"] == 18.45, "Custo esperado: R$ 18,45"
+    print(f"Resultado: R$ {resultado:.2f}")
+    assert resultado == 18.45, "Custo esperado: R$ 18,45"
     print("✓ PASSOU")
 
 
@@ -132,8 +111,8 @@ def testar_integracao_pricing_calculator():
         regime_tributario="Lucro Real",
         tipo_anuncio="Clássico",
         peso_kg=0.4,
-        tipo_logistica_ml="Full",
-        categoria_ml="Produtos Comuns"
+        logistica="Full",
+        categoria="Produtos Comuns"
     )
     
     print(f"\nTeste 1: Produto com Logística Full, Preço R$ 45,00, Peso 400g")
@@ -156,8 +135,8 @@ def testar_integracao_pricing_calculator():
         regime_tributario="Lucro Real",
         tipo_anuncio="Clássico",
         peso_kg=0.4,
-        tipo_logistica_ml="Flex",
-        categoria_ml="Produtos Comuns"
+        logistica="Flex",
+        categoria="Produtos Comuns"
     )
     
     print(f"\nTeste 2: Produto com Logística Flex, Preço R$ 45,00")
@@ -180,8 +159,8 @@ def testar_integracao_pricing_calculator():
         regime_tributario="Lucro Real",
         tipo_anuncio="Clássico",
         peso_kg=0.4,
-        tipo_logistica_ml="Full",
-        categoria_ml="Produtos Comuns"
+        logistica="Full",
+        categoria="Produtos Comuns"
     )
     
     print(f"\nTeste 3: Produto com Logística Full, Preço R$ 90,00, Peso 400g (Frete Grátis)")
@@ -192,6 +171,29 @@ def testar_integracao_pricing_calculator():
     print(f"Status: {resultado['Status']}")
     assert resultado['Taxa Fixa R$'] == 13.25, "Taxa fixa esperada: R$ 13,25"
     print("✓ PASSOU")
+    
+    # Teste 4: Mesmo produto com frete informado no relatório: o frete do relatório já
+    # entra no lucro, então o frete grátis da tabela não é cobrado de novo
+    resultado = calculator.calcular_linha(
+        sku="MLB555555555",
+        descricao="Produto Teste 4",
+        custo_produto=40.00,
+        frete=8.00,
+        preco_atual=90.00,
+        marketplace="Mercado Livre",
+        regime_tributario="Lucro Real",
+        tipo_anuncio="Clássico",
+        peso_kg=0.4,
+        logistica="Full",
+        categoria="Produtos Comuns"
+    )
+    
+    print(f"\nTeste 4: Produto com Logística Full, Preço R$ 90,00, Frete do relatório R$ 8,00")
+    print(f"Taxa Fixa: R$ {resultado['Taxa Fixa R$']:.2f}")
+    print(f"Faixa: {resultado['Faixa Taxa Fixa']}")
+    assert resultado['Taxa Fixa R$'] == 0.0, "Taxa fixa esperada: R$ 0,00 (frete do relatório)"
+    assert resultado['Faixa Taxa Fixa'] == "Frete do relatório"
+    print("✓ PASSOU")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+"""
+Testes da conversão vetorizada de números em texto (padrão brasileiro ou americano)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from numeros_br import (FORMATO_BR, FORMATO_US, converter_numeros, formatar_percentuais, formatar_reais,
+                        estilizar_tabela, somar_estatisticas)
+
+
+def test_formato_brasileiro_com_moeda_e_percentual():
+    numeros, estatisticas = converter_numeros(
+        ["1.234,56", "R$ 12,90", "12,5%", "-R$ 1,50", "(3,00)", "R$\xa0 7", "", None, "n/d"]
+    )
+
+    assert numeros.tolist()[:6] == pytest.approx([1234.56, 12.90, 12.5, -1.5, -3.0, 7.0])
+    assert numeros.iloc[6:].isna().all()
+    assert estatisticas == {"formato": FORMATO_BR, "convertidos": 6, "invalidos": 1, "vazios": 2, "percentuais": 1}
+
+
+def test_formato_detectado_por_coluna():
+    """Ponto decimal vira en-US; valores ambíguos seguem o formato da coluna"""
+    numeros, estatisticas = converter_numeros(pd.Series(["1,234.56", "$12.90", "1,500", "7"], dtype="str"))
+    assert estatisticas["formato"] == FORMATO_US
+    assert numeros.tolist() == pytest.approx([1234.56, 12.90, 1500.0, 7.0])
+
+    numeros, estatisticas = converter_numeros(["1.500", "12,90"])
+    assert estatisticas["formato"] == FORMATO_BR
+    assert numeros.tolist() == pytest.approx([1500.0, 12.90])
+
+
+def test_colunas_numericas_e_mistas():
+    """Colunas numéricas passam direto; em colunas mistas do Excel só o texto é convertido"""
+    numeros, estatisticas = converter_numeros(np.array([1.5, np.nan, 3.0]))
+    assert estatisticas["formato"] is None and estatisticas["vazios"] == 1
+
+    mista = pd.Series([12.5, "1.234,56", None, 3], dtype=object, index=[10, 11, 12, 13])
+    numeros, estatisticas = converter_numeros(mista)
+    assert numeros.index.tolist() == [10, 11, 12, 13]
+    assert numeros.tolist()[:2] == pytest.approx([12.5, 1234.56]) and numeros.iloc[3] == 3.0
+    assert (estatisticas["convertidos"], estatisticas["vazios"]) == (3, 1)
+
+    total = somar_estatisticas([{"Frete": estatisticas}, {"Frete": estatisticas}])
+    assert total["Frete"]["convertidos"] == 6
+
+
+def test_formatar_reais_igual_a_formatacao_por_valor():
+    """A passada vetorizada dá o mesmo texto que a formatação de um valor por vez"""
+    valores = np.random.default_rng(0).normal(0, 1e5, 20_000).round(3)
+    esperado = [f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in valores]
+
+    assert formatar_reais(valores).tolist() == esperado
+    assert formatar_reais([1234567.891, -0.001, 0.5, np.nan]).tolist() == [
+        "R$ 1.234.567,89", "R$ 0,00", "R$ 0,50", "R$ 0,00"]
+
+
+def test_formatar_percentuais():
+    assert formatar_percentuais([12.5, 1234.567, -3.0, np.nan]).tolist() == ["12,50%", "1234,57%", "-3,00%", "0,00%"]
+    assert formatar_percentuais([12.345, 0.04], casas=1).tolist() == ["12,3%", "0,0%"]
+
+
+def test_estilizar_tabela_mantem_valores_numericos():
+    """A tabela exibe texto pt-BR, mas os valores (e a ordenação) continuam numéricos"""
+    df = pd.DataFrame({"SKU": ["A", "B"], "Lucro R$": [1500.0, -2.5], "Margem Bruta %": [30.0, None]})
+
+    estilo = estilizar_tabela(df, moeda=["Lucro R$", "Ausente"], percentual=["Margem Bruta %", "SKU"])
+    html = estilo.to_html()
+
+    assert estilo.data is df
+    for texto in ("R$ 1.500,00", "R$ -2,50", "30,00%", ">A<"):
+        assert texto in html
+    assert df["Lucro R$"].dtype == float
@@ -0,0 +1,71 @@
+"""
+Testes da escolha de logística Full x Flex por SKU
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mercado_livre_costs import MercadoLivreCostsCalculator
+from otimizador_logistica import OtimizadorLogistica
+
+
+def test_comparar_igual_ao_calculo_escalar():
+    """Os custos de cada logística reproduzem MercadoLivreCostsCalculator"""
+    rng = np.random.default_rng(3)
+    precos = np.concatenate([[18.99, 19.0, 78.99, 79.0], np.round(rng.uniform(1, 300, 500), 2)])
+    pesos = np.round(rng.uniform(0, 6, len(precos)), 2)
+
+    comparacao = OtimizadorLogistica.comparar(precos, pesos, custo_envio_flex=0.0, data_tarifas="2026-03-02")
+
+    def custo(preco, peso, logistica):
+        total = MercadoLivreCostsCalculator.calcular_custo_total_ml(preco, peso, logistica)
+        return total["custo_operacional"] + total["frete"]
+
+    np.testing.assert_allclose(comparacao["Custo Full R$"], [custo(p, w, "Full") for p, w in zip(precos, pesos)])
+    np.testing.assert_allclose(comparacao["Custo Flex R$"], [custo(p, w, "Flex") for p, w in zip(precos, pesos)])
+
+
+def test_analisar_catalogo_e_resumo():
+    """A recomendação respeita o limite de R$ 79 e a economia considera a logística atual e a quantidade"""
+    df = pd.DataFrame({
+        "SKU": ["BARATO_LEVE", "BARATO_PESADO", "CARO"],
+        "Preço Atual": [45.0, 60.0, 150.0],
+        "Peso (kg)": [0.2, 4.5, 0.4],
+        "Logística": ["Flex", "Flex", "Full"],
+        "Quantidade Vendida": [10, 2, 5],
+    })
+
+    analise = OtimizadorLogistica.analisar_catalogo(df, custo_envio_flex=10.0, data_tarifas="2026-03-02")
+
+    # 45: Full 6,55 x Flex 6,65 + 10; 60 (4,5 kg): Full 9,75 x Flex 7,75 + 10; 150: Full 19,85 x Flex 10
+    assert analise["Custo Full R$"].tolist() == pytest.approx([6.55, 9.75, 19.85])
+    assert analise["Custo Flex R$"].tolist() == pytest.approx([16.65, 17.75, 10.0])
+    assert analise["Logística Recomendada"].tolist() == ["Full", "Full", "Flex"]
+    assert analise["Economia no Período R$"].tolist() == pytest.approx([101.0, 16.0, 49.25])
+    assert OtimizadorLogistica.resumir(analise) == {
+        "skus": 3, "skus_full": 2, "skus_flex": 1, "skus_sem_recomendacao": 0, "skus_mudam": 3,
+        "economia_total": pytest.approx(166.25),
+    }
+
+
+def test_sem_custo_envio_flex_nao_recomenda_acima_de_79():
+    """Sem o custo de entrega do vendedor, SKUs a partir de R$ 79 não são recomendados nem somam economia"""
+    df = pd.DataFrame({
+        "SKU": ["BARATO", "CARO", "CARO_FLEX"],
+        "Preço Atual": [45.0, 150.0, 200.0],
+        "Peso (kg)": [0.2, 0.4, 1.0],
+        "Logística": ["Flex", "Full", "Flex"],
+        "Quantidade Vendida": [10, 5, 3],
+    })
+
+    analise = OtimizadorLogistica.analisar_catalogo(df, data_tarifas="2026-03-02")
+
+    assert analise["Logística Recomendada"].tolist()[0] == "Full"
+    assert analise["Logística Recomendada"].iloc[1:].isna().all()
+    assert analise["Custo Flex R$"].iloc[1:].isna().all()
+    assert analise["Economia no Período R$"].iloc[1:].isna().all()
+    assert OtimizadorLogistica.resumir(analise) == {
+        "skus": 3, "skus_full": 1, "skus_flex": 0, "skus_sem_recomendacao": 2, "skus_mudam": 1,
+        "economia_total": pytest.approx(1.0),
+    }
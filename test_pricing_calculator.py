@@ -0,0 +1,77 @@
+"""
+Testes da calculadora de precificação da base de dados (PricingCalculator)
+"""
+
+import numpy as np
+import pandas as pd
+
+from pricing_calculator import PricingCalculator
+
+
+def gerar_base(n_linhas, seed=0):
+    """Base de dados sintética com marketplaces e regimes misturados"""
+    rng = np.random.default_rng(seed)
+    precos = np.concatenate([[0.0, -5.0, 29.0, 50.0, 79.0, 79.01], rng.uniform(10, 400, n_linhas - 6).round(2)])
+    return pd.DataFrame({
+        "SKU": [f"SKU{i:05d}" for i in range(n_linhas)],
+        "Marketplace": rng.choice(["Mercado Livre", "Shopee", "Amazon", "Magalu", "Outros", "Mercado Livre Premium"], n_linhas),
+        "Regime Tributário": rng.choice(["Simples Nacional", "Lucro Presumido", "Lucro Real", "MEI", "Desconhecido"], n_linhas),
+        "Custo Produto (R$)": rng.uniform(5, 150, n_linhas).round(2),
+        "Frete (R$)": rng.uniform(0, 30, n_linhas).round(2),
+        "Preço Base (R$)": precos,
+        "Ads (%)": rng.choice([0.0, 2.0, 5.0], n_linhas),
+        "Margem Bruta (%)": rng.choice([20.0, 30.0], n_linhas),
+        "Margem Líquida (%)": rng.choice([5.0, 10.0], n_linhas),
+    })
+
+
+def processar_linha_a_linha(calculator, df):
+    """Referência: o cálculo por linha com os métodos escalares da calculadora"""
+    df = df.copy()
+    df["Custo Total Direto"] = df["Custo Produto (R$)"] + df["Frete (R$)"]
+    df["Custos Variáveis"] = df.apply(
+        lambda row: calculator.calcular_custos_variáveis(
+            row["Preço Base (R$)"], row["Marketplace"], row["Regime Tributário"], row["Ads (%)"] / 100
+        )["total_variavel"],
+        axis=1,
+    )
+    df["Lucro R$"] = df["Preço Base (R$)"] - df["Custo Total Direto"] - df["Custos Variáveis"]
+    df["Margem Calculada %"] = df.apply(
+        lambda row: row["Lucro R$"] / row["Preço Base (R$)"] * 100 if row["Preço Base (R$)"] > 0 else 0, axis=1
+    )
+    df["Desconto Máximo %"] = df.apply(
+        lambda row: calculator.calcular_desconto_maximo(
+            row["Preço Base (R$)"], row["Custo Total Direto"], row["Margem Líquida (%)"]
+        ),
+        axis=1,
+    )
+    df["Status"] = df.apply(
+        lambda row: calculator.avaliar_saude_precificacao(
+            row["Preço Base (R$)"], row["Margem Calculada %"], row["Margem Líquida (%)"], row["Margem Bruta (%)"]
+        ),
+        axis=1,
+    )
+    return df
+
+
+def test_processar_base_dados_igual_linha_a_linha():
+    """O cálculo vetorizado reproduz o cálculo por linha em marketplaces/regimes misturados"""
+    calculator = PricingCalculator()
+    df = gerar_base(2000)
+
+    pd.testing.assert_frame_equal(
+        calculator.processar_base_dados(df),
+        processar_linha_a_linha(calculator, df),
+        check_dtype=False,
+    )
+
+
+def test_taxa_fixa_mercado_livre_vetorizada():
+    """As faixas de taxa fixa do Mercado Livre batem com a versão escalar, inclusive nos limites"""
+    calculator = PricingCalculator()
+    precos = np.array([-1.0, 0.0, 10.0, 29.0, 29.01, 50.0, 50.01, 79.0, 79.01, 200.0])
+
+    for categoria in ("Produtos Comuns", "Livros"):
+        esperado = [calculator.calcular_taxa_fixa_mercado_livre(p, categoria)["taxa_fixa"] for p in precos]
+        obtido = PricingCalculator._taxa_fixa_mercado_livre_vetorizada(precos, categoria)
+        assert obtido.tolist() == esperado
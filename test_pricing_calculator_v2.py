@@ -0,0 +1,150 @@
+"""
+Testes da Calculadora de Precificação V2 (cálculo vetorizado e modo centavos)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from centavos import BANCARIO, MEIO_PARA_CIMA, aplicar_taxa, dividir_arredondando, para_centavos
+from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+from pricing_calculator_v2 import PricingCalculatorV2
+
+
+def gerar_relatorio(n_linhas, seed=0):
+    """Relatório agregado sintético, incluindo preços nos limites das faixas"""
+    rng = np.random.default_rng(seed)
+    limites = [10.0, 29.0, 29.01, 50.0, 79.0, 79.01, 79.99, 79.995, 80.0, 99.99, 100.0, 499.99, 500.0, 1200.0]
+    precos = np.concatenate([limites, rng.uniform(5, 800, n_linhas - len(limites)).round(2)])
+    return pd.DataFrame({
+        "SKU": [f"SKU{i:05d}" for i in range(n_linhas)],
+        "Descrição": [f"Produto {i}" for i in range(n_linhas)],
+        "Custo Produto": rng.uniform(5, 300, n_linhas).round(2),
+        "Frete": rng.uniform(0, 40, n_linhas).round(2),
+        "Preço Atual": precos,
+        "Tipo de Anúncio": rng.choice(["Clássico", "Premium", ""], n_linhas),
+    })
+
+
+def criar_calculadora(**kwargs):
+    return PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0,
+                               custo_fixo_operacional=2.0, taxa_devolucao=1.5, **kwargs)
+
+
+@pytest.mark.parametrize("marketplace", ["Mercado Livre", "Shopee", "Amazon", "Inexistente"])
+def test_calculo_vetorizado_igual_calcular_linha(marketplace):
+    """O cálculo vetorizado reproduz calcular_linha linha a linha"""
+    calculadora = criar_calculadora()
+    df = gerar_relatorio(300)
+    
+    esperado = pd.DataFrame([
+        calculadora.calcular_linha(
+            sku=row["SKU"],
+            descricao=row["Descrição"],
+            custo_produto=row["Custo Produto"],
+            frete=row["Frete"],
+            preco_atual=row["Preço Atual"],
+            marketplace=marketplace,
+            regime_tributario="Lucro Presumido",
+            tipo_anuncio=row["Tipo de Anúncio"],
+        )
+        for _, row in df.iterrows()
+    ])
+    obtido = calculadora._calcular_vetorizado(df, marketplace, "Lucro Presumido")
+    
+    # Colunas de texto repetitivo são categóricas no cálculo vetorizado
+    categoricas = obtido.select_dtypes("category").columns
+    obtido[categoricas] = obtido[categoricas].astype(str)
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False)
+
+
+def test_dividir_arredondando():
+    """Meio centavo: meio para cima afasta do zero; bancário vai para o par"""
+    numeradores = np.array([25, 35, -25, 24, 26])
+    
+    assert dividir_arredondando(numeradores, 10, MEIO_PARA_CIMA).tolist() == [3, 4, -3, 2, 3]
+    assert dividir_arredondando(numeradores, 10, BANCARIO).tolist() == [2, 4, -2, 2, 3]
+    with pytest.raises(ValueError):
+        dividir_arredondando(numeradores, 10, "truncar")
+
+
+def test_para_centavos_sem_deriva_binaria():
+    """12,345 é meio centavo exato, mesmo sendo 12,34499... em float"""
+    assert para_centavos([12.345, 0.005, 19.99, np.nan]).tolist() == [1235, 1, 1999, 0]
+    assert para_centavos([12.345, 0.005], BANCARIO).tolist() == [1234, 0]
+    # 14% de R$ 12,75 = 1,785 → 1,79 (meio para cima) ou 1,78 (bancário)
+    assert aplicar_taxa(np.array([1275]), 0.14).tolist() == [179]
+    assert aplicar_taxa(np.array([1275]), 0.14, BANCARIO).tolist() == [178]
+
+
+def test_modo_centavos():
+    """No modo centavos todo valor monetário tem no máximo duas casas e o lucro fecha exatamente"""
+    df = gerar_relatorio(500)
+    resultado = criar_calculadora(modo_monetario="centavos")._calcular_vetorizado(df, "Shopee", "Simples Nacional")
+    referencia = criar_calculadora()._calcular_vetorizado(df, "Shopee", "Simples Nacional")
+    
+    colunas = ["Preco Atual (R$)", "Custo Produto", "Frete", "Comissao R$", "Taxa Fixa R$", "Impostos",
+               "Publicidade", "Subsidio Pix R$", "Lucro R$"]
+    centavos = resultado[colunas] * 100
+    assert np.allclose(centavos, centavos.round(), atol=1e-6)
+    
+    # Cada taxa difere do float em no máximo meio centavo (o lucro acumula até 7 arredondamentos)
+    assert (resultado["Comissao R$"] - referencia["Comissao R$"]).abs().max() <= 0.005 + 1e-9
+    assert (resultado["Lucro R$"] - referencia["Lucro R$"]).abs().max() <= 0.035 + 1e-9
+    assert list(resultado.columns) == list(referencia.columns)
+
+
+def test_modo_monetario_invalido():
+    with pytest.raises(ValueError):
+        criar_calculadora(modo_monetario="decimal")
+
+
+def test_tarifas_mercado_livre_2026_por_peso_e_logistica():
+    """Custo operacional, taxa Flex e frete grátis por peso entram no cálculo e no detalhamento"""
+    df = pd.DataFrame({
+        "SKU": ["FULL45", "FLEX25", "FULL150", "FULL150_FRETE", "LIVRO30", "VEICULO100"],
+        "Descrição": ["a", "b", "c", "d", "e", "f"],
+        "Custo Produto": [10.0] * 6,
+        "Frete": [0.0, 0.0, 0.0, 15.0, 0.0, 0.0],
+        "Preço Atual": [45.0, 25.0, 150.0, 150.0, 30.0, 100.0],
+        "Tipo de Anúncio": ["Clássico", "Clássico", "Premium", "Premium", "Clássico", "Premium"],
+        "Peso (kg)": [0.25, np.nan, 0.4, 0.4, 0.3, 0.8],
+        "Logística": ["Full", "Flex", "Full", "Full", "", "Full"],
+        "Categoria": ["", "", "", "", "Livros", "Acessórios para Veículos"],
+    })
+    calculadora = criar_calculadora(data_tarifas="2026-03-02")
+    resultado = calculadora._calcular_vetorizado(df, "Mercado Livre", "Simples Nacional")
+    
+    assert resultado["Custo Operacional R$"].tolist() == pytest.approx([6.55, 6.65, 0.0, 0.0, 3.28, 0.0])
+    # O frete informado no relatório prevalece sobre o frete grátis da tabela
+    assert resultado["Frete ML R$"].tolist() == pytest.approx([0.0, 0.0, 19.85, 0.0, 0.0, 16.15])
+    assert resultado["Taxa Fixa R$"].tolist() == pytest.approx([6.55, 6.65, 19.85, 0.0, 3.28, 16.15])
+    assert resultado["Comissao R$"].tolist() == pytest.approx([6.30, 3.50, 28.50, 28.50, 1.95, 17.00])
+    assert resultado["Faixa Taxa Fixa"].astype(str).tolist() == [
+        "Custo operacional Full", "Taxa fixa Flex", "Frete grátis Full", "Frete do relatório",
+        "Custo operacional Full", "Frete grátis Full",
+    ]
+    
+    esperado = [
+        calculadora.calcular_linha(r["SKU"], r["Descrição"], r["Custo Produto"], r["Frete"], r["Preço Atual"],
+                                   "Mercado Livre", "Simples Nacional", r["Tipo de Anúncio"], r["Peso (kg)"],
+                                   r["Logística"], r["Categoria"])["Lucro R$"]
+        for _, r in df.iterrows()
+    ]
+    np.testing.assert_allclose(resultado["Lucro R$"], esperado)
+    
+    # Pelas regras de 2025, a taxa fixa só depende do preço
+    anterior = criar_calculadora(data_tarifas="2025-12-31")._calcular_vetorizado(df, "Mercado Livre", "Simples Nacional")
+    assert anterior["Taxa Fixa R$"].tolist() == pytest.approx([6.50, 6.25, 0.0, 0.0, 3.50, 0.0])
+
+
+def test_resultado_traz_quantidade_e_faturamento_por_linha():
+    """Faturamento e Curva ABC saem no resultado, alinhados às linhas do cálculo"""
+    df = gerar_relatorio(200, seed=5)
+    df["Quantidade Vendida"] = np.random.default_rng(5).integers(0, 50, len(df))
+
+    resultado = criar_calculadora().calcular_dataframe(df, "Mercado Livre", "Simples Nacional")
+
+    assert resultado["Quantidade Vendida"].tolist() == df["Quantidade Vendida"].tolist()
+    np.testing.assert_allclose(resultado["Faturamento"], df["Preço Atual"] * df["Quantidade Vendida"])
+    assert list(resultado.columns[-4:]) == ["Quantidade Vendida", "Faturamento", "Curva ABC", "Status"]
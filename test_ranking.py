@@ -0,0 +1,58 @@
+"""
+Testes das consultas de top-N e da curva de Pareto do Dashboard
+"""
+
+import numpy as np
+
+from config import CURVA_ABC_LIMITS
+from ranking import curva_pareto, posicoes_top_n
+
+
+def test_top_n_igual_a_ordenacao_completa():
+    """Os N vencedores saem na mesma ordem da ordenação completa (empates pela ordem das linhas)"""
+    rng = np.random.default_rng(0)
+    lucro = rng.normal(10, 30, 50_000).round(1)
+
+    np.testing.assert_array_equal(posicoes_top_n(lucro, 25), np.argsort(-lucro, kind="stable")[:25])
+    np.testing.assert_array_equal(posicoes_top_n(lucro, 25, maiores=False), np.argsort(lucro, kind="stable")[:25])
+    assert len(posicoes_top_n(lucro[:3], 10)) == 3
+
+
+def test_top_n_com_muitos_empates():
+    """Com valores repetidos, os empatados no corte entram na ordem das linhas"""
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        valores = rng.integers(0, 5, 300).astype(float)
+        mascara = rng.random(300) < 0.7
+        candidatas = np.flatnonzero(mascara)
+
+        np.testing.assert_array_equal(posicoes_top_n(valores, 10), np.argsort(-valores, kind="stable")[:10])
+        np.testing.assert_array_equal(posicoes_top_n(valores, 10, maiores=False),
+                                      np.argsort(valores, kind="stable")[:10])
+        np.testing.assert_array_equal(posicoes_top_n(valores, 10, mascara=mascara),
+                                      candidatas[np.argsort(-valores[candidatas], kind="stable")[:10]])
+
+
+def test_top_n_com_mascara_e_nulos():
+    """Só as linhas da máscara concorrem e valores nulos nunca entram no ranking"""
+    margem = np.array([5.0, np.nan, 40.0, 12.0, np.nan, 33.0, 8.0])
+    mascara = np.array([True, True, False, True, True, True, True])
+
+    assert posicoes_top_n(margem, 3).tolist() == [2, 5, 3]
+    assert posicoes_top_n(margem, 3, mascara=mascara).tolist() == [5, 3, 6]
+    assert posicoes_top_n(margem, 10, maiores=False, mascara=mascara).tolist() == [0, 6, 3, 5]
+
+
+def test_curva_pareto_em_pontos_fixos():
+    """A curva tem sempre o mesmo número de pontos e cada ponto é o acumulado exato"""
+    rng = np.random.default_rng(1)
+    faturamento = rng.lognormal(3, 1.5, 100_000)
+
+    curva = curva_pareto(faturamento, pontos=100)
+    acumulado = np.cumsum(np.sort(faturamento)[::-1]) / faturamento.sum() * 100
+
+    assert len(curva) == 101 and len(curva_pareto(faturamento[:5_000], pontos=100)) == 101
+    np.testing.assert_allclose(curva["% Faturamento"].iloc[1:], acumulado[999::1_000])
+    assert curva["% Faturamento"].is_monotonic_increasing
+    # Curva A: os SKUs até 80% do faturamento são uma minoria
+    assert curva.loc[curva["% Faturamento"] <= CURVA_ABC_LIMITS["A"] * 100, "% SKUs"].max() < 50
@@ -0,0 +1,73 @@
+"""
+Testes do registro de tabelas de tarifas por vigência
+"""
+
+import datetime
+
+import numpy as np
+import pytest
+
+from mercado_livre_costs import MercadoLivreCostsCalculator
+from tabelas_tarifas import comparar_tabelas, obter_tabela
+
+
+def test_tabela_vigente_por_data():
+    """Até 01/03/2026 valem as regras de 2025; a partir de 02/03/2026, as novas"""
+    assert obter_tabela("Mercado Livre", "2026-03-01").nome == "Mercado Livre 2025"
+    assert obter_tabela("Mercado Livre", datetime.date(2026, 3, 2)).nome == "Mercado Livre 2026"
+    assert obter_tabela("Mercado Livre", "2026-03-02") is obter_tabela("Mercado Livre", "2030-01-01")
+
+    with pytest.raises(ValueError):
+        obter_tabela("Mercado Livre", "2024-12-31")
+    with pytest.raises(ValueError):
+        obter_tabela("Marketplace Inexistente")
+
+
+def test_valores_das_tabelas_de_2026():
+    """Valores conferidos com NOVOS_CUSTOS_ML_MARCO_2026.md"""
+    tabela = obter_tabela("Mercado Livre", "2026-03-02")
+
+    full = tabela.calcular([45.0, 60.0, 150.0, 10.0], pesos=[0.25, 0.55, 0.4, 0.2])
+    assert full["custo_operacional"].tolist() == pytest.approx([6.55, 7.95, 0.0, 5.0])
+    assert full["frete"].tolist() == pytest.approx([0.0, 0.0, 19.85, 0.0])
+
+    flex = tabela.calcular([25.0, 35.0], categoria=["Geral", "Livros"], logistica="Flex")
+    assert flex["custo_operacional"].tolist() == pytest.approx([6.65, 3.50])
+    assert flex["frete"].tolist() == [0.0, 0.0]
+
+    categorias = tabela.calcular([30.0, 25.0, 100.0], pesos=0.3, categoria=["Livros", "Supermercado",
+                                                                           "Acessórios para Veículos"],
+                                 tipo_anuncio=["Clássico", "Clássico", "Premium"])
+    assert categorias["custo_operacional"].tolist() == pytest.approx([3.28, 1.50, 0.0])
+    assert categorias["comissao_taxa"].tolist() == pytest.approx([0.065, 0.14, 0.17])
+
+
+def test_tabela_compilada_igual_ao_calculo_escalar():
+    """A consulta vetorizada reproduz MercadoLivreCostsCalculator.calcular_custo_total_ml"""
+    rng = np.random.default_rng(1)
+    n = 2000
+    precos = np.concatenate([[12.49, 12.5, 18.99, 19.0, 28.99, 29.0, 78.99, 79.0, 199.99, 200.0],
+                             np.round(rng.uniform(1, 300, n), 2)])
+    pesos = np.round(rng.uniform(0, 7, len(precos)), 2)
+    categorias = rng.choice(["Geral", "Livros", "Supermercado", "Acessórios para Veículos"], len(precos))
+    logisticas = rng.choice(["Full", "Flex"], len(precos))
+    tipos = rng.choice(["Clássico", "Premium"], len(precos))
+
+    tarifas = obter_tabela("Mercado Livre", "2026-06-01").calcular(precos, pesos, categorias, logisticas, tipos)
+    esperado = [
+        MercadoLivreCostsCalculator.calcular_custo_total_ml(p, w, l, c, t)["custo_total"]
+        for p, w, c, l, t in zip(precos, pesos, categorias, logisticas, tipos)
+    ]
+
+    np.testing.assert_allclose(tarifas["custo_total"], esperado)
+
+
+def test_comparar_tabelas_lado_a_lado():
+    """A comparação traz as duas tabelas e a diferença de custo total"""
+    comparacao = comparar_tabelas([29.0, 45.0, 85.0], "Mercado Livre", "2025-06-01", "2026-03-02", pesos=0.25)
+
+    assert comparacao.attrs == {"tabela_a": "Mercado Livre 2025", "tabela_b": "Mercado Livre 2026"}
+    assert comparacao["custo_operacional_a"].tolist() == pytest.approx([6.25, 6.50, 0.0])
+    assert comparacao["custo_operacional_b"].tolist() == pytest.approx([6.55, 6.55, 0.0])
+    assert comparacao["frete_b"].tolist() == pytest.approx([0.0, 0.0, 12.35])
+    assert comparacao["diferenca"].tolist() == pytest.approx([0.30, 0.05, 12.35])
@@ -0,0 +1,86 @@
+"""
+Testes da execução de cálculos em segundo plano
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_MARKETPLACES, DEFAULT_REGIMES
+from pricing_calculator_v2 import PricingCalculatorV2
+from tarefas import CANCELADA, CONCLUIDA, ERRO, ExecutorTarefas, processar_em_blocos
+
+
+def criar_relatorio(n):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "SKU": [f"SKU{i}" for i in range(n)],
+        "Descrição": [f"Produto {i}" for i in range(n)],
+        "Custo Produto": rng.uniform(10, 200, n).round(2),
+        "Frete": rng.uniform(0, 30, n).round(2),
+        "Preço Atual": rng.uniform(20, 600, n).round(2),
+        "Tipo de Anúncio": rng.choice(["Clássico", "Premium"], n),
+    })
+
+
+def test_calculo_em_blocos_igual_ao_direto():
+    """O resultado em blocos é idêntico ao cálculo de uma vez, e o progresso soma todas as linhas"""
+    calculadora = PricingCalculatorV2(DEFAULT_MARKETPLACES, DEFAULT_REGIMES, 30.0, 10.0, 3.0)
+    df = criar_relatorio(2_500)
+    blocos = []
+
+    direto = calculadora.calcular_dataframe(df, "Mercado Livre", "Simples Nacional")
+    em_blocos = processar_em_blocos(
+        df,
+        lambda bloco: calculadora.calcular_dataframe(bloco, "Mercado Livre", "Simples Nacional"),
+        blocos.append,
+        tamanho_bloco=1_000,
+    )
+
+    assert blocos == [1_000, 1_000, 500]
+    pd.testing.assert_frame_equal(em_blocos, direto.reset_index(drop=True))
+
+
+def test_cancelar_tarefa_entre_blocos():
+    """Cancelada, a tarefa para no fim do bloco e o resultado não chega à sessão"""
+    executor = ExecutorTarefas()
+    liberar = threading.Event()
+
+    def funcao(bloco):
+        liberar.wait(5)
+        return bloco
+
+    df = pd.DataFrame({"x": range(100)})
+    tarefa = executor.iniciar(
+        "teste", lambda progresso: processar_em_blocos(df, funcao, progresso, tamanho_bloco=10),
+        len(df), "resultado",
+    )
+    tarefa.cancelar()
+    liberar.set()
+    executor.encerrar()
+    executor._executor.shutdown(wait=True)
+
+    estado = {}
+    assert tarefa.estado == CANCELADA
+    assert tarefa.concluidas == 10
+    assert executor.coletar(estado) == [tarefa]
+    assert estado == {}
+
+
+def test_coletar_resultado_e_erro():
+    """Tarefas concluídas copiam o resultado para o destino; erros ficam registrados, uma coleta só"""
+    executor = ExecutorTarefas()
+
+    def falhar(progresso):
+        raise ValueError("falhou")
+
+    ok = executor.iniciar("ok", lambda progresso: 42, 1, "resultado", em_segundo_plano=False)
+    erro = executor.iniciar("erro", falhar, 1, "outro", em_segundo_plano=False)
+
+    estado = {}
+    assert executor.coletar(estado) == [ok, erro]
+    assert estado == {"resultado": 42}
+    assert ok.estado == CONCLUIDA and ok.progresso == 1.0
+    assert erro.estado == ERRO and isinstance(erro.erro, ValueError)
+    assert executor.coletar(estado) == []